@@ -1,87 +1,148 @@
-"""Addon registry and loader"""
+"""Addon registry and loader
+
+Addons are registered by module and class name and imported on first use,
+so importing this package (e.g. for ``BaseAddon``) does not pull in gradio
+and every addon's dependencies. Expensive indexes are built by each addon's
+``warm_up`` in a background thread once the UI has been created.
+"""
 import sys
 import os
+import importlib
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Type
 
 # Ensure parent directory is in path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from addons.base_addon import BaseAddon
-from addons.storyboard_editor import StoryboardEditorAddon
-from addons.storyboard_manager import StoryboardManagerAddon
-from addons.storyboard_llm_generator import StoryboardLLMGeneratorAddon
-from addons.project_panel import ProjectAddon
-from addons.keyframe_generator import KeyframeGeneratorAddon
-from addons.keyframe_selector import KeyframeSelectorAddon
-from addons.video_generator import VideoGeneratorAddon
-from addons.image_importer import ImageImporterAddon
-from addons.test_comfy_flux import TestComfyFluxAddon
-from addons.model_manager import ModelManagerAddon
-from addons.settings_panel import SettingsAddon
-from addons.setup_wizard import SetupWizardAddon
-from addons.firstlast_video import FirstLastVideoAddon
-from addons.lipsync_addon import LipsyncAddon
-from addons.dataset_generator import DatasetGeneratorAddon
-from addons.character_trainer import CharacterTrainerAddon
-from addons.help_addon import HelpAddon
-from addons.tts_addon import TTSAddon
-from addons.update_addon import UpdateAddon
 from infrastructure.logger import get_logger
+from infrastructure.startup_profile import StartupProfile
 
 logger = get_logger(__name__)
 
 
-# Registry of all available addons
+# Registry of all available addons: (module, class name)
 # Order determines tab order in the UI
-AVAILABLE_ADDONS = [
+AVAILABLE_ADDONS: List[Tuple[str, str]] = [
     # === Project & Setup ===
-    ProjectAddon,            # Create/select project
-    StoryboardManagerAddon,  # Manage storyboards
-    StoryboardEditorAddon,   # Define shots
-    StoryboardLLMGeneratorAddon,  # AI storyboard generation
+    ("addons.project_panel", "ProjectAddon"),                        # Create/select project
+    ("addons.storyboard_manager", "StoryboardManagerAddon"),         # Manage storyboards
+    ("addons.storyboard_editor", "StoryboardEditorAddon"),           # Define shots
+    ("addons.storyboard_llm_generator", "StoryboardLLMGeneratorAddon"),  # AI storyboard generation
 
     # === Keyframe Production ===
-    ImageImporterAddon,      # Import custom images (alternative)
-    KeyframeGeneratorAddon,  # AI-generated keyframes
-    KeyframeSelectorAddon,   # Select best variant
+    ("addons.image_importer", "ImageImporterAddon"),      # Import custom images (alternative)
+    ("addons.keyframe_generator", "KeyframeGeneratorAddon"),  # AI-generated keyframes
+    ("addons.keyframe_selector", "KeyframeSelectorAddon"),    # Select best variant
 
     # === Video Production ===
-    VideoGeneratorAddon,     # Animate keyframes to video
-    FirstLastVideoAddon,     # First/Last frame video
-    LipsyncAddon,            # Audio-to-video lipsync
+    ("addons.video_generator", "VideoGeneratorAddon"),    # Animate keyframes to video
+    ("addons.firstlast_video", "FirstLastVideoAddon"),    # First/Last frame video
+    ("addons.lipsync_addon", "LipsyncAddon"),             # Audio-to-video lipsync
 
     # === Training & Tools ===
-    DatasetGeneratorAddon,   # Create character datasets
-    CharacterTrainerAddon,   # LoRA training
-    TTSAddon,                # Text-to-speech for explainer videos
-    TestComfyFluxAddon,      # Test ComfyUI
-    ModelManagerAddon,       # Manage models
-    SetupWizardAddon,        # Initial setup
+    ("addons.dataset_generator", "DatasetGeneratorAddon"),    # Create character datasets
+    ("addons.character_trainer", "CharacterTrainerAddon"),    # LoRA training
+    ("addons.tts_addon", "TTSAddon"),                         # Text-to-speech for explainer videos
+    ("addons.test_comfy_flux", "TestComfyFluxAddon"),         # Test ComfyUI
+    ("addons.model_manager", "ModelManagerAddon"),            # Manage models
+    ("addons.setup_wizard", "SetupWizardAddon"),              # Initial setup
 
     # === Settings & Help ===
-    SettingsAddon,           # Configuration
-    UpdateAddon,             # Updates & Rollback
-    HelpAddon,               # Help & workflow overview (rightmost)
+    ("addons.settings_panel", "SettingsAddon"),   # Configuration
+    ("addons.update_addon", "UpdateAddon"),       # Updates & Rollback
+    ("addons.help_addon", "HelpAddon"),           # Help & workflow overview (rightmost)
 ]
 
+_ADDON_MODULES: Dict[str, str] = {class_name: module for module, class_name in AVAILABLE_ADDONS}
+
 
-def load_addons():
+def get_addon_class(class_name: str) -> Type[BaseAddon]:
+    """
+    Import an addon class by name
+
+    Args:
+        class_name: Registered class name, e.g. "ModelManagerAddon"
+
+    Returns:
+        The addon class
+
+    Raises:
+        KeyError: If the class is not registered
+    """
+    module = importlib.import_module(_ADDON_MODULES[class_name])
+    return getattr(module, class_name)
+
+
+def load_addons(profile: Optional[StartupProfile] = None) -> List[BaseAddon]:
     """
     Load all enabled addons
 
+    Args:
+        profile: Optional startup profile to record import/construct timings
+
     Returns:
         List of instantiated addon objects
     """
+    profile = profile or StartupProfile()
     addons = []
-    for addon_class in AVAILABLE_ADDONS:
+    for module_name, class_name in AVAILABLE_ADDONS:
         try:
-            addon = addon_class()
-            addon.on_load()
+            with profile.measure(class_name, "import"):
+                addon_class = get_addon_class(class_name)
+            with profile.measure(class_name, "construct"):
+                addon = addon_class()
+                addon.on_load()
             addons.append(addon)
             logger.info(f"✓ Loaded addon: {addon.name}")
         except Exception as e:
-            logger.error(f"Failed to load {addon_class.__name__}: {e}", exc_info=True)
+            logger.error(f"Failed to load {class_name} ({module_name}): {e}", exc_info=True)
 
     return addons
 
 
-__all__ = ["BaseAddon", "load_addons", "AVAILABLE_ADDONS"]
+def warm_up_addons(
+    addons: List[BaseAddon],
+    profile: Optional[StartupProfile] = None,
+    on_complete: Optional[Callable[[], None]] = None
+) -> threading.Thread:
+    """
+    Run each addon's ``warm_up`` in one background thread
+
+    Called after the UI is built so expensive indexes do not delay startup.
+
+    Args:
+        addons: Loaded addons
+        profile: Optional startup profile to record warm-up timings
+        on_complete: Called after all addons warmed up (e.g. to save the profile)
+
+    Returns:
+        The started daemon thread
+    """
+    def run():
+        for addon in addons:
+            try:
+                if profile is not None:
+                    with profile.measure(type(addon).__name__, "warm_up"):
+                        addon.warm_up()
+                else:
+                    addon.warm_up()
+            except Exception as e:
+                logger.warning(f"Warm-up failed for {addon.name}: {e}")
+        logger.info("Addon warm-up complete")
+        if on_complete is not None:
+            on_complete()
+
+    thread = threading.Thread(target=run, name="addon-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def __getattr__(name: str):
+    """Lazy access to addon classes, e.g. ``from addons import ModelManagerAddon``."""
+    if name in _ADDON_MODULES:
+        return get_addon_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["BaseAddon", "load_addons", "warm_up_addons", "get_addon_class", "AVAILABLE_ADDONS"]
@@ -2,6 +2,8 @@
 from abc import ABC, abstractmethod
 from typing import List, Any
 
+from infrastructure.service_container import ServiceContainer, get_service_container
+
 
 # Valid addon categories for tab grouping
 ADDON_CATEGORIES = {
@@ -32,6 +34,8 @@ class BaseAddon(ABC):
         self.description = description
         self.category = category if category in ADDON_CATEGORIES else "production"
         self.enabled = True
+        # Shared config, stores and services (one instance per process)
+        self.services: ServiceContainer = get_service_container()
 
     @abstractmethod
     def render(self) -> List[Any]:
@@ -57,6 +61,10 @@ class BaseAddon(ABC):
         """Called when addon is loaded (optional override)"""
         pass
 
+    def warm_up(self):
+        """Build expensive caches in the background after the UI is up (optional override)"""
+        pass
+
     def on_unload(self):
         """Called when GUI closes (optional override)"""
         pass
@@ -65,10 +65,10 @@ class CharacterTrainerAddon(BaseAddon):
             description="Train character LoRAs with Kohya sd-scripts",
             category="training"
         )
-        self.config = ConfigManager()
+        self.config = self.services.get(ConfigManager)
         self.lora_service = LoraTrainerService(self.config)
         self.kohya_service = KohyaTrainerService(self.config)
-        self._job_store = JobStatusStore()
+        self._job_store = self.services.get(JobStatusStore)
 
     def get_tab_name(self) -> str:
         return "🎭 LoRA"
@@ -314,9 +314,9 @@ def _get_remote_backend_label() -> str:
     """Return a badge label if a remote ComfyUI backend is configured."""
     try:
         from urllib.parse import urlparse
-        from infrastructure.config_manager import ConfigManager
+        from infrastructure.service_container import get_service_container
 
-        url = ConfigManager().get_comfy_url()
+        url = get_service_container().config.get_comfy_url()
         if not url:
             return ""
 
@@ -17,6 +17,8 @@ from addons.components import format_project_status
 from infrastructure.config_manager import ConfigManager
 from infrastructure.logger import get_logger
 from infrastructure.job_status_store import JobStatusStore
+from infrastructure.job_runner import Job
+from infrastructure.thumbnail_cache import get_thumbnail_cache
 from services.character_trainer_service import (
     CharacterTrainerService,
     VIEW_PRESETS,
@@ -28,15 +30,19 @@ logger = get_logger(__name__)
 class DatasetGeneratorAddon(BaseAddon):
     """Addon for generating character training datasets using Qwen Image Edit."""
 
+    # Seconds between status refreshes while following a background job
+    JOB_POLL_SECONDS = 2.0
+
     def __init__(self):
         super().__init__(
             name="Dataset Generator",
             description="Generate character training datasets with 15 views/poses",
             category="training"
         )
-        self.config = ConfigManager()
+        self.config = self.services.get(ConfigManager)
         self.char_service = CharacterTrainerService(self.config)
-        self._job_store = JobStatusStore()
+        self._job_store = self.services.get(JobStatusStore)
+        self.job_runner = self.services.job_runner
 
     def get_tab_name(self) -> str:
         return "📸 Dataset"
@@ -168,73 +174,55 @@ class DatasetGeneratorAddon(BaseAddon):
                         copy_path_btn = gr.Button("📋 Copy path", size="sm")
 
         # Event handlers
-        def generate_dataset(name, image_path, workflow, steps, cfg, progress=gr.Progress()):
+        def generate_dataset(name, image_path, workflow, steps, cfg):
             if not name or not name.strip():
-                return "**Status:** ❌ Please enter a character name", [], "", self._get_job_status_md("dataset_generation")
+                yield "**Status:** ❌ Please enter a character name", [], "", self._get_job_status_md("dataset_generation")
+                return
 
             if not image_path or not os.path.exists(image_path):
-                return "**Status:** ❌ Please upload a base image", [], "", self._get_job_status_md("dataset_generation")
-
-            # Set workflow before generation
-            workflow_file = self._get_workflow_file(workflow)
-            if workflow_file:
-                self.char_service.set_workflow(workflow_file)
-
-            def progress_callback(pct, status):
-                progress(pct, desc=status)
-
-            progress(0, desc="Starting Generation...")
+                yield "**Status:** ❌ Please upload a base image", [], "", self._get_job_status_md("dataset_generation")
+                return
+
+            job = self.job_runner.find_active("dataset_generation")
+            if job is None:
+                # Set workflow before generation
+                workflow_file = self._get_workflow_file(workflow)
+                if workflow_file:
+                    self.char_service.set_workflow(workflow_file)
+                job = self.job_runner.submit(
+                    "dataset_generation",
+                    lambda job: self._generate_training_set(job, image_path, name.strip(), int(steps), float(cfg)),
+                    label=f"Dataset: {name.strip()}",
+                )
 
-            self._job_store.set_status(
-                None,
-                "dataset_generation",
-                "running",
-                message="Dataset generation started",
-                metadata={"character": name.strip()},
-            )
+            # The job keeps running if the page is closed; the status panel shows its outcome
+            while not job.wait(timeout=self.JOB_POLL_SECONDS):
+                yield f"**Status:** ⏳ {job.message}", gr.update(), gr.update(), gr.update()
 
-            result = self.char_service.generate_training_set(
-                base_image_path=image_path,
-                character_name=name.strip(),
-                steps=int(steps),
-                cfg=float(cfg),
-                callback=progress_callback
-            )
+            if job.status != "completed":
+                yield f"**Status:** ❌ {job.error or job.message}", [], "", self._get_job_status_md("dataset_generation")
+                return
 
-            if result.success:
-                gallery_items = []
+            result = job.result
+            gallery_items = []
 
-                # Base image
-                base_path = os.path.join(result.output_dir, "00_base_image.png")
-                if os.path.exists(base_path):
-                    gallery_items.append((base_path, "Base"))
+            # Base image
+            base_path = os.path.join(result.output_dir, "00_base_image.png")
+            if os.path.exists(base_path):
+                gallery_items.append((base_path, "Base"))
 
-                # Generated views
-                for view in result.views:
-                    if view.success and view.image_path:
-                        gallery_items.append((view.image_path, view.preset.name))
+            # Generated views
+            for view in result.views:
+                if view.success and view.image_path:
+                    gallery_items.append((view.image_path, view.preset.name))
 
-                status = (
-                    f"**Status:** ✅ {result.successful_count}/15 views generated "
-                    f"in {result.duration_seconds:.1f}s\n\n"
-                    f"📁 Dataset ready for LoRA training!"
-                )
-
-                self._job_store.set_status(
-                    None,
-                    "dataset_generation",
-                    "completed",
-                    message=f"Generated {result.successful_count}/15 views",
-                )
-                return status, gallery_items, result.output_dir, self._get_job_status_md("dataset_generation")
-            else:
-                self._job_store.set_status(
-                    None,
-                    "dataset_generation",
-                    "failed",
-                    message=result.error,
-                )
-                return f"**Status:** ❌ {result.error}", [], "", self._get_job_status_md("dataset_generation")
+            status = (
+                f"**Status:** ✅ {result.successful_count}/15 views generated "
+                f"in {result.duration_seconds:.1f}s\n\n"
+                f"📁 Dataset ready for LoRA training!"
+            )
+            gallery_items = get_thumbnail_cache().gallery(gallery_items)
+            yield status, gallery_items, result.output_dir, self._get_job_status_md("dataset_generation")
 
         def open_dataset_folder(path):
             if path and os.path.exists(path):
@@ -280,6 +268,21 @@ class DatasetGeneratorAddon(BaseAddon):
             wrap=True
         )
 
+    def _generate_training_set(self, job: Job, image_path: str, name: str, steps: int, cfg: float):
+        """Job body: render the 15 views, reporting progress to the job."""
+        job.report("Starting Generation...", 0.0)
+        result = self.char_service.generate_training_set(
+            base_image_path=image_path,
+            character_name=name,
+            steps=steps,
+            cfg=cfg,
+            callback=lambda pct, status: job.report(status, pct)
+        )
+        if not result.success:
+            raise RuntimeError(result.error)
+        job.report(f"Generated {result.successful_count}/15 views", 1.0)
+        return result
+
     def _get_job_status_md(self, job_type: str) -> str:
         """Return last job status for the given job type."""
         status = self._job_store.get_status(None, job_type)
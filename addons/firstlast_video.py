@@ -38,10 +38,10 @@ class FirstLastVideoAddon(BaseAddon):
             description="Generate transition videos between keyframes",
             category="production"
         )
-        self.config = ConfigManager()
+        self.config = self.services.get(ConfigManager)
         self.service = FirstLastVideoService(self.config)
-        self.workflow_registry = WorkflowRegistry()
-        self._job_store = JobStatusStore()
+        self.workflow_registry = self.services.get(WorkflowRegistry)
+        self._job_store = self.services.get(JobStatusStore)
 
     def get_tab_name(self) -> str:
         return "🎞️ Transition"
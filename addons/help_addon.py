@@ -1,8 +1,12 @@
 """Help & Workflow Overview Addon for CINDERGRACE Pipeline"""
+import sqlite3
+from typing import Optional
+
 import gradio as gr
 
 from addons.base_addon import BaseAddon
 from addons.components import format_project_status
+from infrastructure.help_service import HelpService, get_help_service
 from infrastructure.logger import get_logger
 
 logger = get_logger(__name__)
@@ -11,12 +15,15 @@ logger = get_logger(__name__)
 class HelpAddon(BaseAddon):
     """Provides help, workflow overview and addon documentation."""
 
-    def __init__(self):
+    SEARCH_SNIPPET_CHARS = 240  # Longer (modal) texts are shortened in the result list
+
+    def __init__(self, help_service: Optional[HelpService] = None):
         super().__init__(
             name="Help & Workflows",
             description="Help, workflow overview and documentation",
             category="tools"
         )
+        self._help_service = help_service
 
     def get_tab_name(self) -> str:
         return "❓ Help"
@@ -31,6 +38,9 @@ class HelpAddon(BaseAddon):
             ))
 
             with gr.Tabs():
+                with gr.Tab("Search"):
+                    self._render_search()
+
                 with gr.Tab("Workflow Overview"):
                     self._render_workflow_overview()
 
@@ -48,6 +58,44 @@ class HelpAddon(BaseAddon):
 
         return interface
 
+    def _render_search(self):
+        """Render full-text search over the help texts of all tabs."""
+        with gr.Row():
+            query = gr.Textbox(
+                label="Search help texts",
+                placeholder="e.g. seed, lipsync, VRAM",
+                scale=4,
+            )
+            search_btn = gr.Button("🔍 Search", scale=1)
+        results = gr.Markdown()
+
+        query.submit(fn=self._search_help, inputs=[query], outputs=[results])
+        search_btn.click(fn=self._search_help, inputs=[query], outputs=[results])
+
+    def _search_help(self, query: str) -> str:
+        """Search the help texts and format the hits as Markdown."""
+        if not (query or "").strip():
+            return "Enter one or more search terms."
+
+        service = self._help_service or get_help_service()
+        try:
+            hits = service.search(query)
+        except sqlite3.Error as e:
+            logger.error(f"Help search failed for {query!r}: {e}")
+            return f"❌ Search failed: {e}"
+
+        if not hits:
+            return f"No help texts found for **{query.strip()}**."
+
+        lines = [f"**{len(hits)} result(s)**", ""]
+        for hit in hits:
+            tab = service.get_tab_info(hit["tab"])["title"] or hit["tab"]
+            content = " ".join(hit["content"].split())
+            if len(content) > self.SEARCH_SNIPPET_CHARS:
+                content = content[:self.SEARCH_SNIPPET_CHARS].rstrip() + " …"
+            lines.append(f"- **{tab} › {hit['field']}** ({hit['text_type']}): {content}")
+        return "\n".join(lines)
+
     def _render_workflow_overview(self):
         """Render visual workflow diagram."""
         gr.Markdown("""
@@ -11,6 +11,7 @@ from infrastructure.config_manager import ConfigManager
 from infrastructure.project_store import ProjectStore
 from infrastructure.logger import get_logger
 from infrastructure.job_status_store import JobStatusStore
+from infrastructure.thumbnail_cache import get_thumbnail_cache
 from services.image_import_service import ImageImportService, ImportedImage
 from services.image_analyzer_service import ImageAnalyzerService
 
@@ -26,11 +27,11 @@ class ImageImporterAddon(BaseAddon):
             description="Import existing images to create storyboards for video generation",
             category="project"
         )
-        self.config = ConfigManager()
-        self.project_manager = ProjectStore(self.config)
+        self.config = self.services.get(ConfigManager)
+        self.project_manager = self.services.get(ProjectStore, self.config)
         self.import_service = ImageImportService()
         self.analyzer_service = ImageAnalyzerService(self.config)
-        self._job_store = JobStatusStore()
+        self._job_store = self.services.get(JobStatusStore)
         self._scanned_images: List[ImportedImage] = []
 
     def get_tab_name(self) -> str:
@@ -276,7 +277,9 @@ class ImageImporterAddon(BaseAddon):
         self._scanned_images = images
 
         # Prepare gallery data
-        gallery_data = [(img.original_path, f"{idx+1}. {img.filename}") for idx, img in enumerate(images)]
+        gallery_data = get_thumbnail_cache().gallery(
+            (img.original_path, f"{idx+1}. {img.filename}") for idx, img in enumerate(images)
+        )
 
         # Prepare table data
         table_data = [
@@ -320,7 +323,9 @@ class ImageImporterAddon(BaseAddon):
         self._scanned_images = images
 
         # Prepare gallery data
-        gallery_data = [(img.original_path, f"{idx+1}. {img.filename}") for idx, img in enumerate(images)]
+        gallery_data = get_thumbnail_cache().gallery(
+            (img.original_path, f"{idx+1}. {img.filename}") for idx, img in enumerate(images)
+        )
 
         # Prepare table data
         table_data = [
@@ -379,7 +384,9 @@ class ImageImporterAddon(BaseAddon):
             return "✅ Image removed. No more images in the list.", [], [], []
 
         # Rebuild gallery and table data
-        gallery_data = [(img["original_path"], f"{idx+1}. {img['filename']}") for idx, img in enumerate(images_state)]
+        gallery_data = get_thumbnail_cache().gallery(
+            (img["original_path"], f"{idx+1}. {img['filename']}") for idx, img in enumerate(images_state)
+        )
         table_data = [
             [idx + 1, img["filename"], f"{img['width']}×{img['height']}", img["suggested_filename_base"]]
             for idx, img in enumerate(images_state)
@@ -3,7 +3,7 @@ import sys
 import subprocess
 import json
 from datetime import datetime
-from typing import List, Tuple, Optional, Dict, Any, Generator
+from typing import List, Tuple, Optional, Dict, Any, Generator, Callable
 import gradio as gr
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -14,25 +14,35 @@ from infrastructure.workflow_registry import WorkflowRegistry, PREFIX_KEYFRAME,
 from infrastructure.project_store import ProjectStore
 from infrastructure.logger import get_logger
 from infrastructure.job_status_store import JobStatusStore
+from infrastructure.job_runner import Job
 from infrastructure.error_handler import handle_errors
+from infrastructure.thumbnail_cache import get_thumbnail_cache
 from domain import models as domain_models
+from domain.exceptions import InputValidationError
 from domain.storyboard_service import StoryboardService
 from domain.validators import KeyframeGeneratorInput, WorkflowFileInput
 from services.keyframe_service import KeyframeGenerationService, KeyframeService
+from services.keyframe.parameter_sweep import MAX_SWEEP_QUEUE_DEPTH, SWEEP_QUEUE_DEPTH, parse_sweep_spec
+from services.keyframe.progress_events import (
+    GenerationEvent, ImagesAdded, ProgressCoalescer, StatusUpdate, compact_events
+)
 from services.character_lora_service import CharacterLoraService
 
 logger = get_logger(__name__)
 class KeyframeGeneratorAddon(BaseAddon):
+    # Minimum seconds between gallery refreshes while generating
+    GALLERY_REFRESH_SECONDS = 2.0
+
     def __init__(self):
         super().__init__(
             name="Keyframe Generator",
             description="Generate multiple keyframe variants for each storyboard shot",
             category="production"
         )
-        self.config = ConfigManager()
+        self.config = self.services.get(ConfigManager)
         self.current_storyboard: Optional[domain_models.Storyboard] = None
-        self.workflow_registry = WorkflowRegistry()
-        self.project_manager = ProjectStore(self.config)
+        self.workflow_registry = self.services.get(WorkflowRegistry)
+        self.project_manager = self.services.get(ProjectStore, self.config)
         self.keyframe_service = KeyframeService(
             project_store=self.project_manager,
             config=self.config,
@@ -42,8 +52,9 @@ class KeyframeGeneratorAddon(BaseAddon):
             config=self.config,
             project_store=self.project_manager
         )
-        self._job_store = JobStatusStore()
-        self.character_lora_service = CharacterLoraService(self.config)
+        self._job_store = self.services.get(JobStatusStore)
+        self.job_runner = self.services.job_runner
+        self.character_lora_service = self.services.get(CharacterLoraService, self.config)
 
     def get_tab_name(self) -> str:
         return "🎬 Keyframes"
@@ -123,13 +134,66 @@ class KeyframeGeneratorAddon(BaseAddon):
                             info="Starting seed (increments per variant)"
                         )
 
+                        draft_mode = gr.Checkbox(
+                            value=False,
+                            label="Draft Mode",
+                            info="Render variants with fewer steps; "
+                                 "finalize the selected ones afterwards"
+                        )
+                        draft_downscale = gr.Checkbox(
+                            value=False,
+                            label="Draft at Half Resolution",
+                            info="Faster drafts, but the final render at full size only approximates them"
+                        )
+
                     # Start Generation Button
                     start_btn = gr.Button("▶️ Start Generation", variant="primary", size="lg")
 
+                    with gr.Row():
+                        follow_btn = gr.Button("📡 Follow Running Job", variant="secondary", size="sm")
+                        cancel_btn = gr.Button("⏹️ Cancel Job", variant="stop", size="sm")
+
+                    finalize_btn = gr.Button("✨ Render Selected in Final Quality", variant="secondary")
+
+                    with gr.Accordion("🎛️ Parameter Sweep", open=False):
+                        sweep_shots = gr.Dropdown(
+                            choices=self._get_shot_ids(),
+                            multiselect=True,
+                            label="Shots",
+                            info="Shots to explore"
+                        )
+                        sweep_spec = gr.Textbox(
+                            value="seed=2000..2003; cfg=3.5,5",
+                            lines=3,
+                            label="Sweep",
+                            info="a,b,c = grid values · a..b = integer range · ~a..b / ~a,b = random "
+                                 "(seed, cfg, steps, sampler, lora_strength)"
+                        )
+                        sweep_samples = gr.Slider(
+                            minimum=1,
+                            maximum=16,
+                            value=1,
+                            step=1,
+                            label="Random Samples",
+                            info="Random draws per grid point (only with ~ ranges)"
+                        )
+                        sweep_queue_depth = gr.Slider(
+                            minimum=1,
+                            maximum=MAX_SWEEP_QUEUE_DEPTH,
+                            value=SWEEP_QUEUE_DEPTH,
+                            step=1,
+                            label="ComfyUI Queue Depth",
+                            info="Prompts queued ahead so the GPU does not idle between renders"
+                        )
+                        sweep_btn = gr.Button("🎛️ Start Sweep", variant="secondary")
+
                     gr.Markdown(
-                        "⚠️ **Do not refresh during generation.** If you refresh, the job "
-                        "continues in the backend but this page will lose tracking. "
-                        "Check `logs/pipeline.log` for progress."
+                        "ℹ️ Generation runs as a background job. Closing or refreshing the page "
+                        "does not stop it - use **Follow Running Job** to reattach. "
+                        "In draft mode, pick and save the variants in the Keyframe Selector, then "
+                        "**Render Selected in Final Quality** re-renders only those with the same seeds. "
+                "Sweep renders are added as further variants; filter them by parameters in the Keyframe Selector. "
+                        "Check `logs/pipeline.log` for details."
                     )
 
                     # Status display
@@ -161,10 +225,33 @@ class KeyframeGeneratorAddon(BaseAddon):
             # Event handlers
             start_btn.click(
                 fn=self.start_generation,
-                inputs=[workflow_dropdown, variants_per_shot, base_seed, model_dropdown],
+                inputs=[workflow_dropdown, variants_per_shot, base_seed, model_dropdown, draft_mode, draft_downscale],
                 outputs=[keyframe_gallery, status_text, progress_details, checkpoint_info, current_shot_display]
             )
 
+            finalize_btn.click(
+                fn=self.finalize_selected,
+                inputs=[model_dropdown],
+                outputs=[keyframe_gallery, status_text, progress_details, checkpoint_info, current_shot_display]
+            )
+
+            sweep_btn.click(
+                fn=self.start_sweep,
+                inputs=[workflow_dropdown, sweep_shots, sweep_spec, sweep_samples, base_seed,
+                        sweep_queue_depth, model_dropdown],
+                outputs=[keyframe_gallery, status_text, progress_details, checkpoint_info, current_shot_display]
+            )
+
+            follow_btn.click(
+                fn=self.follow_generation,
+                outputs=[keyframe_gallery, status_text, progress_details, checkpoint_info, current_shot_display]
+            )
+
+            cancel_btn.click(
+                fn=self.cancel_generation,
+                outputs=[status_text]
+            )
+
             clear_gallery_btn.click(
                 fn=lambda: ([], "**Status:** Gallery cleared", ""),
                 outputs=[keyframe_gallery, status_text, progress_details]
@@ -203,7 +290,8 @@ class KeyframeGeneratorAddon(BaseAddon):
             # Auto-refresh storyboard on tab load
             interface.load(
                 fn=self._on_tab_load,
-                outputs=[project_status, status_text, job_status_text, workflow_dropdown, compatibility_warning]
+                outputs=[project_status, status_text, job_status_text, workflow_dropdown, compatibility_warning,
+                         sweep_shots]
             )
 
         return interface
@@ -244,7 +332,14 @@ class KeyframeGeneratorAddon(BaseAddon):
 
         project = self.project_manager.get_active_project(refresh=True)
         job_status = self._get_job_status_md(project)
-        return project_status, status, job_status, workflow_update, compatibility_update
+        sweep_shots_update = gr.update(choices=self._get_shot_ids())
+        return project_status, status, job_status, workflow_update, compatibility_update, sweep_shots_update
+
+    def _get_shot_ids(self) -> List[str]:
+        """Shot IDs of the loaded storyboard (sweep shot choices)."""
+        if not self.current_storyboard:
+            return []
+        return [shot.shot_id for shot in self.current_storyboard.shots]
 
     def _get_job_status_md(self, project: Optional[dict]) -> str:
         """Return last job status for this project."""
@@ -354,7 +449,8 @@ class KeyframeGeneratorAddon(BaseAddon):
         variants_per_shot: int,
         base_seed: int,
         selected_model: str = "(Standard)",
-        progress=gr.Progress(track_tqdm=True)
+        draft_mode: bool = False,
+        draft_downscale: bool = False
     ) -> Generator[Tuple[List[str], str, str, Dict, str], None, None]:
         self.config.refresh()
         storyboard_file = self.config.get_current_storyboard()
@@ -367,6 +463,12 @@ class KeyframeGeneratorAddon(BaseAddon):
             yield [], "**❌ Error:** No active project. Please select one in the '📁 Project' tab first.", "No project", {}, "No shot"
             return
 
+        active_job = self.job_runner.find_active("keyframe_generation", project.get("path"))
+        if active_job:
+            # One run per project; reattach instead of starting a second one
+            yield from self._follow_job(active_job)
+            return
+
         validated_inputs, validation_error = self._validate_generation_inputs(variants_per_shot, base_seed, workflow_file)
         if validation_error:
             yield [], validation_error, "Invalid input parameters", {}, "Error"
@@ -391,28 +493,29 @@ class KeyframeGeneratorAddon(BaseAddon):
             storyboard=self.current_storyboard,
             workflow_file=resolved_workflow,
             variants_per_shot=validated_inputs.variants_per_shot,
-            base_seed=validated_inputs.base_seed
+            base_seed=validated_inputs.base_seed,
+            draft=bool(draft_mode),
+            draft_downscale=bool(draft_mode and draft_downscale)
         )
 
-        self._save_checkpoint(checkpoint, storyboard_file, project)
-
         # Get ComfyUI URL from settings
         comfy_url = self.config.get_comfy_url()
 
-        yield from self.generation_service.run_generation(
+        job = self._submit_generation(
+            project,
+            # Saved by the job: a concurrent start must not replace the running job's checkpoint
+            setup=lambda: self._save_checkpoint(checkpoint, storyboard_file, project),
             storyboard=self.current_storyboard,
             workflow_file=resolved_workflow,
             checkpoint=checkpoint,
-            project=project,
             comfy_url=comfy_url,
-            progress_callback=progress,
             model_override=model_override
         )
+        yield from self._follow_job(job)
 
     def resume_generation(
         self,
-        workflow_file: str,
-        progress=gr.Progress(track_tqdm=True)
+        workflow_file: str
     ) -> Generator[Tuple[List[str], str, str, Dict, str], None, None]:
         self.config.refresh()
         storyboard_file = self.config.get_current_storyboard()
@@ -425,6 +528,11 @@ class KeyframeGeneratorAddon(BaseAddon):
             yield [], "**❌ Error:** No active project. Please select one in the '📁 Project' tab.", "No project", {}, "No shot"
             return
 
+        active_job = self.job_runner.find_active("keyframe_generation", project.get("path"))
+        if active_job:
+            yield from self._follow_job(active_job)
+            return
+
         checkpoint = self._load_checkpoint(storyboard_file, project)
         if not checkpoint:
             yield [], "**❌ Error:** No checkpoint found. Start a new generation first.", "No checkpoint", {}, "None"
@@ -446,18 +554,222 @@ class KeyframeGeneratorAddon(BaseAddon):
         # Get ComfyUI URL from settings
         comfy_url = self.config.get_comfy_url()
 
-        yield from self.generation_service.run_generation(
+        job = self._submit_generation(
+            project,
             storyboard=self.current_storyboard,
             workflow_file=workflow_file,
             checkpoint=checkpoint,
-            project=project,
-            comfy_url=comfy_url,
-            progress_callback=progress
+            comfy_url=comfy_url
         )
+        yield from self._follow_job(job)
+
+    def finalize_selected(
+        self,
+        selected_model: str = "(Standard)"
+    ) -> Generator[Tuple[List[str], str, str, Dict, str], None, None]:
+        """Re-render the exported selection of a draft run at final quality."""
+        self.config.refresh()
+        storyboard_file = self.config.get_current_storyboard()
+        if not storyboard_file:
+            yield [], "**❌ Error:** No storyboard set. Please select one in the '📁 Project' tab.", "No storyboard", {}, "No shot"
+            return
+
+        project = self.project_manager.get_active_project(refresh=True)
+        if not project:
+            yield [], "**❌ Error:** No active project. Please select one in the '📁 Project' tab.", "No project", {}, "No shot"
+            return
+
+        active_job = self.job_runner.find_active("keyframe_generation", project.get("path"))
+        if active_job:
+            yield from self._follow_job(active_job)
+            return
+
+        checkpoint = self._load_checkpoint(storyboard_file, project)
+        if not checkpoint:
+            yield [], "**❌ Error:** No checkpoint found. Start a draft generation first.", "No checkpoint", {}, "None"
+            return
+
+        if self.current_storyboard is None:
+            _, load_status = self.load_storyboard(storyboard_file)
+            if "Error" in load_status:
+                yield [], load_status, "No progress", {}, "No shot"
+                return
+
+        job = self._submit_generation(
+            project,
+            mode="finalize",
+            storyboard=self.current_storyboard,
+            checkpoint=checkpoint,
+            comfy_url=self.config.get_comfy_url(),
+            model_override=None if selected_model == "(Standard)" else selected_model
+        )
+        yield from self._follow_job(job)
+
+    def start_sweep(
+        self,
+        workflow_file: str,
+        shot_ids: List[str],
+        spec_text: str,
+        samples: int,
+        base_seed: int,
+        queue_depth: int,
+        selected_model: str = "(Standard)"
+    ) -> Generator[Tuple[List[str], str, str, Dict, str], None, None]:
+        """Render a parameter sweep for the selected shots as a background job."""
+        self.config.refresh()
+        storyboard_file = self.config.get_current_storyboard()
+        if not storyboard_file:
+            yield [], "**❌ Error:** No storyboard set. Please select one in the '📁 Project' tab.", "No storyboard", {}, "No shot"
+            return
+
+        project = self.project_manager.get_active_project(refresh=True)
+        if not project:
+            yield [], "**❌ Error:** No active project. Please select one in the '📁 Project' tab.", "No project", {}, "No shot"
+            return
+
+        active_job = self.job_runner.find_active("keyframe_generation", project.get("path"))
+        if active_job:
+            yield from self._follow_job(active_job)
+            return
+
+        if not shot_ids:
+            yield [], "**⚠️ Note:** Select at least one shot for the sweep.", "No shots", {}, "None"
+            return
+
+        validated_inputs, validation_error = self._validate_generation_inputs(1, base_seed, workflow_file)
+        if validation_error:
+            yield [], validation_error, "Invalid input parameters", {}, "Error"
+            return
+
+        try:
+            spec = parse_sweep_spec(spec_text or "")
+        except InputValidationError as e:
+            yield [], f"**❌ Error:** {e}", "Invalid sweep", {}, "Error"
+            return
+
+        if self.current_storyboard is None:
+            _, load_status = self.load_storyboard(storyboard_file)
+            if "Error" in load_status:
+                yield [], load_status, "No progress", {}, "No shot"
+                return
+
+        resolved_workflow, lora_warning = self._resolve_workflow_for_lora(workflow_file)
+        if lora_warning:
+            yield [], lora_warning, "LoRA Warning", {}, "Warning"
+
+        job = self._submit_generation(
+            project,
+            mode="sweep",
+            storyboard=self.current_storyboard,
+            comfy_url=self.config.get_comfy_url(),
+            workflow_file=resolved_workflow,
+            shot_ids=list(shot_ids),
+            spec=spec,
+            samples=int(samples),
+            base_seed=validated_inputs.base_seed,
+            queue_depth=int(queue_depth),
+            model_override=None if selected_model == "(Standard)" else selected_model
+        )
+        yield from self._follow_job(job)
+
+    def follow_generation(self) -> Generator[Tuple[Any, str, str, Any, str], None, None]:
+        """Reattach to the running keyframe job of the active project."""
+        project = self.project_manager.get_active_project(refresh=True)
+        job = self.job_runner.find_active("keyframe_generation", project.get("path")) if project else None
+        if job is None:
+            yield gr.update(), "**ℹ️ No keyframe job running for this project.**", gr.update(), gr.update(), gr.update()
+            return
+        yield from self._follow_job(job)
+
+    def cancel_generation(self) -> str:
+        """Cancel the running keyframe job of the active project."""
+        project = self.project_manager.get_active_project(refresh=True)
+        job = self.job_runner.find_active("keyframe_generation", project.get("path")) if project else None
+        if job is None or not self.job_runner.cancel(job.job_id):
+            return "**ℹ️ No keyframe job running for this project.**"
+        if job.status == "queued":
+            return "**⏹️ Job cancelled** before it started."
+        return "**⏹️ Stop requested:** The job stops after the current shot."
+
+    def _submit_generation(
+        self,
+        project: Dict[str, Any],
+        mode: str = "generate",
+        setup: Optional[Callable[[], None]] = None,
+        **run_kwargs
+    ) -> Job:
+        """Queue a keyframe run on the background job runner.
+
+        mode: "generate" (regular run), "finalize" (final render of a draft
+        selection) or "sweep" (parameter sweep). Each job gets its own
+        generation service, so runs for different projects do not share
+        ComfyUI client or stop flags. Submission is exclusive per project:
+        if a run is already active (e.g. a double click), that job is
+        returned and setup is not called.
+        """
+        service = KeyframeGenerationService(config=self.config, project_store=self.project_manager)
+        run, label = {
+            "generate": (service.run_generation_events, "Keyframes"),
+            "finalize": (service.finalize_events, "Final render"),
+            "sweep": (service.sweep_events, "Parameter sweep"),
+        }[mode]
+
+        def work(job: Job):
+            if setup:
+                setup()
+            for event in run(project=project, **run_kwargs):
+                if isinstance(event, StatusUpdate):
+                    job.report(event.status)
+                yield event
+
+        return self.job_runner.submit(
+            "keyframe_generation",
+            work,
+            project_path=project.get("path"),
+            label=f"{label}: {project.get('name', 'Unknown')}",
+            persist=False,  # The service writes its own job status
+            on_cancel=service.request_stop,
+            compact_events=compact_events,
+            exclusive=True,
+        )
+
+    def _follow_job(self, job: Job) -> Generator[Tuple[Any, str, str, Any, str], None, None]:
+        """Stream a job's events to the UI; leaving the page keeps the job running."""
+        if job.status == "queued":
+            position = self.job_runner.queue_position(job)
+            yield (gr.update(), f"**Status:** ⏳ Queued (position {position}) - waiting for a free worker",
+                   gr.update(), gr.update(), gr.update())
+        yield from self._stream_generation(job.follow())
+        if job.status == "failed":
+            yield gr.update(), f"**❌ Error:** {job.error}", "Generation failed", gr.update(), "Error"
+
+    def _stream_generation(
+        self, events: Generator[GenerationEvent, None, None]
+    ) -> Generator[Tuple[Any, str, str, Any, str], None, None]:
+        """Coalesce generation events into UI updates.
+
+        Status text is sent per event; the gallery and checkpoint JSON are
+        only re-sent when new images arrived and GALLERY_REFRESH_SECONDS
+        passed (and once at the end), so long runs do not re-serialize the
+        whole gallery on every status change.
+        """
+        # An empty gr.update() keeps the output; gr.skip() is missing in older Gradio 4.x
+        coalescer = ProgressCoalescer(self.GALLERY_REFRESH_SECONDS, unchanged=gr.update())
+        thumbnail_cache = get_thumbnail_cache()
+        for event in events:
+            if isinstance(event, ImagesAdded):
+                event = ImagesAdded(tuple(thumbnail_cache.thumbnails(event.images)))
+            update = coalescer.feed(event)
+            if update is not None:
+                yield update
 
     def stop_generation(self) -> Tuple[str, str]:
-        """Stop generation (kept for future use - see Backlog #001)."""
-        return self.generation_service.stop_generation()
+        """Stop the active project's running job (kept for future use - see Backlog #001)."""
+        project = self.project_manager.get_active_project(refresh=True)
+        job = self.job_runner.find_active("keyframe_generation", project.get("path")) if project else None
+        if job is None or not self.job_runner.cancel(job.job_id):
+            return "**ℹ️ Kein Lauf aktiv.**", "Kein aktiver Fortschritt."
+        return "**⏹️ Stop angefordert:** Warte auf laufenden Shot.", "Stop wird ausgeführt..."
 
     def _status_bar(self) -> str:
         project = self.project_manager.get_active_project(refresh=True)
@@ -642,14 +954,5 @@ class KeyframeGeneratorAddon(BaseAddon):
             logger.error(f"Failed to save checkpoint: {exc}", exc_info=True)
 
     def _load_checkpoint(self, storyboard_file: str, project: Dict[str, Any]) -> Optional[Dict]:
-        try:
-            checkpoint_dir = self.project_manager.ensure_dir(project, "checkpoints")
-            base_name = os.path.splitext(os.path.basename(storyboard_file))[0]
-            checkpoint_path = os.path.join(checkpoint_dir, f"{base_name}_checkpoint.json")
-            if not os.path.exists(checkpoint_path):
-                return None
-            with open(checkpoint_path, "r") as f:
-                return json.load(f)
-        except Exception as exc:
-            logger.error(f"Failed to load checkpoint: {exc}", exc_info=True)
-            return None
+        # Same file the generation service writes (checkpoints/checkpoint_<storyboard>)
+        return self.generation_service._load_checkpoint(storyboard_file, project) or None  # pylint: disable=protected-access
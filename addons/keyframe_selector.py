@@ -22,6 +22,8 @@ from infrastructure.config_manager import ConfigManager
 from infrastructure.project_store import ProjectStore
 from infrastructure.logger import get_logger
 from infrastructure.error_handler import handle_errors
+from infrastructure.thumbnail_cache import get_thumbnail_cache
+from domain.exceptions import InputValidationError
 from domain.storyboard_service import StoryboardService
 from services.selection_service import SelectionService
 
@@ -37,9 +39,10 @@ class KeyframeSelectorAddon(BaseAddon):
             description="Review generated keyframes and pick the best variant per shot",
             category="production"
         )
-        self.config = ConfigManager()
-        self.project_manager = ProjectStore(self.config)
+        self.config = self.services.get(ConfigManager)
+        self.project_manager = self.services.get(ProjectStore, self.config)
         self.selection_service = SelectionService(self.project_manager)
+        self.thumbnail_cache = get_thumbnail_cache()
 
     def get_tab_name(self) -> str:
         return "✅ Select"
@@ -158,6 +161,11 @@ class KeyframeSelectorAddon(BaseAddon):
                 with gr.Column(scale=4):
                     gr.Markdown("### 🖼️ Shot Overview")
                     shot_info = gr.Markdown("No shot selected.")
+                    param_filter = gr.Textbox(
+                        label="Parameter Filter",
+                        placeholder="e.g. cfg>=4 sampler=euler steps=30",
+                        info="Only show sweep variants with these parameters (Enter to apply)",
+                    )
 
                     keyframe_gallery = gr.Gallery(
                         label="Varianten",
@@ -167,6 +175,13 @@ class KeyframeSelectorAddon(BaseAddon):
                         object_fit="contain",
                         elem_id="keyframe-gallery",
                     )
+                    # Gallery shows thumbnails; full resolution only for the clicked variant
+                    original_preview = gr.Image(
+                        label="Original (click a variant)",
+                        type="filepath",
+                        interactive=False,
+                        visible=False,
+                    )
 
             # JSON Preview (collapsed by default)
             with gr.Accordion("📄 Export-Vorschau (JSON)", open=False):
@@ -189,16 +204,32 @@ class KeyframeSelectorAddon(BaseAddon):
 
             shot_dropdown.change(
                 fn=self.load_shot_preview,
-                inputs=[storyboard_state, shot_dropdown, variants_state, selections_state],
+                inputs=[storyboard_state, shot_dropdown, variants_state, selections_state, param_filter],
                 outputs=[shot_info, keyframe_gallery, variant_radio, status_text, variants_state],
             )
 
             refresh_shot_btn.click(
                 fn=self.load_shot_preview,
-                inputs=[storyboard_state, shot_dropdown, variants_state, selections_state],
+                inputs=[storyboard_state, shot_dropdown, variants_state, selections_state, param_filter],
                 outputs=[shot_info, keyframe_gallery, variant_radio, status_text, variants_state],
             )
 
+            param_filter.submit(
+                fn=self.load_shot_preview,
+                inputs=[storyboard_state, shot_dropdown, variants_state, selections_state, param_filter],
+                outputs=[shot_info, keyframe_gallery, variant_radio, status_text, variants_state],
+            )
+
+            shot_dropdown.change(
+                fn=lambda: gr.update(value=None, visible=False),
+                outputs=[original_preview],
+            )
+            keyframe_gallery.select(
+                fn=self.show_original,
+                inputs=[shot_dropdown, variants_state],
+                outputs=[original_preview],
+            )
+
             save_selection_btn.click(
                 fn=self.save_selection,
                 inputs=[shot_dropdown, variant_radio, storyboard_state, variants_state, selections_state],
@@ -374,8 +405,9 @@ class KeyframeSelectorAddon(BaseAddon):
         shot_id: str,
         variants_state: Dict[str, Dict[str, Dict[str, Any]]],
         selections_state: Dict[str, Dict[str, Any]],
+        param_filter: str = "",
     ) -> Tuple[str, List[Tuple[str, str]], Any, str, Dict[str, Dict[str, Dict[str, Any]]]]:
-        """Load gallery + variant list for selected shot"""
+        """Load gallery + variant list for selected shot (optionally filtered by sweep parameters)"""
         if not storyboard_state:
             return "Please load a storyboard first.", [], gr.update(choices=[]), "**❌ Error:** No storyboard", variants_state
 
@@ -395,16 +427,24 @@ class KeyframeSelectorAddon(BaseAddon):
 
         filename_base = shot.get("filename_base", shot_id)
         keyframes = self.selection_service.collect_keyframes(project, filename_base)
+        total = len(keyframes)
+        try:
+            keyframes = self.selection_service.filter_keyframes(keyframes, param_filter)
+        except InputValidationError as e:
+            return self._format_shot_markdown(shot, available=bool(total), total=total), [], \
+                gr.update(choices=[], value=None), f"**❌ Error:** {e}", variants_state
 
         if not keyframes:
-            info = self._format_shot_markdown(shot, available=False)
-            status = f"**⚠️ Note:** No keyframes found for `{filename_base}`."
+            info = self._format_shot_markdown(shot, available=bool(total), total=total)
+            status = (f"**⚠️ Note:** No keyframes of `{filename_base}` match `{param_filter}`." if total
+                      else f"**⚠️ Note:** No keyframes found for `{filename_base}`.")
             variants_state = variants_state or {}
             variants_state[shot_id] = {}
             return info, [], gr.update(choices=[], value=None), status, variants_state
 
-        # Gradio 4.x format: list of (path, caption) tuples
-        gallery_items = [(item["path"], item["label"]) for item in keyframes]
+        # Gradio 4.x format: list of (path, caption) tuples - thumbnails, not originals
+        gallery_items = self.thumbnail_cache.gallery((item["path"], item["label"]) for item in keyframes)
+        self._prefetch_next_shot(storyboard_state, shot_id, project)
 
         options_map = {item["label"]: item for item in keyframes}
         variants_state = variants_state or {}
@@ -419,11 +459,39 @@ class KeyframeSelectorAddon(BaseAddon):
             )
             default_value = label_match
 
-        info = self._format_shot_markdown(shot, available=True, total=len(keyframes))
+        info = self._format_shot_markdown(shot, available=True, total=total)
         status = f"**ℹ️ {shot_id}:** {len(keyframes)} Varianten loaded."
+        if len(keyframes) < total:
+            status += f" (filter: {len(keyframes)}/{total})"
 
         return info, gallery_items, gr.update(choices=list(options_map.keys()), value=default_value), status, variants_state
 
+    def show_original(
+        self,
+        shot_id: str,
+        variants_state: Dict[str, Dict[str, Dict[str, Any]]],
+        evt: gr.SelectData,
+    ) -> Any:
+        """Show the full-resolution file of the clicked gallery variant."""
+        options = list(((variants_state or {}).get(shot_id) or {}).values())
+        if evt is None or not isinstance(evt.index, int) or not 0 <= evt.index < len(options):
+            return gr.update(value=None, visible=False)
+        return gr.update(value=options[evt.index]["path"], visible=True)
+
+    def _prefetch_next_shot(self, storyboard_state: Dict[str, Any], shot_id: str, project: Dict[str, Any]) -> None:
+        """Render thumbnails of the following shot in the background."""
+        shots = storyboard_state.get("shots", []) if storyboard_state else []
+        ids = [shot.get("shot_id") for shot in shots]
+        if shot_id not in ids or ids.index(shot_id) + 1 >= len(shots):
+            return
+        next_shot = shots[ids.index(shot_id) + 1]
+        filename_base = next_shot.get("filename_base", next_shot.get("shot_id"))
+        try:
+            keyframes = self.selection_service.collect_keyframes(project, filename_base)
+            self.thumbnail_cache.prefetch(item["path"] for item in keyframes)
+        except Exception as e:
+            logger.debug(f"Thumbnail prefetch skipped: {e}")
+
     def _show_clear_confirm(
         self,
         shot_id: str,
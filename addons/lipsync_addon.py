@@ -56,12 +56,12 @@ class LipsyncAddon(BaseAddon):
             description="Generate lip-synced videos from audio and character images",
             category="production"
         )
-        self.config = ConfigManager()
+        self.config = self.services.get(ConfigManager)
         self.lipsync_service = LipsyncService(self.config)
-        self.character_lora_service = CharacterLoraService(self.config)
-        self.workflow_registry = WorkflowRegistry()
+        self.character_lora_service = self.services.get(CharacterLoraService, self.config)
+        self.workflow_registry = self.services.get(WorkflowRegistry)
         self.audio_analyzer = AudioAnalyzerService(self.config)
-        self._job_store = JobStatusStore()
+        self._job_store = self.services.get(JobStatusStore)
 
         # State
         self._current_image_path: Optional[str] = None
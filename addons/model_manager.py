@@ -30,7 +30,8 @@ from services.model_manager import (
     StorageAnalyzer,
     WorkflowMapper,
     ReportExporter,
-    ModelFilter,
+    ModelCatalog,
+    ModelSnapshot,
     ModelDownloader,
     DownloadStatus,
 )
@@ -41,14 +42,30 @@ logger = get_logger(__name__)
 class ModelManagerAddon(BaseAddon):
     """Model Manager - Analyze and manage ComfyUI models"""
 
+    TABLE_PAGE_SIZE = 100
+    SORT_OPTIONS = {
+        "Default": "default",
+        "Filename": "filename",
+        "Size": "size",
+        "Type": "type",
+        "Status": "status",
+        "Workflows": "workflows",
+        "Modified": "modified",
+    }
+    STATUS_FILTERS = {
+        "Used": ModelStatus.USED,
+        "Unused": ModelStatus.UNUSED,
+        "Missing": ModelStatus.MISSING,
+    }
+
     def __init__(self):
         super().__init__(
             name="Model Manager",
             description="Analyze workflows, classify models, and manage model files",
             category="tools"
         )
-        self.config = ConfigManager()
-        self._job_store = JobStatusStore()
+        self.config = self.services.get(ConfigManager)
+        self._job_store = self.services.get(JobStatusStore)
 
         # Paths
         self.comfyui_root = None
@@ -65,10 +82,12 @@ class ModelManagerAddon(BaseAddon):
         self.storage_analyzer = None
         self.workflow_mapper = None
         self.report_exporter = None
+        self.snapshot = None  # Shared scan + workflow index + classification
 
         # Cached data
-        self.last_classification = None
         self.last_duplicates = []
+        self._catalog: Optional[ModelCatalog] = None
+        self._catalog_key = None
 
         # Downloader
         self.model_downloader = None
@@ -298,6 +317,13 @@ class ModelManagerAddon(BaseAddon):
                     date_after = gr.Textbox(label="Modified After (YYYY-MM-DD)", placeholder="Optional")
                     date_before = gr.Textbox(label="Modified Before (YYYY-MM-DD)", placeholder="Optional")
                     filename_regex = gr.Textbox(label="Filename Regex", placeholder="e.g. .*safetensors$")
+                with gr.Row():
+                    sort_by = gr.Dropdown(choices=list(self.SORT_OPTIONS), value="Default", label="Sort By")
+                    sort_desc = gr.Checkbox(label="Descending", value=False)
+                    page_number = gr.Number(value=1, precision=0, minimum=1, label="Page")
+                    page_size = gr.Dropdown(
+                        choices=[50, 100, 250, 500, "All"], value=self.TABLE_PAGE_SIZE, label="Rows per Page"
+                    )
                 with gr.Row():
                     apply_filters_btn = gr.Button("Apply Advanced Filters", variant="secondary")
                     clear_filters_btn = gr.Button("Clear All Filters", variant="secondary")
@@ -316,6 +342,7 @@ class ModelManagerAddon(BaseAddon):
                     date_before,
                     filename_regex,
                 ]
+                table_inputs = [*filter_inputs, sort_by, sort_desc, page_number, page_size]
 
                 models_dataframe = gr.Dataframe(
                     headers=["Select", "Filename", "Type", "Status", "Size", "Workflows", "Path"],
@@ -325,6 +352,7 @@ class ModelManagerAddon(BaseAddon):
                     interactive=True,
                     wrap=True
                 )
+                page_info = gr.Markdown("")
 
                 gr.Markdown("### Batch Actions")
 
@@ -524,22 +552,22 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
             )
 
             refresh_btn.click(
-                fn=self.filter_models,
-                inputs=filter_inputs,
-                outputs=[models_dataframe]
+                fn=self.filter_models_page,
+                inputs=table_inputs,
+                outputs=[models_dataframe, page_info]
             )
 
-            for comp in [status_filter, type_filter, search_box]:
+            for comp in [status_filter, type_filter, search_box, sort_by, sort_desc, page_number, page_size]:
                 comp.change(
-                    fn=self.filter_models,
-                    inputs=filter_inputs,
-                    outputs=[models_dataframe]
+                    fn=self.filter_models_page,
+                    inputs=table_inputs,
+                    outputs=[models_dataframe, page_info]
                 )
 
             apply_filters_btn.click(
-                fn=self.filter_models,
-                inputs=filter_inputs,
-                outputs=[models_dataframe]
+                fn=self.filter_models_page,
+                inputs=table_inputs,
+                outputs=[models_dataframe, page_info]
             )
 
             clear_filters_btn.click(
@@ -712,11 +740,24 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
 
         return interface
 
+    @property
+    def last_classification(self) -> Optional[Dict]:
+        """Classification of the shared snapshot (None until analyzed)."""
+        if self.snapshot is None or not self.snapshot.is_loaded:
+            return None
+        return self.snapshot.classification
+
     # ------------------------------------------------------------------ #
     # Core logic
     # ------------------------------------------------------------------ #
     def _init_services(self, comfyui_root: str, workflows_dir: str, archive_dir: str):
         """Initialize all services using provided paths."""
+        # Same paths: keep the snapshot so re-analysis refreshes incrementally
+        if self.snapshot is not None and (comfyui_root, workflows_dir, archive_dir) == (
+            self.comfyui_root, self.workflows_dir, self.archive_dir
+        ):
+            return
+
         self.comfyui_root = comfyui_root
         self.workflows_dir = workflows_dir
         self.archive_dir = archive_dir
@@ -725,9 +766,10 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
         self.workflow_scanner = WorkflowScanner(workflows_dir)
         self.model_scanner = ModelScanner(self.models_dir)
         self.classifier = ModelClassifier(self.workflow_scanner, self.model_scanner)
+        self.snapshot = ModelSnapshot(self.classifier)
         self.archive_manager = ArchiveManager(archive_dir, self.models_dir)
         self.duplicate_detector = DuplicateDetector()
-        self.storage_analyzer = StorageAnalyzer(self.classifier)
+        self.storage_analyzer = StorageAnalyzer(self.classifier, self.snapshot)
         self.workflow_mapper = WorkflowMapper(self.workflow_scanner)
         self.report_exporter = ReportExporter({
             "comfyui_root": comfyui_root,
@@ -760,7 +802,7 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
             self.storage_analyzer = None
             self.workflow_mapper = None
             self.report_exporter = None
-            self.last_classification = None
+            self.snapshot = None
             self.last_duplicates = []
 
             logger.info(f"Settings saved: ComfyUI={comfyui_root}, Workflows={workflows_dir}, Archive={archive_dir}")
@@ -783,8 +825,8 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
 
             # Run classification
             logger.info("Starting model analysis...")
-            self.last_classification = self.classifier.classify_all_models()
-            stats = self.classifier.get_statistics()
+            self.snapshot.refresh()
+            stats = self.snapshot.get_statistics()
             overview = self.storage_analyzer.get_storage_overview()
 
             # Charts
@@ -796,11 +838,12 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
             histogram = self.storage_analyzer.get_size_distribution()["buckets"]
 
             # Workflow statistics
-            all_workflows = self.workflow_scanner.scan_all_workflows()
+            workflow_index = self.snapshot.workflow_index
+            all_workflows = workflow_index.workflow_map
             workflow_stats = {
                 "total_workflows": len(all_workflows),
                 "workflows_with_models": len([w for w in all_workflows.values() if w]),
-                "total_model_references": sum(len(models) for models in all_workflows.values()),
+                "total_model_references": workflow_index.reference_count(),
             }
 
             # Format statistics markdown
@@ -865,48 +908,97 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
         date_after: str,
         date_before: str,
         filename_regex: str,
+        sort_by: str = "Default",
+        descending: bool = False,
+        page: int = 1,
+        page_size: Optional[int] = None,
     ) -> List:
-        """Filter models based on criteria"""
-        if self.last_classification is None:
-            return []
-
-        all_models = []
-        for status, models in self.last_classification.items():
-            all_models.extend(models)
-
-        mf = ModelFilter(all_models)
-
-        if status_filter != "All":
-            status_map = {
-                "Used": ModelStatus.USED,
-                "Unused": ModelStatus.UNUSED,
-                "Missing": ModelStatus.MISSING,
-            }
-            mf.by_status(status_map[status_filter])
-
-        if type_filter != "All":
-            mf.filters.append(lambda m: m["type"] == type_filter)
-
-        if search_text:
-            search_lower = search_text.lower()
-            mf.filters.append(lambda m: search_lower in m["filename"].lower())
+        """Filter models based on criteria (all matches unless page_size is given)"""
+        table, _ = self._query_table(
+            status_filter, type_filter, search_text, size_min_gb, size_max_gb,
+            workflow_min, workflow_max, date_after, date_before, filename_regex,
+            sort_by, descending, page, page_size,
+        )
+        return table
 
-        # Advanced filters
-        min_bytes = int(size_min_gb * 1024 * 1024 * 1024)
-        max_bytes = int(size_max_gb * 1024 * 1024 * 1024)
-        mf.by_size_range(min_bytes=min_bytes, max_bytes=max_bytes if size_max_gb > 0 else None)
-        mf.by_workflow_count(min_count=workflow_min, max_count=workflow_max if workflow_max > 0 else None)
+    def filter_models_page(
+        self,
+        status_filter: str,
+        type_filter: str,
+        search_text: str,
+        size_min_gb: float,
+        size_max_gb: float,
+        workflow_min: int,
+        workflow_max: int,
+        date_after: str,
+        date_before: str,
+        filename_regex: str,
+        sort_by: str,
+        descending: bool,
+        page: int,
+        page_size: Any,
+    ) -> Tuple[List, str]:
+        """Filter, sort and return one page of the models table plus page info"""
+        page_size = None if page_size in (None, "", "All") else int(page_size)
+        return self._query_table(
+            status_filter, type_filter, search_text, size_min_gb, size_max_gb,
+            workflow_min, workflow_max, date_after, date_before, filename_regex,
+            sort_by, descending, page, page_size,
+        )
 
-        after_dt = datetime.fromisoformat(date_after) if date_after else None
-        before_dt = datetime.fromisoformat(date_before) if date_before else None
-        if after_dt or before_dt:
-            mf.by_modified_date(after=after_dt, before=before_dt)
+    def _query_table(
+        self,
+        status_filter: str,
+        type_filter: str,
+        search_text: str,
+        size_min_gb: float,
+        size_max_gb: float,
+        workflow_min: int,
+        workflow_max: int,
+        date_after: str,
+        date_before: str,
+        filename_regex: str,
+        sort_by: str,
+        descending: bool,
+        page: int,
+        page_size: Optional[int],
+    ) -> Tuple[List, str]:
+        """Run a catalog query and format the requested page"""
+        catalog = self._get_catalog()
+        if catalog is None:
+            return [], ""
+
+        rows = catalog.query(
+            statuses=None if status_filter == "All" else [self.STATUS_FILTERS[status_filter]],
+            types=None if type_filter == "All" else [type_filter],
+            search=search_text or "",
+            # Advanced filters
+            min_bytes=int(size_min_gb * 1024 * 1024 * 1024),
+            max_bytes=int(size_max_gb * 1024 * 1024 * 1024) if size_max_gb > 0 else None,
+            min_workflows=workflow_min,
+            max_workflows=workflow_max if workflow_max > 0 else None,
+            modified_after=datetime.fromisoformat(date_after) if date_after else None,
+            modified_before=datetime.fromisoformat(date_before) if date_before else None,
+            filename_regex=filename_regex or "",
+            sort_by=self.SORT_OPTIONS.get(sort_by, "default"),
+            descending=bool(descending),
+        )
+        page_rows, page, page_count = catalog.page(rows, page, page_size)
 
-        if filename_regex:
-            mf.by_filename_pattern(filename_regex)
+        table = self._models_to_table(catalog.rows(page_rows), catalog.in_archive[page_rows].tolist())
+        info = f"Showing {len(page_rows)} of {len(rows)} matching models (page {page}/{page_count})"
+        return table, info
 
-        filtered = mf.apply()
-        return self._models_to_table(filtered)
+    def _get_catalog(self) -> Optional[ModelCatalog]:
+        """Columnar catalog of the current snapshot (rebuilt when it changes)."""
+        if self.last_classification is None:
+            return None
+        key = (id(self.snapshot), self.snapshot.version)
+        if self._catalog is None or self._catalog_key != key:
+            archived = self.archive_manager.scan_archive(include_flat=True) if self.archive_manager else {}
+            self._catalog = ModelCatalog(self.snapshot.all_models(), self.snapshot.workflow_index, archived)
+            self._catalog_key = key
+        return self._catalog
 
     def clear_filters(self, status_filter, type_filter, search_box):
         """Reset filters to defaults."""
@@ -926,34 +1018,35 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
         )
 
     def _get_all_models_for_table(self) -> List:
-        """Get all models formatted for dataframe"""
-        if self.last_classification is None:
-            return []
+        """First page of all models formatted for dataframe"""
+        return self.filter_models("All", "All", "", 0, 50, 0, 50, "", "", "", page_size=self.TABLE_PAGE_SIZE)
 
-        all_models = []
-        for status, models in self.last_classification.items():
-            all_models.extend(models)
+    def _models_to_table(self, models: List[Dict], in_archive: Optional[List[bool]] = None) -> List:
+        """Convert model list to table format
 
-        return self._models_to_table(all_models)
-
-    def _models_to_table(self, models: List[Dict]) -> List:
-        """Convert model list to table format"""
+        Args:
+            models: Model dicts
+            in_archive: Per-model archive flags (checked per missing model if omitted)
+        """
         table_data = []
+        status_display = {
+            ModelStatus.USED: "✅ Used",
+            ModelStatus.UNUSED: "📦 Unused",
+            ModelStatus.MISSING: "❌ Missing",
+        }
 
-        for model in models:
+        for idx, model in enumerate(models):
             model_status = model.get("status", ModelStatus.UNUSED)
-
-            status_display = {
-                ModelStatus.USED: "✅ Used",
-                ModelStatus.UNUSED: "📦 Unused",
-                ModelStatus.MISSING: "❌ Missing",
-            }
             status = status_display.get(model_status, "Unknown")
 
-            if model_status == ModelStatus.MISSING and self.archive_manager:
-                filename = model["filename"]
-                model_type = model["type"]
-                if self.archive_manager.check_if_in_archive(filename, model_type):
+            if model_status == ModelStatus.MISSING:
+                if in_archive is not None:
+                    archived = in_archive[idx]
+                else:
+                    archived = bool(self.archive_manager) and self.archive_manager.check_if_in_archive(
+                        model["filename"], model["type"]
+                    )
+                if archived:
                     status = "❌ Missing (📦 In Archive)"
 
             workflow_count = model.get("workflow_count", 0)
@@ -1018,13 +1111,15 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
             return "**⚠️ No valid models to move (selected models may be missing)**", models_table
 
         results = self.archive_manager.batch_move_to_archive(to_move, dry_run=False)
+        moved = set(results['success'])
+        self.snapshot.mark_removed(m["path"] for m in to_move if Path(m["path"]).name in moved)
 
         msg = f"**✅ Moved {len(results['success'])} model(s) to archive**"
         if results['failed']:
             msg += f"\n\n**⚠️ Failed:** {len(results['failed'])} model(s)\n"
             msg += "\n".join(results['failed'][:5])
 
-        refreshed_table = self.filter_models("All", "All", "", 0, 50, 0, 50, "", "", "")
+        refreshed_table = self._get_all_models_for_table()
 
         return msg, refreshed_table
 
@@ -1059,13 +1154,18 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
             return "**⚠️ No models to restore (models must be missing and in archive)**", models_table
 
         results = self.archive_manager.batch_restore_from_archive(to_restore, dry_run=False)
+        restored = set(results['success'])
+        self.snapshot.mark_restored(
+            {**m, "path": self.archive_manager.get_restore_path(m["filename"], m["type"])}
+            for m in to_restore if m["filename"] in restored
+        )
 
         msg = f"**✅ Restored {len(results['success'])} model(s) from archive**"
         if results['failed']:
             msg += f"\n\n**⚠️ Failed:** {len(results['failed'])} model(s)\n"
             msg += "\n".join(results['failed'][:5])
 
-        refreshed_table = self.filter_models("All", "All", "", 0, 50, 0, 50, "", "", "")
+        refreshed_table = self._get_all_models_for_table()
 
         return msg, refreshed_table
 
@@ -1076,11 +1176,8 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
         if not self.last_classification:
             return "**⚠️ Run analysis first**", []
 
-        # Build models_by_type from classifier output (used + unused only)
-        models_by_type = {}
-        for status in [ModelStatus.USED, ModelStatus.UNUSED]:
-            for model in self.last_classification.get(status, []):
-                models_by_type.setdefault(model["type"], []).append(model)
+        # Used + unused models from the shared snapshot
+        models_by_type = self.snapshot.models_by_type([ModelStatus.USED, ModelStatus.UNUSED])
 
         duplicates = self.duplicate_detector.find_duplicates(models_by_type)
         self.last_duplicates = duplicates
@@ -1145,6 +1242,7 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
 
         failures = []
         success = []
+        archived_paths = []
         for row in selected:
             _, _, filename, model_type, status, _, path = row
             if not path or path == "N/A":
@@ -1153,9 +1251,13 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
             ok, msg = self.archive_manager.move_to_archive(path, model_type, dry_run=False)
             if ok:
                 success.append(filename)
+                archived_paths.append(path)
             else:
                 failures.append(f"{filename}: {msg}")
 
+        if self.snapshot is not None:
+            self.snapshot.mark_removed(archived_paths)
+
         refreshed = [r for r in table if r[1] not in {row[1] for row in selected}]
         message = f"**✅ Archived {len(success)} duplicate(s)**"
         if failures:
@@ -1216,7 +1318,7 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
     def export_summary(self, fmt: str, path: str) -> str:
         if not self.last_classification:
             return "**⚠️ Run analysis first**"
-        stats = self.classifier.get_statistics()
+        stats = self.snapshot.get_statistics()
         if fmt == "CSV":
             path = self.report_exporter.export_to_csv([stats], path)
         elif fmt == "JSON":
@@ -1352,12 +1454,7 @@ Diese Informationen werden im Keyframe Generator verwendet, um die richtigen Mod
             # Search for all missing models
             logger.info(f"Searching for {len(missing_models)} missing models...")
 
-            for model in missing_models:
-                self.model_downloader.add_to_queue(
-                    filename=model["filename"],
-                    model_type=model["type"],
-                    auto_search=True
-                )
+            self.model_downloader.search_all_missing(missing_models)
 
             # Get results
             stats = self.model_downloader.get_statistics()
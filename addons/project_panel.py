@@ -34,8 +34,8 @@ class ProjectAddon(BaseAddon):
             description="Manage CINDERGRACE project folders under ComfyUI/output",
             category="project"
         )
-        self.config = ConfigManager()
-        self.project_manager = ProjectStore(self.config)
+        self.config = self.services.get(ConfigManager)
+        self.project_manager = self.services.get(ProjectStore, self.config)
 
     def get_tab_name(self) -> str:
         return "📁 Project"
@@ -26,8 +26,8 @@ class SettingsAddon(BaseAddon):
             description="Global configuration for ComfyUI + workflow presets",
             category="tools"
         )
-        self.config = ConfigManager()
-        self.registry = WorkflowRegistry()
+        self.config = self.services.get(ConfigManager)
+        self.registry = self.services.get(WorkflowRegistry)
 
     def get_tab_name(self) -> str:
         return "⚙️ Settings"
@@ -21,7 +21,7 @@ class SetupWizardAddon(BaseAddon):
             description="Initial setup and system check",
             category="tools"
         )
-        self.config = ConfigManager()
+        self.config = self.services.get(ConfigManager)
         self.detector = SystemDetector()
         self.help = HelpContext("setup_wizard", get_help_service())
 
@@ -405,7 +405,7 @@ class SetupWizardAddon(BaseAddon):
                 if create_example_project:
                     try:
                         from infrastructure.project_store import ProjectStore
-                        project_store = ProjectStore(self.config)
+                        project_store = self.services.get(ProjectStore, self.config)
                         project_store.create_project("Example")
                         logger.info("Example project created during setup")
                     except Exception as e:
@@ -94,11 +94,11 @@ class StoryboardEditorAddon(BaseAddon):
             description="Create and edit storyboards for the active project",
             category="project"
         )
-        self.config = ConfigManager()
-        self.project_store = ProjectStore(self.config)
+        self.config = self.services.get(ConfigManager)
+        self.project_store = self.services.get(ProjectStore, self.config)
         self.editor_service = StoryboardEditorService()
-        self.preset_service = PresetService()  # Auto-seeds if empty
-        self.character_lora_service = CharacterLoraService(self.config)
+        self.preset_service = self.services.get(PresetService)  # Auto-seeds if empty
+        self.character_lora_service = self.services.get(CharacterLoraService, self.config)
         self.current_storyboard: Optional[domain_models.Storyboard] = None
         self.shot_handlers = StoryboardHandlers(self)
 
@@ -32,8 +32,8 @@ class StoryboardLLMGeneratorAddon(BaseAddon):
             description="Generate storyboards from natural language descriptions",
             category="tools"
         )
-        self.config = ConfigManager()
-        self.project_store = ProjectStore(self.config)
+        self.config = self.services.get(ConfigManager)
+        self.project_store = self.services.get(ProjectStore, self.config)
         self.llm_service = StoryboardLLMService(self.config)
 
     def get_tab_name(self) -> str:
@@ -48,8 +48,6 @@ class StoryboardLLMGeneratorAddon(BaseAddon):
 
     def _check_api_key(self) -> Tuple[bool, str]:
         """Check if OpenRouter API key is configured."""
-        # Refresh config to get latest value
-        self.config = ConfigManager()
         key = self.config.get_openrouter_api_key()
         if key:
             return True, ""
@@ -61,9 +59,6 @@ class StoryboardLLMGeneratorAddon(BaseAddon):
 
     def _on_tab_load(self) -> Tuple[str, str]:
         """Called when tab loads - refresh project header and API warning."""
-        # Refresh stores to get current state
-        self.config = ConfigManager()
-        self.project_store = ProjectStore(self.config)
         return self._get_project_header(), self._get_api_warning()
 
     def _get_project_header(self) -> str:
@@ -265,8 +260,7 @@ Je detaillierter, desto besser das Ergebnis!""",
 
     def refresh_models(self) -> dict:
         """Refresh model dropdown."""
-        # Refresh config to get latest models
-        self.config = ConfigManager()
+        # ConfigManager reads settings live, no reload needed
         choices = self._get_model_choices()
         return gr.update(choices=choices, value=choices[0] if choices else None)
 
@@ -274,14 +268,13 @@ Je detaillierter, desto besser das Ergebnis!""",
         """Import storyboard to current project."""
         try:
             # Validate JSON first
-            config = ConfigManager()
-            llm_service = StoryboardLLMService(config)
+            llm_service = StoryboardLLMService(self.config)
             is_valid, errors, _ = llm_service.validate_draft(json_str)
             if not is_valid:
                 return f"❌ **Validierungsfehler:**\n" + "\n".join(f"- {e}" for e in errors)
 
-            # Get current project (fresh ProjectStore)
-            project_store = ProjectStore(config)
+            # Get current project (shared store, refreshed from DB)
+            project_store = self.project_store
             project = project_store.get_active_project(refresh=True)
             if not project:
                 return "❌ **Kein Projekt aktiv** - Bitte zuerst ein Projekt auswählen"
@@ -30,8 +30,8 @@ class StoryboardManagerAddon(BaseAddon):
             description="Manage storyboard files in the active project",
             category="project"
         )
-        self.config = ConfigManager()
-        self.project_store = ProjectStore(self.config)
+        self.config = self.services.get(ConfigManager)
+        self.project_store = self.services.get(ProjectStore, self.config)
         self.editor_service = StoryboardEditorService()
 
     def get_tab_name(self) -> str:
@@ -25,10 +25,10 @@ class TestComfyFluxAddon(BaseAddon):
             description="Test ComfyUI connection and generate keyframe test images",
             category="tools"
         )
-        self.config = ConfigManager()
+        self.config = self.services.get(ConfigManager)
         self.api = None
         self.current_images = []
-        self.workflow_registry = WorkflowRegistry()
+        self.workflow_registry = self.services.get(WorkflowRegistry)
 
     def get_tab_name(self) -> str:
         return "🧪 Test"
@@ -21,8 +21,8 @@ class TTSAddon(BaseAddon):
             description="Voice output for explainer videos and narration",
             category="production"
         )
-        self.config = ConfigManager()
-        self.project_store = ProjectStore(self.config)
+        self.config = self.services.get(ConfigManager)
+        self.project_store = self.services.get(ProjectStore, self.config)
         self.tts_service = TTSService(self.config)
 
     def get_tab_name(self) -> str:
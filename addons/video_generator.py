@@ -2,6 +2,7 @@ import os
 import sys
 import subprocess
 import json
+import time
 from copy import deepcopy
 from typing import Dict, Any, List, Tuple, Optional
 import gradio as gr
@@ -24,6 +25,7 @@ from infrastructure.state_store import VideoGeneratorStateStore
 from infrastructure.project_store import ProjectStore
 from infrastructure.logger import get_logger
 from infrastructure.job_status_store import JobStatusStore
+from infrastructure.job_runner import Job
 from infrastructure.comfy_api import ComfyUIAPI
 from infrastructure.error_handler import handle_errors
 from domain import models as domain_models
@@ -39,24 +41,31 @@ NO_PLAN_TEXT = "No plan calculated yet."
 NO_SHOT_TEXT = "No shot selected."
 
 class VideoGeneratorAddon(BaseAddon):
+    # Seconds between status refreshes while following a background job
+    JOB_POLL_SECONDS = 5.0
+
     def __init__(self):
         super().__init__(name="Video Generator", description="Use selected keyframes to drive Wan 2.2 clip generation", category="production")
-        self.config = ConfigManager()
-        self.workflow_registry = WorkflowRegistry()
-        self.project_manager = ProjectStore(self.config)
+        self.config = self.services.get(ConfigManager)
+        self.workflow_registry = self.services.get(WorkflowRegistry)
+        self.project_manager = self.services.get(ProjectStore, self.config)
         self.state_store = VideoGeneratorStateStore()
-        self._job_store = JobStatusStore()
-        self.model_validator = ModelValidator(self.config.get_comfy_root())
-        if hasattr(self.model_validator, "rebuild_index"):
-            self.model_validator.rebuild_index()  # Build index immediately at startup
-        model_count = len(getattr(self.model_validator, "_index", {}) or {})
-        logger.info(f"Video Generator: ModelValidator initialized with {model_count} models")
+        self._job_store = self.services.get(JobStatusStore)
+        self.job_runner = self.services.job_runner
+        # Model index is built by warm_up() in the background (or on first validation)
+        self.model_validator = self.services.get(ModelValidator, self.config.get_comfy_root())
         self.plan_builder = VideoPlanBuilder()  # Uses defaults: 73 frames, 24 fps
         self.video_service = VideoGenerationService(self.project_manager, self.model_validator, self.state_store, self.plan_builder)
         self.storyboard_model: Optional[domain_models.Storyboard] = None
         self.selection_model: Optional[domain_models.SelectionSet] = None
         self.max_clip_duration = 3.0
 
+    def warm_up(self):
+        """Build the model index after the UI is up instead of during startup."""
+        if hasattr(self.model_validator, "ensure_index"):
+            model_count = self.model_validator.ensure_index()
+            logger.info(f"Video Generator: ModelValidator initialized with {model_count} models")
+
     @handle_errors("Failed to load storyboard", return_tuple=True)
     def _load_storyboard_model(self, storyboard_file: str) -> domain_models.Storyboard:
         storyboard_model = StoryboardService.load_from_config(self.config, filename=storyboard_file)
@@ -288,9 +297,12 @@ class VideoGeneratorAddon(BaseAddon):
 
                     with gr.Group():
                         generate_btn = gr.Button("▶️ Generate Clips", variant="primary", size="lg")
+                        with gr.Row():
+                            follow_btn = gr.Button("📡 Follow Running Job", variant="secondary", size="sm")
+                            stop_job_btn = gr.Button("⏹️ Stop Job", variant="stop", size="sm")
                         gr.Markdown(
-                            "⚠️ **Do not refresh during generation.** If you refresh, the job "
-                            "continues in the backend but this page will lose tracking. "
+                            "ℹ️ Clips are rendered as a background job. Closing or refreshing the page "
+                            "does not stop it - use **Follow Running Job** to reattach. "
                             "Check `logs/pipeline.log` for progress."
                         )
 
@@ -306,6 +318,12 @@ class VideoGeneratorAddon(BaseAddon):
                         revalidate_models_btn = gr.Button("🔍 Revalidate Models", variant="secondary")
                         model_status = gr.Markdown("")
 
+                    with gr.Group():
+                        gr.Markdown("## 🎞️ Final Render")
+                        crossfade_slider = gr.Slider(minimum=0.0, maximum=2.0, step=0.1, value=0.0, label="Crossfade (sec.)", info="0 = hard cut (stream copy, no re-encode)")
+                        audio_bed_input = gr.Audio(label="Audio Bed (optional)", type="filepath", sources=["upload"])
+                        assemble_btn = gr.Button("🎞️ Assemble Final Video", variant="secondary")
+
                 # Right Column (50%): Shot Preview
                 with gr.Column(scale=1):
                     with gr.Group():
@@ -340,6 +358,11 @@ class VideoGeneratorAddon(BaseAddon):
                 inputs=[workflow_dropdown, fps_slider, storyboard_state, plan_state, model_dropdown],
                 outputs=[status_text, progress_details, plan_summary, plan_state, last_video, confirm_group]
             )
+            follow_btn.click(
+                fn=self.follow_generation,
+                outputs=[status_text, progress_details, plan_summary, plan_state, last_video, confirm_group]
+            )
+            stop_job_btn.click(fn=self.cancel_generation, outputs=[status_text])
             cancel_btn.click(
                 fn=lambda: (gr.update(visible=False), "**Status:** Generation cancelled"),
                 outputs=[confirm_group, status_text]
@@ -348,6 +371,7 @@ class VideoGeneratorAddon(BaseAddon):
             open_video_btn.click(fn=self.open_video_folder, inputs=[storyboard_state], outputs=[status_text])
             reload_storyboard_btn.click(fn=self._reload_storyboard_ui, outputs=[storyboard_md, storyboard_status, storyboard_state, selection_status, selection_state, plan_summary, plan_shot_dropdown, plan_state, shot_preview_info, startframe_preview])
             revalidate_models_btn.click(fn=self.revalidate_models, outputs=[model_status])
+            assemble_btn.click(fn=self.assemble_final_video, inputs=[fps_slider, crossfade_slider, audio_bed_input, plan_state], outputs=[status_text, last_video])
 
             # Auto-refresh storyboard and selection on tab load
             interface.load(
@@ -611,27 +635,101 @@ Please check the settings before starting:
 
         return "**Status:** ⏳ Confirmation required...", confirm_md, gr.update(visible=True)
 
-    def execute_generation(self, workflow_file: str, fps: int, storyboard_state: Dict[str, Any], plan_state: List[Dict[str, Any]], selected_model: str = "(Standard)") -> Tuple[str, str, str, List[Dict[str, Any]], str, gr.update]:
-        """Execute generation after user confirmation."""
-        # Run the actual generation
-        status, progress, summary, updated_plan, last_video = self.generate_clips(workflow_file, fps, storyboard_state, plan_state, selected_model)
-        # Hide confirmation dialog and return results
-        return status, progress, summary, updated_plan, last_video, gr.update(visible=False)
+    def execute_generation(self, workflow_file: str, fps: int, storyboard_state: Dict[str, Any], plan_state: List[Dict[str, Any]], selected_model: str = "(Standard)"):
+        """Execute generation after user confirmation (as a background job)."""
+        hide_confirm = gr.update(visible=False)
+        project = self.project_manager.get_active_project(refresh=True)
+        active_job = self.job_runner.find_active("video_generation", project.get("path")) if project else None
+        if active_job:
+            # One render per project; reattach instead of starting a second one
+            yield from self._follow_job(active_job)
+            return
+
+        run_args, error = self._prepare_clip_run(workflow_file, fps, storyboard_state, plan_state, selected_model)
+        if error:
+            yield (*error, hide_confirm)
+            return
+
+        # Own state store per job: the tab may switch projects while the job runs
+        project = run_args["project"]
+        state_store = VideoGeneratorStateStore(os.path.join(project["path"], "video", "_state.json"))
+        video_service = VideoGenerationService(self.project_manager, self.model_validator, state_store, self.plan_builder)
+        job = self.job_runner.submit(
+            "video_generation",
+            lambda job: self._run_clips(state_store=state_store, video_service=video_service, **run_args),
+            project_path=project.get("path"),
+            label=f"Video clips: {project.get('name', 'Unknown')}",
+            persist=False,  # VideoGenerationService writes its own job status
+            on_cancel=video_service.request_stop,
+            exclusive=True,  # A double click reattaches to the job queued first
+        )
+        yield from self._follow_job(job)
+
+    def cancel_generation(self) -> str:
+        """Stop the running video job of the active project after the current clip."""
+        project = self.project_manager.get_active_project(refresh=True)
+        job = self.job_runner.find_active("video_generation", project.get("path")) if project else None
+        if job is None or not self.job_runner.cancel(job.job_id):
+            return "**ℹ️ No video job running for this project.**"
+        if job.status == "queued":
+            return "**⏹️ Job cancelled** before it started."
+        return "**⏹️ Stop requested:** The job stops after the current clip."
+
+    def follow_generation(self):
+        """Reattach to the running video job of the active project."""
+        project = self.project_manager.get_active_project(refresh=True)
+        job = self.job_runner.find_active("video_generation", project.get("path")) if project else None
+        if job is None:
+            yield ("**ℹ️ No video job running for this project.**", gr.update(), gr.update(), gr.update(), gr.update(), gr.update())
+            return
+        yield from self._follow_job(job)
+
+    def _follow_job(self, job: Job):
+        """Report job state until it finishes, then show the result."""
+        hide_confirm = gr.update(visible=False)
+        started = time.monotonic()
+        while not job.wait(timeout=self.JOB_POLL_SECONDS):
+            elapsed = int(time.monotonic() - started)
+            if job.status == "queued":
+                status = f"**Status:** ⏳ Queued (position {self.job_runner.queue_position(job)}) - waiting for a free worker"
+            else:
+                status = f"**Status:** 🎬 Rendering clips... ({elapsed}s, see `logs/pipeline.log`)"
+            yield status, gr.update(), gr.update(), gr.update(), gr.update(), hide_confirm
+        if job.status == "cancelled" and job.result:
+            yield (*job.result, hide_confirm)  # Stopped between clips: finished clips are kept
+            return
+        if job.status != "completed":
+            yield (f"**Status:** ❌ Video job {job.status}: {job.error or job.message}",
+                   gr.update(), gr.update(), gr.update(), gr.update(), hide_confirm)
+            return
+        yield (*job.result, hide_confirm)
 
     def generate_clips(self, workflow_file: str, fps: int, storyboard_state: Dict[str, Any], plan_state: List[Dict[str, Any]], selected_model: str = "(Standard)") -> Tuple[str, str, str, List[Dict[str, Any]], str]:
+        """Render clips synchronously in the calling thread."""
+        run_args, error = self._prepare_clip_run(workflow_file, fps, storyboard_state, plan_state, selected_model)
+        if error:
+            return error
+        return self._run_clips(state_store=self.state_store, **run_args)
+
+    def _prepare_clip_run(self, workflow_file: str, fps: int, storyboard_state: Dict[str, Any], plan_state: List[Dict[str, Any]], selected_model: str = "(Standard)"):
+        """Validate inputs and load the workflow.
+
+        Returns:
+            (run_args, None) for _run_clips, or (None, error_response)
+        """
         validated_inputs, validation_error = self._validate_video_inputs(fps, workflow_file)
         if validation_error:
-            return self._error_response(f"**Status:** ❌ {validation_error}", "Invalid input parameters", plan_state)
+            return None, self._error_response(f"**Status:** ❌ {validation_error}", "Invalid input parameters", plan_state)
         project = self.project_manager.get_active_project(refresh=True)
-        if not project: return self._error_response("**Status:** ❌ No active project. Please select one in the '📁 Project' tab.", "No data", plan_state)
+        if not project: return None, self._error_response("**Status:** ❌ No active project. Please select one in the '📁 Project' tab.", "No data", plan_state)
         self._configure_state_store(project)
-        if not storyboard_state: return self._error_response("**Status:** ❌ Please load a storyboard first", "No data", plan_state)
-        if not plan_state: return self._error_response("**Status:** ❌ No generation plan available", "No data", plan_state)
-        if not workflow_file or workflow_file.startswith("No workflows"): return self._error_response("**Status:** ❌ No workflow selected", "No data", plan_state)
+        if not storyboard_state: return None, self._error_response("**Status:** ❌ Please load a storyboard first", "No data", plan_state)
+        if not plan_state: return None, self._error_response("**Status:** ❌ No generation plan available", "No data", plan_state)
+        if not workflow_file or workflow_file.startswith("No workflows"): return None, self._error_response("**Status:** ❌ No workflow selected", "No data", plan_state)
         if not any(entry.get("ready") for entry in plan_state):
             missing = sorted({entry.get("shot_id") for entry in plan_state if entry.get("start_frame_source") == "missing"})
             missing_hint = ", ".join(missing) if missing else "no start frames found"
-            return self._error_response(f"**Status:** ❌ No shot with valid start frame (missing: {missing_hint})", "Please export from the Selector or manually add start frames.", plan_state)
+            return None, self._error_response(f"**Status:** ❌ No shot with valid start frame (missing: {missing_hint})", "Please export from the Selector or manually add start frames.", plan_state)
 
         # Resolve workflow: use SageAttention variant if enabled and available
         use_sage = self.config.use_sage_attention()
@@ -640,14 +738,14 @@ Please check the settings before starting:
             logger.info(f"SageAttention aktiv: verwende {resolved_workflow} statt {workflow_file}")
 
         workflow_path = os.path.join(self.config.get_workflow_dir(), resolved_workflow)
-        if not os.path.exists(workflow_path): return self._error_response(f"**Status:** ❌ Workflow not found ({resolved_workflow})", "No data", plan_state)
+        if not os.path.exists(workflow_path): return None, self._error_response(f"**Status:** ❌ Workflow not found ({resolved_workflow})", "No data", plan_state)
         comfy_url = self.config.get_comfy_url()
         comfy_api = ComfyUIAPI(comfy_url)
         conn = comfy_api.test_connection()
-        if not conn.get("connected"): return self._error_response(f"**Status:** ❌ Connection failed ({conn.get('error')})", "No data", plan_state)
+        if not conn.get("connected"): return None, self._error_response(f"**Status:** ❌ Connection failed ({conn.get('error')})", "No data", plan_state)
         workflow_template, workflow_error = self._load_workflow_template(comfy_api, workflow_path)
         if workflow_error:
-            return self._error_response(f"**Status:** ❌ {workflow_error}", "No data", plan_state)
+            return None, self._error_response(f"**Status:** ❌ {workflow_error}", "No data", plan_state)
 
         # Inject model override if specified
         model_override = None if selected_model == "(Standard)" else selected_model
@@ -656,17 +754,50 @@ Please check the settings before starting:
             logger.info(f"Model override applied: {model_override}")
 
         missing_models = self.model_validator.find_missing(workflow_template) if self.model_validator else []
-        if missing_models: return self._error_response(f"**Status:** ❌ Models missing ({len(missing_models)})", self._format_missing_models(missing_models), plan_state)
-        log_hint = "💡 **Tip:** For real-time progress see `logs/pipeline.log` and ComfyUI terminal.\n\n"
+        if missing_models: return None, self._error_response(f"**Status:** ❌ Models missing ({len(missing_models)})", self._format_missing_models(missing_models), plan_state)
         # Get resolution from project config (central setting)
         resolution = self.config.get_resolution_tuple()
-        updated_plan, logs, last_video_path = self.video_service.run_generation(plan_state=plan_state, workflow_template=workflow_template, fps=validated_inputs.fps, project=project, comfy_api=comfy_api, resolution=resolution)
+        run_args = dict(
+            project=project, plan_state=plan_state, workflow_template=workflow_template, fps=validated_inputs.fps,
+            comfy_api=comfy_api, resolution=resolution, workflow_file=workflow_file,
+        )
+        return run_args, None
+
+    def _run_clips(self, project: Dict[str, Any], plan_state: List[Dict[str, Any]], workflow_template: Dict[str, Any], fps: int, comfy_api: ComfyUIAPI, resolution: Tuple[int, int], workflow_file: str, state_store: VideoGeneratorStateStore, video_service: Optional[VideoGenerationService] = None) -> Tuple[str, str, str, List[Dict[str, Any]], str]:
+        """Render all ready clips and persist the resulting UI state."""
+        if video_service is None:
+            video_service = self.video_service
+            if state_store is not self.state_store:
+                video_service = VideoGenerationService(self.project_manager, self.model_validator, state_store, self.plan_builder)
+        log_hint = "💡 **Tip:** For real-time progress see `logs/pipeline.log` and ComfyUI terminal.\n\n"
+        updated_plan, logs, last_video_path = video_service.run_generation(plan_state=plan_state, workflow_template=workflow_template, fps=fps, project=project, comfy_api=comfy_api, resolution=resolution)
         progress_md = log_hint + "### Progress\n" + "\n".join(logs)
         summary = format_plan_summary(updated_plan)
-        status = "**Status:** ✅ Clips generated (see log)" if last_video_path else "**Status:** ⚠️ See log for details"
-        self._persist_state(plan_state=updated_plan, plan_summary=summary, status_text=status, progress_md=progress_md, last_video=last_video_path, workflow_file=workflow_file)
+        if video_service.stop_requested:
+            status = "**Status:** ⏹️ Stopped - finished clips are kept (see log)"
+        else:
+            status = "**Status:** ✅ Clips generated (see log)" if last_video_path else "**Status:** ⚠️ See log for details"
+        state_store.update(plan_state=updated_plan, plan_summary=summary, status_text=status, progress_md=progress_md, last_video=last_video_path, workflow_file=workflow_file)
         return status, progress_md, summary, updated_plan, last_video_path
 
+    def assemble_final_video(self, fps: int, crossfade: float, audio_bed: Optional[str], plan_state: List[Dict[str, Any]]) -> Tuple[str, Optional[str]]:
+        """Render all completed clips of the plan into one final video."""
+        project = self.project_manager.get_active_project(refresh=True)
+        if not project:
+            return "**Status:** ❌ No active project. Please select one in the '📁 Project' tab.", None
+        if not any(entry.get("status") == "completed" for entry in plan_state or []):
+            return "**Status:** ❌ No completed clips yet. Generate clips first.", None
+        success, result = self.video_service.assemble_final_video(
+            plan_state=plan_state,
+            project=project,
+            fps=int(fps) if fps else None,
+            crossfade=float(crossfade or 0.0),
+            audio_bed=audio_bed or None,
+        )
+        if not success:
+            return f"**Status:** ❌ Final render failed: {result}", None
+        return f"**Status:** ✅ Final video rendered: `{result}`", result
+
     def _format_missing_models(self, missing: List[str]) -> str:
         items = "\n".join([f"  - `{name}`" for name in missing])
         return "### Missing Models\n- The following files are referenced in the workflow but not found in your ComfyUI/models/ folder:\n" + items + "\n\nPlease install the models or adjust the workflow via ⚙️ Settings."
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""CINDERGRACE batch mode - run the pipeline headless (no Gradio).
+
+Examples:
+    python batch.py                                  # active project, all stages
+    python batch.py --project demo --project teaser --variants 2
+    python batch.py --all --stages keyframes,select --pick last
+    python batch.py --project demo --draft --variants 8     # draft variants, final render of the picks
+    python batch.py --project demo --stages video --fps 16
+    python batch.py --all --queue /mnt/shared/work_queue.db  # render on worker.py processes
+
+Progress goes to stdout as JSON lines (``--format text`` for humans); logs
+go to stderr and logs/pipeline.log.
+
+Exit codes: 0 all projects completed, 1 at least one project failed,
+2 invalid arguments or no project found, 130 interrupted.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from domain.exceptions import PipelineException  # noqa: E402
+from infrastructure.logger import PipelineLogger  # noqa: E402
+from services.batch_pipeline import PICK_STRATEGIES, STAGES, BatchOptions, BatchPipeline  # noqa: E402
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def _stages(value: str) -> tuple:
+    stages = tuple(stage.strip() for stage in value.split(",") if stage.strip())
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown or not stages:
+        raise argparse.ArgumentTypeError(f"Stages must be a comma-separated subset of {','.join(STAGES)}")
+    return stages
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the CINDERGRACE pipeline headless for one or many projects.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--project", action="append", default=[], metavar="SLUG",
+                        help="Project slug (repeatable; default: the active project)")
+    target.add_argument("--all", action="store_true", help="Process all projects")
+    parser.add_argument("--stages", type=_stages, default=STAGES,
+                        help=f"Comma-separated stages (default: {','.join(STAGES)})")
+    parser.add_argument("--storyboard", help="Storyboard file (default: the project's current storyboard)")
+    parser.add_argument("--keyframe-workflow", help="Keyframe workflow gcp_* (default: configured default)")
+    parser.add_argument("--video-workflow", help="Video workflow gcv_* (default: configured default)")
+    parser.add_argument("--model", dest="model_override", help="Diffusion model override")
+    parser.add_argument("--variants", type=int, default=BatchOptions.variants_per_shot, help="Keyframe variants per shot")
+    parser.add_argument("--seed", type=int, default=BatchOptions.base_seed, help="Base seed")
+    parser.add_argument("--fps", type=int, default=BatchOptions.fps, help="Video frames per second")
+    parser.add_argument("--resume", action="store_true", help="Continue an unfinished keyframe checkpoint")
+    parser.add_argument("--draft", action="store_true",
+                        help="Render keyframe variants as drafts; the finalize stage re-renders the selection")
+    parser.add_argument("--draft-downscale", action="store_true",
+                        help="Drafts also at half resolution (faster, but only approximates the final composition)")
+    parser.add_argument("--selection", dest="selection_file", metavar="FILE",
+                        help="Selection file: exported selected_keyframes.json or {shot_id: variant|filename}")
+    parser.add_argument("--pick", choices=PICK_STRATEGIES, default=BatchOptions.pick,
+                        help="Automatic selection: first or last variant per shot")
+    parser.add_argument("--queue", metavar="FILE",
+                        help="Dispatch keyframes/video to distributed workers via this work queue (see worker.py)")
+    parser.add_argument("--format", choices=("json", "text"), default="json", help="Progress output format")
+    parser.add_argument("--log-level", default="WARNING", help="Console log level (stderr)")
+    return parser
+
+
+def _printer(fmt: str):
+    def emit_json(event: Dict[str, Any]) -> None:
+        print(json.dumps(event, ensure_ascii=False, default=str), flush=True)
+
+    def emit_text(event: Dict[str, Any]) -> None:
+        fields = " ".join(f"{key}={value}" for key, value in event.items() if key not in ("event", "ts"))
+        print(f"[{event['event']}] {fields}", flush=True)
+
+    return emit_json if fmt == "json" else emit_text
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    PipelineLogger.set_level(getattr(logging, str(args.log_level).upper(), logging.WARNING))
+    emit = _printer(args.format)
+
+    options = BatchOptions(
+        stages=args.stages,
+        storyboard=args.storyboard,
+        keyframe_workflow=args.keyframe_workflow,
+        video_workflow=args.video_workflow,
+        variants_per_shot=args.variants,
+        base_seed=args.seed,
+        fps=args.fps,
+        model_override=args.model_override,
+        selection_file=args.selection_file,
+        pick=args.pick,
+        resume=args.resume,
+        queue=args.queue,
+        draft=args.draft,
+        draft_downscale=args.draft_downscale,
+    )
+    pipeline = BatchPipeline(emit=emit)
+    try:
+        projects = pipeline.resolve_projects(args.project, all_projects=args.all)
+    except PipelineException as e:
+        emit({"event": "error", "error": str(e)})
+        return EXIT_USAGE
+
+    try:
+        results = pipeline.run(projects, options)
+    except KeyboardInterrupt:
+        emit({"event": "interrupted"})
+        return EXIT_INTERRUPTED
+    return EXIT_OK if all(result.ok for result in results) else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,7 @@ import copy
 import urllib.request
 import urllib.parse
 import urllib.error
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Tuple
 import websocket
 from io import BytesIO
 from PIL import Image
@@ -528,6 +528,61 @@ class ComfyUIAPI:
             logger.warning(f"Failed to get history: {e}")
             return None
 
+    @staticmethod
+    def find_output_file(
+        history: Optional[Dict[str, Any]],
+        output_root: str,
+        extensions: Tuple[str, ...]
+    ) -> Optional[str]:
+        """
+        Resolve a saved output of a finished job from its history entry
+
+        Args:
+            history: The job's /history entry
+            output_root: ComfyUI output directory as seen from this machine
+            extensions: Accepted file extensions (lower case, e.g. (".mp4",))
+
+        Returns:
+            Path of the first listed file that exists locally, or None
+        """
+        for node_output in ((history or {}).get("outputs") or {}).values():
+            for key in ("images", "gifs", "videos"):
+                for file_info in node_output.get(key, []):
+                    filename = file_info.get("filename", "")
+                    if not filename.lower().endswith(extensions):
+                        continue
+                    if file_info.get("type", "output") != "output":
+                        continue
+                    path = os.path.join(output_root, file_info.get("subfolder", ""), filename)
+                    if os.path.isfile(path):
+                        return path
+        return None
+
+    def cancel_prompt(self, prompt_id: str) -> bool:
+        """
+        Stop a job: delete it from the queue, or interrupt it if it is running
+
+        Only this job is touched; other clients' jobs keep running.
+
+        Args:
+            prompt_id: Job ID
+
+        Returns:
+            True if the job was still queued or running
+        """
+        try:
+            queue = self._get_request("/queue")
+            running = {item[1] for item in queue.get("queue_running", []) if len(item) > 1}
+            pending = {item[1] for item in queue.get("queue_pending", []) if len(item) > 1}
+            if prompt_id in pending:
+                self._post_request("/queue", {"delete": [prompt_id]})
+            if prompt_id in running:
+                self._post_request("/interrupt", {"prompt_id": prompt_id})
+            return prompt_id in running or prompt_id in pending
+        except Exception as e:
+            logger.warning(f"Failed to cancel job {prompt_id}: {e}")
+            return False
+
     def _get_image(
         self,
         filename: str,
@@ -793,7 +848,8 @@ class ComfyUIAPI:
 
         try:
             with urllib.request.urlopen(request, timeout=30) as response:
-                return json.loads(response.read())
+                body = response.read()
+                return json.loads(body) if body.strip() else {}  # /interrupt and /queue reply empty
         except urllib.error.HTTPError as e:
             # Read error response body for details
             error_body = e.read().decode('utf-8')
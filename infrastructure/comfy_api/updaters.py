@@ -61,13 +61,15 @@ class RandomNoiseUpdater(NodeUpdater):
 
 
 class KSamplerUpdater(NodeUpdater):
-    target_types = ("KSampler",)
+    """Update KSampler (seed/steps/cfg/sampler) and KSamplerSelect (sampler) nodes."""
+    target_types = ("KSampler", "KSamplerSelect")
 
     def update(self, node_data: Dict[str, Any], params: Dict[str, Any]) -> None:
         inputs = node_data.setdefault("inputs", {})
         seed = params.get("seed")
         steps = params.get("steps")
         cfg = params.get("cfg")
+        sampler = params.get("sampler")
 
         if seed is not None and "seed" in inputs:
             inputs["seed"] = seed
@@ -75,6 +77,8 @@ class KSamplerUpdater(NodeUpdater):
             inputs["steps"] = steps
         if cfg is not None and "cfg" in inputs:
             inputs["cfg"] = cfg
+        if sampler is not None and "sampler_name" in inputs:
+            inputs["sampler_name"] = sampler
 
 
 class BasicSchedulerUpdater(NodeUpdater):
@@ -301,22 +305,24 @@ class LoraLoaderUpdater(NodeUpdater):
         lora_strength_model: Model strength (default 0.85)
         lora_strength_clip: CLIP strength (default 0.85)
         lora_strength: Combined strength for both model and clip
+
+    Without lora_name only lora_strength is applied (to the workflow's own LoRA).
     """
     target_types = ("LoraLoader", "LoraLoaderModelOnly")
 
     def update(self, node_data: Dict[str, Any], params: Dict[str, Any]) -> None:
         lora_name = params.get("lora_name")
-        if lora_name is None:
+        strength = params.get("lora_strength")
+        if lora_name is None and strength is None:
             return
 
         inputs = node_data.setdefault("inputs", {})
 
         # Set LoRA filename
-        if "lora_name" in inputs:
+        if lora_name is not None and "lora_name" in inputs:
             inputs["lora_name"] = lora_name
 
         # Set strengths
-        strength = params.get("lora_strength")
         strength_model = _merge_params(params.get("lora_strength_model"), strength)
         strength_clip = _merge_params(params.get("lora_strength_clip"), strength)
 
@@ -4,6 +4,7 @@ This module provides backwards-compatible access to settings
 while storing all data securely in SQLite with encryption for
 sensitive values like API keys.
 """
+import copy
 import os
 from typing import Any, Dict, Optional
 
@@ -17,6 +18,8 @@ class ConfigManager:
     Sensitive values (API keys) are automatically encrypted.
     """
 
+    _pinned_backend: Optional[Dict[str, Any]] = None  # Set by with_backend()
+
     def __init__(self, config_path: str = None):
         """Initialize config manager.
 
@@ -113,6 +116,8 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
+        if key == "comfy_root" and self._pinned_backend and self._pinned_backend.get("comfy_root"):
+            return self._pinned_backend["comfy_root"]
         value = self._store.get(key)
         if value is None:
             return default
@@ -250,10 +255,35 @@ class ConfigManager:
 
     def get_active_backend(self) -> Dict[str, Any]:
         """Get the currently active backend configuration."""
+        if self._pinned_backend is not None:
+            return dict(self._pinned_backend)
         backends = self.get_backends()
         active_id = self.get_active_backend_id()
         return backends.get(active_id, backends.get("local", {}))
 
+    def with_backend(self, url: Optional[str] = None, comfy_root: Optional[str] = None) -> "ConfigManager":
+        """Return a copy bound to one ComfyUI backend (settings stay shared).
+
+        Used by distributed workers whose backend differs from the active one.
+        With comfy_root the backend is local (files are read from that root).
+        A different url without comfy_root is treated like RunPod: inputs are
+        uploaded and outputs downloaded through the API into the local root.
+
+        Args:
+            url: ComfyUI server URL (default: active backend)
+            comfy_root: ComfyUI installation root as seen from this machine
+        """
+        backend = dict(self.get_active_backend())
+        if comfy_root:
+            backend.update(type="local", comfy_root=comfy_root)
+        elif url and url.rstrip("/") != self.get_comfy_url().rstrip("/"):
+            backend["type"] = "runpod"
+        if url:
+            backend["url"] = url
+        pinned = copy.copy(self)
+        pinned._pinned_backend = backend
+        return pinned
+
     def set_active_backend(self, backend_id: str) -> bool:
         """Switch to a different backend.
 
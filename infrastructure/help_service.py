@@ -1,13 +1,32 @@
-"""Help Service - SQLite-basierte Hilfetexte für alle Tabs."""
+"""Help Service - SQLite-basierte Hilfetexte für alle Tabs.
+
+Die Tabellen werden pro Sprache einmal komplett in unveränderliche
+Dictionaries geladen; Tooltip-/Modal-Abfragen beim UI-Aufbau öffnen damit
+keine eigene Datenbankverbindung mehr. Schreibzugriffe über den Service
+verwerfen den Cache der betroffenen Sprache, die nächste Abfrage lädt neu.
+Für die Volltextsuche wird daraus ein FTS5-Index im Speicher aufgebaut.
+"""
 import sqlite3
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
 from infrastructure.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class _HelpTables:
+    """Unveränderlicher Snapshot aller Hilfetexte einer Sprache."""
+
+    texts: Mapping[Tuple[str, str, str], str]        # (tab, field, text_type) -> content
+    tab_info: Mapping[str, Tuple[str, str]]           # tab -> (title, description)
+    fields: Mapping[str, Tuple[str, ...]]             # tab -> sortierte Feldnamen
+
+
 class HelpService:
     """Service zum Laden und Bereitstellen von Hilfetexten aus SQLite."""
 
@@ -25,6 +44,10 @@ class HelpService:
 
         self.db_path = db_path
         self.language = language
+        self._tables: Dict[str, _HelpTables] = {}
+        # Suchindex pro Sprache, gebunden an den Snapshot aus dem er gebaut wurde
+        self._search_indexes: Dict[str, Tuple[_HelpTables, sqlite3.Connection]] = {}
+        self._lock = threading.Lock()
         self._ensure_db()
 
     def _ensure_db(self) -> None:
@@ -105,32 +128,12 @@ class HelpService:
         Returns:
             Text oder leerer String
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Erst in spezifischem Tab suchen
-        cursor.execute(
-            """
-            SELECT content FROM help_texts
-            WHERE tab = ? AND field = ? AND text_type = ? AND language = ?
-            """,
-            (tab, field, text_type, self.language),
-        )
-        result = cursor.fetchone()
-
-        # Fallback auf 'common' Tab
-        if not result:
-            cursor.execute(
-                """
-                SELECT content FROM help_texts
-                WHERE tab = 'common' AND field = ? AND text_type = ? AND language = ?
-                """,
-                (field, text_type, self.language),
-            )
-            result = cursor.fetchone()
-
-        conn.close()
-        return result[0] if result else ""
+        texts = self._get_tables().texts
+        # Erst in spezifischem Tab suchen, Fallback auf 'common' Tab
+        result = texts.get((tab, field, text_type))
+        if result is None:
+            result = texts.get(("common", field, text_type))
+        return result or ""
 
     def get_tab_info(self, tab: str) -> dict:
         """Holt Tab-Informationen (Titel, Beschreibung).
@@ -141,22 +144,8 @@ class HelpService:
         Returns:
             Dict mit 'title' und 'description' oder leere Werte
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT title, description FROM tab_info
-            WHERE tab = ? AND language = ?
-            """,
-            (tab, self.language),
-        )
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            return {"title": result[0], "description": result[1] or ""}
-        return {"title": "", "description": ""}
+        title, description = self._get_tables().tab_info.get(tab, ("", ""))
+        return {"title": title, "description": description}
 
     def get_common(self, key: str) -> dict:
         """Holt gemeinsame Hilfetexte (tooltip + modal).
@@ -212,6 +201,7 @@ class HelpService:
 
         conn.commit()
         conn.close()
+        self.reload(lang)
         logger.debug(f"Help-Text hinzugefügt: {tab}.{field}.{text_type} ({lang})")
 
     def add_tab_info(
@@ -243,6 +233,7 @@ class HelpService:
 
         conn.commit()
         conn.close()
+        self.reload(lang)
         logger.debug(f"Tab-Info hinzugefügt: {tab} ({lang})")
 
     def get_all_fields(self, tab: str) -> list[str]:
@@ -254,21 +245,109 @@ class HelpService:
         Returns:
             Liste der Feld-Bezeichner
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return list(self._get_tables().fields.get(tab, ()))
 
-        cursor.execute(
-            """
-            SELECT DISTINCT field FROM help_texts
-            WHERE tab = ? AND language = ?
-            ORDER BY field
-            """,
-            (tab, self.language),
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        """Volltextsuche über alle Hilfetexte der aktuellen Sprache.
+
+        Args:
+            query: Suchbegriffe (alle müssen vorkommen, Präfix-Suche)
+            limit: Maximale Anzahl Treffer
+
+        Returns:
+            Liste von Dicts mit 'tab', 'field', 'text_type', 'content',
+            sortiert nach Relevanz
+        """
+        terms = [t.replace('"', '') for t in query.split()]
+        terms = [t for t in terms if t]
+        if not terms:
+            return []
+
+        tables = self._get_tables()
+        match = " ".join(f'"{t}"*' for t in terms)
+        with self._lock:
+            indexed = self._search_indexes.get(self.language)
+            if indexed is None or indexed[0] is not tables:
+                indexed = (tables, self._build_search_index(tables))
+                self._search_indexes[self.language] = indexed
+            rows = indexed[1].execute(
+                """
+                SELECT tab, field, text_type, content FROM help_search
+                WHERE help_search MATCH ?
+                ORDER BY rank
+                LIMIT ?
+                """,
+                (match, limit),
+            ).fetchall()
+
+        return [
+            {"tab": tab, "field": field, "text_type": text_type, "content": content}
+            for tab, field, text_type, content in rows
+        ]
+
+    def reload(self, language: Optional[str] = None) -> None:
+        """Verwirft den In-Memory-Cache (z.B. nach externen Änderungen).
+
+        Args:
+            language: Nur diese Sprache neu laden (Standard: alle)
+        """
+        with self._lock:
+            if language is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(language, None)
+
+    def _get_tables(self) -> _HelpTables:
+        """Liefert die Tabellen der aktuellen Sprache (lädt beim ersten Zugriff)."""
+        language = self.language
+        tables = self._tables.get(language)
+        if tables is None:
+            with self._lock:
+                tables = self._tables.get(language)
+                if tables is None:
+                    tables = self._load_tables(language)
+                    self._tables[language] = tables
+        return tables
+
+    def _load_tables(self, language: str) -> _HelpTables:
+        """Lädt alle Hilfetexte und Tab-Infos einer Sprache mit einer Verbindung."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            text_rows = conn.execute(
+                "SELECT tab, field, text_type, content FROM help_texts WHERE language = ?",
+                (language,),
+            ).fetchall()
+            info_rows = conn.execute(
+                "SELECT tab, title, description FROM tab_info WHERE language = ?",
+                (language,),
+            ).fetchall()
+        finally:
+            conn.close()
+
+        fields: Dict[str, set] = {}
+        for tab, field, _, _ in text_rows:
+            fields.setdefault(tab, set()).add(field)
+
+        logger.debug(f"Help-Texte geladen: {len(text_rows)} Texte, {len(info_rows)} Tabs ({language})")
+        return _HelpTables(
+            texts=MappingProxyType({(tab, field, tt): content for tab, field, tt, content in text_rows}),
+            tab_info=MappingProxyType({tab: (title, description or "") for tab, title, description in info_rows}),
+            fields=MappingProxyType({tab: tuple(sorted(names)) for tab, names in fields.items()}),
         )
-        results = cursor.fetchall()
-        conn.close()
 
-        return [r[0] for r in results]
+    @staticmethod
+    def _build_search_index(tables: _HelpTables) -> sqlite3.Connection:
+        """Baut den FTS5-Suchindex im Speicher aus dem geladenen Snapshot."""
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.execute(
+            "CREATE VIRTUAL TABLE help_search USING fts5("
+            "tab UNINDEXED, field, text_type UNINDEXED, content, tokenize='unicode61 remove_diacritics 2')"
+        )
+        conn.executemany(
+            "INSERT INTO help_search (tab, field, text_type, content) VALUES (?, ?, ?, ?)",
+            [(tab, field, tt, content) for (tab, field, tt), content in tables.texts.items()],
+        )
+        return conn
 
 
 # Singleton-Instanz für einfachen Zugriff
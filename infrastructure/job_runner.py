@@ -0,0 +1,393 @@
+"""Background job runner - long operations outside Gradio request handlers.
+
+Generation runs are submitted as jobs and executed on a bounded thread pool.
+A handler only *follows* a job (``job.follow()``); closing the tab or a
+browser reconnect ends the subscription, not the run, and another handler
+can pick the job up again via :meth:`JobRunner.find_active`. This also allows
+queueing work for one project while another project's job is still running.
+
+Work functions receive their :class:`Job` and either return a result or a
+generator; yielded items are recorded as job events that followers replay::
+
+    runner = get_service_container().job_runner
+    job = runner.submit("keyframe_generation", work, project_path=path, label="Keyframes")
+    for event in job.follow():
+        ...
+
+Job states: ``queued`` -> ``running`` -> ``completed`` / ``failed`` /
+``cancelled``. Snapshots are persisted via :class:`JobStatusStore` under the
+job type, so the "Last job" panels keep working after a restart.
+
+Each job keeps at most ``max_events`` events: older ones are folded by the
+job's ``compact_events`` callable (e.g. merged image lists plus the latest
+status) or dropped, so long runs do not grow without bound.
+"""
+import inspect
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from infrastructure.job_status_store import JobStatusStore
+from infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+ACTIVE_STATES = ("queued", "running")
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """Raised inside work functions (via Job.check_cancelled) to stop a job."""
+
+
+@dataclass(eq=False)
+class Job:
+    """Handle of a submitted job; shared between the worker and followers."""
+    job_id: str
+    job_type: str
+    project_path: Optional[str] = None
+    label: str = ""
+    status: str = "queued"
+    message: str = ""
+    progress: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    max_events: Optional[int] = None
+    _events: List[Any] = field(default_factory=list, repr=False)
+    _trimmed: int = field(default=0, repr=False)  # Stream position of _events[0]
+    _first_live: int = field(default=0, repr=False)  # First stream position not folded
+    _compact: Optional[Callable[[List[Any]], List[Any]]] = field(default=None, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _on_cancel: Optional[Callable[[], Any]] = field(default=None, repr=False)
+    _winding_down: bool = field(default=False, repr=False)  # on_cancel accepted the stop
+    _on_report: Optional[Callable[["Job"], None]] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def event_count(self) -> int:
+        return self._trimmed + len(self._events)
+
+    def emit(self, event: Any) -> None:
+        """Record an event and wake up followers."""
+        with self._cond:
+            self._events.append(event)
+            if self.max_events and len(self._events) > self.max_events:
+                self._fold_events()
+            self._cond.notify_all()
+
+    def _fold_events(self) -> None:
+        """Fold the older half of the buffer (caller holds the condition)."""
+        count = len(self._events) - self.max_events // 2
+        old, self._events = self._events[:count], self._events[count:]
+        folded = self._compact(old) if self._compact else []
+        if len(folded) >= count:
+            folded = []  # Compaction must shrink the buffer
+        self._events = folded + self._events
+        self._trimmed += count - len(folded)
+        self._first_live = self._trimmed + len(folded)
+
+    def report(self, message: str, progress: Optional[float] = None) -> None:
+        """Update the human-readable status (persisted, throttled)."""
+        self.message = message
+        if progress is not None:
+            self.progress = progress
+        if self._on_report:
+            self._on_report(self)
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelled if cancellation was requested."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.job_id)
+
+    def follow(self, start: int = 0, poll_interval: float = 1.0) -> Iterator[Any]:
+        """
+        Yield events from index start until the job has finished
+
+        Closing the iterator (e.g. a disconnected client) does not affect the job.
+        A follower starting at 0 gets folded events first; one that fell behind
+        a fold continues with the first event that was not folded.
+        """
+        index = start
+        while True:
+            with self._cond:
+                while index >= self.event_count and not self.done:
+                    self._cond.wait(poll_interval)
+                if index < self._first_live:
+                    index = self._trimmed if index == start == 0 else self._first_live
+                pending = self._events[index - self._trimmed:]
+                finished = self.done
+            for event in pending:
+                yield event
+            index += len(pending)
+            if finished and index >= self.event_count:
+                return
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job has finished; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.done, timeout)
+
+    def _finish(self, status: str, **fields: Any) -> None:
+        with self._cond:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.status = status
+            self.finished_at = datetime.now().isoformat()
+            self._cond.notify_all()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "job_type": self.job_type,
+            "project_path": self.project_path,
+            "label": self.label,
+            "status": self.status,
+            "message": self.message,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobRunner:
+    """Execute jobs on a bounded worker pool and keep their status."""
+
+    # Generation jobs share one ComfyUI server, so a small pool is enough
+    DEFAULT_MAX_WORKERS = 2
+    # Minimum seconds between persisted progress snapshots of one job
+    PERSIST_INTERVAL = 2.0
+    # Finished jobs kept in memory for followers and the job list
+    MAX_FINISHED_JOBS = 50
+    # Events buffered per job (older ones are folded or dropped)
+    MAX_JOB_EVENTS = 500
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, job_store: Optional[JobStatusStore] = None):
+        """
+        Args:
+            max_workers: Jobs that run at the same time; further jobs queue
+            job_store: Status persistence (default: JobStatusStore())
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.job_store = job_store or JobStatusStore()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Dict[str, Job] = {}
+        self._counter = itertools.count(1)
+        self._last_persist: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        job_type: str,
+        work: Callable[[Job], Any],
+        *,
+        project_path: Optional[str] = None,
+        label: str = "",
+        persist: bool = True,
+        on_cancel: Optional[Callable[[], Any]] = None,
+        compact_events: Optional[Callable[[List[Any]], List[Any]]] = None,
+        exclusive: bool = False
+    ) -> Job:
+        """
+        Queue a job
+
+        Args:
+            job_type: Job category, also the JobStatusStore key (e.g. "video_generation")
+            work: Called with the Job on a worker thread; may return a generator
+                whose items become job events
+            project_path: Project the job belongs to (status lives in <project>/jobs/)
+            label: Short description for job lists
+            persist: Persist running/completed snapshots; False when the work
+                already writes its own JobStatusStore entries (queued, crash
+                and cancel states are persisted either way)
+            on_cancel: Called on cancel() so cooperative services can stop early;
+                return True if the work then winds down by itself (it may emit
+                its final events), otherwise the job stops at its next event
+            compact_events: Folds old events into fewer ones once the job has
+                more than MAX_JOB_EVENTS (default: drop them)
+            exclusive: Return the active job of this type for the project
+                instead of queueing a second one (checked atomically)
+
+        Returns:
+            The Job handle (the already active one for exclusive submits)
+        """
+        job = Job(
+            job_id=f"{job_type}-{datetime.now():%Y%m%d%H%M%S}-{next(self._counter)}",
+            job_type=job_type,
+            project_path=project_path,
+            label=label or job_type,
+            message="Queued",
+            max_events=self.MAX_JOB_EVENTS,
+            _compact=compact_events,
+            _on_cancel=on_cancel,
+            _on_report=self._persist_progress if persist else None,
+        )
+        with self._lock:
+            if exclusive:
+                active = self._find_active_locked(job_type, project_path)
+                if active is not None:
+                    return active
+            self._prune_finished()
+            self._jobs[job.job_id] = job
+            executor = self._get_executor()
+        self._persist(job, "queued", "Queued")
+        logger.info(f"Job queued: {job.job_id} ({job.label})")
+        executor.submit(self._run, job, work, persist)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, project_path: Optional[str] = None, active_only: bool = False) -> List[Job]:
+        """Jobs in submission order, optionally filtered by project/state."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [
+            job for job in jobs
+            if (project_path is None or job.project_path == project_path)
+            and (not active_only or job.status in ACTIVE_STATES)
+        ]
+
+    def find_active(self, job_type: str, project_path: Optional[str] = None) -> Optional[Job]:
+        """Latest queued/running job of this type for the project."""
+        with self._lock:
+            return self._find_active_locked(job_type, project_path)
+
+    def queue_position(self, job: Job) -> int:
+        """1-based position among queued jobs (0 if not queued)."""
+        queued = [j for j in self.list_jobs() if j.status == "queued"]
+        return queued.index(job) + 1 if job in queued else 0
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Request cancellation
+
+        Queued jobs never start. For running jobs on_cancel is invoked; unless
+        it returns True (the work winds down itself), the job is stopped at
+        its next event or check_cancelled() call.
+
+        Returns:
+            True if the job was still active
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        if job.status == "running" and job._on_cancel:
+            try:
+                job._winding_down = job._on_cancel() is True
+            except Exception as e:
+                logger.warning(f"Cancel hook failed for {job_id}: {e}")
+        job._cancel.set()
+        return True
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker pool (queued jobs are dropped)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        return self._executor
+
+    def _run(self, job: Job, work: Callable[[Job], Any], persist: bool) -> None:
+        if job.cancel_requested:
+            self._complete(job, "cancelled", message="Cancelled before start")
+            return
+
+        job.status = "running"
+        job.started_at = datetime.now().isoformat()
+        job.message = "Running"
+        if persist:
+            self._persist(job, "running", job.message)
+        logger.info(f"Job started: {job.job_id}")
+
+        try:
+            result = work(job)
+            if inspect.isgenerator(result):
+                try:
+                    for event in result:
+                        job.emit(event)
+                        # Work whose cancel hook accepted the stop winds down itself
+                        if not job._winding_down:
+                            job.check_cancelled()
+                finally:
+                    result.close()
+                result = job._events[-1] if job._events else None
+        except JobCancelled:
+            self._complete(job, "cancelled", message="Cancelled by user")
+        except Exception as e:
+            logger.error(f"Job failed: {job.job_id}: {e}", exc_info=True)
+            self._complete(job, "failed", error=str(e), message=f"Failed: {e}")
+        else:
+            if job.cancel_requested:
+                self._complete(job, "cancelled", result=result, message="Cancelled by user")
+            else:
+                message = job.message if job.message != "Running" else "Completed"
+                self._complete(job, "completed", persist=persist, result=result, message=message, progress=1.0)
+        finally:
+            self._last_persist.pop(job.job_id, None)
+
+    def _complete(self, job: Job, status: str, persist: bool = True, **fields: Any) -> None:
+        """Persist the final state, then release followers."""
+        if persist:
+            self._persist(job, status, fields.get("message", job.message), fields.get("progress", job.progress))
+        job._finish(status, **fields)
+        logger.info(f"Job {status}: {job.job_id}")
+
+    def _persist_progress(self, job: Job) -> None:
+        now = time.monotonic()
+        if now - self._last_persist.get(job.job_id, 0.0) < self.PERSIST_INTERVAL:
+            return
+        self._last_persist[job.job_id] = now
+        self._persist(job, "running", job.message)
+
+    def _persist(self, job: Job, status: str, message: str, progress: Optional[float] = None) -> None:
+        try:
+            self.job_store.set_status(
+                job.project_path,
+                job.job_type,
+                status,
+                message=message,
+                progress=progress if progress is not None else job.progress,
+                metadata={"job_id": job.job_id, "label": job.label},
+            )
+        except Exception as e:
+            logger.warning(f"Could not persist status of {job.job_id}: {e}")
+
+    def _find_active_locked(self, job_type: str, project_path: Optional[str]) -> Optional[Job]:
+        for job in reversed(list(self._jobs.values())):
+            if (job.job_type == job_type and job.status in ACTIVE_STATES
+                    and (project_path is None or job.project_path == project_path)):
+                return job
+        return None
+
+    def _prune_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+__all__ = ["Job", "JobRunner", "JobCancelled", "ACTIVE_STATES", "FINISHED_STATES"]
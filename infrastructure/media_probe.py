@@ -0,0 +1,272 @@
+"""Shared ffprobe wrapper with a persistent metadata cache.
+
+All services that need media metadata (duration, codecs, fps, frame count,
+sample rate) go through :class:`MediaProbe`. Each file is probed with a single
+``ffprobe -show_format -show_streams -of json`` call and the parsed result is
+cached in memory and on disk, keyed by (path, size, mtime). A changed file
+gets a new key and is probed again automatically.
+"""
+import json
+import os
+import shutil
+import subprocess
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cindergrace" / "cache" / "media_probe.json"
+
+
+def find_ffmpeg() -> str:
+    """Find ffmpeg executable."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg:
+        return ffmpeg
+    # Common locations
+    for path in ["/usr/bin/ffmpeg", "/usr/local/bin/ffmpeg"]:
+        if os.path.isfile(path):
+            return path
+    return "ffmpeg"  # Hope it's in PATH
+
+
+def find_ffprobe(ffmpeg_path: Optional[str] = None) -> str:
+    """Derive the ffprobe executable from the ffmpeg location."""
+    return (ffmpeg_path or find_ffmpeg()).replace("ffmpeg", "ffprobe")
+
+
+def _parse_rate(value: Optional[str]) -> Optional[float]:
+    """Parse an ffprobe rational like '16/1' into a float."""
+    if not value:
+        return None
+    try:
+        if "/" in value:
+            num, den = value.split("/", 1)
+            den_f = float(den)
+            return float(num) / den_f if den_f else None
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class MediaInfo:
+    """Parsed ffprobe metadata for a media file."""
+    path: str
+    duration: float  # seconds
+    format_name: str = ""
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    frame_count: Optional[int] = None
+    pix_fmt: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+
+    @property
+    def has_video(self) -> bool:
+        return self.video_codec is not None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio_codec is not None
+
+    @classmethod
+    def from_ffprobe(cls, path: str, payload: Dict[str, Any]) -> "MediaInfo":
+        """Build MediaInfo from ``ffprobe -show_format -show_streams`` JSON."""
+        fmt = payload.get("format") or {}
+        streams = payload.get("streams") or []
+        video = next((s for s in streams if s.get("codec_type") == "video"), None)
+        audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+        duration = _to_float(fmt.get("duration"))
+        if duration is None:
+            stream_durations = [_to_float(s.get("duration")) for s in streams]
+            duration = max((d for d in stream_durations if d is not None), default=0.0)
+
+        info = cls(path=path, duration=duration, format_name=fmt.get("format_name", ""))
+
+        if video:
+            info.video_codec = video.get("codec_name")
+            info.width = _to_int(video.get("width"))
+            info.height = _to_int(video.get("height"))
+            info.fps = _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate"))
+            info.frame_count = _to_int(video.get("nb_frames"))
+            info.pix_fmt = video.get("pix_fmt")
+            if info.frame_count is None and info.fps and duration:
+                info.frame_count = int(round(duration * info.fps))
+
+        if audio:
+            info.audio_codec = audio.get("codec_name")
+            info.sample_rate = _to_int(audio.get("sample_rate"))
+            info.channels = _to_int(audio.get("channels"))
+
+        return info
+
+
+class MediaProbe:
+    """Run ffprobe once per file version and cache the parsed result."""
+
+    TIMEOUT = 30
+    MAX_ENTRIES = 5000
+
+    def __init__(self, ffprobe_path: Optional[str] = None, cache_path: Optional[Path] = None):
+        self._ffprobe_path = ffprobe_path or find_ffprobe()
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None  # Loaded lazily
+
+    def probe(self, path: str) -> Optional[MediaInfo]:
+        """Return metadata for a media file, probing only on cache miss.
+
+        Args:
+            path: Path to the audio/video file
+
+        Returns:
+            MediaInfo or None if ffprobe failed
+        """
+        key, stamp = self._cache_key(path)
+        if key is not None:
+            cached = self._lookup(key, stamp)
+            if cached is not None:
+                return cached
+
+        payload = self._run_ffprobe(path)
+        if payload is None:
+            return None
+
+        info = MediaInfo.from_ffprobe(path, payload)
+        if key is not None:
+            self._store(key, stamp, info)
+        return info
+
+    def get_duration(self, path: str) -> Optional[float]:
+        """Return media duration in seconds, or None if probing failed."""
+        info = self.probe(path)
+        return info.duration if info else None
+
+    def invalidate(self, path: str) -> None:
+        """Drop the cache entry for a path (e.g. after overwriting it)."""
+        key = os.path.abspath(path)
+        with self._lock:
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._save(entries)
+
+    def clear(self) -> None:
+        """Drop all cached entries (memory and disk)."""
+        with self._lock:
+            self._entries = {}
+            self._save(self._entries)
+
+    def _cache_key(self, path: str) -> Tuple[Optional[str], Tuple[int, int]]:
+        """Return (absolute path, (size, mtime_ns)) or (None, ...) if not stat-able."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None, (0, 0)
+        return os.path.abspath(path), (st.st_size, st.st_mtime_ns)
+
+    def _lookup(self, key: str, stamp: Tuple[int, int]) -> Optional[MediaInfo]:
+        with self._lock:
+            entry = self._load().get(key)
+        if not entry or (entry.get("size"), entry.get("mtime_ns")) != stamp:
+            return None
+        if entry.get("info", {}).get("video_codec") and "pix_fmt" not in entry["info"]:
+            return None  # Cached before pix_fmt was recorded
+        try:
+            return MediaInfo(**entry["info"])
+        except (KeyError, TypeError):
+            return None
+
+    def _store(self, key: str, stamp: Tuple[int, int], info: MediaInfo) -> None:
+        with self._lock:
+            entries = self._load()
+            entries.pop(key, None)  # Re-insert so the newest entries survive trimming
+            entries[key] = {"size": stamp[0], "mtime_ns": stamp[1], "info": asdict(info)}
+            while len(entries) > self.MAX_ENTRIES:
+                entries.pop(next(iter(entries)))
+            self._save(entries)
+
+    def _run_ffprobe(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            result = subprocess.run(
+                [
+                    self._ffprobe_path,
+                    "-v", "error",
+                    "-show_format",
+                    "-show_streams",
+                    "-of", "json",
+                    path
+                ],
+                capture_output=True,
+                text=True,
+                timeout=self.TIMEOUT
+            )
+            if result.returncode != 0:
+                logger.error(f"ffprobe failed for {path}: {result.stderr}")
+                return None
+            return json.loads(result.stdout)
+        except subprocess.TimeoutExpired:
+            logger.error(f"ffprobe timed out: {path}")
+        except Exception as e:
+            logger.error(f"ffprobe failed for {path}: {e}")
+        return None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load disk cache on first access (caller holds the lock)."""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                if self.cache_path.exists():
+                    data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+                    if isinstance(data, dict):
+                        self._entries = data
+            except Exception as e:
+                logger.warning(f"Media probe cache unreadable, starting fresh: {e}")
+        return self._entries
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Write cache atomically (caller holds the lock)."""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(entries), encoding="utf-8")
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Could not persist media probe cache: {e}")
+
+
+# Singleton instance
+_media_probe: Optional[MediaProbe] = None
+
+
+def get_media_probe() -> MediaProbe:
+    """Get the global MediaProbe instance."""
+    global _media_probe
+    if _media_probe is None:
+        _media_probe = MediaProbe()
+    return _media_probe
+
+
+__all__ = ["MediaInfo", "MediaProbe", "get_media_probe", "find_ffmpeg", "find_ffprobe"]
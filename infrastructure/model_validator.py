@@ -1,5 +1,6 @@
 """Utility to validate required model files referenced in a workflow"""
 import os
+import threading
 from typing import Dict, Any, List, Set, Optional
 
 
@@ -13,6 +14,8 @@ class ModelValidator:
         self.comfy_root = comfy_root
         self.enabled = bool(comfy_root and os.path.exists(comfy_root))
         self._index = None  # type: Optional[Dict[str, List[str]]]
+        # Serializes index builds (background warm-up vs. first validation)
+        self._index_lock = threading.Lock()
 
     def _build_index(self):
         if not self.enabled:
@@ -35,7 +38,14 @@ class ModelValidator:
 
     def _ensure_index(self):
         if self._index is None:
-            self._build_index()
+            with self._index_lock:
+                if self._index is None:
+                    self._build_index()
+
+    def ensure_index(self) -> int:
+        """Build the model index if not built yet. Returns number of models found."""
+        self._ensure_index()
+        return len(self._index) if self._index else 0
 
     def _extract_model_refs(self, workflow: Dict[str, Any]) -> Set[str]:
         refs: Set[str] = set()
@@ -82,9 +92,10 @@ class ModelValidator:
 
     def rebuild_index(self) -> int:
         """Rebuild the model index from scratch. Returns number of models found."""
-        self._index = None
-        self._build_index()
-        return len(self._index) if self._index else 0
+        with self._index_lock:
+            self._index = None
+            self._build_index()
+            return len(self._index) if self._index else 0
 
 
 __all__ = ["ModelValidator"]
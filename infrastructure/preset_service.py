@@ -1,7 +1,15 @@
-"""Preset management service for prompt building."""
+"""Preset management service for prompt building.
+
+All active presets are loaded with one query into an immutable in-memory
+snapshot on first use; dropdown choices and prompt lookups are served from
+it. add_preset() drops the snapshot so the next lookup reloads.
+"""
 import sqlite3
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
 from infrastructure.logger import get_logger
 
@@ -14,6 +22,15 @@ def get_preset_db_path() -> str:
     return str(base_dir / "data" / "presets.db")
 
 
+@dataclass(frozen=True)
+class _PresetSnapshot:
+    """Active presets in (category, sort_order, name_de) order."""
+
+    by_category: Mapping[str, Tuple[Mapping[str, str], ...]]
+    by_phase: Mapping[str, Tuple[Mapping[str, str], ...]]
+    prompts: Mapping[Tuple[str, str], str]  # (category, key) -> prompt_text
+
+
 class PresetService:
     """Manage prompt presets for different generation phases."""
 
@@ -34,6 +51,8 @@ class PresetService:
 
     def __init__(self, db_path: Optional[str] = None, auto_seed: bool = True):
         self.db_path = db_path or get_preset_db_path()
+        self._snapshot: Optional[_PresetSnapshot] = None
+        self._lock = threading.Lock()
         self._ensure_db()
         # Auto-seed default presets if database is empty
         if auto_seed and self.get_preset_count() == 0:
@@ -95,56 +114,80 @@ class PresetService:
         conn.row_factory = sqlite3.Row
         return conn
 
-    def get_presets_by_category(self, category: str) -> List[Dict]:
-        """Get all active presets for a category."""
+    def _get_snapshot(self) -> _PresetSnapshot:
+        """Return the in-memory presets, loading them on first use."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._snapshot = self._load_snapshot()
+        return snapshot
+
+    def _load_snapshot(self) -> _PresetSnapshot:
+        """Load all active presets with a single query."""
         conn = self._get_conn()
-        cursor = conn.cursor()
+        try:
+            rows = conn.execute("""
+                SELECT category, key, name_de, name_en, prompt_text, phase
+                FROM prompt_presets
+                WHERE is_active = 1
+                ORDER BY category, sort_order, name_de
+            """).fetchall()
+        finally:
+            conn.close()
 
-        cursor.execute("""
-            SELECT key, name_de, name_en, prompt_text, phase
-            FROM prompt_presets
-            WHERE category = ? AND is_active = 1
-            ORDER BY sort_order, name_de
-        """, (category,))
-
-        presets = []
-        for row in cursor.fetchall():
-            presets.append({
+        by_category: Dict[str, list] = {}
+        by_phase: Dict[str, list] = {}
+        prompts: Dict[Tuple[str, str], str] = {}
+        for row in rows:
+            preset = MappingProxyType({
+                "category": row["category"],
                 "key": row["key"],
                 "name_de": row["name_de"],
                 "name_en": row["name_en"],
                 "prompt_text": row["prompt_text"],
                 "phase": row["phase"],
             })
+            by_category.setdefault(row["category"], []).append(preset)
+            by_phase.setdefault(row["phase"], []).append(preset)
+            prompts[(row["category"], row["key"])] = row["prompt_text"]
+
+        logger.debug(f"{len(rows)} Presets geladen")
+        return _PresetSnapshot(
+            by_category=MappingProxyType({k: tuple(v) for k, v in by_category.items()}),
+            by_phase=MappingProxyType({k: tuple(v) for k, v in by_phase.items()}),
+            prompts=MappingProxyType(prompts),
+        )
+
+    def reload(self) -> None:
+        """Drop the in-memory presets (next lookup reads the database)."""
+        with self._lock:
+            self._snapshot = None
 
-        conn.close()
-        return presets
+    def get_presets_by_category(self, category: str) -> List[Dict]:
+        """Get all active presets for a category."""
+        return [
+            {
+                "key": preset["key"],
+                "name_de": preset["name_de"],
+                "name_en": preset["name_en"],
+                "prompt_text": preset["prompt_text"],
+                "phase": preset["phase"],
+            }
+            for preset in self._get_snapshot().by_category.get(category, ())
+        ]
 
     def get_presets_by_phase(self, phase: str) -> Dict[str, List[Dict]]:
         """Get all presets for a phase, grouped by category."""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT category, key, name_de, name_en, prompt_text
-            FROM prompt_presets
-            WHERE phase = ? AND is_active = 1
-            ORDER BY category, sort_order, name_de
-        """, (phase,))
-
         result = {}
-        for row in cursor.fetchall():
-            category = row["category"]
-            if category not in result:
-                result[category] = []
-            result[category].append({
-                "key": row["key"],
-                "name_de": row["name_de"],
-                "name_en": row["name_en"],
-                "prompt_text": row["prompt_text"],
+        for preset in self._get_snapshot().by_phase.get(phase, ()):
+            result.setdefault(preset["category"], []).append({
+                "key": preset["key"],
+                "name_de": preset["name_de"],
+                "name_en": preset["name_en"],
+                "prompt_text": preset["prompt_text"],
             })
-
-        conn.close()
         return result
 
     def get_dropdown_choices(self, category: str, include_none: bool = True) -> List[tuple]:
@@ -165,19 +208,7 @@ class PresetService:
         if not key or key == "none":
             return None
 
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT prompt_text
-            FROM prompt_presets
-            WHERE category = ? AND key = ? AND is_active = 1
-        """, (category, key))
-
-        row = cursor.fetchone()
-        conn.close()
-
-        return row["prompt_text"] if row else None
+        return self._get_snapshot().prompts.get((category, key))
 
     def build_prompt(
         self,
@@ -237,6 +268,7 @@ class PresetService:
 
             conn.commit()
             conn.close()
+            self.reload()
             return True
         except Exception as e:
             logger.error(f"Failed to add preset: {e}")
@@ -344,12 +376,7 @@ class PresetService:
 
     def get_preset_count(self) -> int:
         """Get total number of presets in database."""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM prompt_presets WHERE is_active = 1")
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count
+        return len(self._get_snapshot().prompts)
 
 
 __all__ = ["PresetService", "get_preset_db_path"]
@@ -0,0 +1,121 @@
+"""Service Container - process-wide shared infrastructure objects and services.
+
+Addons and services ask the container for their collaborators instead of
+constructing their own, so a single ``ConfigManager``, ``ProjectStore``,
+``WorkflowRegistry``, ``JobStatusStore``, the background ``JobRunner`` and
+heavy services such as the character LoRA scanner exist per process and
+their caches are hit across tabs.
+
+Instances are keyed by factory and constructor arguments::
+
+    services = get_service_container()
+    config = services.get(ConfigManager)
+    store = services.get(ProjectStore, config)   # same store for the same config
+
+Keying by factory keeps call sites patchable: a test that replaces a module's
+``ConfigManager`` with a stub gets an instance of the stub.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from infrastructure.config_manager import ConfigManager
+from infrastructure.job_runner import JobRunner
+from infrastructure.job_status_store import JobStatusStore
+from infrastructure.logger import get_logger
+from infrastructure.project_store import ProjectStore
+from infrastructure.workflow_registry import WorkflowRegistry
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class ServiceContainer:
+    """Owns one instance per (factory, args) for the lifetime of the process."""
+
+    def __init__(self):
+        self._instances: Dict[Tuple[Callable, Tuple[Hashable, ...]], Any] = {}
+        # Reentrant: factories may resolve their own dependencies via the container
+        self._lock = threading.RLock()
+
+    def get(self, factory: Callable[..., T], *args: Hashable) -> T:
+        """
+        Return the shared instance for factory/args, creating it on first use
+
+        Args:
+            factory: Class or callable that builds the instance
+            *args: Hashable constructor arguments (part of the key)
+
+        Returns:
+            The shared instance
+        """
+        key = (factory, args)
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                instance = factory(*args)
+                self._instances[key] = instance
+                logger.debug(f"Service created: {getattr(factory, '__name__', factory)}{args or ''}")
+            return instance
+
+    def register(self, factory: Callable[..., T], instance: T, *args: Hashable) -> T:
+        """Use an existing instance for factory/args (e.g. a preconfigured object)."""
+        with self._lock:
+            self._instances[(factory, args)] = instance
+        return instance
+
+    def clear(self) -> None:
+        """Drop all instances (next get() creates fresh ones)."""
+        with self._lock:
+            self._instances.clear()
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    @property
+    def config(self) -> ConfigManager:
+        return self.get(ConfigManager)
+
+    @property
+    def project_store(self) -> ProjectStore:
+        return self.get(ProjectStore, self.config)
+
+    @property
+    def workflow_registry(self) -> WorkflowRegistry:
+        return self.get(WorkflowRegistry)
+
+    @property
+    def job_store(self) -> JobStatusStore:
+        return self.get(JobStatusStore)
+
+    @property
+    def job_runner(self) -> JobRunner:
+        return self.get(JobRunner, JobRunner.DEFAULT_MAX_WORKERS, self.job_store)
+
+
+# Singleton instance
+_service_container: Optional[ServiceContainer] = None
+_service_container_lock = threading.Lock()
+
+
+def get_service_container() -> ServiceContainer:
+    """Get the global ServiceContainer instance."""
+    global _service_container
+    if _service_container is None:
+        with _service_container_lock:
+            if _service_container is None:
+                _service_container = ServiceContainer()
+    return _service_container
+
+
+def reset_service_container() -> None:
+    """Discard the global container (tests, settings reload)."""
+    global _service_container
+    with _service_container_lock:
+        _service_container = None
+
+
+__all__ = ["ServiceContainer", "get_service_container", "reset_service_container"]
@@ -0,0 +1,101 @@
+"""Startup profiling - per-addon import, construct, render and warm-up cost.
+
+``load_addons`` and ``create_gui`` record each phase in a
+:class:`StartupProfile`; ``main`` logs the report and writes it to
+``logs/startup_profile.json`` so slow cold starts can be attributed.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+PHASES = ("import", "construct", "render", "warm_up")
+
+DEFAULT_PROFILE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "startup_profile.json"
+)
+
+
+class StartupProfile:
+    """Collects wall-clock seconds per (name, phase)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, name: str, phase: str) -> Iterator[None]:
+        """Time a block and add it to ``name``/``phase``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, phase, time.perf_counter() - start)
+
+    def record(self, name: str, phase: str, seconds: float) -> None:
+        with self._lock:
+            phases = self._timings.setdefault(name, {})
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """Copy of the recorded timings."""
+        with self._lock:
+            return {name: dict(phases) for name, phases in self._timings.items()}
+
+    def elapsed(self) -> float:
+        """Seconds since the profile was created."""
+        return time.perf_counter() - self.started
+
+    def report(self, top: Optional[int] = None) -> str:
+        """
+        Plain-text table sorted by blocking cost (import + construct + render)
+
+        Args:
+            top: Only list the slowest N entries
+        """
+        timings = self.timings()
+        rows = sorted(
+            timings.items(),
+            key=lambda item: -sum(item[1].get(p, 0.0) for p in PHASES if p != "warm_up"),
+        )
+        if top:
+            rows = rows[:top]
+
+        lines = [f"{'Addon':<28}" + "".join(f"{phase:>11}" for phase in PHASES)]
+        for name, phases in rows:
+            lines.append(
+                f"{name[:28]:<28}"
+                + "".join(f"{phases[p]:>10.2f}s" if p in phases else f"{'-':>11}" for p in PHASES)
+            )
+        totals = {p: sum(ph.get(p, 0.0) for ph in timings.values()) for p in PHASES}
+        lines.append(f"{'Total':<28}" + "".join(f"{totals[p]:>10.2f}s" for p in PHASES))
+        lines.append(f"Startup elapsed: {self.elapsed():.2f}s (warm-up runs in background)")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict:
+        return {"elapsed": round(self.elapsed(), 4), "addons": self.timings()}
+
+    def save(self, path: str = DEFAULT_PROFILE_PATH) -> None:
+        """Write the profile as JSON (best effort)."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write startup profile: {e}")
+
+    def log_report(self, top: Optional[int] = 10) -> None:
+        for line in self.report(top).splitlines():
+            logger.info(line)
+
+
+__all__ = ["StartupProfile", "PHASES", "DEFAULT_PROFILE_PATH"]
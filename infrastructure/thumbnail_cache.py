@@ -0,0 +1,242 @@
+"""Thumbnail and proxy cache for image/video galleries.
+
+Galleries show downscaled WebP thumbnails instead of full-resolution
+keyframes; videos get a WebP poster frame (thumbnail) or a low-res H.264
+proxy. Derived files live under ``~/.cindergrace/cache/thumbnails`` and are
+named after a hash of (path, size, mtime_ns, variant), so a changed source
+gets a new entry automatically. Missing thumbnails are rendered in a
+background process pool (workers only import the lightweight
+:mod:`infrastructure.thumbnail_worker`); anything that cannot be rendered
+falls back to the original file, so callers can always use the returned path.
+"""
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from infrastructure.logger import get_logger
+from infrastructure.media_probe import find_ffmpeg
+from infrastructure.thumbnail_worker import render_image_thumbnail, render_video_poster, render_video_proxy
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cindergrace" / "cache" / "thumbnails"
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif")
+VIDEO_EXTENSIONS = (".mp4", ".webm", ".mov", ".mkv", ".avi")
+
+
+class ThumbnailCache:
+    """Disk cache of gallery thumbnails, video poster frames and proxies."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_size: int = 384,
+        quality: int = 80,
+        proxy_height: int = 360,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            cache_dir: Cache directory (default: ~/.cindergrace/cache/thumbnails)
+            max_size: Longest thumbnail edge in pixels
+            quality: WebP quality (0-100)
+            proxy_height: Height of video proxies in pixels
+            max_workers: Render processes (default: half the CPUs, at least 1;
+                0 renders inline in the calling thread)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_size = max_size
+        self.quality = quality
+        self.proxy_height = proxy_height
+        self.max_workers = max_workers if max_workers is not None else max(1, (os.cpu_count() or 2) // 2)
+        self._ffmpeg: Optional[str] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}  # In-flight renders by destination
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def thumbnail(self, path: str) -> str:
+        """Thumbnail (image) or poster frame (video) for one file, or the original."""
+        return self.thumbnails([path])[0]
+
+    def thumbnails(self, paths: Sequence[str]) -> List[str]:
+        """
+        Thumbnails for many files, rendering missing ones in parallel
+
+        Returns:
+            One path per input: the cached thumbnail, or the original file
+            if it is not a supported media file or could not be rendered
+        """
+        futures = {i: self._submit_thumbnail(path) for i, path in enumerate(paths)}
+        pending = [f for f in futures.values() if isinstance(f, Future)]
+        if pending:
+            wait(pending)
+
+        results = []
+        for i, path in enumerate(paths):
+            outcome = futures[i]
+            if isinstance(outcome, Future):
+                outcome = self._result(outcome, path)
+            results.append(outcome or path)
+        return results
+
+    def prefetch(self, paths: Iterable[str]) -> int:
+        """
+        Queue thumbnails in the background without waiting
+
+        Returns:
+            Number of renders queued
+        """
+        return sum(isinstance(self._submit_thumbnail(path), Future) for path in paths)
+
+    def gallery(self, items: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Map gallery (path, caption) items to (thumbnail, caption)."""
+        items = list(items)
+        thumbs = self.thumbnails([path for path, _ in items])
+        return [(thumb, caption) for thumb, (_, caption) in zip(thumbs, items)]
+
+    def proxy(self, path: str, wait_for: bool = True) -> Optional[str]:
+        """
+        Low-res H.264 proxy of a video
+
+        Args:
+            path: Video file
+            wait_for: Block until the proxy exists; otherwise only queue it
+
+        Returns:
+            Proxy path, or None if not available (yet)
+        """
+        if not path.lower().endswith(VIDEO_EXTENSIONS):
+            return None
+        key = self._cache_path(path, "proxy", f"h{self.proxy_height}", ".mp4")
+        if key is None:
+            return None
+        if os.path.exists(key):
+            return key
+        future = self._submit(key, render_video_proxy, self._get_ffmpeg(), path, key, self.proxy_height)
+        if not wait_for:
+            return None
+        return self._result(future, path)
+
+    def shutdown(self) -> None:
+        """Stop the render pool (queued renders are cancelled)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _submit_thumbnail(self, path: str):
+        """Return a cached thumbnail path, a Future for a render, or None."""
+        lower = path.lower()
+        if lower.endswith(IMAGE_EXTENSIONS):
+            dst = self._cache_path(path, "thumb", f"s{self.max_size}q{self.quality}", ".webp")
+            if dst is None or os.path.exists(dst):
+                return dst
+            return self._submit(dst, render_image_thumbnail, path, dst, self.max_size, self.quality)
+        if lower.endswith(VIDEO_EXTENSIONS):
+            dst = self._cache_path(path, "poster", f"s{self.max_size}q{self.quality}", ".webp")
+            if dst is None or os.path.exists(dst):
+                return dst
+            return self._submit(dst, render_video_poster, self._get_ffmpeg(), path, dst, self.max_size, self.quality)
+        return None
+
+    def _cache_path(self, path: str, kind: str, variant: str, suffix: str) -> Optional[str]:
+        """Cache file for path; None if the source does not exist."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{variant}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return str(self.cache_dir / kind / digest[:2] / f"{digest}{suffix}")
+
+    def _submit(self, dst: str, fn, *args) -> Future:
+        """Render dst once; concurrent requests share the Future."""
+        with self._lock:
+            future = self._pending.get(dst)
+            if future is not None:
+                return future
+            executor = self._get_executor()
+            if executor is not None:
+                try:
+                    future = executor.submit(fn, *args)
+                    self._pending[dst] = future
+                except (BrokenProcessPool, RuntimeError) as e:
+                    # Pool died (worker crash) or is shutting down: start a new one next time
+                    logger.warning(f"Thumbnail pool unavailable, rendering inline: {e}")
+                    self._executor = None
+        if future is not None:
+            future.add_done_callback(lambda _f, dst=dst: self._forget(dst))
+            return future
+
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _forget(self, dst: str) -> None:
+        with self._lock:
+            self._pending.pop(dst, None)
+
+    def _result(self, future: Future, path: str) -> Optional[str]:
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning(f"Thumbnail failed for {os.path.basename(path)}: {e}")
+            return None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Lazily start the render pool (falls back to in-process rendering)."""
+        if self._executor is None and self.max_workers:
+            try:
+                # spawn: the GUI process runs many threads, forking it is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Thumbnail process pool unavailable, rendering inline: {e}")
+                self.max_workers = 0
+        return self._executor if self.max_workers else None
+
+    def _get_ffmpeg(self) -> str:
+        if self._ffmpeg is None:
+            self._ffmpeg = find_ffmpeg()
+        return self._ffmpeg
+
+
+# Singleton instance
+_thumbnail_cache: Optional[ThumbnailCache] = None
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Get the global ThumbnailCache instance."""
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        _thumbnail_cache = ThumbnailCache()
+    return _thumbnail_cache
+
+
+__all__ = [
+    "ThumbnailCache",
+    "get_thumbnail_cache",
+    "DEFAULT_CACHE_DIR",
+    "IMAGE_EXTENSIONS",
+    "VIDEO_EXTENSIONS",
+]
@@ -0,0 +1,72 @@
+"""Render functions run by the thumbnail process pool.
+
+Imports nothing but the stdlib and Pillow (lazily): spawned pool workers
+import this module to unpickle each task, so it has to stay light.
+"""
+import io
+import os
+import subprocess
+
+
+def _save_webp(image, dst: str, max_size: int, quality: int) -> str:
+    """Downscale a PIL image and write it atomically as WebP."""
+    from PIL import Image, ImageOps
+
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    image.save(tmp, "WEBP", quality=quality, method=4)
+    os.replace(tmp, dst)
+    return dst
+
+
+def render_image_thumbnail(src: str, dst: str, max_size: int, quality: int) -> str:
+    """Worker: write a WebP thumbnail of an image (runs in the process pool)."""
+    from PIL import Image
+
+    with Image.open(src) as image:
+        # JPEG decoders can downscale while decoding
+        image.draft("RGB", (max_size, max_size))
+        return _save_webp(image, dst, max_size, quality)
+
+
+def render_video_poster(ffmpeg: str, src: str, dst: str, max_size: int, quality: int) -> str:
+    """Worker: write a WebP poster frame of a video (representative frame)."""
+    from PIL import Image
+
+    result = subprocess.run(
+        [
+            ffmpeg, "-v", "error", "-i", src,
+            "-vf", f"thumbnail=50,scale='min({max_size},iw)':-2",
+            "-frames:v", "1", "-f", "image2pipe", "-vcodec", "png", "-",
+        ],
+        capture_output=True, timeout=120,
+    )
+    if result.returncode != 0 or not result.stdout:
+        raise RuntimeError(result.stderr.decode(errors="replace").strip() or "no frame decoded")
+    with Image.open(io.BytesIO(result.stdout)) as image:
+        return _save_webp(image, dst, max_size, quality)
+
+
+def render_video_proxy(ffmpeg: str, src: str, dst: str, height: int) -> str:
+    """Worker: transcode a low-res H.264 proxy for smooth browser playback."""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.tmp.mp4"
+    result = subprocess.run(
+        [
+            ffmpeg, "-y", "-v", "error", "-i", src,
+            "-vf", f"scale=-2:'min({height},ih)'",
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", "28", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-b:a", "96k", "-movflags", "+faststart", tmp,
+        ],
+        capture_output=True, timeout=1800,
+    )
+    if result.returncode != 0:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise RuntimeError(result.stderr.decode(errors="replace").strip() or "transcode failed")
+    os.replace(tmp, dst)
+    return dst
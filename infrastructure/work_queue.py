@@ -0,0 +1,385 @@
+"""Durable work queue in SQLite - shared by distributed generation workers.
+
+Several worker processes (on one machine or on GPU boxes sharing a
+filesystem) pull tasks from one queue file. Every claim is a lease: the worker
+renews it with :meth:`WorkQueue.heartbeat` while rendering, and a lease that
+runs out (worker crashed, box rebooted) is put back to ``pending`` by the next
+``claim`` of any worker. Tasks can depend on one other task (``depends_on``);
+they are only handed out once the dependency is ``done`` and receive its
+result, which keeps chained video segments in order.
+
+Task states: ``pending`` -> ``leased`` -> ``done`` / ``failed``. A failed task
+is retried until ``max_attempts`` is reached; a finally failed task also fails
+the tasks that depend on it.
+
+Notes:
+    - All state changes run in ``BEGIN IMMEDIATE`` transactions, so two
+      workers never lease the same task.
+    - The database keeps SQLite's default rollback journal (WAL needs shared
+      memory and does not work on network filesystems); the filesystem must
+      support POSIX locks.
+    - Lease expiry uses wall-clock time, so clocks of the worker boxes should
+      be NTP-synced.
+"""
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+TASK_STATES = ("pending", "leased", "done", "failed")
+
+
+def default_queue_path() -> str:
+    """Return path to data/work_queue.db (next to cindergrace.db)."""
+    db_dir = Path(__file__).parent.parent / "data"
+    db_dir.mkdir(parents=True, exist_ok=True)
+    return str(db_dir / "work_queue.db")
+
+
+@dataclass
+class Task:
+    """A queued unit of work."""
+    task_id: int
+    kind: str
+    payload: Dict[str, Any]
+    batch: str = ""
+    depends_on: Optional[int] = None
+    status: str = "pending"
+    attempts: int = 0
+    max_attempts: int = 3
+    worker_id: Optional[str] = None
+    lease_expires: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    dependency_result: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Task":
+        keys = row.keys()
+        return cls(
+            task_id=row["id"],
+            kind=row["kind"],
+            payload=json.loads(row["payload"]),
+            batch=row["batch"],
+            depends_on=row["depends_on"],
+            status=row["status"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            worker_id=row["worker_id"],
+            lease_expires=row["lease_expires"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            dependency_result=(
+                json.loads(row["dependency_result"])
+                if "dependency_result" in keys and row["dependency_result"] else None
+            ),
+        )
+
+
+class WorkQueue:
+    """Lease-based task queue stored in a SQLite file."""
+
+    DEFAULT_MAX_ATTEMPTS = 3
+    # Seconds a connection waits for another process' write lock
+    BUSY_TIMEOUT = 30.0
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: Queue database (default: data/work_queue.db); all workers
+                and the dispatching process must use the same file
+        """
+        self.db_path = db_path or default_queue_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._ensure_table()
+
+    @staticmethod
+    def new_batch_id(prefix: str = "batch") -> str:
+        return f"{prefix}-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        *,
+        batch: str = "",
+        depends_on: Optional[int] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> int:
+        """
+        Add a task
+
+        Args:
+            kind: Task type, selects the worker handler (e.g. "keyframe_variant")
+            payload: JSON-serialisable task parameters
+            batch: Groups the tasks of one dispatch (for stats/waiting)
+            depends_on: Task that has to be done first; its result is passed on
+            max_attempts: Claims before the task counts as failed
+
+        Returns:
+            The task id
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO tasks (batch, kind, payload, depends_on, max_attempts, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (batch, kind, json.dumps(payload), depends_on, max(1, int(max_attempts)), now, now),
+            )
+            return cursor.lastrowid
+
+    def claim(
+        self,
+        worker_id: str,
+        kinds: Optional[Sequence[str]] = None,
+        lease_seconds: float = 120.0
+    ) -> Optional[Task]:
+        """
+        Lease the oldest runnable task
+
+        Expired leases are re-queued first. A task is runnable when it is
+        pending and has no dependency or a done one.
+
+        Args:
+            worker_id: Lease owner
+            kinds: Only claim these task types (default: all)
+            lease_seconds: Lease duration; renew with heartbeat()
+
+        Returns:
+            The leased Task (attempts already counted) or None
+        """
+        now = time.time()
+        query = """
+            SELECT t.*, d.result AS dependency_result
+            FROM tasks t LEFT JOIN tasks d ON d.id = t.depends_on
+            WHERE t.status = 'pending' AND (t.depends_on IS NULL OR d.status = 'done')
+        """
+        params: List[Any] = []
+        if kinds:
+            query += f" AND t.kind IN ({','.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        query += " ORDER BY t.id LIMIT 1"
+
+        with self._transaction() as conn:
+            self._requeue_expired(conn, now)
+            row = conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                """
+                UPDATE tasks SET status = 'leased', worker_id = ?, lease_expires = ?,
+                    attempts = attempts + 1, updated_at = ?
+                WHERE id = ?
+                """,
+                (worker_id, now + lease_seconds, now, row["id"]),
+            )
+            task = Task.from_row(row)
+        task.status, task.worker_id, task.lease_expires = "leased", worker_id, now + lease_seconds
+        task.attempts += 1
+        logger.info(f"Task {task.task_id} ({task.kind}) leased by {worker_id}, attempt {task.attempts}")
+        return task
+
+    def heartbeat(self, task_id: int, worker_id: str, lease_seconds: float = 120.0) -> bool:
+        """Extend a lease; False if the worker no longer holds it."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE tasks SET lease_expires = ?, updated_at = ?
+                WHERE id = ? AND worker_id = ? AND status = 'leased'
+                """,
+                (now + lease_seconds, now, task_id, worker_id),
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, task_id: int, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Mark a leased task done; False if the lease was lost meanwhile."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE tasks SET status = 'done', result = ?, error = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND worker_id = ? AND status = 'leased'
+                """,
+                (json.dumps(result or {}), now, task_id, worker_id),
+            )
+            return cursor.rowcount > 0
+
+    def fail(self, task_id: int, worker_id: str, error: str, retry: bool = True) -> bool:
+        """
+        Report a failed attempt
+
+        The task goes back to pending while attempts remain (and retry is
+        True), otherwise it and its dependents fail.
+
+        Returns:
+            False if the lease was lost meanwhile
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM tasks WHERE id = ? AND worker_id = ? AND status = 'leased'",
+                (task_id, worker_id),
+            ).fetchone()
+            if row is None:
+                return False
+            if retry and row["attempts"] < row["max_attempts"]:
+                conn.execute(
+                    """
+                    UPDATE tasks SET status = 'pending', worker_id = NULL, lease_expires = NULL,
+                        error = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (error, now, task_id),
+                )
+                logger.warning(f"Task {task_id} attempt {row['attempts']} failed, re-queued: {error}")
+            else:
+                self._fail_with_dependents(conn, task_id, error, now)
+            return True
+
+    def release(self, task_id: int, worker_id: str) -> bool:
+        """Hand a leased task back without counting the attempt (worker shutdown)."""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE tasks SET status = 'pending', worker_id = NULL, lease_expires = NULL,
+                    attempts = MAX(attempts - 1, 0), updated_at = ?
+                WHERE id = ? AND worker_id = ? AND status = 'leased'
+                """,
+                (now, task_id, worker_id),
+            )
+            return cursor.rowcount > 0
+
+    def requeue_expired(self) -> int:
+        """Re-queue tasks whose lease ran out; returns the number of tasks."""
+        with self._transaction() as conn:
+            return self._requeue_expired(conn, time.time())
+
+    def get(self, task_id: int) -> Optional[Task]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return Task.from_row(row) if row else None
+
+    def tasks(self, batch: Optional[str] = None) -> List[Task]:
+        """Tasks in enqueue order, optionally of one batch."""
+        with closing(self._connect()) as conn:
+            if batch is None:
+                rows = conn.execute("SELECT * FROM tasks ORDER BY id").fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM tasks WHERE batch = ? ORDER BY id", (batch,)).fetchall()
+        return [Task.from_row(row) for row in rows]
+
+    def stats(self, batch: Optional[str] = None) -> Dict[str, int]:
+        """Number of tasks per state (all states present)."""
+        query = "SELECT status, COUNT(*) AS n FROM tasks"
+        params: List[Any] = []
+        if batch is not None:
+            query += " WHERE batch = ?"
+            params.append(batch)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + " GROUP BY status", params).fetchall()
+        counts = {state: 0 for state in TASK_STATES}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the database lock up front."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _ensure_table(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    batch TEXT NOT NULL DEFAULT '',
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    depends_on INTEGER REFERENCES tasks(id),
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL DEFAULT 3,
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL,
+                    updated_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_batch ON tasks (batch)")
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> int:
+        rows = conn.execute(
+            "SELECT id, worker_id, attempts, max_attempts FROM tasks WHERE status = 'leased' AND lease_expires < ?",
+            (now,),
+        ).fetchall()
+        for row in rows:
+            error = f"Lease of worker {row['worker_id']} expired"
+            if row["attempts"] >= row["max_attempts"]:
+                self._fail_with_dependents(conn, row["id"], f"{error} (attempt {row['attempts']})", now)
+                continue
+            conn.execute(
+                """
+                UPDATE tasks SET status = 'pending', worker_id = NULL, lease_expires = NULL,
+                    error = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (error, now, row["id"]),
+            )
+            logger.warning(f"Task {row['id']} re-queued: {error}")
+        return len(rows)
+
+    def _fail_with_dependents(self, conn: sqlite3.Connection, task_id: int, error: str, now: float) -> None:
+        conn.execute(
+            "UPDATE tasks SET status = 'failed', error = ?, lease_expires = NULL, updated_at = ? WHERE id = ?",
+            (error, now, task_id),
+        )
+        logger.error(f"Task {task_id} failed: {error}")
+        pending = [task_id]
+        while pending:
+            parent = pending.pop()
+            dependents = conn.execute(
+                "SELECT id FROM tasks WHERE depends_on = ? AND status = 'pending'", (parent,)
+            ).fetchall()
+            for row in dependents:
+                conn.execute(
+                    "UPDATE tasks SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                    (f"Dependency {parent} failed", now, row["id"]),
+                )
+                pending.append(row["id"])
+
+
+__all__ = ["WorkQueue", "Task", "TASK_STATES", "default_queue_path"]
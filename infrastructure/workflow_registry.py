@@ -3,7 +3,7 @@ import json
 import os
 from typing import Dict, List, Optional, Tuple
 
-from infrastructure.settings_store import SettingsStore
+from infrastructure.settings_store import get_settings_store
 from infrastructure.logger import get_logger
 
 logger = get_logger(__name__)
@@ -41,7 +41,7 @@ class WorkflowRegistry:
     ):
         self.config_path = config_path
         self.workflow_dir = workflow_dir
-        self.settings_store = SettingsStore()
+        self.settings_store = get_settings_store()
 
     # -----------------------------
     # Prefix-based discovery (new)
@@ -6,31 +6,45 @@ import logging
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-import gradio as gr
-from addons import load_addons
-from addons.components import create_log_panel
 from infrastructure.logger import get_logger, PipelineLogger
 from infrastructure.config_manager import ConfigManager
-
-# Apply log level from config before first log message
-_config = ConfigManager()
-_log_level_str = _config.get_log_level()
-_log_level = getattr(logging, _log_level_str.upper(), logging.INFO)
-PipelineLogger.set_level(_log_level)
+from infrastructure.project_store import ProjectStore
+from infrastructure.service_container import get_service_container
+from infrastructure.startup_profile import StartupProfile
+from infrastructure.thumbnail_cache import get_thumbnail_cache
 
 # Initialize logger
 logger = get_logger(__name__)
 
+# Gradio, the addons and the config are loaded in main()/create_gui(): spawned
+# worker processes (thumbnail pool) re-import this module as __mp_main__ and
+# must not pay for the GUI stack.
+if __name__ == "__main__":
+    # Apply log level from config before first log message
+    _config = get_service_container().config
+    _log_level = getattr(logging, _config.get_log_level().upper(), logging.INFO)
+    PipelineLogger.set_level(_log_level)
+
 
-def create_gui():
-    """Create and configure the main GUI application"""
+def create_gui(profile: StartupProfile = None):
+    """Create and configure the main GUI application
+
+    Args:
+        profile: Optional startup profile; per-addon import/construct/render
+                 timings are recorded into it and warm-up starts in the background
+    """
+    import gradio as gr
+    from addons import load_addons, warm_up_addons
+    from addons.components import create_log_panel
+
+    profile = profile or StartupProfile()
 
     # Load all addons
     logger.info("=" * 60)
     logger.info("CINDERGRACE Pipeline Control - Loading...")
     logger.info("=" * 60)
 
-    addons = load_addons()
+    addons = load_addons(profile)
 
     if not addons:
         logger.warning("No addons loaded!")
@@ -62,7 +76,7 @@ def create_gui():
     """
 
     # Check if first run (evaluated once at startup)
-    config = ConfigManager()
+    config = get_service_container().config
     is_first_run = config.is_first_run()
 
     # Get active backend info
@@ -149,7 +163,8 @@ def create_gui():
                         </div>
                         """)
                     else:
-                        addon.render()
+                        with profile.measure(type(addon).__name__, "render"):
+                            addon.render()
 
         # Global log panel (below tabs)
         create_log_panel(lines=20, auto_refresh=True)
@@ -160,12 +175,14 @@ def create_gui():
         **CINDERGRACE Pipeline Control** • Version 0.6.1 • [Documentation](../GUI_FRAMEWORK_README.md)
         """)
 
+    # Expensive indexes build while the server starts and the UI is in use
+    warm_up_addons(addons, profile, on_complete=profile.save)
+
     return demo
 
 
 def _validate_storyboard_on_startup(config: ConfigManager) -> None:
     """Check if current_storyboard exists, fix if needed."""
-    from infrastructure.project_store import ProjectStore
 
     current_sb = config.get_current_storyboard()
 
@@ -179,7 +196,7 @@ def _validate_storyboard_on_startup(config: ConfigManager) -> None:
     logger.warning(f"Storyboard nicht gefunden: {current_sb}")
 
     try:
-        store = ProjectStore(config)
+        store = get_service_container().get(ProjectStore, config)
         project = store.get_active_project(refresh=True)
 
         if project:
@@ -199,19 +216,24 @@ def main():
     """Main entry point"""
 
     logger.info("CINDERGRACE GUI starting...")
-    config = ConfigManager()
+    config = get_service_container().config
     config.refresh()
 
     # Validate storyboard path on startup
     _validate_storyboard_on_startup(config)
 
     # Create GUI
-    demo = create_gui()
+    profile = StartupProfile()
+    demo = create_gui(profile)
 
     if demo is None:
         logger.error("Failed to create GUI")
         return
 
+    logger.info("Startup profile (slowest addons):")
+    profile.log_report()
+    profile.save()
+
     # Launch
     logger.info("🚀 Launching CINDERGRACE GUI...")
     logger.info("=" * 60)
@@ -259,6 +281,12 @@ def main():
                 allowed_paths.append(backend_output)
                 logger.info(f"Allowed path (backend {backend_id}): {backend_output}")
 
+    # Gallery thumbnails, video poster frames and proxies
+    thumbnail_dir = str(get_thumbnail_cache().cache_dir)
+    os.makedirs(thumbnail_dir, exist_ok=True)
+    allowed_paths.append(thumbnail_dir)
+    logger.info(f"Allowed path (thumbnails): {thumbnail_dir}")
+
     # Enable queue for long-running operations (video generation can take 10+ minutes)
     demo.queue(default_concurrency_limit=1)
 
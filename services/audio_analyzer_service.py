@@ -1,15 +1,15 @@
 """Audio Analyzer Service - Smart audio segmentation for lipsync videos."""
-import json
 import os
-import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 from infrastructure.config_manager import ConfigManager
 from infrastructure.logger import get_logger
+from infrastructure.media_probe import find_ffmpeg, find_ffprobe, get_media_probe
 
 logger = get_logger(__name__)
 
@@ -82,42 +82,20 @@ class AudioAnalyzerService:
     MAX_SEGMENT_DURATION = 30.0  # Maximum segment length (hardware limit)
     DEFAULT_OVERLAP = 2.0  # Default overlap between segments
 
+    # Segment export
+    EXPORT_BATCH_SIZE = 32  # Segments written per decode pass
+    EXPORT_WORKERS = 4  # Parallel ffmpeg processes for per-segment retries
+    EXPORT_PASS_TIMEOUT = 900
+
     def __init__(self, config: Optional[ConfigManager] = None):
         self.config = config or ConfigManager()
-        self._ffmpeg_path = self._find_ffmpeg()
-        self._ffprobe_path = self._ffmpeg_path.replace("ffmpeg", "ffprobe")
-
-    def _find_ffmpeg(self) -> str:
-        """Find ffmpeg executable."""
-        ffmpeg = shutil.which("ffmpeg")
-        if ffmpeg:
-            return ffmpeg
-        for path in ["/usr/bin/ffmpeg", "/usr/local/bin/ffmpeg"]:
-            if os.path.isfile(path):
-                return path
-        return "ffmpeg"
+        self._ffmpeg_path = find_ffmpeg()
+        self._ffprobe_path = find_ffprobe(self._ffmpeg_path)
+        self._probe = get_media_probe()
 
     def get_audio_duration(self, audio_path: str) -> Optional[float]:
-        """Get duration of audio file in seconds."""
-        try:
-            result = subprocess.run(
-                [
-                    self._ffprobe_path,
-                    "-v", "quiet",
-                    "-show_entries", "format=duration",
-                    "-of", "json",
-                    audio_path
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                return float(data["format"]["duration"])
-        except Exception as e:
-            logger.error(f"Failed to get audio duration: {e}")
-        return None
+        """Get duration of audio file in seconds (cached ffprobe)."""
+        return self._probe.get_duration(audio_path)
 
     def detect_silence(self, audio_path: str) -> List[Tuple[float, float]]:
         """Detect silence ranges in audio using ffmpeg.
@@ -454,9 +432,11 @@ class AudioAnalyzerService:
             cut_points=cut_points
         )
 
+        info = self._probe.probe(audio_path)
+
         return AnalysisResult(
             duration=duration,
-            sample_rate=44100,  # Assumed
+            sample_rate=(info.sample_rate if info else None) or 44100,
             cut_points=cut_points,
             segments=segments,
             beats=beats,
@@ -472,6 +452,10 @@ class AudioAnalyzerService:
     ) -> List[str]:
         """Export audio segments to separate files.
 
+        The source is decoded once per batch of EXPORT_BATCH_SIZE segments and
+        split into one output per segment (overlaps included). Segments of a
+        failed pass are retried one by one with input seeking, in parallel.
+
         Args:
             audio_path: Source audio file
             segments: List of segments to export
@@ -482,46 +466,105 @@ class AudioAnalyzerService:
             List of output file paths
         """
         os.makedirs(output_dir, exist_ok=True)
-        output_files = []
 
         base_name = Path(audio_path).stem
+        codec = "pcm_s16le" if format == "wav" else "libmp3lame"
+        targets = [
+            (segment, os.path.join(output_dir, f"{base_name}_seg{segment.index:03d}.{format}"))
+            for segment in segments
+        ]
+
+        exported = set()
+        retry: List[Tuple[AudioSegment, str]] = []
+        for offset in range(0, len(targets), self.EXPORT_BATCH_SIZE):
+            batch = targets[offset:offset + self.EXPORT_BATCH_SIZE]
+            if len(batch) > 1 and self._export_single_pass(audio_path, batch, codec):
+                exported.update(path for _, path in batch)
+            else:
+                retry.extend(batch)
+
+        if retry:
+            with ThreadPoolExecutor(max_workers=min(self.EXPORT_WORKERS, len(retry))) as pool:
+                results = pool.map(
+                    lambda target: self._export_one(audio_path, target[0], target[1], codec),
+                    retry
+                )
+                exported.update(path for (_, path), ok in zip(retry, results) if ok)
+
+        output_files = [path for _, path in targets if path in exported]
+        logger.info(f"Exported {len(output_files)}/{len(targets)} segments to {output_dir}")
+        return output_files
 
-        for segment in segments:
-            output_path = os.path.join(
-                output_dir,
-                f"{base_name}_seg{segment.index:03d}.{format}"
+    def _export_single_pass(
+        self,
+        audio_path: str,
+        targets: List[Tuple[AudioSegment, str]],
+        codec: str
+    ) -> bool:
+        """Write several segments from a single decode of the source."""
+        labels = "".join(f"[s{i}]" for i in range(len(targets)))
+        graph = [f"[0:a]asplit={len(targets)}{labels}"]
+        cmd = [self._ffmpeg_path, "-y", "-i", audio_path]
+        outputs: List[str] = []
+
+        for i, (segment, output_path) in enumerate(targets):
+            graph.append(
+                f"[s{i}]atrim=start={segment.generation_start:.3f}:end={segment.generation_end:.3f},"
+                f"asetpts=PTS-STARTPTS[o{i}]"
             )
+            outputs.extend(["-map", f"[o{i}]", "-acodec", codec, output_path])
 
-            # Include overlap in export
-            start = segment.generation_start
-            duration = segment.generation_duration
-
-            try:
-                result = subprocess.run(
-                    [
-                        self._ffmpeg_path,
-                        "-y",
-                        "-i", audio_path,
-                        "-ss", str(start),
-                        "-t", str(duration),
-                        "-acodec", "pcm_s16le" if format == "wav" else "libmp3lame",
-                        output_path
-                    ],
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
+        cmd.extend(["-filter_complex", ";".join(graph)])
+        cmd.extend(outputs)
+
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=self.EXPORT_PASS_TIMEOUT
+            )
+            if result.returncode != 0:
+                logger.warning(f"Single-pass export failed, retrying per segment: {result.stderr[-500:]}")
+                return False
+            return True
+        except Exception as e:
+            logger.warning(f"Single-pass export failed, retrying per segment: {e}")
+            return False
 
-                if result.returncode == 0:
-                    output_files.append(output_path)
-                    logger.info(f"Exported segment {segment.index}: {output_path}")
-                else:
-                    logger.error(f"Failed to export segment {segment.index}: {result.stderr}")
+    def _export_one(
+        self,
+        audio_path: str,
+        segment: AudioSegment,
+        output_path: str,
+        codec: str
+    ) -> bool:
+        """Export one segment, seeking on the input instead of decoding from the start."""
+        try:
+            result = subprocess.run(
+                [
+                    self._ffmpeg_path,
+                    "-y",
+                    "-ss", str(segment.generation_start),
+                    "-i", audio_path,
+                    "-t", str(segment.generation_duration),
+                    "-acodec", codec,
+                    output_path
+                ],
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
 
-            except Exception as e:
-                logger.error(f"Failed to export segment {segment.index}: {e}")
+            if result.returncode == 0:
+                logger.info(f"Exported segment {segment.index}: {output_path}")
+                return True
+            logger.error(f"Failed to export segment {segment.index}: {result.stderr}")
 
-        return output_files
+        except Exception as e:
+            logger.error(f"Failed to export segment {segment.index}: {e}")
+
+        return False
 
     def format_segments_table(self, segments: List[AudioSegment]) -> List[List[str]]:
         """Format segments for Gradio dataframe display.
@@ -0,0 +1,479 @@
+"""Batch Pipeline - headless storyboard -> keyframes -> selection -> video runs.
+
+Drives the same services as the UI tabs for one or many projects without
+importing Gradio (entry point: ``batch.py``). Progress is reported as plain
+dict events through the ``emit`` callback, so the CLI can print them as JSON
+lines for cron jobs and render farms.
+
+Stages:
+- ``keyframes``: KeyframeGenerationService (optionally resuming the checkpoint)
+- ``select``: pick one variant per shot (automatic or from a file) and export
+  it via SelectionService.export_selections
+- ``finalize``: after a draft keyframe run, re-render the selected variants at
+  final quality (KeyframeGenerationService.finalize_events); skipped otherwise
+- ``video``: VideoPlanBuilder plan -> VideoGenerationService clips
+
+With ``BatchOptions.queue`` the keyframe and video stages are dispatched to
+distributed workers (``worker.py``) through a shared WorkQueue instead of the
+local ComfyUI; the pipeline waits for the workers and then continues.
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from domain.exceptions import PipelineException, ProjectNotFoundError, ValidationError
+from domain.models import Storyboard
+from domain.storyboard_service import StoryboardService, load_selection
+from infrastructure.comfy_api import ComfyUIAPI
+from infrastructure.logger import get_logger
+from infrastructure.model_validator import ModelValidator
+from infrastructure.service_container import ServiceContainer, get_service_container
+from infrastructure.state_store import VideoGeneratorStateStore
+from infrastructure.work_queue import WorkQueue
+from infrastructure.workflow_registry import PREFIX_KEYFRAME, PREFIX_VIDEO
+from services.distributed_worker import WorkDispatcher
+from services.keyframe import CheckpointHandler, ImagesAdded, StatusUpdate, inject_model_override
+from services.keyframe_service import KeyframeGenerationService, KeyframeService
+from services.selection_service import SelectionService
+from services.video.video_generation_service import VideoGenerationService
+from services.video.video_plan_builder import DEFAULT_FPS, VideoPlanBuilder
+
+logger = get_logger(__name__)
+
+STAGES = ("keyframes", "select", "finalize", "video")
+PICK_STRATEGIES = ("first", "last")
+
+Event = Dict[str, Any]
+
+
+class BatchStageError(PipelineException):
+    """A pipeline stage could not complete for a project."""
+
+
+@dataclass
+class BatchOptions:
+    """Settings for a batch run (defaults match the UI defaults)."""
+    stages: Tuple[str, ...] = STAGES
+    storyboard: Optional[str] = None          # Default: the project's current storyboard
+    keyframe_workflow: Optional[str] = None   # Default: registry default (gcp_*)
+    video_workflow: Optional[str] = None      # Default: registry default (gcv_*)
+    variants_per_shot: int = 4
+    base_seed: int = 2000
+    fps: int = DEFAULT_FPS
+    model_override: Optional[str] = None
+    selection_file: Optional[str] = None      # File-based selection instead of automatic
+    pick: str = "first"                       # Automatic selection: first/last variant
+    resume: bool = False                      # Continue an unfinished keyframe checkpoint
+    queue: Optional[str] = None               # Work queue file: dispatch to distributed workers
+    draft: bool = False                       # Draft keyframes, finalize the selection afterwards
+    draft_downscale: bool = False             # Drafts also at reduced resolution (approximate)
+
+
+@dataclass
+class ProjectResult:
+    """Outcome of one project's run."""
+    project: str
+    status: str = "completed"                 # completed / failed
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "completed"
+
+
+def _plain(text: str) -> str:
+    """Status markdown -> single-line plain text."""
+    return " ".join((text or "").replace("**", "").replace("`", "").split())
+
+
+class BatchPipeline:
+    """Run pipeline stages for projects without the UI."""
+
+    # Seconds between queue polls while distributed workers render
+    QUEUE_POLL_SECONDS = 5.0
+
+    def __init__(
+        self,
+        services: Optional[ServiceContainer] = None,
+        emit: Optional[Callable[[Event], None]] = None
+    ):
+        """
+        Args:
+            services: Service container (default: the process-wide one)
+            emit: Receives progress events (dicts with an "event" key)
+        """
+        self.services = services or get_service_container()
+        self.config = self.services.config
+        self.project_store = self.services.project_store
+        self.workflow_registry = self.services.workflow_registry
+        self.selection_service = SelectionService(self.project_store)
+        self._emit = emit or (lambda event: None)
+
+    def resolve_projects(self, slugs: Sequence[str] = (), all_projects: bool = False) -> List[Dict[str, Any]]:
+        """
+        Projects to process: the given slugs, all projects, or the active one
+
+        Raises:
+            ProjectNotFoundError: If a slug is unknown or no project is available
+        """
+        if all_projects:
+            projects = self.project_store.list_projects()
+        elif slugs:
+            projects = []
+            for slug in slugs:
+                project = self.project_store.load_project(slug)
+                if not project:
+                    raise ProjectNotFoundError(f"Unknown project: {slug}")
+                projects.append(project)
+        else:
+            active = self.project_store.get_active_project(refresh=True)
+            projects = [active] if active else []
+        if not projects:
+            raise ProjectNotFoundError("No project to process (use --project or --all)")
+        return projects
+
+    def run(self, projects: Sequence[Dict[str, Any]], options: BatchOptions) -> List[ProjectResult]:
+        """Run all projects one after another; a failing project does not stop the batch."""
+        results = [self.run_project(project, options) for project in projects]
+        self.emit(
+            "batch_done",
+            projects=len(results),
+            failed=[result.project for result in results if not result.ok],
+        )
+        return results
+
+    def run_project(self, project: Dict[str, Any], options: BatchOptions) -> ProjectResult:
+        """Run the selected stages for one project."""
+        slug = project.get("slug", project.get("name", "unknown"))
+        result = ProjectResult(project=slug)
+        self.emit("project_start", project=slug, stages=list(options.stages))
+        stage = None
+        try:
+            storyboard = self._load_storyboard(project, options)
+            selection_path = None  # Video stage alone uses the project's last export
+            for stage in STAGES:
+                if stage not in options.stages:
+                    continue
+                started = time.monotonic()
+                self.emit("stage_start", project=slug, stage=stage)
+                if stage == "keyframes":
+                    summary = self._run_keyframes(project, storyboard, options, slug)
+                elif stage == "select":
+                    summary = self._run_selection(project, storyboard, options)
+                    selection_path = summary["path"]
+                elif stage == "finalize":
+                    summary = self._run_finalize(project, storyboard, options, slug)
+                else:
+                    summary = self._run_video(project, storyboard, selection_path, options)
+                summary["seconds"] = round(time.monotonic() - started, 1)
+                result.stages[stage] = summary
+                self.emit("stage_done", project=slug, stage=stage, **summary)
+        except (PipelineException, FileNotFoundError) as e:
+            result.status, result.error = "failed", str(e)
+        except Exception as e:
+            logger.error(f"Batch run failed for {slug}: {e}", exc_info=True)
+            result.status, result.error = "failed", f"{type(e).__name__}: {e}"
+
+        if result.ok:
+            self.emit("project_done", project=slug, status=result.status)
+        else:
+            self.emit("project_done", project=slug, status=result.status, stage=stage, error=result.error)
+        return result
+
+    def emit(self, event: str, **fields: Any) -> None:
+        self._emit({"event": event, "ts": round(time.time(), 3), **fields})
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def _load_storyboard(self, project: Dict[str, Any], options: BatchOptions) -> Storyboard:
+        storyboard_file = options.storyboard or project.get("current_storyboard")
+        if not storyboard_file:
+            raise BatchStageError("Project has no current storyboard (use --storyboard)")
+        storyboard = StoryboardService.load_from_file(storyboard_file)
+        StoryboardService.apply_resolution_from_config(storyboard, self.config)
+        storyboard.raw["storyboard_file"] = storyboard_file
+        return storyboard
+
+    def _run_keyframes(
+        self, project: Dict[str, Any], storyboard: Storyboard, options: BatchOptions, slug: str
+    ) -> Dict[str, Any]:
+        workflow_file = options.keyframe_workflow or self.workflow_registry.get_default(PREFIX_KEYFRAME)
+        if not workflow_file:
+            raise BatchStageError("No keyframe workflow (gcp_*) configured")
+        if any(shot.character_lora for shot in storyboard.shots):
+            lora_variant = self.workflow_registry.get_lora_variant(workflow_file)
+            if lora_variant:
+                workflow_file = lora_variant
+            else:
+                self.emit("warning", project=slug, stage="keyframes",
+                          message=f"No gcpl_* variant of {workflow_file}; Character LoRA is ignored")
+
+        if options.queue:
+            if options.draft:
+                self.emit("warning", project=slug, stage="keyframes",
+                          message="Draft mode is not available with --queue; rendering final quality")
+            return self._dispatch_keyframes(project, storyboard, workflow_file, options, slug)
+
+        storyboard_file = storyboard.raw["storyboard_file"]
+        checkpoint = CheckpointHandler(self.project_store).load(storyboard_file, project) if options.resume else {}
+        if checkpoint.get("status") == "completed":
+            return {"skipped": True, "images": checkpoint.get("total_images_generated", 0)}
+        if checkpoint:
+            checkpoint["status"] = "running"
+            workflow_file = checkpoint.get("workflow_file", workflow_file)
+        else:
+            checkpoint = KeyframeService(self.project_store, self.config, self.workflow_registry).prepare_checkpoint(
+                storyboard=storyboard,
+                workflow_file=workflow_file,
+                variants_per_shot=options.variants_per_shot,
+                base_seed=options.base_seed,
+                draft=options.draft,
+                draft_downscale=options.draft_downscale,
+            )
+
+        service = KeyframeGenerationService(config=self.config, project_store=self.project_store)
+        service._save_checkpoint(checkpoint, storyboard_file, project)  # pylint: disable=protected-access
+        images = 0
+        total_shots = len(storyboard.shots)
+        final: Optional[StatusUpdate] = None
+        for event in service.run_generation_events(
+            storyboard=storyboard,
+            workflow_file=workflow_file,
+            checkpoint=checkpoint,
+            project=project,
+            comfy_url=self.config.get_comfy_url(),
+            model_override=options.model_override,
+        ):
+            if isinstance(event, ImagesAdded):
+                images += len(event.images)
+                continue
+            checkpoint = event.checkpoint
+            final = event if event.final else final
+            self.emit(
+                "progress",
+                project=slug,
+                stage="keyframes",
+                message=_plain(event.status),
+                completed_shots=len(checkpoint.get("completed_shots", [])),
+                total_shots=total_shots,
+                images=images,
+            )
+
+        if checkpoint.get("status") != "completed":
+            raise BatchStageError(_plain(final.status) if final else "Keyframe generation did not finish")
+        return {"workflow": workflow_file, "images": images, "shots": len(checkpoint.get("completed_shots", []))}
+
+    def _run_selection(self, project: Dict[str, Any], storyboard: Storyboard, options: BatchOptions) -> Dict[str, Any]:
+        wanted = self._load_selection_file(options.selection_file) if options.selection_file else {}
+        selections: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for shot in storyboard.shots:
+            keyframes = self.selection_service.collect_keyframes(project, shot.filename_base)
+            choice = self._pick(keyframes, wanted.get(shot.shot_id), options.pick, bool(wanted))
+            if choice is None:
+                missing.append(shot.shot_id)
+                continue
+            selections[shot.shot_id] = {
+                "shot_id": shot.shot_id,
+                "filename_base": shot.filename_base,
+                "selected_variant": choice["variant"],
+                "selected_file": choice["filename"],
+                "source_path": choice["path"],
+            }
+        if not selections:
+            raise BatchStageError("No keyframes found to select")
+
+        payload = self.selection_service.export_selections(project, storyboard.raw, selections)
+        return {"path": payload["_path"], "selected": len(selections), "missing": missing}
+
+    def _run_finalize(
+        self, project: Dict[str, Any], storyboard: Storyboard, options: BatchOptions, slug: str
+    ) -> Dict[str, Any]:
+        service = KeyframeGenerationService(config=self.config, project_store=self.project_store)
+        checkpoint = service._load_checkpoint(storyboard.raw["storyboard_file"], project)  # pylint: disable=protected-access
+        if checkpoint.get("quality") != "draft":
+            return {"skipped": True}
+
+        final: Optional[StatusUpdate] = None
+        for event in service.finalize_events(
+            storyboard=storyboard,
+            checkpoint=checkpoint,
+            project=project,
+            comfy_url=self.config.get_comfy_url(),
+            model_override=options.model_override,
+        ):
+            if isinstance(event, StatusUpdate):
+                final = event if event.final else final
+                self.emit("progress", project=slug, stage="finalize", message=_plain(event.status),
+                          finalized=len(checkpoint.get("finalized", {})))
+
+        if checkpoint.get("finalize_status") not in ("completed", "completed_with_issues"):
+            raise BatchStageError(_plain(final.status) if final else "Final render did not finish")
+        return {"finalized": len(checkpoint.get("finalized", {})), "status": checkpoint["finalize_status"]}
+
+    def _run_video(
+        self,
+        project: Dict[str, Any],
+        storyboard: Storyboard,
+        selection_path: Optional[str],
+        options: BatchOptions
+    ) -> Dict[str, Any]:
+        selection_path = selection_path or os.path.join(project["path"], "selected", "selected_keyframes.json")
+        selection = load_selection(selection_path)
+        plan_builder = VideoPlanBuilder(fps=options.fps)
+        plan_state = plan_builder.build(storyboard, selection).to_dict_list()
+        if not any(entry.get("ready") for entry in plan_state):
+            raise BatchStageError("No shot with a valid start frame in the selection")
+
+        workflow_file = options.video_workflow or self.workflow_registry.get_default(PREFIX_VIDEO)
+        if not workflow_file:
+            raise BatchStageError("No video workflow (gcv_*) configured")
+        workflow_file = self.workflow_registry.resolve_workflow(workflow_file, use_sage=self.config.use_sage_attention())
+        workflow_path = os.path.join(self.config.get_workflow_dir(), workflow_file)
+        if not os.path.exists(workflow_path):
+            raise BatchStageError(f"Workflow not found: {workflow_path}")
+        if options.queue:
+            return self._dispatch_video(project, plan_state, workflow_file, options)
+
+        comfy_api = ComfyUIAPI(self.config.get_comfy_url())
+        conn = comfy_api.test_connection()
+        if not conn.get("connected"):
+            raise BatchStageError(f"Connection failed: {conn.get('error')}")
+        workflow_template = comfy_api.load_workflow(workflow_path)
+        if options.model_override:
+            workflow_template = inject_model_override(workflow_template, options.model_override)
+
+        model_validator = self.services.get(ModelValidator, self.config.get_comfy_root())
+        missing_models = model_validator.find_missing(workflow_template)
+        if missing_models:
+            raise BatchStageError(f"Models missing: {', '.join(missing_models)}")
+
+        state_store = VideoGeneratorStateStore(os.path.join(project["path"], "video", "_state.json"))
+        service = VideoGenerationService(self.project_store, model_validator, state_store, plan_builder)
+        updated_plan, _, last_video = service.run_generation(
+            plan_state=plan_state,
+            workflow_template=workflow_template,
+            fps=options.fps,
+            project=project,
+            comfy_api=comfy_api,
+            resolution=self.config.get_resolution_tuple(),
+        )
+        state_store.update(plan_state=updated_plan, last_video=last_video, workflow_file=workflow_file)
+
+        completed = sum(1 for entry in updated_plan if entry.get("status") == "completed")
+        if not completed:
+            raise BatchStageError("No clip was generated (see logs/pipeline.log)")
+        return {
+            "workflow": workflow_file,
+            "clips": completed,
+            "segments": len(updated_plan),
+            "last_video": last_video,
+        }
+
+    # ------------------------------------------------------------------
+    # Distributed stages
+    # ------------------------------------------------------------------
+
+    def _dispatch_keyframes(
+        self, project: Dict[str, Any], storyboard: Storyboard, workflow_file: str, options: BatchOptions, slug: str
+    ) -> Dict[str, Any]:
+        dispatcher = WorkDispatcher(WorkQueue(options.queue), self.services)
+        batch, count = dispatcher.enqueue_keyframes(
+            project,
+            storyboard,
+            workflow_file,
+            variants_per_shot=options.variants_per_shot,
+            base_seed=options.base_seed,
+            model_override=options.model_override,
+        )
+        stats = self._await_batch(dispatcher, batch, count, slug, "keyframes")
+        images = sum(len((task.result or {}).get("images", [])) for task in dispatcher.queue.tasks(batch))
+        if not stats["done"]:
+            raise BatchStageError(f"All {count} keyframe task(s) failed (see worker logs)")
+        return {"workflow": workflow_file, "batch": batch, "images": images, "failed_tasks": stats["failed"]}
+
+    def _dispatch_video(
+        self, project: Dict[str, Any], plan_state: List[Dict[str, Any]], workflow_file: str, options: BatchOptions
+    ) -> Dict[str, Any]:
+        dispatcher = WorkDispatcher(WorkQueue(options.queue), self.services)
+        batch, count = dispatcher.enqueue_video(
+            project, plan_state, workflow_file, fps=options.fps, model_override=options.model_override
+        )
+        self._await_batch(dispatcher, batch, count, project.get("slug", project.get("name")), "video")
+        updated_plan, last_video = dispatcher.apply_video_results(batch, plan_state)
+        state_store = VideoGeneratorStateStore(os.path.join(project["path"], "video", "_state.json"))
+        state_store.update(plan_state=updated_plan, last_video=last_video, workflow_file=workflow_file)
+
+        completed = sum(1 for entry in updated_plan if entry.get("status") == "completed")
+        if not completed:
+            raise BatchStageError("No clip was generated (see worker logs)")
+        return {
+            "workflow": workflow_file,
+            "batch": batch,
+            "clips": completed,
+            "segments": len(updated_plan),
+            "last_video": last_video,
+        }
+
+    def _await_batch(self, dispatcher: WorkDispatcher, batch: str, count: int, slug: str, stage: str) -> Dict[str, int]:
+        self.emit("dispatched", project=slug, stage=stage, batch=batch, tasks=count)
+
+        def progress(stats: Dict[str, int]) -> None:
+            self.emit("progress", project=slug, stage=stage, batch=batch, tasks=count, **stats)
+
+        return dispatcher.wait(batch, poll_interval=self.QUEUE_POLL_SECONDS, on_progress=progress)
+
+    # ------------------------------------------------------------------
+    # Selection helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _load_selection_file(path: str) -> Dict[str, Any]:
+        """
+        Read a selection file
+
+        Accepts an exported selected_keyframes.json ({"selections": [...]}) or
+        a plain mapping {shot_id: variant number or filename}.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if isinstance(payload, dict) and isinstance(payload.get("selections"), list):
+            return {
+                entry["shot_id"]: entry.get("selected_file") or entry.get("selected_variant")
+                for entry in payload["selections"] if entry.get("shot_id")
+            }
+        if not isinstance(payload, dict):
+            raise ValidationError(f"Selection file must contain a JSON object: {path}")
+        return payload
+
+    @staticmethod
+    def _pick(
+        keyframes: List[Dict[str, Any]], wanted: Any, strategy: str, file_based: bool
+    ) -> Optional[Dict[str, Any]]:
+        """Choose a variant: the wanted one (file-based) or first/last (automatic)."""
+        if not keyframes:
+            return None
+        if file_based:
+            if wanted is None:
+                return None
+            for keyframe in keyframes:
+                if str(wanted) in (keyframe["filename"], str(keyframe["variant"])):
+                    return keyframe
+            return None
+        ordered = sorted(keyframes, key=lambda keyframe: keyframe["variant"] or 0)
+        return ordered[-1] if strategy == "last" else ordered[0]
+
+
+__all__ = [
+    "BatchPipeline",
+    "BatchOptions",
+    "BatchStageError",
+    "ProjectResult",
+    "STAGES",
+    "PICK_STRATEGIES",
+]
@@ -5,6 +5,7 @@ from typing import List, Optional, Tuple
 
 from infrastructure.config_manager import ConfigManager
 from infrastructure.logger import get_logger
+from services.model_manager.model_metadata import get_model_metadata_reader
 
 logger = get_logger(__name__)
 
@@ -18,6 +19,7 @@ class CharacterLora:
 
     Model compatibility is defined via optional .models sidecar file:
     cg_elena.models -> lists compatible diffusion models and model type
+    Without a type= line, the type is read from the LoRA's safetensors header.
     """
     id: str  # Full ID with prefix, e.g., "cg_elena"
     name: str  # Display name, e.g., "Elena"
@@ -26,7 +28,7 @@ class CharacterLora:
     lora_path: str  # Full path to file
     strength: float = 1.0  # Fixed strength for character LoRAs
     compatible_models: Optional[List[str]] = None  # From .models sidecar file
-    model_type: Optional[str] = None  # "flux", "sdxl", "sd3" from .models file
+    model_type: Optional[str] = None  # "flux", "sdxl", "sd3" from .models file or header
 
 
 class CharacterLoraService:
@@ -45,6 +47,7 @@ class CharacterLoraService:
     DEFAULT_STRENGTH = 1.0  # Fixed strength for character LoRAs
     SUPPORTED_EXTENSIONS = ('.safetensors',)
     CG_PREFIX = "cg_"  # Prefix for CINDERGRACE character LoRAs
+    MODEL_TYPES = ("flux", "sdxl", "sd3")  # Types the compatibility checks compare
 
     def __init__(self, config: Optional[ConfigManager] = None):
         self.config = config or ConfigManager()
@@ -114,8 +117,12 @@ class CharacterLoraService:
                 # Display name: format nicely (without prefix)
                 display_name = self._id_to_display_name(trigger_word)
 
-                # Check for .models sidecar file
+                # Check for .models sidecar file, fall back to the file header
                 model_type, compatible_models = self._load_models_file(filepath)
+                if model_type is None:
+                    model_type = self._known_model_type(
+                        get_model_metadata_reader().detect_architecture(filepath)
+                    )
 
                 lora = CharacterLora(
                     id=character_id,
@@ -457,17 +464,25 @@ class CharacterLoraService:
         return False
 
     def _detect_model_type(self, model_path: str) -> Optional[str]:
-        """Detect model type from model path/filename.
+        """Detect model type from the file header, falling back to the filename.
 
         Args:
-            model_path: Path to the model file
+            model_path: Path to the model file (absolute or relative to ComfyUI/models/)
 
         Returns:
-            Detected type ("flux", "sdxl", "sd3") or None
+            Detected type ("flux", "sdxl", "sd3") or None; other header
+            architectures (e.g. "sd15", "wan") count as unknown
         """
         if not model_path:
             return None
 
+        full_path = self._resolve_model_path(model_path)
+        if full_path:
+            detected = get_model_metadata_reader().detect_architecture(full_path)
+            architecture = self._known_model_type(detected)
+            if architecture:
+                return architecture
+
         path_lower = model_path.lower()
 
         # Check for FLUX indicators
@@ -484,6 +499,21 @@ class CharacterLoraService:
 
         return None
 
+    def _known_model_type(self, architecture: Optional[str]) -> Optional[str]:
+        """Map a header architecture onto MODEL_TYPES (None = no restriction)."""
+        return architecture if architecture in self.MODEL_TYPES else None
+
+    def _resolve_model_path(self, model_path: str) -> Optional[str]:
+        """Return the model file on disk, or None if it cannot be found."""
+        if os.path.isabs(model_path):
+            return model_path if os.path.isfile(model_path) else None
+        comfy_root = self.config.get_comfy_root()
+        if comfy_root:
+            full_path = os.path.join(comfy_root, "models", model_path)
+            if os.path.isfile(full_path):
+                return full_path
+        return None
+
     def get_compatible_models_for_character(self, character_id: str) -> Optional[List[str]]:
         """Get list of compatible models for a character.
 
@@ -0,0 +1,479 @@
+"""Distributed generation - dispatch pipeline work to workers via a WorkQueue.
+
+The dispatcher splits a stage into queue tasks; every worker process is bound
+to its own ComfyUI backend and renders whatever task it can lease (entry
+point: ``worker.py``). Projects, keyframes and videos live on a filesystem
+shared by all workers, so task payloads carry plain paths.
+
+Task kinds:
+- ``keyframe_variant``: one variant of one shot (same seed/name as a local run)
+- ``video_segment``: one plan segment; segment N of a chained shot depends on
+  segment N-1 and starts from its extracted last frame
+- ``transition``: one First/Last-Frame transition between two images
+
+Results are written back to the queue; :meth:`WorkDispatcher.apply_video_results`
+merges finished segments into the video plan for the Video Generator tab.
+"""
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from domain.exceptions import (
+    KeyframeGenerationError,
+    ModelValidationError,
+    VideoGenerationError,
+    WorkflowLoadError,
+)
+from domain.models import Storyboard
+from infrastructure.comfy_api import ComfyUIAPI
+from infrastructure.logger import get_logger
+from infrastructure.model_validator import ModelValidator
+from infrastructure.project_store import ProjectStore
+from infrastructure.service_container import ServiceContainer, get_service_container
+from infrastructure.state_store import VideoGeneratorStateStore
+from infrastructure.work_queue import Task, WorkQueue
+from services.cleanup_service import CleanupService
+from services.firstlast_video_service import FirstLastVideoService
+from services.keyframe import get_workflow_for_shot, inject_model_override
+from services.keyframe_service import KeyframeGenerationService
+from services.video.last_frame_extractor import LastFrameExtractor
+from services.video.video_generation_service import VideoGenerationService
+
+logger = get_logger(__name__)
+
+KIND_KEYFRAME = "keyframe_variant"
+KIND_VIDEO = "video_segment"
+KIND_TRANSITION = "transition"
+TASK_KINDS = (KIND_KEYFRAME, KIND_VIDEO, KIND_TRANSITION)
+
+Event = Dict[str, Any]
+
+
+def _project_ref(project: Dict[str, Any]) -> Dict[str, Any]:
+    """The project fields a worker needs (paths on the shared filesystem)."""
+    return {key: project.get(key) for key in ("slug", "name", "path")}
+
+
+class WorkDispatcher:
+    """Turn pipeline stages into queue tasks and collect their results."""
+
+    def __init__(self, queue: WorkQueue, services: Optional[ServiceContainer] = None):
+        self.queue = queue
+        self.services = services or get_service_container()
+        self.config = self.services.config
+        self.project_store = self.services.project_store
+
+    def enqueue_keyframes(
+        self,
+        project: Dict[str, Any],
+        storyboard: Storyboard,
+        workflow_file: str,
+        variants_per_shot: int,
+        base_seed: int,
+        model_override: Optional[str] = None
+    ) -> Tuple[str, int]:
+        """
+        Queue one task per shot variant
+
+        Returns:
+            Tuple of (batch id, number of tasks)
+        """
+        cleanup_count = self.services.get(CleanupService, self.project_store).cleanup_before_keyframe_generation(project)
+        if cleanup_count > 0:
+            logger.info(f"Pre-generation cleanup: {cleanup_count} file(s) archived")
+
+        batch = self.queue.new_batch_id("keyframes")
+        width, height = self.config.get_resolution_tuple()
+        count = 0
+        for shot_idx, shot in enumerate(storyboard.raw.get("shots", [])):
+            for variant_idx in range(variants_per_shot):
+                self.queue.enqueue(KIND_KEYFRAME, {
+                    "project": _project_ref(project),
+                    "shot": shot,
+                    "shot_idx": shot_idx,
+                    "variant_idx": variant_idx,
+                    "variants_per_shot": variants_per_shot,
+                    "base_seed": base_seed,
+                    "workflow_file": workflow_file,
+                    "model_override": model_override,
+                    "resolution": [width, height],
+                }, batch=batch)
+                count += 1
+        logger.info(f"Queued {count} keyframe task(s) as {batch}")
+        return batch, count
+
+    def enqueue_video(
+        self,
+        project: Dict[str, Any],
+        plan_state: List[Dict[str, Any]],
+        workflow_file: str,
+        fps: int,
+        model_override: Optional[str] = None
+    ) -> Tuple[str, int]:
+        """
+        Queue the plan's segments; chained segments wait for their predecessor
+
+        Segments without a start frame that are not part of a chain are skipped,
+        like in VideoGenerationService.run_generation.
+
+        Returns:
+            Tuple of (batch id, number of tasks)
+        """
+        cleanup_count = self.services.get(CleanupService, self.project_store).cleanup_before_video_generation(project)
+        if cleanup_count > 0:
+            logger.info(f"Pre-generation cleanup: {cleanup_count} file(s) archived")
+
+        batch = self.queue.new_batch_id("video")
+        resolution = list(self.config.get_resolution_tuple())
+        task_ids: Dict[Tuple[Any, int], int] = {}
+        for entry in plan_state:
+            segment_index = entry.get("segment_index", 1)
+            previous = task_ids.get((entry.get("shot_id"), segment_index - 1))
+            if not entry.get("ready") and previous is None:
+                logger.info(f"Skipping {entry.get('plan_id')}: no start frame")
+                continue
+            task_ids[(entry.get("shot_id"), segment_index)] = self.queue.enqueue(KIND_VIDEO, {
+                "project": _project_ref(project),
+                "entry": entry,
+                "workflow_file": workflow_file,
+                "fps": fps,
+                "model_override": model_override,
+                "resolution": resolution,
+            }, batch=batch, depends_on=previous)
+        logger.info(f"Queued {len(task_ids)} video segment task(s) as {batch}")
+        return batch, len(task_ids)
+
+    def enqueue_transitions(
+        self,
+        image_paths: Sequence[str],
+        prompt: str,
+        workflow_file: Optional[str] = None,
+        output_prefix: str = "transition",
+        **params: Any
+    ) -> Tuple[str, int]:
+        """
+        Queue one transition per consecutive image pair
+
+        Args:
+            image_paths: Frames in order (at least two)
+            prompt: Transition prompt
+            workflow_file: gcvfl_* workflow (default: FirstLastVideoService default)
+            output_prefix: Output prefix; the pair index is appended
+            **params: Further FirstLastVideoService.generate_transition arguments
+                (width, height, frames, fps, steps, cfg, negative_prompt)
+
+        Returns:
+            Tuple of (batch id, number of tasks)
+        """
+        batch = self.queue.new_batch_id("transitions")
+        pairs = list(zip(image_paths, image_paths[1:]))
+        for index, (start, end) in enumerate(pairs, start=1):
+            self.queue.enqueue(KIND_TRANSITION, {
+                **params,
+                "start_image_path": start,
+                "end_image_path": end,
+                "prompt": prompt,
+                "workflow_file": workflow_file,
+                "output_prefix": f"{output_prefix}_{index:03d}",
+            }, batch=batch)
+        return batch, len(pairs)
+
+    def wait(
+        self,
+        batch: str,
+        poll_interval: float = 5.0,
+        on_progress: Optional[Callable[[Dict[str, int]], None]] = None
+    ) -> Dict[str, int]:
+        """Block until no task of the batch is pending or leased; returns the final stats."""
+        last = None
+        while True:
+            stats = self.queue.stats(batch)
+            if on_progress and stats != last:
+                on_progress(stats)
+            last = stats
+            if not stats["pending"] and not stats["leased"]:
+                return stats
+            time.sleep(poll_interval)
+
+    def apply_video_results(self, batch: str, plan_state: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Merge finished segment tasks into the plan
+
+        Returns:
+            Tuple of (updated plan, last video path)
+        """
+        by_plan_id = {entry.get("plan_id"): dict(entry) for entry in plan_state}
+        last_video = None
+        for task in self.queue.tasks(batch):
+            entry = by_plan_id.get(task.payload.get("entry", {}).get("plan_id"))
+            if entry is None:
+                continue
+            if task.status == "done":
+                result = task.result or {}
+                entry["status"] = "completed"
+                entry["output_files"] = result.get("video_paths", [])
+                if result.get("last_frame"):
+                    entry["last_frame"] = result["last_frame"]
+                if entry["output_files"]:
+                    last_video = entry["output_files"][-1]
+            elif task.status == "failed":
+                entry["status"] = f"error: {task.error}"
+        return list(by_plan_id.values()), last_video
+
+
+class DistributedWorker:
+    """Lease tasks from a WorkQueue and render them on one ComfyUI backend."""
+
+    DEFAULT_LEASE_SECONDS = 120.0
+    # Seconds between claim attempts while the queue is empty
+    POLL_INTERVAL = 2.0
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        comfy_url: Optional[str] = None,
+        comfy_root: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        kinds: Optional[Sequence[str]] = None,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = POLL_INTERVAL,
+        services: Optional[ServiceContainer] = None,
+        handlers: Optional[Dict[str, Callable[[Task], Dict[str, Any]]]] = None,
+        emit: Optional[Callable[[Event], None]] = None
+    ):
+        """
+        Args:
+            queue: Shared work queue
+            comfy_url: This worker's ComfyUI backend (default: configured URL)
+            comfy_root: That backend's ComfyUI root as mounted on this machine;
+                without it a foreign comfy_url is used like a RunPod backend
+                (outputs are fetched through the API)
+            worker_id: Lease owner name (default: host-pid-random)
+            kinds: Task kinds this worker takes (default: all; remote backends
+                skip transitions, which need access to the ComfyUI folders)
+            lease_seconds: Lease duration; renewed every lease_seconds / 3
+            poll_interval: Sleep between claims while the queue is empty
+            services: Service container (default: the process-wide one)
+            handlers: Task kind -> handler overrides (returns the task result)
+            emit: Receives progress events (dicts with an "event" key)
+        """
+        self.queue = queue
+        self.services = services or get_service_container()
+        self.config = self.services.config
+        self.project_store = self.services.project_store
+        if comfy_url or comfy_root:
+            # Upload/download paths and runpod detection must follow this worker's backend
+            self.config = self.config.with_backend(url=comfy_url, comfy_root=comfy_root)
+            if self.config is not self.services.config:
+                self.project_store = ProjectStore(self.config)
+        self.comfy_url = self.config.get_comfy_url()
+        self.remote = self.config.is_runpod_backend()
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:4]}"
+        if self.remote and kinds and KIND_TRANSITION in kinds:
+            raise ValueError("Transitions need the backend's ComfyUI folders - pass comfy_root")
+        default_kinds = tuple(kind for kind in TASK_KINDS if kind != KIND_TRANSITION) if self.remote else TASK_KINDS
+        self.kinds = tuple(kinds) if kinds else default_kinds
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.api = ComfyUIAPI(self.comfy_url)
+        self.handlers: Dict[str, Callable[[Task], Dict[str, Any]]] = {
+            KIND_KEYFRAME: self._render_keyframe,
+            KIND_VIDEO: self._render_video_segment,
+            KIND_TRANSITION: self._render_transition,
+        }
+        self.handlers.update(handlers or {})
+        self._emit = emit or (lambda event: None)
+        self._stop = threading.Event()
+        self._workflows: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        self._checked_models: Dict[str, List[str]] = {}
+        self._keyframe_service: Optional[KeyframeGenerationService] = None
+
+    def check_backend(self) -> Dict[str, Any]:
+        """Connection test of this worker's ComfyUI backend."""
+        return self.api.test_connection()
+
+    def run(self, max_tasks: Optional[int] = None, exit_when_idle: bool = False) -> int:
+        """
+        Process tasks until stop() is called
+
+        Args:
+            max_tasks: Stop after this many tasks
+            exit_when_idle: Stop as soon as no task is runnable
+
+        Returns:
+            Number of processed tasks
+        """
+        processed = 0
+        self.emit("worker_start", comfy_url=self.comfy_url, remote=self.remote, kinds=list(self.kinds))
+        while not self._stop.is_set() and (max_tasks is None or processed < max_tasks):
+            if self.run_once():
+                processed += 1
+            elif exit_when_idle:
+                break
+            else:
+                self._stop.wait(self.poll_interval)
+        self.emit("worker_stop", processed=processed)
+        return processed
+
+    def run_once(self) -> bool:
+        """Claim and process one task; False if none was runnable."""
+        task = self.queue.claim(self.worker_id, self.kinds, self.lease_seconds)
+        if task is None:
+            return False
+        self._process(task)
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        self._emit({"event": event, "ts": round(time.time(), 3), "worker": self.worker_id, **fields})
+
+    # ------------------------------------------------------------------
+    # Task execution
+    # ------------------------------------------------------------------
+
+    def _process(self, task: Task) -> None:
+        self.emit("task_start", task=task.task_id, kind=task.kind, attempt=task.attempts)
+        lease_lost = threading.Event()
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(task, done, lease_lost), name=f"lease-{task.task_id}", daemon=True
+        )
+        heartbeat.start()
+        started = time.monotonic()
+        try:
+            handler = self.handlers.get(task.kind)
+            if handler is None:
+                raise ValueError(f"No handler for task kind '{task.kind}'")
+            result = handler(task)
+        except KeyboardInterrupt:
+            self.queue.release(task.task_id, self.worker_id)
+            raise
+        except Exception as e:
+            logger.error(f"Task {task.task_id} failed on {self.worker_id}: {e}", exc_info=True)
+            self.queue.fail(task.task_id, self.worker_id, str(e))
+            self.emit("task_failed", task=task.task_id, kind=task.kind, error=str(e))
+            return
+        finally:
+            done.set()
+            heartbeat.join()
+
+        seconds = round(time.monotonic() - started, 1)
+        if lease_lost.is_set() or not self.queue.complete(task.task_id, self.worker_id, result):
+            logger.warning(f"Lease of task {task.task_id} was lost; result discarded")
+            self.emit("task_lost", task=task.task_id, kind=task.kind, seconds=seconds)
+            return
+        self.emit("task_done", task=task.task_id, kind=task.kind, seconds=seconds)
+
+    def _heartbeat(self, task: Task, done: threading.Event, lease_lost: threading.Event) -> None:
+        interval = max(0.05, self.lease_seconds / 3)
+        while not done.wait(interval):
+            try:
+                if not self.queue.heartbeat(task.task_id, self.worker_id, self.lease_seconds):
+                    lease_lost.set()
+                    return
+            except Exception as e:
+                logger.warning(f"Heartbeat for task {task.task_id} failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Handlers
+    # ------------------------------------------------------------------
+
+    def _load_workflow(self, workflow_file: str, model_override: Optional[str] = None) -> Dict[str, Any]:
+        key = (workflow_file, model_override)
+        if key not in self._workflows:
+            workflow_path = os.path.join(self.config.get_workflow_dir(), workflow_file)
+            if not os.path.exists(workflow_path):
+                raise WorkflowLoadError(f"Workflow not found: {workflow_path}")
+            workflow = self.api.load_workflow(workflow_path)
+            if model_override:
+                workflow = inject_model_override(workflow, model_override)
+            self._workflows[key] = workflow
+        return self._workflows[key]
+
+    def _render_keyframe(self, task: Task) -> Dict[str, Any]:
+        payload = task.payload
+        shot = payload["shot"]
+        if self._keyframe_service is None:
+            self._keyframe_service = KeyframeGenerationService(self.config, self.project_store, comfy_api=self.api)
+        service = self._keyframe_service
+
+        workflow_file = get_workflow_for_shot(shot, payload["workflow_file"], self.config.get_workflow_dir())
+        workflow = self._load_workflow(workflow_file, payload.get("model_override"))
+        seed, variant_name = service.variant_identity(
+            shot.get("filename_base", f"shot_{shot.get('shot_id')}"),
+            payload["base_seed"],
+            payload["shot_idx"],
+            payload["variant_idx"],
+            payload["variants_per_shot"],
+        )
+        width, height = payload.get("resolution") or self.config.get_resolution_tuple()
+        output_dir = self.project_store.ensure_dir(payload["project"], "keyframes")
+
+        images = service.render_variant(
+            shot=shot,
+            workflow=workflow,
+            seed=seed,
+            variant_name=variant_name,
+            width=width,
+            height=height,
+            output_dir=output_dir,
+        )
+        if not images:
+            raise KeyframeGenerationError(f"{variant_name}: ComfyUI finished but no image was found")
+        return {"images": images, "seed": seed, "shot_id": shot.get("shot_id")}
+
+    def _render_video_segment(self, task: Task) -> Dict[str, Any]:
+        payload = task.payload
+        entry = dict(payload["entry"])
+        chained = task.dependency_result or {}
+        if chained.get("last_frame"):
+            entry.update(start_frame=chained["last_frame"], start_frame_source="chain", ready=True)
+        if not entry.get("start_frame"):
+            raise VideoGenerationError(f"{entry.get('plan_id')}: no start frame from the previous segment")
+
+        workflow = self._load_workflow(payload["workflow_file"], payload.get("model_override"))
+        model_validator = self.services.get(ModelValidator, self.config.get_comfy_root())
+        if self.remote:
+            self._checked_models[payload["workflow_file"]] = []  # Models live on the remote box
+        if payload["workflow_file"] not in self._checked_models:
+            self._checked_models[payload["workflow_file"]] = model_validator.find_missing(workflow)
+        missing = self._checked_models[payload["workflow_file"]]
+        if missing:
+            raise ModelValidationError(f"Models missing on {self.worker_id}: {', '.join(missing)}")
+
+        service = VideoGenerationService(self.project_store, model_validator, VideoGeneratorStateStore())
+        resolution = payload.get("resolution")
+        video_paths, last_frame = service._run_video_job(  # pylint: disable=protected-access
+            workflow_template=workflow,
+            entry=entry,
+            fps=payload["fps"],
+            project=payload["project"],
+            comfy_api=self.api,
+            extractor=LastFrameExtractor(),
+            resolution=tuple(resolution) if resolution else None,
+        )
+        return {"video_paths": video_paths, "last_frame": last_frame, "plan_id": entry.get("plan_id")}
+
+    def _render_transition(self, task: Task) -> Dict[str, Any]:
+        params = dict(task.payload)
+        service = FirstLastVideoService(self.config)
+        service.api = self.api
+        result = service.generate_transition(**params)
+        if not result.success:
+            raise VideoGenerationError(result.error or "Transition failed")
+        return {"video_path": result.video_path}
+
+
+__all__ = [
+    "WorkDispatcher",
+    "DistributedWorker",
+    "KIND_KEYFRAME",
+    "KIND_VIDEO",
+    "KIND_TRANSITION",
+    "TASK_KINDS",
+]
@@ -4,6 +4,8 @@ import glob
 import os
 import shutil
 import time
+import uuid
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
@@ -44,11 +46,28 @@ class GenerationResult:
     error: Optional[str] = None
 
 
+@dataclass
+class _TransitionJob:
+    """A queued transition of a multi-clip run."""
+    clip_index: int
+    index: int
+    start_image: str
+    end_image: str
+    output_prefix: str
+    comfy_prefix: str = ""  # Unique filename prefix of the queued prompt
+    prompt_id: Optional[str] = None
+    submitted_at: float = 0.0
+
+
 class FirstLastVideoService:
     """Service for generating First/Last Frame transition videos."""
 
     DEFAULT_WORKFLOW_FILE = "config/workflow_templates/gcvfl_wan_2.2_14b_flf2v.json"
     OUTPUT_DIR = "output/firstlast"
+    TRANSITION_TIMEOUT = 600  # 10 minutes per transition
+    MAX_IN_FLIGHT = 4  # Transitions queued in ComfyUI at the same time
+    POLL_INTERVAL = 2.0
+    VIDEO_EXTENSIONS = (".mp4", ".webm", ".mov", ".mkv")
 
     # Node IDs in the workflow
     NODES = {
@@ -140,13 +159,21 @@ class FirstLastVideoService:
         except Exception as e:
             logger.warning(f"Could not cleanup image {filename}: {e}")
 
+    @staticmethod
+    def _comfy_prefix(output_prefix: str) -> str:
+        """Filename prefix that only one queued prompt writes to."""
+        return f"{output_prefix}_{uuid.uuid4().hex[:8]}"
+
     def _find_output_video(self, start_time: float, prefix: str) -> Optional[str]:
-        """Find video file generated after start_time."""
+        """Find the video saved under a job's unique prefix after start_time.
+
+        Fallback for history entries without outputs; generic names such as
+        ``ComfyUI_*.mp4`` are never picked since they may belong to another job.
+        """
         comfy_root = self.config.get_comfy_root()
         output_patterns = [
-            os.path.join(comfy_root, "output", "video", f"{prefix}*.mp4"),
-            os.path.join(comfy_root, "output", "video", "ComfyUI*.mp4"),
-            os.path.join(comfy_root, "output", f"{prefix}*.mp4"),
+            os.path.join(comfy_root, "output", "video", f"{prefix}_*.mp4"),
+            os.path.join(comfy_root, "output", f"{prefix}_*.mp4"),
         ]
 
         # Wait a bit for file to appear
@@ -159,6 +186,67 @@ class FirstLastVideoService:
 
         return None
 
+    def _configure_workflow(
+        self,
+        uploaded_start: str,
+        uploaded_end: str,
+        prompt: str,
+        negative_prompt: Optional[str] = None,
+        width: int = 1280,
+        height: int = 720,
+        frames: int = 81,
+        fps: int = 16,
+        steps: int = 20,
+        cfg: float = 4.0,
+        output_prefix: str = "transition",
+        workflow_file: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Load the workflow and fill in images, prompts and sampling settings."""
+        workflow = self._load_workflow(workflow_file)
+
+        # Set images
+        workflow[self.NODES["start_image"]]["inputs"]["image"] = uploaded_start
+        workflow[self.NODES["end_image"]]["inputs"]["image"] = uploaded_end
+
+        # Set prompts
+        workflow[self.NODES["positive_prompt"]]["inputs"]["text"] = prompt
+        workflow[self.NODES["negative_prompt"]]["inputs"]["text"] = (
+            negative_prompt or self.DEFAULT_NEGATIVE
+        )
+
+        # Set resolution and frames
+        wan_node = workflow[self.NODES["wan_flf"]]["inputs"]
+        wan_node["width"] = width
+        wan_node["height"] = height
+        wan_node["length"] = frames
+
+        # Set FPS
+        workflow[self.NODES["create_video"]]["inputs"]["fps"] = fps
+
+        # Set sampling parameters
+        for sampler_key in ["sampler_high", "sampler_low"]:
+            sampler = workflow[self.NODES[sampler_key]]["inputs"]
+            sampler["steps"] = steps
+            sampler["cfg"] = cfg
+
+        # Set output prefix
+        workflow[self.NODES["save_video"]]["inputs"]["filename_prefix"] = f"video/{output_prefix}"
+
+        return workflow
+
+    def _move_to_output(self, video_path: str, output_prefix: str) -> str:
+        """Move a ComfyUI output video into our output directory."""
+        output_dir = self._get_output_dir()
+        dest_filename = f"{output_prefix}_{int(time.time())}.mp4"
+        dest_path = os.path.join(output_dir, dest_filename)
+        shutil.move(video_path, dest_path)
+        return dest_path
+
+    def _video_from_history(self, history: Dict[str, Any]) -> Optional[str]:
+        """Resolve the saved video of a finished job from its history outputs."""
+        output_root = os.path.join(self.config.get_comfy_root(), "output")
+        return ComfyUIAPI.find_output_file(history, output_root, self.VIDEO_EXTENSIONS)
+
     def generate_transition(
         self,
         start_image_path: str,
@@ -226,36 +314,20 @@ class FirstLastVideoService:
             # Step 2: Load and configure workflow
             if callback:
                 callback(0.1, "Configuring workflow...")
-            workflow = self._load_workflow(workflow_file)
-
-            # Set images
-            workflow[self.NODES["start_image"]]["inputs"]["image"] = uploaded_start
-            workflow[self.NODES["end_image"]]["inputs"]["image"] = uploaded_end
-
-            # Set prompts
-            workflow[self.NODES["positive_prompt"]]["inputs"]["text"] = prompt
-            workflow[self.NODES["negative_prompt"]]["inputs"]["text"] = (
-                negative_prompt or self.DEFAULT_NEGATIVE
+            comfy_prefix = self._comfy_prefix(output_prefix)
+            workflow = self._configure_workflow(
+                uploaded_start, uploaded_end, prompt,
+                negative_prompt=negative_prompt,
+                width=width,
+                height=height,
+                frames=frames,
+                fps=fps,
+                steps=steps,
+                cfg=cfg,
+                output_prefix=comfy_prefix,
+                workflow_file=workflow_file,
             )
 
-            # Set resolution and frames
-            wan_node = workflow[self.NODES["wan_flf"]]["inputs"]
-            wan_node["width"] = width
-            wan_node["height"] = height
-            wan_node["length"] = frames
-
-            # Set FPS
-            workflow[self.NODES["create_video"]]["inputs"]["fps"] = fps
-
-            # Set sampling parameters
-            for sampler_key in ["sampler_high", "sampler_low"]:
-                sampler = workflow[self.NODES[sampler_key]]["inputs"]
-                sampler["steps"] = steps
-                sampler["cfg"] = cfg
-
-            # Set output prefix
-            workflow[self.NODES["save_video"]]["inputs"]["filename_prefix"] = f"video/{output_prefix}"
-
             if callback:
                 callback(0.15, f"Configured: {width}x{height}, {frames} frames")
 
@@ -276,10 +348,12 @@ class FirstLastVideoService:
             result = self.api.monitor_progress(
                 prompt_id,
                 callback=progress_wrapper,
-                timeout=600  # 10 minutes
+                timeout=self.TRANSITION_TIMEOUT
             )
 
             if result["status"] != "success":
+                # Do not leave a timed-out prompt rendering in the background
+                self.api.cancel_prompt(prompt_id)
                 return TransitionResult(
                     success=False,
                     start_image=start_image_path,
@@ -291,15 +365,18 @@ class FirstLastVideoService:
             if callback:
                 callback(0.95, "Collecting output...")
 
-            video_path = self._find_output_video(generation_start, output_prefix)
-
-            if video_path:
-                # Move to our output directory
-                output_dir = self._get_output_dir()
-                dest_filename = f"{output_prefix}_{int(time.time())}.mp4"
-                dest_path = os.path.join(output_dir, dest_filename)
-                shutil.move(video_path, dest_path)
-                video_path = dest_path
+            video_path = (
+                self._video_from_history(self.api.get_history(prompt_id) or {})
+                or self._find_output_video(generation_start, comfy_prefix)
+            )
+            if not video_path:
+                return TransitionResult(
+                    success=False,
+                    start_image=start_image_path,
+                    end_image=end_image_path,
+                    error=f"No output video found for prompt {prompt_id}"
+                )
+            video_path = self._move_to_output(video_path, output_prefix)
 
             if callback:
                 callback(1.0, "Complete")
@@ -420,20 +497,26 @@ class FirstLastVideoService:
         cfg: float = 4.0,
         callback: Optional[Callable[[float, str], None]] = None,
         workflow_file: Optional[str] = None,
+        max_in_flight: Optional[int] = None,
     ) -> GenerationResult:
         """
         Generate all clips from grouped images.
 
+        Transitions only depend on their two keyframes, so all of them are
+        queued up front (at most ``max_in_flight`` at a time) and collected
+        as they finish. Each image is uploaded once per run, even when it is
+        the end of one transition and the start of the next.
+
         Args:
             clips: List of clip groups, each group is a list of image paths
             prompt: Positive prompt (used for all transitions)
+            max_in_flight: Transitions queued concurrently (default MAX_IN_FLIGHT)
             ... (same parameters as generate_transition)
 
         Returns:
             GenerationResult with all clips
         """
         start_time = time.time()
-        clip_results: List[ClipResult] = []
         total_transitions = sum(max(0, len(clip) - 1) for clip in clips)
 
         if total_transitions == 0:
@@ -442,35 +525,59 @@ class FirstLastVideoService:
                 error="No transitions to generate (need at least 2 images per clip)"
             )
 
-        transitions_done = 0
-
+        jobs: List[_TransitionJob] = []
         for clip_idx, clip_images in enumerate(clips):
             if len(clip_images) < 2:
                 logger.warning(f"Clip {clip_idx + 1} has less than 2 images, skipping")
                 continue
+            for i in range(len(clip_images) - 1):
+                jobs.append(_TransitionJob(
+                    clip_index=clip_idx,
+                    index=i,
+                    start_image=clip_images[i],
+                    end_image=clip_images[i + 1],
+                    output_prefix=f"clip{clip_idx + 1:02d}_trans{i + 1:02d}",
+                ))
+
+        settings = dict(
+            negative_prompt=negative_prompt,
+            width=width,
+            height=height,
+            frames=frames,
+            fps=fps,
+            steps=steps,
+            cfg=cfg,
+            workflow_file=workflow_file,
+        )
 
-            def clip_callback(pct, status):
-                if callback:
-                    clip_transitions = len(clip_images) - 1
-                    overall = (transitions_done + pct * clip_transitions) / total_transitions
-                    callback(overall, status)
+        uploads: Dict[str, str] = {}
+        try:
+            if callback:
+                callback(0.0, "Uploading images...")
+            upload_errors = self._upload_unique_images(jobs, uploads)
+            results = self._run_transitions(
+                jobs, prompt, settings, uploads, upload_errors,
+                max_in_flight or self.MAX_IN_FLIGHT, callback,
+            )
+        finally:
+            for filename in uploads.values():
+                self._cleanup_image(filename)
 
-            result = self.generate_clip(
-                image_paths=clip_images,
-                prompt=prompt,
+        clip_results: List[ClipResult] = []
+        for clip_idx, clip_images in enumerate(clips):
+            if len(clip_images) < 2:
+                continue
+            transitions = [results[(clip_idx, i)] for i in range(len(clip_images) - 1)]
+            for i, transition in enumerate(transitions):
+                if not transition.success:
+                    logger.warning(f"Clip {clip_idx + 1} transition {i + 1} failed: {transition.error}")
+            successful = [t for t in transitions if t.success]
+            clip_results.append(ClipResult(
+                success=len(successful) > 0,
                 clip_index=clip_idx,
-                negative_prompt=negative_prompt,
-                width=width,
-                height=height,
-                frames=frames,
-                fps=fps,
-                steps=steps,
-                cfg=cfg,
-                callback=clip_callback,
-                workflow_file=workflow_file,
-            )
-            clip_results.append(result)
-            transitions_done += len(clip_images) - 1
+                transitions=transitions,
+                error=None if successful else "All transitions failed"
+            ))
 
         duration = time.time() - start_time
         successful_clips = [c for c in clip_results if c.success]
@@ -483,5 +590,149 @@ class FirstLastVideoService:
             error=None if successful_clips else "All clips failed"
         )
 
+    def _upload_unique_images(self, jobs: List[_TransitionJob], uploads: Dict[str, str]) -> Dict[str, str]:
+        """Upload every distinct image of the run once.
+
+        Fills ``uploads`` (image path -> ComfyUI filename) and returns the
+        errors for images that could not be uploaded.
+        """
+        errors: Dict[str, str] = {}
+        for job in jobs:
+            for label, path in (("Start", job.start_image), ("End", job.end_image)):
+                if path in uploads or path in errors:
+                    continue
+                if not os.path.exists(path):
+                    errors[path] = f"{label} image not found: {path}"
+                    continue
+                try:
+                    # Index in the prefix keeps same-named images apart
+                    uploads[path] = self._upload_image(path, f"flf_{len(uploads):03d}")
+                except Exception as e:
+                    logger.error(f"Could not upload {path}: {e}")
+                    errors[path] = f"Upload failed for {path}: {e}"
+        return errors
+
+    def _run_transitions(
+        self,
+        jobs: List[_TransitionJob],
+        prompt: str,
+        settings: Dict[str, Any],
+        uploads: Dict[str, str],
+        upload_errors: Dict[str, str],
+        max_in_flight: int,
+        callback: Optional[Callable[[float, str], None]] = None,
+    ) -> Dict[Tuple[int, int], TransitionResult]:
+        """Keep up to ``max_in_flight`` transitions queued and collect them as they finish.
+
+        Jobs are tracked by polling ``/history`` instead of one WebSocket per
+        job, since all jobs share the same ComfyUI client id.
+        """
+        pending = deque(jobs)
+        in_flight: List[_TransitionJob] = []  # Oldest first
+        results: Dict[Tuple[int, int], TransitionResult] = {}
+        last_progress = time.time()
+
+        def finish(job: _TransitionJob, result: TransitionResult) -> None:
+            results[(job.clip_index, job.index)] = result
+            if callback:
+                state = "done" if result.success else "failed"
+                callback(
+                    len(results) / len(jobs),
+                    f"Clip {job.clip_index + 1}: Transition {job.index + 1} {state} "
+                    f"({len(results)}/{len(jobs)})"
+                )
+
+        def failure(job: _TransitionJob, error: str) -> TransitionResult:
+            return TransitionResult(
+                success=False,
+                start_image=job.start_image,
+                end_image=job.end_image,
+                error=error
+            )
+
+        while pending or in_flight:
+            # Top up the ComfyUI queue
+            while pending and len(in_flight) < max_in_flight:
+                job = pending.popleft()
+                error = upload_errors.get(job.start_image) or upload_errors.get(job.end_image)
+                if error:
+                    finish(job, failure(job, error))
+                    continue
+                try:
+                    job.comfy_prefix = self._comfy_prefix(job.output_prefix)
+                    workflow = self._configure_workflow(
+                        uploads[job.start_image], uploads[job.end_image], prompt,
+                        output_prefix=job.comfy_prefix, **settings
+                    )
+                    job.submitted_at = time.time()
+                    job.prompt_id = self.api.queue_prompt(workflow)
+                    logger.info(f"Queued First/Last Frame job {job.output_prefix}: {job.prompt_id}")
+                    in_flight.append(job)
+                except Exception as e:
+                    logger.error(f"Could not queue {job.output_prefix}: {e}")
+                    finish(job, failure(job, str(e)))
+
+            completed = False
+            for job in list(in_flight):
+                history = self.api.get_history(job.prompt_id)
+                if not history:
+                    continue
+                in_flight.remove(job)
+                completed = True
+                finish(job, self._collect_transition(job, history))
+
+            if completed:
+                last_progress = time.time()
+            elif in_flight:
+                if time.time() - last_progress > self.TRANSITION_TIMEOUT:
+                    # ComfyUI runs jobs in order, so the oldest one is the stuck one
+                    job = in_flight.pop(0)
+                    self.api.cancel_prompt(job.prompt_id)
+                    finish(job, failure(job, f"Timeout after {self.TRANSITION_TIMEOUT}s waiting for completion"))
+                    last_progress = time.time()
+                else:
+                    time.sleep(self.POLL_INTERVAL)
+
+        return results
+
+    def _collect_transition(self, job: _TransitionJob, history: Dict[str, Any]) -> TransitionResult:
+        """Turn a finished job's history entry into a TransitionResult."""
+        status = history.get("status") or {}
+        if status.get("status_str") == "error":
+            return TransitionResult(
+                success=False,
+                start_image=job.start_image,
+                end_image=job.end_image,
+                error="ComfyUI reported an execution error"
+            )
+
+        try:
+            video_path = self._video_from_history(history)
+            if not video_path:
+                video_path = self._find_output_video(job.submitted_at, job.comfy_prefix)
+            if not video_path:
+                return TransitionResult(
+                    success=False,
+                    start_image=job.start_image,
+                    end_image=job.end_image,
+                    error=f"No output video found for prompt {job.prompt_id}"
+                )
+            video_path = self._move_to_output(video_path, job.output_prefix)
+        except Exception as e:
+            logger.error(f"Could not collect output of {job.output_prefix}: {e}")
+            return TransitionResult(
+                success=False,
+                start_image=job.start_image,
+                end_image=job.end_image,
+                error=str(e)
+            )
+
+        return TransitionResult(
+            success=True,
+            start_image=job.start_image,
+            end_image=job.end_image,
+            video_path=video_path
+        )
+
 
 __all__ = ["FirstLastVideoService", "TransitionResult", "ClipResult", "GenerationResult"]
@@ -6,6 +6,8 @@ Modules:
 - file_handler: Image copy and cleanup operations
 - checkpoint_handler: Progress tracking and persistence
 - workflow_utils: LoRA and workflow selection
+- progress_events: Typed progress events and UI coalescing
+- parameter_sweep: Sweep plans over seed/cfg/steps/sampler/LoRA strength
 """
 
 from .file_handler import KeyframeFileHandler
@@ -15,19 +17,46 @@ from .checkpoint_handler import (
     format_progress,
 )
 from .workflow_utils import (
+    draft_render_settings,
+    get_workflow_steps,
     inject_model_override,
     get_workflow_for_shot,
     LoraParamsResolver,
 )
+from .parameter_sweep import (
+    build_sweep,
+    load_parameter_manifest,
+    matches_filter,
+    parse_sweep_spec,
+)
+from .progress_events import (
+    GenerationEvent,
+    ImagesAdded,
+    ProgressCoalescer,
+    StatusUpdate,
+    compact_events,
+)
 
 __all__ = [
     # Classes
     "KeyframeFileHandler",
     "CheckpointHandler",
     "LoraParamsResolver",
+    "ProgressCoalescer",
+    # Events
+    "GenerationEvent",
+    "ImagesAdded",
+    "StatusUpdate",
     # Functions
     "create_checkpoint",
     "format_progress",
     "inject_model_override",
     "get_workflow_for_shot",
+    "get_workflow_steps",
+    "draft_render_settings",
+    "build_sweep",
+    "parse_sweep_spec",
+    "load_parameter_manifest",
+    "matches_filter",
+    "compact_events",
 ]
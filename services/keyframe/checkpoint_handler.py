@@ -17,7 +17,9 @@ def create_checkpoint(
     storyboard_file: str,
     workflow_file: str,
     variants_per_shot: int,
-    base_seed: int
+    base_seed: int,
+    quality: str = "final",
+    draft_downscale: bool = False
 ) -> Dict[str, Any]:
     """Create a new generation checkpoint.
 
@@ -26,11 +28,13 @@ def create_checkpoint(
         workflow_file: Workflow template filename
         variants_per_shot: Number of variants per shot
         base_seed: Base random seed
+        quality: "final" or "draft" (reduced steps, finalized later)
+        draft_downscale: Also reduce the draft resolution (approximate preview)
 
     Returns:
         New checkpoint dictionary
     """
-    return {
+    checkpoint = {
         "storyboard_file": storyboard_file,
         "workflow_file": workflow_file,
         "variants_per_shot": int(variants_per_shot),
@@ -40,7 +44,11 @@ def create_checkpoint(
         "current_shot": None,
         "total_images_generated": 0,
         "status": "running",
+        "quality": quality,
     }
+    if quality == "draft" and draft_downscale:
+        checkpoint["draft_downscale"] = True
+    return checkpoint
 
 
 def format_progress(checkpoint: Dict[str, Any], total_shots: int) -> str:
@@ -64,6 +72,7 @@ def format_progress(checkpoint: Dict[str, Any], total_shots: int) -> str:
 - **Completed Shots:** {completed}/{total_shots}
 - **Total Images Generated:** {total_images}
 - **Current Shot:** {current_shot}
+- **Quality:** {checkpoint.get('quality', 'final')}
 - **Started:** {checkpoint.get('started_at', 'N/A')}
 """
 
@@ -0,0 +1,273 @@
+"""Parameter sweeps - grid/random exploration of sampling parameters per shot.
+
+A sweep spec maps parameter names to either a list of values (grid axis)
+or a random range (``{"min": a, "max": b}`` or ``{"choices": [...]}``).
+:func:`build_sweep` crosses the grid axes, draws the random axes and drops
+duplicate configurations. The parameter set of every rendered file is kept
+in ``keyframes/parameters.json`` so the Keyframe Selector can filter by it.
+
+Text form (UI / CLI), entries separated by ``;`` or new lines::
+
+    seed=1000..1003; cfg=3,4.5,6; sampler=euler,dpmpp_2m; lora_strength=~0.6..1.0
+
+- ``a,b,c``  grid values
+- ``a..b``   inclusive integer range (grid)
+- ``~a..b``  random uniform range, ``~a,b,c`` random choice
+"""
+import itertools
+import json
+import os
+import random
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from domain.exceptions import InputValidationError
+
+SWEEP_PARAMETERS = ("seed", "cfg", "steps", "sampler", "lora_strength")
+MANIFEST_FILENAME = "parameters.json"
+MAX_SWEEP_CONFIGS = 256
+# Prompts kept queued in ComfyUI ahead of the one being collected
+SWEEP_QUEUE_DEPTH = 2
+MAX_SWEEP_QUEUE_DEPTH = 8
+
+_INT_PARAMS = ("seed", "steps")
+_FLOAT_PARAMS = ("cfg", "lora_strength")
+
+
+def normalize_value(name: str, value: Any) -> Any:
+    """Coerce a parameter value to its canonical type (floats rounded to 2 decimals).
+
+    Raises:
+        InputValidationError: Unknown parameter or value of the wrong type
+    """
+    if name not in SWEEP_PARAMETERS:
+        raise InputValidationError(f"Unknown sweep parameter '{name}' (allowed: {', '.join(SWEEP_PARAMETERS)})")
+    try:
+        if name in _INT_PARAMS:
+            number = float(value)
+            if not number.is_integer() or number < (0 if name == "seed" else 1):
+                raise ValueError(value)
+            return int(number)
+        if name in _FLOAT_PARAMS:
+            return round(float(value), 2)
+    except (TypeError, ValueError):
+        raise InputValidationError(f"Invalid value for {name}: {value!r}") from None
+    text = str(value).strip()
+    if not text:
+        raise InputValidationError(f"Empty value for {name}")
+    return text
+
+
+def parse_sweep_spec(text: str) -> Dict[str, Any]:
+    """Parse the text form of a sweep spec (see module docstring).
+
+    Raises:
+        InputValidationError: On malformed entries
+    """
+    spec: Dict[str, Any] = {}
+    for raw in text.replace("\n", ";").split(";"):
+        entry = raw.strip()
+        if not entry:
+            continue
+        name, sep, values = entry.partition("=")
+        name, values = name.strip(), values.strip()
+        if not sep or not values:
+            raise InputValidationError(f"Sweep entry '{entry}' must look like name=values")
+        randomized = values.startswith("~")
+        values = values.lstrip("~").strip()
+
+        if ".." in values:
+            low, _, high = values.partition("..")
+            low, high = normalize_value(name, low), normalize_value(name, high)
+            if name == "sampler" or low > high:
+                raise InputValidationError(f"Invalid range for {name}: {values}")
+            if randomized:
+                spec[name] = {"min": low, "max": high}
+            elif name in _INT_PARAMS:
+                spec[name] = list(range(low, high + 1))
+            else:
+                raise InputValidationError(f"{name} ranges are random only - use ~{values} or list values")
+        else:
+            choices = [normalize_value(name, value) for value in values.split(",") if value.strip()]
+            spec[name] = {"choices": choices} if randomized else choices
+    return spec
+
+
+def build_sweep(
+    spec: Dict[str, Any],
+    samples: int = 1,
+    defaults: Optional[Dict[str, Any]] = None,
+    rng_seed: Optional[int] = None,
+    limit: int = MAX_SWEEP_CONFIGS,
+) -> List[Dict[str, Any]]:
+    """Expand a sweep spec into unique parameter configurations.
+
+    Args:
+        spec: Parameter -> list (grid) or {"min","max"} / {"choices"} (random)
+        samples: Random draws per grid point (ignored without random axes)
+        defaults: Values for parameters the spec leaves out (e.g. the base seed)
+        rng_seed: Seed for the random draws (same seed = same sweep)
+        limit: Maximum number of configurations
+
+    Returns:
+        Configurations in grid order, duplicates removed
+
+    Raises:
+        InputValidationError: Invalid spec or more than ``limit`` configurations
+    """
+    grid: List[Tuple[str, List[Any]]] = []
+    ranges: Dict[str, Dict[str, Any]] = {}
+    for name, values in spec.items():
+        if isinstance(values, dict):
+            ranges[name] = _normalize_range(name, values)
+        else:
+            values = [normalize_value(name, value) for value in (values if isinstance(values, list) else [values])]
+            if not values:
+                raise InputValidationError(f"No values for {name}")
+            grid.append((name, values))
+
+    draws = max(1, int(samples)) if ranges else 1
+    if _product_size(grid) * draws > limit * 4:  # Refuse before expanding huge grids
+        raise InputValidationError(f"Sweep too large (max. {limit} configurations)")
+
+    rng = random.Random(rng_seed)
+    base = {name: normalize_value(name, value) for name, value in (defaults or {}).items() if value is not None}
+    configs: List[Dict[str, Any]] = []
+    seen = set()
+    for point in itertools.product(*(values for _, values in grid)):
+        for _ in range(draws):
+            config = dict(base)
+            config.update(zip((name for name, _ in grid), point))
+            config.update({name: _draw(name, spec_range, rng) for name, spec_range in ranges.items()})
+            key = config_key(config)
+            if key in seen:
+                continue
+            seen.add(key)
+            configs.append(config)
+    if len(configs) > limit:
+        raise InputValidationError(f"Sweep has {len(configs)} configurations (max. {limit})")
+    return configs
+
+
+def config_key(params: Dict[str, Any], model: Optional[str] = None) -> Tuple[Tuple[str, Any], ...]:
+    """Hashable identity of a configuration (sweep parameters plus the model override)."""
+    return tuple(sorted(
+        (name, normalize_value(name, value)) for name, value in params.items()
+        if name in SWEEP_PARAMETERS and value is not None
+    )) + (("model", model or None),)
+
+
+def describe_params(params: Dict[str, Any]) -> str:
+    """Short label like ``seed 1001 · cfg 4.5 · euler``."""
+    parts = []
+    for name in SWEEP_PARAMETERS:
+        if params.get(name) is None:
+            continue
+        parts.append(str(params[name]) if name == "sampler" else f"{name.replace('_', ' ')} {params[name]}")
+    return " · ".join(parts)
+
+
+def matches_filter(params: Dict[str, Any], filter_text: str) -> bool:
+    """Check params against a filter like ``cfg>=4 sampler=euler`` (all terms must match).
+
+    Operators: ``=``, ``!=``, ``<``, ``<=``, ``>``, ``>=``; terms are separated
+    by spaces, commas or semicolons. Files without parameters never match a
+    non-empty filter.
+    """
+    terms = [term for term in filter_text.replace(",", " ").replace(";", " ").split() if term]
+    for term in terms:
+        for op in ("!=", "<=", ">=", "=", "<", ">"):
+            name, sep, expected = term.partition(op)
+            if sep:
+                break
+        else:
+            raise InputValidationError(f"Invalid filter term '{term}'")
+        name = name.strip()
+        if params.get(name) is None:
+            return False
+        actual = normalize_value(name, params[name])
+        expected = normalize_value(name, expected)
+        if op in ("=", "!="):
+            if (actual == expected) != (op == "="):
+                return False
+        elif name == "sampler":
+            raise InputValidationError(f"Operator {op} is not supported for sampler")
+        elif not {"<": actual < expected, "<=": actual <= expected,
+                  ">": actual > expected, ">=": actual >= expected}[op]:
+            return False
+    return True
+
+
+def load_parameter_manifest(keyframes_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Filename -> recorded parameters (empty if no sweep ran yet)."""
+    path = os.path.join(keyframes_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def record_parameters(keyframes_dir: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """Merge filename -> parameter entries into the manifest (atomic replace)."""
+    files = load_parameter_manifest(keyframes_dir)
+    files.update(entries)
+    _write_manifest(keyframes_dir, files)
+
+
+def forget_parameters(keyframes_dir: str, filenames: Iterable[str]) -> None:
+    """Drop manifest entries of files that were overwritten by a regular run."""
+    files = load_parameter_manifest(keyframes_dir)
+    stale = [name for name in filenames if name in files]
+    if not stale:
+        return
+    for name in stale:
+        del files[name]
+    _write_manifest(keyframes_dir, files)
+
+
+def rendered_configs(manifest: Dict[str, Dict[str, Any]], shot_id: str, workflow_file: str,
+                     keyframes_dir: str) -> Iterable[Tuple[Tuple[str, Any], ...]]:
+    """Keys (incl. model override) of configurations a shot already has (files still present)."""
+    for filename, params in manifest.items():
+        if (params.get("shot_id") == shot_id and params.get("workflow") == workflow_file
+                and os.path.exists(os.path.join(keyframes_dir, filename))):
+            yield config_key(params, params.get("model"))
+
+
+def _write_manifest(keyframes_dir: str, files: Dict[str, Dict[str, Any]]) -> None:
+    path = os.path.join(keyframes_dir, MANIFEST_FILENAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"files": files}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _normalize_range(name: str, values: Dict[str, Any]) -> Dict[str, Any]:
+    if "choices" in values:
+        choices = [normalize_value(name, value) for value in values["choices"]]
+        if not choices:
+            raise InputValidationError(f"No choices for {name}")
+        return {"choices": choices}
+    if name == "sampler" or "min" not in values or "max" not in values:
+        raise InputValidationError(f"Random range for {name} needs min/max")
+    low, high = normalize_value(name, values["min"]), normalize_value(name, values["max"])
+    if low > high:
+        raise InputValidationError(f"Invalid range for {name}: {low}..{high}")
+    return {"min": low, "max": high}
+
+
+def _draw(name: str, spec_range: Dict[str, Any], rng: random.Random) -> Any:
+    if "choices" in spec_range:
+        return rng.choice(spec_range["choices"])
+    if name in _INT_PARAMS:
+        return rng.randint(spec_range["min"], spec_range["max"])
+    return round(rng.uniform(spec_range["min"], spec_range["max"]), 2)
+
+
+def _product_size(grid: List[Tuple[str, List[Any]]]) -> int:
+    size = 1
+    for _, values in grid:
+        size *= len(values)
+    return size
@@ -0,0 +1,101 @@
+"""Keyframe progress events - typed generation updates and UI coalescing.
+
+``KeyframeGenerationService.run_generation_events`` emits small typed
+events instead of re-yielding the cumulative image list on every status
+change. :class:`ProgressCoalescer` turns them into UI updates: status text
+goes out immediately, the gallery (and the hidden checkpoint JSON) only
+when new images arrived and the refresh interval elapsed, and always on the
+final event. :func:`compact_events` folds old events of a background job so
+its buffer stays bounded while late followers still see every image.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+
+@dataclass(frozen=True)
+class StatusUpdate:
+    """Status/progress text changed."""
+    status: str
+    progress_md: str
+    current_shot: str
+    checkpoint: Dict[str, Any] = field(compare=False)
+    final: bool = False
+
+
+@dataclass(frozen=True)
+class ImagesAdded:
+    """New keyframe images were written (only the new ones)."""
+    images: Tuple[str, ...]
+
+
+GenerationEvent = Union[StatusUpdate, ImagesAdded]
+
+# (gallery, status, progress, checkpoint, current shot) - same order as the UI outputs
+UIUpdate = Tuple[Any, str, str, Any, str]
+
+
+def compact_events(events: List[GenerationEvent]) -> List[GenerationEvent]:
+    """Fold events into one ImagesAdded (all images) plus the latest StatusUpdate."""
+    images = tuple(image for event in events if isinstance(event, ImagesAdded) for image in event.images)
+    statuses = [event for event in events if isinstance(event, StatusUpdate)]
+    folded: List[GenerationEvent] = [ImagesAdded(images)] if images else []
+    if statuses:
+        folded.append(statuses[-1])
+    return folded
+
+
+class ProgressCoalescer:
+    """Coalesce generation events into throttled UI updates."""
+
+    def __init__(
+        self,
+        gallery_interval: float = 2.0,
+        unchanged: Any = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            gallery_interval: Minimum seconds between gallery refreshes
+            unchanged: Value that tells the UI to keep an output as is (e.g. ``gr.update()``)
+            clock: Monotonic time source
+        """
+        self.gallery_interval = gallery_interval
+        self.unchanged = unchanged
+        self._clock = clock
+        self.images: List[str] = []
+        self._pending = 0
+        self._last_flush = clock()
+        self._status: Optional[StatusUpdate] = None
+
+    def feed(self, event: GenerationEvent) -> Optional[UIUpdate]:
+        """
+        Consume one event
+
+        Returns:
+            UI update tuple, or None if nothing needs to be sent yet
+        """
+        if isinstance(event, ImagesAdded):
+            self.images.extend(event.images)
+            self._pending += len(event.images)
+            if self._status is None or not self._flush_due():
+                return None
+            return self._update(self._status, flush=True)
+
+        self._status = event
+        return self._update(event, flush=event.final or (self._pending > 0 and self._flush_due()))
+
+    def _flush_due(self) -> bool:
+        return self._clock() - self._last_flush >= self.gallery_interval
+
+    def _update(self, status: StatusUpdate, flush: bool) -> UIUpdate:
+        if flush:
+            self._pending = 0
+            self._last_flush = self._clock()
+            gallery, checkpoint = list(self.images), status.checkpoint
+        else:
+            gallery, checkpoint = self.unchanged, self.unchanged
+        return gallery, status.status, status.progress_md, checkpoint, status.current_shot
+
+
+__all__ = ["StatusUpdate", "ImagesAdded", "GenerationEvent", "ProgressCoalescer", "compact_events"]
@@ -77,6 +77,59 @@ def inject_model_override(workflow: Dict[str, Any], model_path: str) -> Dict[str
     return workflow
 
 
+def get_workflow_steps(workflow: Dict[str, Any]) -> Optional[int]:
+    """Return the sampling step count of a workflow (largest sampler/scheduler value).
+
+    Args:
+        workflow: Workflow dictionary (API format)
+
+    Returns:
+        Step count or None if no node has an integer "steps" input
+    """
+    steps = [
+        node["inputs"]["steps"]
+        for node in workflow.values()
+        if isinstance(node, dict) and isinstance(node.get("inputs"), dict)
+        and isinstance(node["inputs"].get("steps"), int)
+    ]
+    return max(steps) if steps else None
+
+
+def draft_render_settings(
+    width: int,
+    height: int,
+    steps: Optional[int],
+    step_ratio: float,
+    min_steps: int = 4,
+    scale: float = 1.0
+) -> Dict[str, Any]:
+    """Reduced step count (and optionally resolution) for draft keyframes.
+
+    Steps are scaled but never below min_steps or above the workflow value.
+    The resolution stays final unless ``scale`` < 1: the same seed at another
+    size gives a different composition, so downscaled drafts only approximate
+    the final render. Scaled sides are rounded to multiples of 16 (latent grid).
+
+    Args:
+        width: Final width
+        height: Final height
+        steps: Final step count (None = unknown, left untouched)
+        step_ratio: Step factor (e.g. 0.5)
+        min_steps: Lower bound for draft steps
+        scale: Resolution factor (1.0 = final resolution; opt-in, approximate)
+
+    Returns:
+        Dict with width, height and steps (None if unknown)
+    """
+    def side(value: int) -> int:
+        return max(256, int(round(value * scale / 16)) * 16)
+
+    draft_steps = None
+    if steps:
+        draft_steps = min(steps, max(min_steps, int(round(steps * step_ratio))))
+    return {"width": min(width, side(width)), "height": min(height, side(height)), "steps": draft_steps}
+
+
 def get_workflow_for_shot(
     shot: Dict[str, Any],
     base_workflow_file: str,
@@ -1,5 +1,8 @@
 """Service layer for keyframe generation (Phase 1)."""
+import json
 import os
+import shutil
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, List, Tuple, Generator, Optional
 
@@ -9,9 +12,12 @@ from infrastructure.config_manager import ConfigManager
 from infrastructure.comfy_api import ComfyUIAPI
 from infrastructure.logger import get_logger
 from infrastructure.job_status_store import JobStatusStore
+from infrastructure.service_container import get_service_container
+from domain.exceptions import InputValidationError, KeyframeGenerationError
 from domain.models import Storyboard
 from services.character_lora_service import CharacterLoraService
 from services.cleanup_service import CleanupService
+from services.selection_service import SelectionService
 
 # Import from keyframe package
 from services.keyframe import (
@@ -19,10 +25,24 @@ from services.keyframe import (
     CheckpointHandler,
     LoraParamsResolver,
     create_checkpoint,
+    draft_render_settings,
     format_progress,
+    get_workflow_steps,
     inject_model_override,
     get_workflow_for_shot,
 )
+from services.keyframe.parameter_sweep import (
+    MAX_SWEEP_QUEUE_DEPTH,
+    SWEEP_QUEUE_DEPTH,
+    build_sweep,
+    config_key,
+    describe_params,
+    forget_parameters,
+    load_parameter_manifest,
+    record_parameters,
+    rendered_configs,
+)
+from services.keyframe.progress_events import GenerationEvent, ImagesAdded, StatusUpdate
 
 logger = get_logger(__name__)
 
@@ -45,13 +65,17 @@ class KeyframeService:
         storyboard: Storyboard,
         workflow_file: str,
         variants_per_shot: int,
-        base_seed: int
+        base_seed: int,
+        draft: bool = False,
+        draft_downscale: bool = False
     ) -> Dict[str, Any]:
         return create_checkpoint(
             storyboard_file=storyboard.raw.get("storyboard_file"),
             workflow_file=workflow_file,
             variants_per_shot=variants_per_shot,
-            base_seed=base_seed
+            base_seed=base_seed,
+            quality="draft" if draft else "final",
+            draft_downscale=draft_downscale
         )
 
 
@@ -59,8 +83,19 @@ class KeyframeGenerationService:
     """Service for generating keyframe variants using ComfyUI.
 
     Extracted from KeyframeGeneratorAddon to reduce complexity and improve testability.
+
+    Draft mode (checkpoint quality "draft") renders all variants with fewer
+    steps at the final resolution, so a seed keeps its composition;
+    finalize_events() then re-renders only the exported selection at full
+    quality with the same seeds. Reducing the resolution as well is opt-in
+    (checkpoint "draft_downscale") and only gives an approximate preview.
     """
 
+    # Draft mode: step factor, minimum steps and opt-in resolution factor
+    DRAFT_STEP_RATIO = 0.5
+    MIN_DRAFT_STEPS = 4
+    DRAFT_DOWNSCALE = 0.5
+
     def __init__(
         self,
         config: ConfigManager,
@@ -73,14 +108,15 @@ class KeyframeGenerationService:
         self.api = comfy_api
         self.is_running = False
         self.stop_requested = False
-        self._job_store = JobStatusStore()
+        services = get_service_container()
+        self._job_store = services.get(JobStatusStore)
 
-        # Initialize handlers
-        self.character_lora_service = CharacterLoraService(config)
+        # Initialize handlers (LoRA scan cache is shared with the addons)
+        self.character_lora_service = services.get(CharacterLoraService, config)
         self._file_handler = KeyframeFileHandler(project_store)
         self._checkpoint_handler = CheckpointHandler(project_store)
         self._lora_resolver = LoraParamsResolver(self.character_lora_service)
-        self._cleanup_service = CleanupService(project_store)
+        self._cleanup_service = services.get(CleanupService, project_store)
 
     def _format_progress(self, checkpoint: Dict[str, Any], total_shots: int) -> str:
         """Backward-compatible wrapper for progress formatting."""
@@ -93,6 +129,10 @@ class KeyframeGenerationService:
         except Exception as exc:
             logger.warning(f"Failed to save checkpoint: {exc}")
 
+    def _load_checkpoint(self, storyboard_file: str, project: Dict[str, Any]) -> Dict[str, Any]:
+        """Checkpoint of a storyboard run (empty dict if none)."""
+        return self._checkpoint_handler.load(storyboard_file, project)
+
     def _copy_generated_images(
         self,
         variant_name: str,
@@ -143,7 +183,36 @@ class KeyframeGenerationService:
         progress_callback=None,
         model_override: Optional[str] = None
     ) -> Generator[Tuple[List[str], str, str, Dict, str], None, None]:
-        """Run the complete keyframe generation process."""
+        """Run the complete keyframe generation process.
+
+        Backward-compatible form of run_generation_events(): yields
+        (all images so far, status, progress, checkpoint, current shot).
+        """
+        all_generated_images: List[str] = []
+        for event in self.run_generation_events(
+            storyboard, workflow_file, checkpoint, project, comfy_url,
+            progress_callback=progress_callback, model_override=model_override
+        ):
+            if isinstance(event, ImagesAdded):
+                all_generated_images.extend(event.images)
+                continue
+            yield all_generated_images, event.status, event.progress_md, event.checkpoint, event.current_shot
+
+    def run_generation_events(
+        self,
+        storyboard: Storyboard,
+        workflow_file: str,
+        checkpoint: Dict[str, Any],
+        project: Dict[str, Any],
+        comfy_url: str,
+        progress_callback=None,
+        model_override: Optional[str] = None
+    ) -> Generator[GenerationEvent, None, None]:
+        """Run the complete keyframe generation process as typed events.
+
+        Yields ImagesAdded with only the newly written images and a
+        StatusUpdate per status change; the last event is a final StatusUpdate.
+        """
         try:
             self._job_store.set_status(
                 project.get("path"),
@@ -169,8 +238,8 @@ class KeyframeGenerationService:
                     "failed",
                     message=f"Connection failed: {conn_result['error']}",
                 )
-                yield [], f"**❌ Error:** Connection failed - {conn_result['error']}", \
-                      "Connection failed", checkpoint, "Error"
+                yield StatusUpdate(f"**❌ Error:** Connection failed - {conn_result['error']}",
+                                   "Connection failed", "Error", checkpoint, final=True)
                 return
 
             # Cleanup old files before starting
@@ -181,8 +250,8 @@ class KeyframeGenerationService:
             # Load workflow template
             workflow_path = os.path.join(self.config.get_workflow_dir(), workflow_file)
             if not os.path.exists(workflow_path):
-                yield [], f"**❌ Error:** Workflow not found: `{workflow_path}`", \
-                      "Workflow missing", checkpoint, "Error"
+                yield StatusUpdate(f"**❌ Error:** Workflow not found: `{workflow_path}`",
+                                   "Workflow missing", "Error", checkpoint, final=True)
                 return
 
             workflow = self.api.load_workflow(workflow_path)
@@ -192,6 +261,9 @@ class KeyframeGenerationService:
                 workflow = inject_model_override(workflow, model_override)
                 logger.info(f"Model override applied: {model_override}")
 
+            if checkpoint.get("quality") == "draft":
+                self._prepare_draft(checkpoint, workflow)
+
             # Extract generation settings
             variants_per_shot = checkpoint["variants_per_shot"]
             base_seed = checkpoint["base_seed"]
@@ -201,7 +273,6 @@ class KeyframeGenerationService:
             output_dir = self.project_store.ensure_dir(project, "keyframes")
             os.makedirs(output_dir, exist_ok=True)
 
-            all_generated_images = []
             shots = storyboard.raw.get("shots", [])
             total_shots = len(shots)
             total_images_est = max(1, total_shots * variants_per_shot)
@@ -211,13 +282,16 @@ class KeyframeGenerationService:
                        f"{variants_per_shot} variants each")
 
             # Initial update
-            yield [], "**Status:** 🚀 Starte Keyframe-Generation...", \
-                  self._format_progress(checkpoint, total_shots), checkpoint, "**Current Shot:** None"
+            yield StatusUpdate("**Status:** 🚀 Starte Keyframe-Generation...",
+                               self._format_progress(checkpoint, total_shots), "**Current Shot:** None", checkpoint)
 
             # Generate keyframes for each shot
             for shot_idx, shot in enumerate(shots):
                 if self.stop_requested:
-                    yield from self._handle_stop(checkpoint, all_generated_images, total_shots, project)
+                    for _, status, progress_md, checkpoint, current_shot in self._handle_stop(
+                        checkpoint, [], total_shots, project
+                    ):
+                        yield StatusUpdate(status, progress_md, current_shot, checkpoint, final=True)
                     return
 
                 shot_id = shot.get("shot_id", f"{shot_idx+1:03d}")
@@ -244,10 +318,11 @@ class KeyframeGenerationService:
                 )
 
                 for shot_images, status, progress_md, updated_checkpoint, current_shot in generator:
-                    all_generated_images.extend(shot_images)
                     images_done += len(shot_images)
                     checkpoint = updated_checkpoint
-                    yield all_generated_images, status, progress_md, checkpoint, current_shot
+                    if shot_images:
+                        yield ImagesAdded(tuple(shot_images))
+                    yield StatusUpdate(status, progress_md, current_shot, checkpoint)
 
             # Mark as completed
             checkpoint["status"] = "completed"
@@ -271,7 +346,7 @@ class KeyframeGenerationService:
                     f"for {len(checkpoint['completed_shots'])} shots"
                 ),
             )
-            yield all_generated_images, status, progress_details, checkpoint, "Complete"
+            yield StatusUpdate(status, progress_details, "Complete", checkpoint, final=True)
 
         except Exception as e:
             checkpoint["status"] = "error"
@@ -287,7 +362,7 @@ class KeyframeGenerationService:
             )
 
             logger.error(f"Generation failed: {e}", exc_info=True)
-            yield [], f"**❌ Error:** {str(e)}", "Generation failed", checkpoint, "Error"
+            yield StatusUpdate(f"**❌ Error:** {str(e)}", "Generation failed", "Error", checkpoint, final=True)
 
     def _generate_shot(
         self,
@@ -333,7 +408,7 @@ class KeyframeGenerationService:
 
         shot_images = []
         filename_base = shot.get("filename_base", f"shot_{shot_id}")
-        res_width, res_height = self.config.get_resolution_tuple()
+        res_width, res_height, steps = self._render_settings(checkpoint)
 
         # Clean up old files
         self._file_handler.cleanup_old_files(filename_base)
@@ -361,7 +436,8 @@ class KeyframeGenerationService:
                 images_done=images_done,
                 total_images_est=total_images_est,
                 progress_callback=progress_callback,
-                current_shot_display=current_shot_display
+                current_shot_display=current_shot_display,
+                steps=steps
             )
 
             for variant_images, status, progress_md, updated_checkpoint, current_display in variant_generator:
@@ -399,77 +475,567 @@ class KeyframeGenerationService:
         images_done: int,
         total_images_est: int,
         progress_callback=None,
-        current_shot_display: str = ""
+        current_shot_display: str = "",
+        steps: Optional[int] = None
     ) -> Generator[Tuple[List[str], str, str, Dict, str], None, None]:
         """Generate a single variant for a shot."""
-        variant_seed = base_seed + (shot_idx * variants_per_shot) + variant_idx
-        variant_name = f"{filename_base}_v{variant_idx+1}"
+        variant_seed, variant_name = self.variant_identity(
+            filename_base, base_seed, shot_idx, variant_idx, variants_per_shot
+        )
 
         logger.info(f"Generating variant {variant_idx + 1}/{variants_per_shot} "
                    f"for shot {shot_id} (seed {variant_seed})")
 
-        # Get LoRA params if character is assigned
-        lora_params = self._lora_resolver.get_lora_params_for_shot(shot)
+        try:
+            copied_images = self.render_variant(
+                shot=shot,
+                workflow=workflow,
+                seed=variant_seed,
+                variant_name=variant_name,
+                width=res_width,
+                height=res_height,
+                output_dir=output_dir,
+                steps=steps,
+            )
+
+            if copied_images:
+                checkpoint["total_images_generated"] += len(copied_images)
+                if checkpoint.get("draft"):
+                    # Finalization re-renders selected drafts with exactly this seed
+                    checkpoint["draft"].setdefault("seeds", {})[variant_name] = variant_seed
+                # A regular variant may overwrite a former sweep file - drop its stale parameters
+                forget_parameters(output_dir, [os.path.basename(image) for image in copied_images])
 
-        # Update workflow with shot parameters
-        updated_workflow = self.api.update_workflow_params(
+                if progress_callback and callable(progress_callback):
+                    progress_callback(
+                        min(0.99, (images_done + len(copied_images)) / total_images_est),
+                        desc=f"{shot_id}: Variant {variant_idx + 1}/{variants_per_shot}"
+                    )
+
+                self._save_checkpoint(checkpoint, checkpoint["storyboard_file"], project)
+
+                variant_progress = self._format_progress(checkpoint, total_shots)
+                yield copied_images, f"**Status:** 🖼️ {shot_id} Variant {variant_idx + 1} fertig", \
+                      variant_progress, checkpoint, current_shot_display
+
+                logger.info(f"Variant {variant_idx + 1} completed: {len(copied_images)} images")
+            else:
+                logger.warning(f"Generated but failed to copy variant {variant_idx + 1}")
+                yield [], f"**Status:** ⚠️ {shot_id} Variant {variant_idx + 1} copy failed", \
+                      self._format_progress(checkpoint, total_shots), checkpoint, current_shot_display
+
+        except KeyframeGenerationError as e:
+            logger.error(f"Failed variant {variant_idx + 1}: {e}")
+            yield [], f"**Status:** ✗ {shot_id} Variant {variant_idx + 1} failed", \
+                  self._format_progress(checkpoint, total_shots), checkpoint, current_shot_display
+
+        except Exception as e:
+            logger.error(f"Error generating variant {variant_idx + 1}: {e}", exc_info=True)
+            yield [], f"**Status:** ✗ {shot_id} Variant {variant_idx + 1} error: {e}", \
+                  self._format_progress(checkpoint, total_shots), checkpoint, current_shot_display
+
+    @staticmethod
+    def variant_identity(
+        filename_base: str,
+        base_seed: int,
+        shot_idx: int,
+        variant_idx: int,
+        variants_per_shot: int
+    ) -> Tuple[int, str]:
+        """Seed and filename prefix of a variant (stable across runs and workers)."""
+        return base_seed + (shot_idx * variants_per_shot) + variant_idx, f"{filename_base}_v{variant_idx+1}"
+
+    def render_variant(
+        self,
+        shot: Dict[str, Any],
+        workflow: Dict[str, Any],
+        seed: int,
+        variant_name: str,
+        width: int,
+        height: int,
+        output_dir: str,
+        steps: Optional[int] = None
+    ) -> List[str]:
+        """Render one variant via self.api and move the images to output_dir.
+
+        steps overrides the workflow's sampling steps (None keeps them).
+
+        Returns:
+            Moved image paths (empty if ComfyUI ran but no image was found)
+
+        Raises:
+            KeyframeGenerationError: If ComfyUI reports a failed job
+        """
+        overrides = {"steps": steps} if steps is not None else {}
+        updated_workflow = self._variant_workflow(shot, workflow, variant_name, width, height, seed=seed, **overrides)
+
+        # Queue and monitor
+        prompt_id = self.api.queue_prompt(updated_workflow)
+        result = self.api.monitor_progress(prompt_id, timeout=300)
+        return self._collect_variant(prompt_id, result, variant_name, output_dir)
+
+    def _variant_workflow(
+        self,
+        shot: Dict[str, Any],
+        workflow: Dict[str, Any],
+        variant_name: str,
+        width: int,
+        height: int,
+        **params: Any
+    ) -> Dict[str, Any]:
+        """Workflow with the shot's prompt, LoRA and the given sampling params injected."""
+        # Get LoRA params if character is assigned; explicit params win
+        shot_params = dict(self._lora_resolver.get_lora_params_for_shot(shot))
+        shot_params.update(params)
+
+        return self.api.update_workflow_params(
             workflow,
             prompt=shot.get("prompt", ""),
-            seed=variant_seed,
             filename_prefix=variant_name,
-            width=res_width,
-            height=res_height,
-            **lora_params
+            width=width,
+            height=height,
+            **shot_params
+        )
+
+    def _collect_variant(
+        self, prompt_id: str, result: Dict[str, Any], variant_name: str, output_dir: str
+    ) -> List[str]:
+        """Move the images of a finished prompt to output_dir (raises on failed jobs)."""
+        if result["status"] != "success":
+            raise KeyframeGenerationError(result.get("error", "Unknown error"))
+
+        # RunPod: Download to comfy_output first (same as local)
+        if self.config.is_runpod_backend():
+            comfy_output = self.project_store.comfy_output_dir()
+            self._download_runpod_outputs(prompt_id, comfy_output)
+
+        # Same copy logic for both Local and RunPod
+        return self._copy_generated_images(
+            variant_name=variant_name,
+            output_dir=output_dir,
+            api_result=result
         )
 
+    def finalize_events(
+        self,
+        storyboard: Storyboard,
+        checkpoint: Dict[str, Any],
+        project: Dict[str, Any],
+        comfy_url: str,
+        model_override: Optional[str] = None
+    ) -> Generator[GenerationEvent, None, None]:
+        """Re-render the exported selection of a draft run at final quality.
+
+        Every selected variant is rendered with its draft seed at the configured
+        resolution and the workflow's full steps. Selections that are not a
+        variant of this draft run (index above variants_per_shot or no
+        recorded draft seed) are skipped, never re-rendered with a guessed seed.
+        Sweep outputs (listed in parameters.json) already use the final
+        resolution and their own settings; they are kept as they are.
+        The final image replaces the draft under the same filename (the draft
+        moves to keyframes/drafts/), then the selection is re-exported.
+        Finished shots are tracked in checkpoint["finalized"] and skipped when
+        the run is repeated.
+        """
+        def status(text: str, final: bool = False) -> StatusUpdate:
+            progress = f"### Final Render\n\n- **Finalized:** {len(finalized)}/{len(selections)}\n"
+            return StatusUpdate(text, progress, f"**Current Shot:** {current}", checkpoint, final=final)
+
+        finalized: Dict[str, Any] = checkpoint.setdefault("finalized", {})
+        selections: List[Dict[str, Any]] = []
+        current = "None"
         try:
-            # Queue and monitor
-            prompt_id = self.api.queue_prompt(updated_workflow)
-            result = self.api.monitor_progress(prompt_id, timeout=300)
-
-            if result["status"] == "success":
-                # RunPod: Download to comfy_output first (same as local)
-                if self.config.is_runpod_backend():
-                    comfy_output = self.project_store.comfy_output_dir()
-                    self._download_runpod_outputs(prompt_id, comfy_output)
-
-                # Same copy logic for both Local and RunPod
-                copied_images = self._copy_generated_images(
-                    variant_name=variant_name,
-                    output_dir=output_dir,
-                    api_result=result
+            if checkpoint.get("quality") != "draft":
+                yield status("**ℹ️ Info:** Keyframes were rendered in final quality - nothing to finalize.", final=True)
+                return
+            selections = self._load_exported_selections(project)
+            if not selections:
+                yield status("**❌ Error:** No exported selection - save the shot selection in the "
+                             "Keyframe Selector first.", final=True)
+                return
+
+            self._job_store.set_status(
+                project.get("path"),
+                "keyframe_generation",
+                "running",
+                message=f"Final render of {len(selections)} selected keyframes started",
+            )
+            self.api = ComfyUIAPI(comfy_url)
+            self.is_running = True
+            conn_result = self.api.test_connection()
+            if not conn_result["connected"]:
+                raise KeyframeGenerationError(f"Connection failed - {conn_result['error']}")
+
+            workflow_file = checkpoint["workflow_file"]
+            workflow_path = os.path.join(self.config.get_workflow_dir(), workflow_file)
+            if not os.path.exists(workflow_path):
+                raise KeyframeGenerationError(f"Workflow not found: {workflow_path}")
+            workflows: Dict[str, Dict[str, Any]] = {}
+
+            width, height = self.config.get_resolution_tuple()
+            shots = {
+                shot.get("shot_id", f"{idx+1:03d}"): (idx, shot)
+                for idx, shot in enumerate(storyboard.raw.get("shots", []))
+            }
+            keyframes_dir = self.project_store.ensure_dir(project, "keyframes")
+            staging_dir = self.project_store.ensure_dir(project, "keyframes", "_final")
+            drafts_dir = self.project_store.ensure_dir(project, "keyframes", "drafts")
+            seeds = checkpoint.get("draft", {}).get("seeds", {})
+            swept = load_parameter_manifest(keyframes_dir)
+            failed: List[str] = []
+            skipped: List[str] = []
+
+            for selection in selections:
+                if self.stop_requested:
+                    self._job_store.set_status(project.get("path"), "keyframe_generation", "stopped",
+                                               message="Final render stopped by user")
+                    yield status("**⏹️ Gestoppt:** Final-Render wurde vom Benutzer abgebrochen.", final=True)
+                    return
+
+                shot_id = selection.get("shot_id")
+                variant = int(selection.get("selected_variant") or 0)
+                if shot_id not in shots or variant < 1:
+                    failed.append(str(shot_id))
+                    yield status(f"**Status:** ⚠️ {shot_id}: not in the storyboard, skipped")
+                    continue
+                if finalized.get(shot_id, {}).get("variant") == variant:
+                    continue
+
+                current = shot_id
+                shot_idx, shot = shots[shot_id]
+                target = selection.get("source_path") or os.path.join(
+                    keyframes_dir, selection["selected_file"]
                 )
+                sweep_params = swept.get(os.path.basename(target))
+                if sweep_params:
+                    finalized[shot_id] = {
+                        "variant": variant,
+                        "seed": sweep_params.get("seed"),
+                        "file": target,
+                        "sweep_id": sweep_params.get("sweep_id"),
+                        "finalized_at": datetime.now().isoformat(),
+                    }
+                    self._save_checkpoint(checkpoint, checkpoint["storyboard_file"], project)
+                    yield status(f"**Status:** ✅ {shot_id} Variant {variant}: "
+                                 "sweep render, already final")
+                    continue
+                variant_name = None
+                if variant <= checkpoint["variants_per_shot"]:
+                    _, variant_name = self.variant_identity(
+                        shot.get("filename_base", f"shot_{shot_id}"),
+                        checkpoint["base_seed"],
+                        shot_idx,
+                        variant - 1,
+                        checkpoint["variants_per_shot"],
+                    )
+                if variant_name not in seeds:
+                    skipped.append(shot_id)
+                    yield status(f"**Status:** ⚠️ {shot_id} Variant {variant}: "
+                                 "not rendered by this draft run, skipped")
+                    continue
+                seed = seeds[variant_name]
+                yield status(f"**Status:** ✨ {shot_id} Variant {variant}: final render (seed {seed})")
+
+                shot_workflow_file = get_workflow_for_shot(shot, workflow_file, self.config.get_workflow_dir())
+                if shot_workflow_file not in workflows:
+                    workflow = self.api.load_workflow(os.path.join(self.config.get_workflow_dir(), shot_workflow_file))
+                    workflows[shot_workflow_file] = (
+                        inject_model_override(workflow, model_override) if model_override else workflow
+                    )
+
+                try:
+                    images = self.render_variant(
+                        shot=shot,
+                        workflow=workflows[shot_workflow_file],
+                        seed=seed,
+                        variant_name=variant_name,
+                        width=width,
+                        height=height,
+                        output_dir=staging_dir,
+                    )
+                except Exception as e:
+                    logger.error(f"Final render failed for {shot_id}: {e}", exc_info=True)
+                    failed.append(shot_id)
+                    yield status(f"**Status:** ✗ {shot_id} Variant {variant} final render failed: {e}")
+                    continue
+                if not images:
+                    failed.append(shot_id)
+                    yield status(f"**Status:** ⚠️ {shot_id} Variant {variant} copy failed")
+                    continue
+
+                self._replace_draft(target, images[0], drafts_dir)
+                finalized[shot_id] = {
+                    "variant": variant,
+                    "seed": seed,
+                    "file": target,
+                    "finalized_at": datetime.now().isoformat(),
+                }
+                self._save_checkpoint(checkpoint, checkpoint["storyboard_file"], project)
+                yield ImagesAdded((target,))
+                yield status(f"**Status:** ✅ {shot_id} Variant {variant} in final quality")
+
+            # Refresh project/selected with the final images
+            SelectionService(self.project_store).export_selections(
+                project, storyboard.raw, {selection["shot_id"]: selection for selection in selections}
+            )
+            issues = failed or skipped
+            checkpoint["finalize_status"] = "completed_with_issues" if issues else "completed"
+            checkpoint["finalized_at"] = datetime.now().isoformat()
+            self._save_checkpoint(checkpoint, checkpoint["storyboard_file"], project)
+            self.is_running = False
+            self.stop_requested = False
+            message = f"Finalized {len(finalized)}/{len(selections)} selected keyframes"
+            if failed:
+                message += f", failed: {', '.join(failed)}"
+            if skipped:
+                message += f", skipped (not from this draft run): {', '.join(skipped)}"
+            self._job_store.set_status(project.get("path"), "keyframe_generation", checkpoint["finalize_status"],
+                                       message=message)
+            current = "Complete"
+            yield status(f"**✅ Final Render Complete!** {message}", final=True)
+
+        except Exception as e:
+            checkpoint["finalize_status"] = "error"
+            self._save_checkpoint(checkpoint, checkpoint["storyboard_file"], project)
+            self.is_running = False
+            self.stop_requested = False
+            self._job_store.set_status(project.get("path"), "keyframe_generation", "failed", message=str(e))
+            logger.error(f"Final render failed: {e}", exc_info=True)
+            yield status(f"**❌ Error:** {e}", final=True)
+
+    def sweep_events(
+        self,
+        storyboard: Storyboard,
+        project: Dict[str, Any],
+        comfy_url: str,
+        workflow_file: str,
+        shot_ids: List[str],
+        spec: Dict[str, Any],
+        samples: int = 1,
+        base_seed: int = 2000,
+        rng_seed: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        model_override: Optional[str] = None
+    ) -> Generator[GenerationEvent, None, None]:
+        """Render a parameter sweep (see services.keyframe.parameter_sweep) for selected shots.
+
+        Configurations already rendered for a shot (same workflow, file still
+        present) are skipped. Up to queue_depth prompts are kept queued in
+        ComfyUI so the GPU never waits for the copy step. Outputs are added as
+        further ``{filename_base}_vN`` variants and their parameters recorded
+        in keyframes/parameters.json for filtering in the Keyframe Selector.
+        """
+        sweep: Dict[str, Any] = {
+            "sweep_id": datetime.now().strftime("sweep_%Y%m%d_%H%M%S"),
+            "workflow_file": workflow_file,
+            "shots": list(shot_ids),
+            "total": 0,
+            "rendered": 0,
+            "duplicates": 0,
+            "failed": [],
+        }
+        current = "None"
+
+        def status(text: str, final: bool = False) -> StatusUpdate:
+            progress = (f"### Parameter Sweep\n\n- **Rendered:** {sweep['rendered']}/{sweep['total']}\n"
+                        f"- **Skipped (already rendered):** {sweep['duplicates']}\n"
+                        f"- **Failed:** {len(sweep['failed'])}\n")
+            return StatusUpdate(text, progress, f"**Current Shot:** {current}", sweep, final=final)
 
-                if copied_images:
-                    checkpoint["total_images_generated"] += len(copied_images)
+        try:
+            configs = build_sweep(spec, samples=samples, defaults={"seed": base_seed}, rng_seed=rng_seed)
+            wanted = set(shot_ids)
+            shots = [
+                (idx, shot) for idx, shot in enumerate(storyboard.raw.get("shots", []))
+                if shot.get("shot_id", f"{idx+1:03d}") in wanted
+            ]
+            if not shots:
+                raise InputValidationError("No shots selected for the sweep")
 
-                    if progress_callback and callable(progress_callback):
-                        progress_callback(
-                            min(0.99, (images_done + len(copied_images)) / total_images_est),
-                            desc=f"{shot_id}: Variant {variant_idx + 1}/{variants_per_shot}"
+            self.api = ComfyUIAPI(comfy_url)
+            self.is_running = True
+            conn_result = self.api.test_connection()
+            if not conn_result["connected"]:
+                raise KeyframeGenerationError(f"Connection failed - {conn_result['error']}")
+            workflow_path = os.path.join(self.config.get_workflow_dir(), workflow_file)
+            if not os.path.exists(workflow_path):
+                raise KeyframeGenerationError(f"Workflow not found: {workflow_path}")
+
+            keyframes_dir = self.project_store.ensure_dir(project, "keyframes")
+            jobs = self._plan_sweep_jobs(
+                project, shots, configs, workflow_file, keyframes_dir, sweep, model_override
+            )
+            sweep["total"] = len(jobs)
+            self._job_store.set_status(project.get("path"), "keyframe_generation", "running",
+                                       message=f"Parameter sweep of {len(jobs)} renders started")
+            yield status(f"**Status:** 🎛️ Sweep: {len(jobs)} renders for {len(shots)} shots "
+                         f"({sweep['duplicates']} already rendered)")
+
+            width, height = self.config.get_resolution_tuple()
+            depth = max(1, min(int(queue_depth or SWEEP_QUEUE_DEPTH), MAX_SWEEP_QUEUE_DEPTH))
+            workflows: Dict[str, Dict[str, Any]] = {}
+            pending = deque(jobs)
+            in_flight: deque = deque()
+
+            while pending or in_flight:
+                # Keep the ComfyUI queue filled, then collect the oldest prompt
+                while pending and len(in_flight) < depth and not self.stop_requested:
+                    job = pending.popleft()
+                    shot_workflow_file = get_workflow_for_shot(job["shot"], workflow_file, self.config.get_workflow_dir())
+                    if shot_workflow_file not in workflows:
+                        workflow = self.api.load_workflow(os.path.join(self.config.get_workflow_dir(), shot_workflow_file))
+                        workflows[shot_workflow_file] = (
+                            inject_model_override(workflow, model_override) if model_override else workflow
                         )
+                    try:
+                        updated = self._variant_workflow(job["shot"], workflows[shot_workflow_file],
+                                                         job["variant_name"], width, height, **job["params"])
+                        in_flight.append((job, self.api.queue_prompt(updated)))
+                    except Exception as e:
+                        logger.error(f"Sweep submit failed for {job['variant_name']}: {e}", exc_info=True)
+                        sweep["failed"].append(job["variant_name"])
+                        yield status(f"**Status:** ✗ {job['variant_name']} could not be queued: {e}")
+                if not in_flight:
+                    break
+
+                job, prompt_id = in_flight.popleft()
+                current = job["shot_id"]
+                label = f"{job['variant_name']} ({describe_params(job['params'])})"
+                try:
+                    images = self._collect_variant(prompt_id, self._await_prompt(prompt_id),
+                                                   job["variant_name"], keyframes_dir)
+                except Exception as e:
+                    logger.error(f"Sweep render failed for {job['variant_name']}: {e}", exc_info=True)
+                    sweep["failed"].append(job["variant_name"])
+                    yield status(f"**Status:** ✗ {label} failed: {e}")
+                    continue
+                if not images:
+                    sweep["failed"].append(job["variant_name"])
+                    yield status(f"**Status:** ⚠️ {label} copy failed")
+                    continue
 
-                    self._save_checkpoint(checkpoint, checkpoint["storyboard_file"], project)
+                record_parameters(keyframes_dir, {
+                    os.path.basename(image): {
+                        **job["params"],
+                        "shot_id": job["shot_id"],
+                        "workflow": workflow_file,
+                        "model": model_override,
+                        "sweep_id": sweep["sweep_id"],
+                        "rendered_at": datetime.now().isoformat(),
+                    }
+                    for image in images
+                })
+                sweep["rendered"] += 1
+                yield ImagesAdded(tuple(images))
+                yield status(f"**Status:** ✅ {label}")
 
-                    variant_progress = self._format_progress(checkpoint, total_shots)
-                    yield copied_images, f"**Status:** 🖼️ {shot_id} Variant {variant_idx + 1} fertig", \
-                          variant_progress, checkpoint, current_shot_display
+            self.is_running = False
+            if self.stop_requested:
+                self.stop_requested = False
+                sweep["status"] = "stopped"
+                self._job_store.set_status(project.get("path"), "keyframe_generation", "stopped",
+                                           message=f"Parameter sweep stopped after {sweep['rendered']} renders")
+                yield status("**⏹️ Gestoppt:** Sweep wurde vom Benutzer abgebrochen.", final=True)
+                return
 
-                    logger.info(f"Variant {variant_idx + 1} completed: {len(copied_images)} images")
-                else:
-                    logger.warning(f"Generated but failed to copy variant {variant_idx + 1}")
-                    yield [], f"**Status:** ⚠️ {shot_id} Variant {variant_idx + 1} copy failed", \
-                          self._format_progress(checkpoint, total_shots), checkpoint, current_shot_display
-            else:
-                error_msg = result.get("error", "Unknown error")
-                logger.error(f"Failed variant {variant_idx + 1}: {error_msg}")
-                yield [], f"**Status:** ✗ {shot_id} Variant {variant_idx + 1} failed", \
-                      self._format_progress(checkpoint, total_shots), checkpoint, current_shot_display
+            sweep["status"] = "completed_with_issues" if sweep["failed"] else "completed"
+            message = f"Parameter sweep rendered {sweep['rendered']}/{sweep['total']}"
+            if sweep["failed"]:
+                message += f", failed: {', '.join(sweep['failed'])}"
+            self._job_store.set_status(project.get("path"), "keyframe_generation", sweep["status"], message=message)
+            current = "Complete"
+            yield status(f"**✅ Sweep Complete!** {message}", final=True)
 
         except Exception as e:
-            logger.error(f"Error generating variant {variant_idx + 1}: {e}", exc_info=True)
-            yield [], f"**Status:** ✗ {shot_id} Variant {variant_idx + 1} error: {e}", \
-                  self._format_progress(checkpoint, total_shots), checkpoint, current_shot_display
+            sweep["status"] = "error"
+            self.is_running = False
+            self.stop_requested = False
+            self._job_store.set_status(project.get("path"), "keyframe_generation", "failed", message=str(e))
+            logger.error(f"Parameter sweep failed: {e}", exc_info=not isinstance(e, InputValidationError))
+            yield status(f"**❌ Error:** {e}", final=True)
+
+    def _plan_sweep_jobs(
+        self,
+        project: Dict[str, Any],
+        shots: List[Tuple[int, Dict[str, Any]]],
+        configs: List[Dict[str, Any]],
+        workflow_file: str,
+        keyframes_dir: str,
+        sweep: Dict[str, Any],
+        model_override: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Sweep renders per shot, minus configurations the shot already has."""
+        manifest = load_parameter_manifest(keyframes_dir)
+        selection_service = SelectionService(self.project_store)
+        jobs: List[Dict[str, Any]] = []
+        for idx, shot in shots:
+            shot_id = shot.get("shot_id", f"{idx+1:03d}")
+            filename_base = shot.get("filename_base", f"shot_{shot_id}")
+            done = set(rendered_configs(manifest, shot_id, workflow_file, keyframes_dir))
+            existing = selection_service.collect_keyframes(project, filename_base)
+            next_variant = max((item["variant"] for item in existing), default=0) + 1
+            for params in configs:
+                if config_key(params, model_override) in done:
+                    sweep["duplicates"] += 1
+                    continue
+                jobs.append({
+                    "shot_id": shot_id,
+                    "shot": shot,
+                    "params": params,
+                    "variant_name": f"{filename_base}_v{next_variant}",
+                })
+                next_variant += 1
+        return jobs
+
+    def _await_prompt(self, prompt_id: str) -> Dict[str, Any]:
+        """Result of a queued prompt; prompts that already finished are read from the history."""
+        history = self.api.get_history(prompt_id)
+        if history:
+            if history.get("status", {}).get("status_str") == "error":
+                return {"status": "error", "output_images": [], "error": "ComfyUI reported an execution error"}
+            return {"status": "success", "output_images": self.api.get_output_images(prompt_id, retries=15, delay=1.0),
+                    "error": None}
+        return self.api.monitor_progress(prompt_id, timeout=300)
+
+    def _load_exported_selections(self, project: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Selections of the project's selected_keyframes.json (empty if not exported)."""
+        export_path = os.path.join(self.project_store.ensure_dir(project, "selected"), "selected_keyframes.json")
+        if not os.path.exists(export_path):
+            return []
+        with open(export_path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        return [entry for entry in payload.get("selections", []) if entry.get("shot_id")]
+
+    @staticmethod
+    def _replace_draft(target: str, final_image: str, drafts_dir: str) -> None:
+        """Put the final image under the draft's filename and keep the draft in drafts_dir."""
+        if os.path.exists(target):
+            shutil.move(target, os.path.join(drafts_dir, os.path.basename(target)))
+        shutil.move(final_image, target)
+
+    def _prepare_draft(self, checkpoint: Dict[str, Any], workflow: Dict[str, Any]) -> None:
+        """Fix the draft resolution/steps in the checkpoint (kept when resuming)."""
+        if checkpoint.get("draft"):
+            return
+        width, height = self.config.get_resolution_tuple()
+        settings = draft_render_settings(
+            width,
+            height,
+            get_workflow_steps(workflow),
+            step_ratio=self.DRAFT_STEP_RATIO,
+            min_steps=self.MIN_DRAFT_STEPS,
+            scale=self.DRAFT_DOWNSCALE if checkpoint.get("draft_downscale") else 1.0,
+        )
+        checkpoint["draft"] = {**settings, "seeds": {}}
+        logger.info(f"Draft mode: {settings['width']}x{settings['height']}, steps {settings['steps'] or 'unchanged'}")
+
+    def _render_settings(self, checkpoint: Dict[str, Any]) -> Tuple[int, int, Optional[int]]:
+        """Width, height and step override for the run's quality."""
+        draft = checkpoint.get("draft")
+        if draft:
+            return draft["width"], draft["height"], draft.get("steps")
+        width, height = self.config.get_resolution_tuple()
+        return width, height, None
 
     def _handle_stop(
         self,
@@ -503,6 +1069,15 @@ class KeyframeGenerationService:
         self.stop_requested = False
         return "**ℹ️ Kein Lauf aktiv.**", "Kein aktiver Fortschritt."
 
+    def request_stop(self) -> bool:
+        """Cancel hook for background jobs: stop at the next check, even before the run started.
+
+        Returns:
+            True if the run loop is active and winds down by itself
+        """
+        self.stop_requested = True
+        return self.is_running
+
     # Legacy method for backwards compatibility
     def get_workflow_for_shot(self, shot: Dict[str, Any], base_workflow_file: str) -> str:
         """Determine which workflow to use for a shot."""
@@ -1,13 +1,17 @@
 """Kohya Model Scanner - Scans for available models in ComfyUI.
 
 This module handles detection of FLUX, SDXL, SD3 and text encoder models
-for training configuration.
+for training configuration. The architecture is taken from the file header
+when it can be read (so renamed files are still found); filename patterns
+are the fallback.
 """
 
+import os
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict
+from typing import Callable, Iterable, List, Tuple, Optional, Dict
 
 from infrastructure.logger import get_logger
+from services.model_manager.model_metadata import get_model_metadata_reader
 from .models import KohyaModelType
 
 logger = get_logger(__name__)
@@ -52,26 +56,15 @@ class KohyaModelScanner:
         Returns:
             List of tuples (display_name, full_path) for each found model
         """
-        models = []
-        if not self.models_dir:
-            return models
-
         # Check diffusion_models and unet folders
-        for subdir in ["diffusion_models", "unet", "checkpoints"]:
-            search_dir = self.models_dir / subdir
-            if not search_dir.exists():
-                continue
-
-            for f in search_dir.iterdir():
-                if f.is_file() and f.suffix == ".safetensors":
-                    name = f.name.lower()
-                    # Filter for FLUX models
-                    if "flux" in name:
-                        # Create display name with size info
-                        size_mb = f.stat().st_size / (1024 * 1024)
-                        size_str = f"{size_mb / 1024:.1f}GB" if size_mb > 1024 else f"{size_mb:.0f}MB"
-                        display = f"{f.name} ({size_str})"
-                        models.append((display, str(f)))
+        models = [
+            (self._display_name(f), str(f))
+            for f in self._matching_files(
+                ["diffusion_models", "unet", "checkpoints"], [".safetensors"],
+                lambda arch: arch == "flux",
+                lambda name: "flux" in name,
+            )
+        ]
 
         # Sort by name
         models.sort(key=lambda x: x[0])
@@ -84,30 +77,19 @@ class KohyaModelScanner:
             List of tuples (display_name, full_path) for each found model
         """
         models = []
-        if not self.models_dir:
-            return models
 
         # Check text_encoders and clip folders
-        for subdir in ["text_encoders", "clip"]:
-            search_dir = self.models_dir / subdir
-            if not search_dir.exists():
-                continue
-
-            for f in search_dir.iterdir():
-                if f.is_file() and f.suffix in [".safetensors", ".gguf"]:
-                    name = f.name.lower()
-                    # Filter for T5XXL models
-                    if "t5" in name and ("xxl" in name or "xl" in name):
-                        # Create display name with size and type info
-                        size_mb = f.stat().st_size / (1024 * 1024)
-                        size_str = f"{size_mb / 1024:.1f}GB" if size_mb > 1024 else f"{size_mb:.0f}MB"
-
-                        # Add FP8/FP16 indicator
-                        precision = "FP8" if "fp8" in name else "FP16" if "fp16" in name else "BF16" if "bf16" in name else ""
-                        precision_str = f" [{precision}]" if precision else ""
-
-                        display = f"{f.name} ({size_str}){precision_str}"
-                        models.append((display, str(f)))
+        for f in self._matching_files(
+            ["text_encoders", "clip"], [".safetensors", ".gguf"],
+            lambda arch: arch.startswith("t5"),
+            lambda name: "t5" in name and ("xxl" in name or "xl" in name),
+        ):
+            name = f.name.lower()
+            # Add FP8/FP16 indicator
+            precision = "FP8" if "fp8" in name else "FP16" if "fp16" in name else "BF16" if "bf16" in name else ""
+            precision_str = f" [{precision}]" if precision else ""
+
+            models.append((f"{self._display_name(f)}{precision_str}", str(f)))
 
         # Sort: FP8 first (smaller), then by name
         def sort_key(x):
@@ -126,26 +108,17 @@ class KohyaModelScanner:
         Returns:
             List of tuples (display_name, full_path) for each found model
         """
-        models = []
-        if not self.models_dir:
-            return models
-
         # Check checkpoints folder (SDXL models are typically full checkpoints)
-        for subdir in ["checkpoints", "unet"]:
-            search_dir = self.models_dir / subdir
-            if not search_dir.exists():
-                continue
-
-            for f in search_dir.iterdir():
-                if f.is_file() and f.suffix == ".safetensors":
-                    name = f.name.lower()
-                    # Filter for SDXL models (exclude FLUX and SD3)
-                    if ("sdxl" in name or "sd_xl" in name or "xl_base" in name) and \
-                       "flux" not in name and "sd3" not in name:
-                        size_mb = f.stat().st_size / (1024 * 1024)
-                        size_str = f"{size_mb / 1024:.1f}GB" if size_mb > 1024 else f"{size_mb:.0f}MB"
-                        display = f"{f.name} ({size_str})"
-                        models.append((display, str(f)))
+        models = [
+            (self._display_name(f), str(f))
+            for f in self._matching_files(
+                ["checkpoints", "unet"], [".safetensors"],
+                lambda arch: arch == "sdxl",
+                # Filter for SDXL models (exclude FLUX and SD3)
+                lambda name: ("sdxl" in name or "sd_xl" in name or "xl_base" in name)
+                and "flux" not in name and "sd3" not in name,
+            )
+        ]
 
         models.sort(key=lambda x: x[0])
         return models
@@ -156,28 +129,59 @@ class KohyaModelScanner:
         Returns:
             List of tuples (display_name, full_path) for each found model
         """
-        models = []
+        # Check checkpoints and diffusion_models folders
+        models = [
+            (self._display_name(f), str(f))
+            for f in self._matching_files(
+                ["checkpoints", "diffusion_models", "unet"], [".safetensors"],
+                lambda arch: arch == "sd3",
+                lambda name: "sd3" in name and "flux" not in name,
+            )
+        ]
+
+        models.sort(key=lambda x: x[0])
+        return models
+
+    def _matching_files(
+        self,
+        subdirs: Iterable[str],
+        suffixes: List[str],
+        header_matches: Callable[[str], bool],
+        name_matches: Callable[[str], bool]
+    ) -> List[Path]:
+        """List model files whose header (or, if unreadable, filename) matches.
+
+        Headers of all candidates are read in one batch; LoRA files are skipped.
+        """
         if not self.models_dir:
-            return models
+            return []
 
-        # Check checkpoints and diffusion_models folders
-        for subdir in ["checkpoints", "diffusion_models", "unet"]:
+        candidates = []
+        for subdir in subdirs:
             search_dir = self.models_dir / subdir
             if not search_dir.exists():
                 continue
+            candidates.extend(f for f in search_dir.iterdir() if f.is_file() and f.suffix in suffixes)
 
-            for f in search_dir.iterdir():
-                if f.is_file() and f.suffix == ".safetensors":
-                    name = f.name.lower()
-                    # Filter for SD3 models
-                    if "sd3" in name and "flux" not in name:
-                        size_mb = f.stat().st_size / (1024 * 1024)
-                        size_str = f"{size_mb / 1024:.1f}GB" if size_mb > 1024 else f"{size_mb:.0f}MB"
-                        display = f"{f.name} ({size_str})"
-                        models.append((display, str(f)))
-
-        models.sort(key=lambda x: x[0])
-        return models
+        headers = get_model_metadata_reader().read_many(str(f) for f in candidates)
+        matches = []
+        for f in candidates:
+            meta = headers.get(os.path.abspath(f))
+            if meta and meta.is_lora:
+                continue
+            if meta and meta.architecture:
+                if header_matches(meta.architecture):
+                    matches.append(f)
+            elif name_matches(f.name.lower()):
+                matches.append(f)
+        return matches
+
+    @staticmethod
+    def _display_name(f: Path) -> str:
+        """Filename with size info, e.g. 'flux1-dev.safetensors (11.1GB)'."""
+        size_mb = f.stat().st_size / (1024 * 1024)
+        size_str = f"{size_mb / 1024:.1f}GB" if size_mb > 1024 else f"{size_mb:.0f}MB"
+        return f"{f.name} ({size_str})"
 
     def scan_models(self, model_type: KohyaModelType) -> List[Tuple[str, str]]:
         """Scan for models of a specific type.
@@ -413,7 +417,6 @@ class KohyaModelScanner:
             return None
 
         import glob
-        import os
 
         loras_dir = self.models_dir / "loras"
         output_name = f"cg_{character_name}"
@@ -1,16 +1,21 @@
 """Lipsync Service - Audio processing and Wan is2v workflow control."""
+import copy
 import os
 import subprocess
 import shutil
 import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Optional, Tuple, Callable, List
+from typing import Any, Dict, Optional, Tuple, Callable, List
 from pathlib import Path
 
 from infrastructure.config_manager import ConfigManager
 from infrastructure.comfy_api.client import ComfyUIAPI
 from infrastructure.logger import get_logger
+from infrastructure.media_probe import find_ffmpeg, get_media_probe
 from services.video.last_frame_extractor import LastFrameExtractor
+from services.video.timeline_assembler import TimelineAssembler
 
 logger = get_logger(__name__)
 
@@ -77,24 +82,18 @@ class LipsyncService:
 
     MAX_DURATION_SECONDS = 14.0  # ~3 chunks at 77 frames each @ 16fps
     DEFAULT_WORKFLOW = "gcl_wan_2.2_is2v.json"
+    PREP_WORKERS = 4  # Parallel audio trims/copies ahead of the GPU
+    SEGMENT_TIMEOUT = 1800  # Max wait without any segment finishing
+    VIDEO_EXTENSIONS = (".mp4", ".webm")
+    POLL_INTERVAL = 2.0
 
     def __init__(self, config: Optional[ConfigManager] = None):
         self.config = config or ConfigManager()
         self.api: Optional[ComfyUIAPI] = None
-        self._ffmpeg_path = self._find_ffmpeg()
+        self._ffmpeg_path = find_ffmpeg()
+        self._probe = get_media_probe()
         self._frame_extractor = LastFrameExtractor()
 
-    def _find_ffmpeg(self) -> str:
-        """Find ffmpeg executable."""
-        ffmpeg = shutil.which("ffmpeg")
-        if ffmpeg:
-            return ffmpeg
-        # Common locations
-        for path in ["/usr/bin/ffmpeg", "/usr/local/bin/ffmpeg"]:
-            if os.path.isfile(path):
-                return path
-        return "ffmpeg"  # Hope it's in PATH
-
     def _get_api(self) -> ComfyUIAPI:
         """Get or create ComfyUI API client."""
         if self.api is None:
@@ -103,7 +102,7 @@ class LipsyncService:
         return self.api
 
     def get_audio_info(self, audio_path: str) -> Optional[AudioInfo]:
-        """Get information about an audio file using ffprobe.
+        """Get information about an audio file (cached ffprobe).
 
         Args:
             audio_path: Path to audio file
@@ -115,65 +114,21 @@ class LipsyncService:
             logger.error(f"Audio file not found: {audio_path}")
             return None
 
-        try:
-            # Get duration
-            result = subprocess.run(
-                [
-                    self._ffmpeg_path.replace("ffmpeg", "ffprobe"),
-                    "-v", "error",
-                    "-show_entries", "format=duration",
-                    "-show_entries", "stream=sample_rate,channels",
-                    "-of", "csv=p=0",
-                    audio_path
-                ],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if result.returncode != 0:
-                logger.error(f"ffprobe failed: {result.stderr}")
-                return None
-
-            lines = result.stdout.strip().split("\n")
-
-            # Parse output
-            duration = 0.0
-            sample_rate = 44100
-            channels = 2
-
-            for line in lines:
-                parts = line.split(",")
-                if len(parts) >= 1:
-                    try:
-                        # Try to parse as duration
-                        duration = float(parts[0])
-                    except ValueError:
-                        pass
-                if len(parts) >= 2:
-                    try:
-                        sample_rate = int(parts[0])
-                        channels = int(parts[1])
-                    except ValueError:
-                        pass
-
-            # Get format from extension
-            fmt = Path(audio_path).suffix.lower().lstrip(".")
-
-            return AudioInfo(
-                path=audio_path,
-                duration=duration,
-                sample_rate=sample_rate,
-                channels=channels,
-                format=fmt
-            )
-        except subprocess.TimeoutExpired:
-            logger.error("ffprobe timed out")
-            return None
-        except Exception as e:
-            logger.error(f"Failed to get audio info: {e}")
+        info = self._probe.probe(audio_path)
+        if info is None:
             return None
 
+        # Get format from extension
+        fmt = Path(audio_path).suffix.lower().lstrip(".")
+
+        return AudioInfo(
+            path=audio_path,
+            duration=info.duration,
+            sample_rate=info.sample_rate or 44100,
+            channels=info.channels or 2,
+            format=fmt
+        )
+
     def trim_audio(
         self,
         input_path: str,
@@ -563,6 +518,11 @@ class LipsyncService:
     ) -> BatchResult:
         """Generate lipsync videos for multiple audio segments with frame chaining.
 
+        Audio trims, copies into ComfyUI input and workflow prep run ahead in
+        a worker pool. Without chaining all segments are queued at once and
+        collected as they finish; with chaining each segment waits for the
+        previous last frame, but its prep is already done by then.
+
         Args:
             base_image_path: Starting character image
             segments: List of audio segments to process
@@ -591,16 +551,39 @@ class LipsyncService:
             result.errors.append("No segments provided")
             return result
 
-        current_image = base_image_path
-        temp_dir = tempfile.mkdtemp(prefix="lipsync_batch_")
+        api = self._get_api()
 
-        for i, segment in enumerate(segments):
+        # Load workflow once for all segments
+        workflow_dir = self.config.get("workflow_dir", "config/workflow_templates")
+        workflow_path = os.path.join(workflow_dir, workflow_file or self.DEFAULT_WORKFLOW)
+        if not os.path.isfile(workflow_path):
+            result.success = False
+            result.errors.append(f"Workflow not found: {workflow_path}")
+            return result
+
+        try:
+            template = api.load_workflow(workflow_path)
+        except Exception as e:
+            result.success = False
+            result.errors.append(f"Failed to load workflow: {e}")
+            return result
+
+        image_filename = f"lipsync_image_{os.path.basename(base_image_path)}"
+        success, message = self.copy_to_comfy_input(base_image_path, image_filename)
+        if not success:
+            result.success = False
+            result.errors.append(f"Failed to copy image: {message}")
+            return result
+
+        total = len(segments)
+
+        def notify(current: int, status: str) -> None:
             if progress_callback:
-                progress_callback(i + 1, len(segments), f"Processing segment {i + 1}/{len(segments)}")
+                progress_callback(current, total, status)
 
-            # Create job for this segment
-            job = LipsyncJob(
-                image_path=current_image,
+        jobs = [
+            LipsyncJob(
+                image_path=image_filename,
                 audio_path=segment.audio_path,
                 prompt=prompt,
                 negative_prompt=negative_prompt,
@@ -611,47 +594,234 @@ class LipsyncService:
                 cfg=cfg,
                 fps=fps
             )
+            for i, segment in enumerate(segments)
+        ]
 
-            # Generate lipsync for this segment
-            success, video_path = self.generate_lipsync(
-                job,
-                progress_callback=None,
-                workflow_file=workflow_file
-            )
-
-            if success and os.path.isfile(video_path):
-                result.videos.append(video_path)
+        temp_dir = tempfile.mkdtemp(prefix="lipsync_batch_")
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.PREP_WORKERS, total)) as pool:
+                prepared = [
+                    pool.submit(self._prepare_segment, job, segment, template, temp_dir)
+                    for job, segment in zip(jobs, segments)
+                ]
+                if use_last_frame_chaining:
+                    outputs = self._run_chained(api, jobs, prepared, temp_dir, notify)
+                else:
+                    outputs = self._run_parallel(api, jobs, prepared, notify)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        for i, (success, value) in enumerate(outputs):
+            if success:
+                result.videos.append(value)
                 result.completed_segments += 1
-
-                # Extract last frame for chaining
-                if use_last_frame_chaining and i < len(segments) - 1:
-                    last_frame = self._frame_extractor.extract(video_path)
-                    if last_frame:
-                        current_image = last_frame
-                        logger.info(f"Using last frame for next segment: {last_frame}")
-                    else:
-                        logger.warning(f"Could not extract last frame from {video_path}")
             else:
-                error_msg = video_path if not success else "Unknown error"
-                result.errors.append(f"Segment {i + 1}: {error_msg}")
-                logger.error(f"Segment {i + 1} failed: {error_msg}")
+                result.errors.append(f"Segment {i + 1}: {value}")
+                logger.error(f"Segment {i + 1} failed: {value}")
 
         result.success = result.completed_segments == result.total_segments
 
-        if progress_callback:
-            status = "Complete!" if result.success else f"Completed with {len(result.errors)} errors"
-            progress_callback(len(segments), len(segments), status)
+        status = "Complete!" if result.success else f"Completed with {len(result.errors)} errors"
+        notify(total, status)
 
         return result
 
+    def _prepare_segment(
+        self,
+        job: LipsyncJob,
+        segment: BatchSegment,
+        template: dict,
+        temp_dir: str
+    ) -> Tuple[Optional[dict], str]:
+        """Trim/copy a segment's audio into ComfyUI input and build its workflow.
+
+        Runs in the prep pool, so it must not touch shared state.
+
+        Returns:
+            Tuple of (workflow or None, audio filename or error message)
+        """
+        source = segment.audio_path
+        if segment.end_time > segment.start_time:
+            trimmed = os.path.join(temp_dir, f"{job.output_name}.wav")
+            success, message = self.trim_audio(source, trimmed, segment.start_time, segment.end_time)
+            if not success:
+                return None, message
+            source = trimmed
+
+        audio_filename = f"lipsync_audio_{job.output_name}_{os.path.basename(source)}"
+        success, message = self.copy_to_comfy_input(source, audio_filename)
+        if not success:
+            return None, f"Failed to copy audio: {message}"
+
+        job.audio_path = audio_filename
+        return self.prepare_workflow(job, copy.deepcopy(template)), audio_filename
+
+    @staticmethod
+    def _prepared(future: Future) -> Tuple[Optional[dict], str]:
+        """Unwrap a prep future, turning unexpected exceptions into errors."""
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Segment preparation failed: {e}")
+            return None, f"Preparation failed: {e}"
+
+    def _run_parallel(
+        self,
+        api: ComfyUIAPI,
+        jobs: List[LipsyncJob],
+        prepared: List[Future],
+        notify: Callable[[int, str], None]
+    ) -> List[Tuple[bool, str]]:
+        """Queue every segment as soon as it is prepared and collect them as they finish.
+
+        Jobs are tracked by polling ``/history``, since all of them share the
+        client id a WebSocket monitor would listen on.
+        """
+        outputs: List[Optional[Tuple[bool, str]]] = [None] * len(jobs)
+        pending = {}  # prompt_id -> segment index
+        submitted = {}  # prompt_id -> queue time
+
+        for i, future in enumerate(prepared):
+            workflow, message = self._prepared(future)
+            if workflow is None:
+                outputs[i] = (False, message)
+                continue
+            try:
+                queued_at = time.time()
+                prompt_id = api.queue_prompt(workflow)
+                pending[prompt_id], submitted[prompt_id] = i, queued_at
+            except Exception as e:
+                outputs[i] = (False, f"Failed to queue job: {e}")
+
+        done = len(jobs) - len(pending)
+        notify(done, f"Queued {len(pending)} segments")
+        last_progress = time.time()
+
+        while pending:
+            finished = False
+            for prompt_id, i in list(pending.items()):
+                history = api.get_history(prompt_id)
+                if not history:
+                    continue
+                del pending[prompt_id]
+                finished = True
+                if (history.get("status") or {}).get("status_str") == "error":
+                    outputs[i] = (False, "ComfyUI reported an execution error")
+                else:
+                    outputs[i] = self._find_segment_output(jobs[i].output_name, history, submitted[prompt_id])
+                done += 1
+                notify(done, f"Segment {i + 1} finished ({done}/{len(jobs)})")
+
+            if finished:
+                last_progress = time.time()
+            elif time.time() - last_progress > self.SEGMENT_TIMEOUT:
+                for prompt_id, i in pending.items():
+                    # Stop it in ComfyUI, or its file is found by a later run
+                    api.cancel_prompt(prompt_id)
+                    outputs[i] = (False, f"Timeout after {self.SEGMENT_TIMEOUT}s waiting for completion")
+                break
+            else:
+                time.sleep(self.POLL_INTERVAL)
+
+        return outputs
+
+    def _run_chained(
+        self,
+        api: ComfyUIAPI,
+        jobs: List[LipsyncJob],
+        prepared: List[Future],
+        temp_dir: str,
+        notify: Callable[[int, str], None]
+    ) -> List[Tuple[bool, str]]:
+        """Generate segments in order, feeding each last frame into the next segment."""
+        outputs: List[Tuple[bool, str]] = []
+        current_image = jobs[0].image_path
+
+        for i, (job, future) in enumerate(zip(jobs, prepared)):
+            notify(i + 1, f"Processing segment {i + 1}/{len(jobs)}")
+
+            workflow, message = self._prepared(future)
+            if workflow is None:
+                outputs.append((False, message))
+                continue
+
+            # Start image is only known now; re-apply the job to pick it up
+            job.image_path = current_image
+            workflow = self.prepare_workflow(job, workflow)
+
+            try:
+                queued_at = time.time()
+                prompt_id = api.queue_prompt(workflow)
+                status = api.monitor_progress(prompt_id)
+            except Exception as e:
+                outputs.append((False, f"Generation failed: {e}"))
+                continue
+
+            if status.get("status") != "success":
+                # Timeouts leave the prompt running in ComfyUI
+                api.cancel_prompt(prompt_id)
+                outputs.append((False, status.get("error") or "Generation failed"))
+                continue
+
+            success, video_path = self._find_segment_output(job.output_name, api.get_history(prompt_id), queued_at)
+            outputs.append((success, video_path))
+
+            # Extract last frame for chaining
+            if success and i < len(jobs) - 1:
+                frame_path = os.path.join(temp_dir, f"{job.output_name}_lastframe.png")
+                last_frame = self._frame_extractor.extract(video_path, frame_path)
+                frame_filename = f"lipsync_image_{os.path.basename(frame_path)}"
+                if last_frame and self.copy_to_comfy_input(last_frame, frame_filename)[0]:
+                    current_image = frame_filename
+                    logger.info(f"Using last frame for next segment: {last_frame}")
+                else:
+                    logger.warning(f"Could not extract last frame from {video_path}")
+
+        return outputs
+
+    def _find_segment_output(
+        self,
+        output_name: str,
+        history: Optional[Dict[str, Any]] = None,
+        submitted_at: float = 0.0
+    ) -> Tuple[bool, str]:
+        """Find the video a segment's prompt wrote.
+
+        The prompt's history outputs are used first. Without them, the newest
+        ``{output_name}_*`` file written after submitted_at counts, so a stale
+        file from an earlier run is never taken for this segment's result.
+        """
+        comfy_root = self.config.get_comfy_root()
+        output_root = os.path.join(comfy_root, "output") if comfy_root else ""
+        path = ComfyUIAPI.find_output_file(history, output_root, self.VIDEO_EXTENSIONS)
+        if path:
+            return True, path
+
+        output_dir = os.path.join(output_root, "lipsync") if output_root else ""
+        if not os.path.isdir(output_dir):
+            return False, f"Output directory not found: {output_dir}"
+
+        videos = [
+            os.path.join(output_dir, f) for f in os.listdir(output_dir)
+            if f.startswith(f"{output_name}_") and f.lower().endswith(self.VIDEO_EXTENSIONS)
+        ]
+        # 1s slack: filesystem timestamps can lag time.time() by a clock tick
+        videos = [path for path in videos if os.path.getmtime(path) >= submitted_at - 1.0]
+        if not videos:
+            return False, f"Output video not found for {output_name}"
+        return True, max(videos, key=os.path.getmtime)
+
     def concatenate_videos(
         self,
         video_paths: List[str],
         output_path: str,
-        crossfade_duration: float = 0.5
+        crossfade_duration: float = 0.0
     ) -> Tuple[bool, str]:
         """Concatenate multiple videos into one with optional crossfade.
 
+        Clips that already match the first clip's format are stream-copied;
+        only mismatching clips are re-encoded (see TimelineAssembler).
+
         Args:
             video_paths: List of video file paths
             output_path: Output file path
@@ -668,48 +838,13 @@ class LipsyncService:
             return True, output_path
 
         try:
-            if crossfade_duration > 0:
-                # Complex filter for crossfade
-                filter_parts = []
-                for i, _ in enumerate(video_paths):
-                    filter_parts.append(f"[{i}:v][{i}:a]")
-
-                # Build xfade filter chain
-                # This is simplified - full implementation would need proper filter graph
-                # For now, use simple concat
-                crossfade_duration = 0
-
-            # Create concat file
-            concat_file = os.path.join(tempfile.gettempdir(), "concat_list.txt")
-            with open(concat_file, "w") as f:
-                for vp in video_paths:
-                    f.write(f"file '{vp}'\n")
-
-            cmd = [
-                self._ffmpeg_path,
-                "-y",
-                "-f", "concat",
-                "-safe", "0",
-                "-i", concat_file,
-                "-c", "copy",
-                output_path
-            ]
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
+            assembler = TimelineAssembler(probe=self._probe, ffmpeg_path=self._ffmpeg_path)
+            timeline = assembler.build(
+                video_paths,
+                crossfade=crossfade_duration,
+                keep_clip_audio=True,
             )
-
-            # Cleanup
-            os.remove(concat_file)
-
-            if result.returncode != 0:
-                return False, f"Concatenation failed: {result.stderr[:200]}"
-
-            return True, output_path
-
+            return assembler.assemble(timeline, output_path)
         except Exception as e:
             logger.error(f"Video concatenation failed: {e}")
             return False, str(e)
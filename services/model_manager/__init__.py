@@ -5,6 +5,7 @@ Download missing models from Civitai and Huggingface.
 """
 
 from services.model_manager.workflow_scanner import WorkflowScanner
+from services.model_manager.workflow_index import WorkflowIndex
 from services.model_manager.model_scanner import ModelScanner
 from services.model_manager.model_classifier import ModelClassifier, ModelStatus
 from services.model_manager.archive_manager import ArchiveManager
@@ -13,6 +14,13 @@ from services.model_manager.storage_analyzer import StorageAnalyzer
 from services.model_manager.workflow_mapper import WorkflowMapper
 from services.model_manager.report_exporter import ReportExporter
 from services.model_manager.model_filter import ModelFilter
+from services.model_manager.model_catalog import ModelCatalog
+from services.model_manager.model_snapshot import ModelSnapshot
+from services.model_manager.model_metadata import (
+    ModelMetadata,
+    ModelMetadataReader,
+    get_model_metadata_reader,
+)
 from services.model_manager.model_downloader import (
     ModelDownloader,
     DownloadSource,
@@ -25,6 +33,7 @@ from services.model_manager.model_downloader import (
 
 __all__ = [
     "WorkflowScanner",
+    "WorkflowIndex",
     "ModelScanner",
     "ModelClassifier",
     "ModelStatus",
@@ -34,6 +43,11 @@ __all__ = [
     "WorkflowMapper",
     "ReportExporter",
     "ModelFilter",
+    "ModelCatalog",
+    "ModelSnapshot",
+    "ModelMetadata",
+    "ModelMetadataReader",
+    "get_model_metadata_reader",
     # Download support
     "ModelDownloader",
     "DownloadSource",
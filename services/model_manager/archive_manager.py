@@ -1,22 +1,76 @@
-"""Archive Manager - Move/restore model files to/from archive"""
+"""Archive Manager - Move/restore model files to/from archive
+
+Moves within one filesystem are hard-link renames. Across filesystems, files
+are copied in parallel (bounded) into an exclusively created ``.part`` file,
+hashed while streaming, verified and linked into place before the source is
+removed; every step is recorded in an fsync'ed per-process journal. Journals
+of dead processes are recovered on the next start: verified copies are
+completed, partial copies resumed from their offset (or rolled back if they
+no longer match the source). Destinations are claimed atomically, so an
+existing file is never overwritten. Archive contents are served from a
+persistent index that only re-lists type directories whose mtime changed.
+"""
+import hashlib
 import json
 import os
 import shutil
-from typing import List, Dict, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional, Tuple
 from pathlib import Path
 
 from infrastructure.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Directories modified this recently are re-listed on the next index refresh,
+# since coarse (NAS) timestamps could hide a second change within one tick.
+_RECENT_MTIME_NS = 2_000_000_000
+
+# Journal bookkeeping shared by all instances in this process: moves (or a
+# recovery) in flight per journal path. A journal is only deleted once its
+# count drops to zero, and only journals without a live owner are recovered.
+_JOURNAL_LOCK = threading.Lock()
+_JOURNALS_IN_USE: Dict[str, int] = {}
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process exists (conservatively True if unsure)."""
+    if os.name == "nt":
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
 
 class ArchiveManager:
     """Manages archiving and restoring model files"""
 
+    COPY_WORKERS = 2  # Parallel cross-device copies
+    COPY_CHUNK = 8 * 1024 * 1024  # 8MB
+    INDEX_FILENAME = ".archive_index.json"
+    JOURNAL_FILENAME = "archive_journal.jsonl"  # Legacy single journal, recovered if present
+    JOURNAL_PREFIX = "archive_journal."
+
     def __init__(
         self,
         archive_root: str,
-        comfyui_models_root: str
+        comfyui_models_root: str,
+        verify_copies: bool = True,
+        max_workers: Optional[int] = None,
+        deep_verify: bool = False
     ):
         """
         Initialize archive manager
@@ -24,25 +78,47 @@ class ArchiveManager:
         Args:
             archive_root: Root directory for archived models
             comfyui_models_root: Root directory of ComfyUI models
+            verify_copies: Check cross-device copies against the source; size and
+                mtime first, checksums only if those differ
+            max_workers: Parallel cross-device copies (default: COPY_WORKERS)
+            deep_verify: Always re-read copies and compare checksums
         """
         self.archive_root = Path(archive_root)
         self.models_root = Path(comfyui_models_root)
+        self.verify_copies = verify_copies
+        self.deep_verify = deep_verify
+        self.max_workers = max_workers or self.COPY_WORKERS
         self.logger = logger
         self.operation_log_file = self.archive_root / "archive_operations.jsonl"
+        self.journal_file = self.archive_root / f"{self.JOURNAL_PREFIX}{os.getpid()}.jsonl"
+        self.index_file = self.archive_root / self.INDEX_FILENAME
+        self._index: Optional[Dict] = None
+        self._index_lock = threading.Lock()
+        self._journal_lock = _JOURNAL_LOCK
+
+        if self.archive_root.is_dir():
+            self.recover_interrupted()
 
     def move_to_archive(
         self,
         model_path: str,
         model_type: str,
-        dry_run: bool = False
+        dry_run: bool = False,
+        progress_callback: Optional[Callable[[int], None]] = None
     ) -> Tuple[bool, str]:
         """
         Move a model file to archive
 
+        Renames within a filesystem; otherwise performs a verified,
+        journaled copy before removing the source. The destination is
+        claimed atomically: if another move created it in the meantime,
+        the move fails and the source stays in place.
+
         Args:
             model_path: Full path to model file
             model_type: Model type (checkpoints, loras, etc.)
             dry_run: If True, don't actually move files
+            progress_callback: Optional callback(bytes_copied_delta)
 
         Returns:
             Tuple of (success, message)
@@ -70,11 +146,14 @@ class ArchiveManager:
             archive_type_dir.mkdir(parents=True, exist_ok=True)
 
             # Move file
-            shutil.move(str(src_path), str(dest_path))
+            self._move_file(src_path, dest_path, progress_callback)
             self.logger.info(f"Moved to archive: {src_path.name} → {dest_path}")
+            self._log_operation("move_to_archive", {"src": str(src_path), "dest": str(dest_path)})
 
             return True, f"Moved to archive: {dest_path}"
 
+        except FileExistsError:
+            return False, f"File already exists in archive: {dest_path}"
         except Exception as e:
             self.logger.error(f"Failed to move {src_path} to archive: {e}")
             return False, f"Error: {str(e)}"
@@ -130,12 +209,14 @@ class ArchiveManager:
             # Create models directory if needed
             models_type_dir.mkdir(parents=True, exist_ok=True)
 
-            # Copy file (keep in archive as backup)
-            shutil.copy2(str(src_path), str(dest_path))
+            # Copy file (keep in archive as backup); never leaves a truncated model
+            self._copy_verified(src_path, dest_path)
             self.logger.info(f"Restored from archive: {filename} → {dest_path}")
 
             return True, f"Restored to: {dest_path}"
 
+        except FileExistsError:
+            return False, f"File already exists in models: {dest_path}"
         except Exception as e:
             self.logger.error(f"Failed to restore {filename} from archive: {e}")
             return False, f"Error: {str(e)}"
@@ -179,47 +260,57 @@ class ArchiveManager:
         """
         return str(self.archive_root / model_type / filename)
 
-    def scan_archive(self) -> Dict[str, List[str]]:
+    def get_restore_path(self, filename: str, model_type: str) -> str:
         """
-        Scan archive directory for all archived models
+        Get the models-directory path a restore writes to
+
+        Args:
+            filename: Model filename (may contain a workflow subpath)
+            model_type: Model type
 
         Returns:
-            Dict mapping model type to list of filenames
+            Full path string
         """
-        archived_models = {}
-
-        if not self.archive_root.exists():
-            self.logger.warning(f"Archive directory does not exist: {self.archive_root}")
-            return archived_models
+        filename_normalized = filename.replace("\\", "/").split("/")[-1]
+        return str(self.models_root / model_type / filename_normalized)
 
-        # Scan each model type subdirectory
-        for model_type_dir in self.archive_root.iterdir():
-            if not model_type_dir.is_dir():
-                continue
+    def scan_archive(self, include_flat: bool = False) -> Dict[str, List[str]]:
+        """
+        Scan archive directory for all archived models
 
-            model_type = model_type_dir.name
-            files = []
+        Answered from the archive index; only changed type directories are re-listed.
 
-            for file_path in model_type_dir.iterdir():
-                if file_path.is_file():
-                    files.append(file_path.name)
+        Args:
+            include_flat: Also return files stored directly in the archive root (key "")
 
-            if files:
-                archived_models[model_type] = sorted(files)
+        Returns:
+            Dict mapping model type to list of filenames
+        """
+        if not self.archive_root.exists():
+            self.logger.warning(f"Archive directory does not exist: {self.archive_root}")
+            return {}
 
-        return archived_models
+        return {
+            model_type: sorted(files)
+            for model_type, files in sorted(self._refresh_index().items())
+            if (model_type or include_flat) and files
+        }
 
     def batch_move_to_archive(
         self,
         models: List[Dict[str, str]],
-        dry_run: bool = False
+        dry_run: bool = False,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None
     ) -> Dict[str, List[str]]:
         """
         Move multiple models to archive
 
+        Cross-device copies run in parallel (bounded by max_workers).
+
         Args:
             models: List of dicts with 'path' and 'type' keys
             dry_run: If True, don't actually move files
+            progress_callback: Optional callback(bytes_done, bytes_total, filename)
 
         Returns:
             Dict with 'success' and 'failed' lists of filenames
@@ -229,16 +320,12 @@ class ArchiveManager:
             "failed": [],
         }
 
-        for model in models:
-            model_path = model["path"]
-            model_type = model["type"]
-
-            success, message = self.move_to_archive(model_path, model_type, dry_run)
-
+        for model, (success, message) in self._move_many(models, dry_run, byte_callback=progress_callback):
+            name = Path(model["path"]).name
             if success:
-                results["success"].append(Path(model_path).name)
+                results["success"].append(name)
             else:
-                results["failed"].append(f"{Path(model_path).name}: {message}")
+                results["failed"].append(f"{name}: {message}")
 
         self.logger.info(f"Batch move: {len(results['success'])} success, {len(results['failed'])} failed")
 
@@ -286,19 +373,14 @@ class ArchiveManager:
         Returns:
             Total size in bytes
         """
-        total_size = 0
-
         if not self.archive_root.exists():
-            return total_size
-
-        for file_path in self.archive_root.rglob("*"):
-            if file_path.is_file():
-                try:
-                    total_size += file_path.stat().st_size
-                except Exception as e:
-                    self.logger.error(f"Error getting size of {file_path}: {e}")
+            return 0
 
-        return total_size
+        return sum(
+            entry["size_bytes"]
+            for files in self._refresh_index().values()
+            for entry in files.values()
+        )
 
     # ------------------------------------------------------------------ #
     # Phase 2 batch enhancements
@@ -328,12 +410,13 @@ class ArchiveManager:
 
         total = len(files)
         results = {"success": [], "failed": []}
+        files = [{**m, "type": model_type} for m in files]
 
-        for idx, model in enumerate(files, start=1):
+        for model, (ok, msg) in self._move_many(
+            files, dry_run, file_callback=(lambda idx, name: progress_callback(idx, total, name))
+            if progress_callback else None
+        ):
             progress_filename = Path(model.get("path", "")).name
-            if progress_callback:
-                progress_callback(idx, total, progress_filename)
-            ok, msg = self.move_to_archive(model.get("path"), model_type, dry_run=dry_run)
             if ok:
                 results["success"].append(progress_filename)
             else:
@@ -358,13 +441,10 @@ class ArchiveManager:
         if missing_models is None:
             # Heuristic: anything in archive not present in models_root counts as missing
             missing_models = []
-            for model_type_dir in self.archive_root.glob("*"):
-                if not model_type_dir.is_dir():
-                    continue
-                for file_path in model_type_dir.glob("*"):
-                    models_path = self.models_root / model_type_dir.name / file_path.name
-                    if not models_path.exists():
-                        missing_models.append({"filename": file_path.name, "type": model_type_dir.name})
+            for model_type, filenames in self.scan_archive().items():
+                for filename in filenames:
+                    if not (self.models_root / model_type / filename).exists():
+                        missing_models.append({"filename": filename, "type": model_type})
 
         total = len(missing_models)
         results = {"success": [], "failed": []}
@@ -438,24 +518,12 @@ class ArchiveManager:
         return entries
 
     def create_archive_index(self) -> str:
-        """Create JSON index of archived models."""
-        index = {}
-        for model_type_dir in self.archive_root.glob("*"):
-            if not model_type_dir.is_dir():
-                continue
-            files = []
-            for file_path in model_type_dir.glob("*"):
-                if not file_path.is_file():
-                    continue
-                try:
-                    files.append({
-                        "filename": file_path.name,
-                        "size_bytes": file_path.stat().st_size,
-                        "modified": file_path.stat().st_mtime,
-                    })
-                except OSError:
-                    continue
-            index[model_type_dir.name] = files
+        """Export the archive index as JSON (archive_index.json)."""
+        index = {
+            model_type: [{"filename": name, **entry} for name, entry in sorted(files.items())]
+            for model_type, files in sorted(self._refresh_index().items())
+            if model_type
+        }
 
         index_path = self.archive_root / "archive_index.json"
         try:
@@ -482,3 +550,442 @@ class ArchiveManager:
                 f.write("\n")
         except Exception as e:
             self.logger.error(f"Failed to log archive operation {action}: {e}")
+
+    # ------------------------------------------------------------------ #
+    # Moves and copies
+    # ------------------------------------------------------------------ #
+    def _move_many(
+        self,
+        models: List[Dict[str, str]],
+        dry_run: bool,
+        byte_callback: Optional[Callable[[int, int, str], None]] = None,
+        file_callback: Optional[Callable[[int, str], None]] = None
+    ) -> List[Tuple[Dict[str, str], Tuple[bool, str]]]:
+        """Run move_to_archive for many files; results keep input order."""
+        if not models:
+            return []
+
+        total_bytes = sum(self._safe_size(m.get("path")) for m in models)
+        state = {"bytes": 0, "files": 0}
+        lock = threading.Lock()
+
+        def work(model: Dict[str, str]) -> Tuple[bool, str]:
+            name = Path(model.get("path") or "").name
+
+            def on_bytes(delta: int):
+                with lock:
+                    state["bytes"] += delta
+                    done = state["bytes"]
+                if byte_callback:
+                    byte_callback(done, total_bytes, name)
+
+            result = self.move_to_archive(model.get("path"), model["type"], dry_run, on_bytes)
+            if file_callback:
+                with lock:
+                    state["files"] += 1
+                    idx = state["files"]
+                file_callback(idx, name)
+            return result
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(models))) as pool:
+            return list(zip(models, pool.map(work, models)))
+
+    def _move_file(
+        self,
+        src_path: Path,
+        dest_path: Path,
+        progress_callback: Optional[Callable[[int], None]] = None
+    ):
+        """Rename on the same device, else journaled verified copy + delete.
+
+        Raises:
+            FileExistsError: dest_path (or its partial copy) already exists
+        """
+        if self._same_device(src_path, dest_path.parent):
+            self._place_exclusive(src_path, dest_path)
+            if progress_callback:
+                progress_callback(self._safe_size(str(dest_path)))
+            return
+
+        entry = {"op": "move", "pid": os.getpid(), "src": str(src_path), "dest": str(dest_path)}
+        journal_key = str(self.journal_file)
+        with self._journal_lock:
+            _JOURNALS_IN_USE[journal_key] = _JOURNALS_IN_USE.get(journal_key, 0) + 1
+        try:
+            self._journal({**entry, "state": "started"})
+            try:
+                digest = self._copy_verified(
+                    src_path, dest_path, progress_callback,
+                    on_claimed=lambda ino: self._journal({**entry, "state": "copying", "part_ino": ino}),
+                )
+            except Exception:
+                self._journal({**entry, "state": "aborted"})
+                raise
+            self._journal({**entry, "state": "copied", "sha256": digest})
+            src_path.unlink()
+            self._journal({**entry, "state": "done"})
+        finally:
+            with self._journal_lock:
+                _JOURNALS_IN_USE[journal_key] -= 1
+                # Nothing left to recover once every move has settled
+                if not _JOURNALS_IN_USE[journal_key]:
+                    del _JOURNALS_IN_USE[journal_key]
+                    if self.journal_file.exists():
+                        self.journal_file.unlink()
+
+    def _copy_verified(
+        self,
+        src_path: Path,
+        dest_path: Path,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        on_claimed: Optional[Callable[[int], None]] = None,
+        resume: bool = False
+    ) -> str:
+        """Stream src into dest.part with SHA256, verify, then link into place.
+
+        The ``.part`` file is created exclusively, so a copy never writes into
+        (or cleans up) another writer's partial file. With ``resume`` an
+        existing ``.part`` is checked against the source prefix and continued
+        from its current size.
+
+        Args:
+            on_claimed: Called with the inode of the claimed ``.part`` file
+            resume: Continue an existing partial copy instead of creating one
+
+        Raises:
+            FileExistsError: dest_path or (without resume) dest.part exists
+        """
+        part_path = dest_path.with_name(dest_path.name + ".part")
+        hasher = hashlib.sha256()
+        part = open(part_path, "r+b" if resume else "xb")
+
+        try:
+            with part as dst, open(src_path, "rb") as src:
+                src_stat = os.fstat(src.fileno())
+                if on_claimed:
+                    on_claimed(os.fstat(dst.fileno()).st_ino)
+                if resume:
+                    self._check_prefix(src, dst, hasher)
+                while True:
+                    block = src.read(self.COPY_CHUNK)
+                    if not block:
+                        break
+                    dst.write(block)
+                    hasher.update(block)
+                    if progress_callback:
+                        progress_callback(len(block))
+                dst.flush()
+                os.fsync(dst.fileno())
+
+            digest = hasher.hexdigest()
+            if self.verify_copies:
+                self._verify_copy(src_path, part_path, src_stat, digest)
+
+            shutil.copystat(str(src_path), str(part_path))
+            self._place_exclusive(part_path, dest_path)
+            return digest
+        except Exception:
+            if part_path.exists():
+                part_path.unlink()
+            raise
+
+    def _verify_copy(self, src_path: Path, part_path: Path, src_stat: os.stat_result, digest: str):
+        """Check a finished copy against its source.
+
+        Equal sizes and an unchanged source mtime are accepted without
+        re-reading; otherwise (or with ``deep_verify``) both files are hashed.
+
+        Raises:
+            IOError: The copy does not match the source
+        """
+        current = os.stat(src_path)
+        unchanged = (
+            part_path.stat().st_size == current.st_size == src_stat.st_size
+            and current.st_mtime_ns == src_stat.st_mtime_ns
+        )
+        if unchanged and not self.deep_verify:
+            return
+        if self._hash_file(part_path) != digest or self._hash_file(src_path) != digest:
+            raise IOError(f"Checksum mismatch after copying {src_path.name}")
+
+    def _check_prefix(self, src, dst, hasher) -> int:
+        """Compare an existing partial copy with the source prefix.
+
+        Leaves both files positioned at the end of the partial copy and feeds
+        the prefix into ``hasher``.
+
+        Raises:
+            IOError: The partial copy is not a prefix of the source
+        """
+        offset = os.fstat(dst.fileno()).st_size
+        if offset > os.fstat(src.fileno()).st_size:
+            raise IOError(f"Partial copy of {Path(src.name).name} is larger than the source")
+        remaining = offset
+        while remaining:
+            block = src.read(min(self.COPY_CHUNK, remaining))
+            if not block or dst.read(len(block)) != block:
+                raise IOError(f"Partial copy of {Path(src.name).name} does not match the source")
+            hasher.update(block)
+            remaining -= len(block)
+        return offset
+
+    @staticmethod
+    def _place_exclusive(src_path: Path, dest_path: Path):
+        """Move src to dest without ever replacing an existing dest.
+
+        Uses a hard link (fails atomically if dest exists); on filesystems
+        without hard links, dest is claimed with O_EXCL first and only that
+        placeholder is replaced.
+
+        Raises:
+            FileExistsError: dest_path already exists
+        """
+        try:
+            os.link(src_path, dest_path)
+        except FileExistsError:
+            raise
+        except OSError:
+            fd = os.open(dest_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.close(fd)
+            try:
+                os.replace(src_path, dest_path)
+            except OSError:
+                os.unlink(dest_path)
+                raise
+            return
+        os.unlink(src_path)
+
+    def _hash_file(self, path: Path) -> str:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(self.COPY_CHUNK), b""):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _same_device(src_path: Path, dest_dir: Path) -> bool:
+        try:
+            return os.stat(src_path).st_dev == os.stat(dest_dir).st_dev
+        except OSError:
+            return False
+
+    @staticmethod
+    def _safe_size(path: Optional[str]) -> int:
+        try:
+            return os.path.getsize(path) if path else 0
+        except OSError:
+            return 0
+
+    # ------------------------------------------------------------------ #
+    # Operation journal
+    # ------------------------------------------------------------------ #
+    def _journal(self, entry: Dict):
+        """Append a journal entry and fsync it before continuing."""
+        with self._journal_lock:
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def recover_interrupted(self) -> Dict[str, List[str]]:
+        """
+        Finish, resume or roll back moves of processes that died mid-move
+
+        Only journals without a live owner are touched: the legacy
+        ``archive_journal.jsonl``, journals of dead pids and stale journals
+        of this pid that no move in this process is using. Each journal is
+        claimed by renaming it to this process first, so concurrent starts
+        never recover the same moves twice.
+
+        A move whose copy was verified is completed (source removed). A
+        partial copy owned by the move (same inode as journaled) is resumed
+        from its current size if it still matches the source, otherwise it
+        is removed and the source stays in place.
+
+        Returns:
+            Dict with 'completed', 'resumed' and 'rolled_back' lists of filenames
+        """
+        results = {"completed": [], "resumed": [], "rolled_back": []}
+
+        with self._journal_lock:
+            claimed = []
+            for journal in self._orphaned_journals():
+                target = journal.with_name(
+                    f"{self.JOURNAL_PREFIX}{os.getpid()}-{self._journal_token(journal) or 'legacy'}.jsonl"
+                )
+                try:
+                    os.rename(journal, target)
+                except OSError:
+                    continue  # Claimed by another process
+                _JOURNALS_IN_USE[str(target)] = 1
+                claimed.append(target)
+
+        for journal in claimed:
+            try:
+                self._recover_journal(journal, results)
+            finally:
+                with self._journal_lock:
+                    del _JOURNALS_IN_USE[str(journal)]
+                    journal.unlink()
+
+        if any(results.values()):
+            self.logger.warning(
+                f"Recovered interrupted archive moves: {len(results['completed'])} completed, "
+                f"{len(results['resumed'])} resumed, {len(results['rolled_back'])} rolled back"
+            )
+            self._log_operation("recover_interrupted", {"result": results})
+        return results
+
+    def _recover_journal(self, journal: Path, results: Dict[str, List[str]]):
+        last_state: Dict[Tuple[str, str], Dict] = {}
+        with open(journal, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn final write
+                last_state[(entry.get("src"), entry.get("dest"))] = entry
+
+        for (src, dest), entry in last_state.items():
+            if not src or not dest or entry.get("state") in ("done", "aborted"):
+                continue
+            src_path, dest_path = Path(src), Path(dest)
+            part_path = dest_path.with_name(dest_path.name + ".part")
+            if entry["state"] == "copied" and dest_path.exists():
+                if src_path.exists():
+                    src_path.unlink()
+                results["completed"].append(dest_path.name)
+            elif entry["state"] == "copying" and self._owns_part(part_path, entry):
+                if src_path.exists():
+                    try:
+                        self._copy_verified(src_path, dest_path, resume=True)
+                        src_path.unlink()
+                        results["resumed"].append(dest_path.name)
+                        continue
+                    except Exception as e:  # Partial copy was removed, source kept
+                        self.logger.warning(f"Could not resume archive move of {src_path.name}: {e}")
+                elif part_path.exists():
+                    part_path.unlink()
+                results["rolled_back"].append(src_path.name)
+            else:
+                # Partial copy never claimed by this move - leave it to its owner
+                results["rolled_back"].append(src_path.name)
+
+    def _orphaned_journals(self) -> List[Path]:
+        """Journals without a live owner (caller holds the journal lock)."""
+        orphaned = []
+        for journal in sorted(self.archive_root.glob(f"{self.JOURNAL_PREFIX}*jsonl")):
+            if str(journal) in _JOURNALS_IN_USE:
+                continue
+            owner = self._journal_token(journal).split("-")[0]
+            if not owner.isdigit() or int(owner) == os.getpid() or not _pid_alive(int(owner)):
+                orphaned.append(journal)
+        return orphaned
+
+    def _journal_token(self, journal: Path) -> str:
+        """Owner token of a journal name ('' for the legacy journal)."""
+        return journal.name[len(self.JOURNAL_PREFIX):-len(".jsonl")]
+
+    @staticmethod
+    def _owns_part(part_path: Path, entry: Dict) -> bool:
+        try:
+            return os.stat(part_path).st_ino == entry.get("part_ino")
+        except OSError:
+            return False
+
+    # ------------------------------------------------------------------ #
+    # Archive index
+    # ------------------------------------------------------------------ #
+    def _refresh_index(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        Bring the persistent index up to date and return its files
+
+        Type directories whose mtime is unchanged are not listed again.
+        Root-level files (flat archives) are kept under the "" key.
+
+        Returns:
+            Dict mapping model type to {filename: {"size_bytes", "modified"}}
+        """
+        with self._index_lock:
+            index = self._load_index()
+            dirs, files = index["dirs"], index["files"]
+            bookkeeping = {
+                self.operation_log_file.name, self.index_file.name, "archive_index.json",
+            }
+            unsettled_before = time.time_ns() - _RECENT_MTIME_NS
+            changed = False
+
+            root_files, type_dirs = {}, {}
+            try:
+                with os.scandir(self.archive_root) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                type_dirs[entry.name] = entry.stat().st_mtime_ns
+                            elif entry.is_file() and entry.name not in bookkeeping \
+                                    and not entry.name.startswith(self.JOURNAL_PREFIX) \
+                                    and not entry.name.endswith((".part", ".tmp")):
+                                st = entry.stat()
+                                root_files[entry.name] = {"size_bytes": st.st_size, "modified": st.st_mtime}
+                        except OSError:
+                            continue
+            except OSError:
+                return {}
+
+            if files.get("") != root_files:
+                files[""] = root_files
+                changed = True
+
+            for model_type in [t for t in dirs if t not in type_dirs]:
+                dirs.pop(model_type)
+                files.pop(model_type, None)
+                changed = True
+
+            for model_type, mtime_ns in type_dirs.items():
+                if dirs.get(model_type) == mtime_ns:
+                    continue
+                files[model_type] = self._list_archive_dir(self.archive_root / model_type)
+                dirs[model_type] = mtime_ns if mtime_ns < unsettled_before else -1
+                changed = True
+
+            if changed:
+                self._save_index(index)
+            return {model_type: dict(entries) for model_type, entries in files.items()}
+
+    def _list_archive_dir(self, directory: Path) -> Dict[str, Dict]:
+        files = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file() and not entry.name.endswith(".part"):
+                            st = entry.stat()
+                            files[entry.name] = {"size_bytes": st.st_size, "modified": st.st_mtime}
+                    except OSError as e:
+                        self.logger.error(f"Error reading archive file {entry.path}: {e}")
+        except OSError as e:
+            self.logger.error(f"Error scanning archive directory {directory}: {e}")
+        return files
+
+    def _load_index(self) -> Dict:
+        """Load the index on first access (caller holds the index lock)."""
+        if self._index is None:
+            self._index = {"dirs": {}, "files": {}}
+            try:
+                if self.index_file.exists():
+                    data = json.loads(self.index_file.read_text(encoding="utf-8"))
+                    if isinstance(data, dict) and {"dirs", "files"} <= set(data):
+                        self._index = data
+            except Exception as e:
+                self.logger.warning(f"Archive index unreadable, rebuilding: {e}")
+        return self._index
+
+    def _save_index(self, index: Dict):
+        """Write the index atomically (caller holds the index lock)."""
+        try:
+            tmp_path = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(index), encoding="utf-8")
+            os.replace(tmp_path, self.index_file)
+        except Exception as e:
+            self.logger.warning(f"Could not persist archive index: {e}")
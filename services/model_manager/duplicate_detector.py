@@ -1,10 +1,19 @@
-"""Duplicate Detector - Find duplicate model files via hashing."""
+"""Duplicate Detector - Find duplicate model files via hashing.
+
+Same-size candidates are narrowed down in tiers: a tiny head/tail
+fingerprint first, then the partial (first/last 100MB) hash, and a full
+SHA256 only when asked for and earlier tiers still collide. Hashes are
+persisted per (path, size, mtime, inode), so reruns only hash new or
+changed files.
+"""
 from __future__ import annotations
 
 import hashlib
 import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from infrastructure.logger import get_logger
 from services.model_manager.model_classifier import ModelStatus
@@ -12,15 +21,35 @@ from services.model_manager.model_scanner import ModelScanner
 
 logger = get_logger(__name__)
 
+DEFAULT_HASH_CACHE_PATH = Path.home() / ".cindergrace" / "cache" / "model_hashes.db"
+
 
 class DuplicateDetector:
     """Detect duplicate model files by size + hash."""
 
+    FINGERPRINT_CHUNK = 64 * 1024  # 64KB head/tail
     PARTIAL_CHUNK = 100 * 1024 * 1024  # 100MB
+    READ_CHUNK = 8 * 1024 * 1024  # Bounded memory per read
+    HASH_WORKERS = 4
+
+    # Hash tiers from cheapest to most expensive (None = whole file)
+    TIERS = {
+        "fingerprint": FINGERPRINT_CHUNK,
+        "partial": PARTIAL_CHUNK,
+        "full": None,
+    }
 
-    def __init__(self, use_partial_hash: bool = True):
+    def __init__(
+        self,
+        use_partial_hash: bool = True,
+        cache_path: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ):
         self.use_partial_hash = use_partial_hash
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_HASH_CACHE_PATH
+        self.max_workers = max_workers or self.HASH_WORKERS
         self.logger = logger
+        self._cache_enabled = self._ensure_cache()
 
     def find_duplicates(
         self,
@@ -66,36 +95,63 @@ class DuplicateDetector:
                 }
                 by_size.setdefault(size, []).append(item)
 
+        # Only hash groups with matching sizes
+        groups = [
+            [c for c in candidates if c.get("path")]
+            for candidates in by_size.values()
+            if len(candidates) >= 2
+        ]
+        groups = [group for group in groups if len(group) >= 2]
+        if not groups:
+            return []
+
+        final_tier = "partial" if use_partial_hash else "full"
+        tiers = list(self.TIERS)[:list(self.TIERS).index(final_tier) + 1]
+
+        stamps = {c["path"]: self._stat(c["path"]) for group in groups for c in group}
+        for path, stamp in stamps.items():
+            if stamp is None:
+                self.logger.error(f"Hash failed for {path}: file not found")
+        hashes = self._load_cached(stamps)
+        dirty = set()
+
         duplicates: List[Dict] = []
+        for tier in tiers:
+            chunk = self.TIERS[tier]
+            pending = list(dict.fromkeys(
+                c["path"] for group in groups for c in group
+                if stamps.get(c["path"]) and tier not in hashes.get(c["path"], {})
+            ))
+            for path, file_hash in self._hash_many(pending, chunk):
+                hashes.setdefault(path, {})[tier] = file_hash
+                dirty.add(path)
 
-        # Only hash groups with matching sizes
-        for size, candidates in by_size.items():
-            if len(candidates) < 2:
-                continue
-
-            hashes: Dict[str, List[Dict]] = {}
-            for candidate in candidates:
-                file_path = candidate.get("path")
-                if not file_path:
-                    continue
-                try:
-                    file_hash = self._hash_file(file_path, partial=use_partial_hash)
-                except Exception as exc:
-                    self.logger.error(f"Hash failed for {file_path}: {exc}")
-                    continue
-                hashes.setdefault(file_hash, []).append(candidate)
+            next_groups = []
+            for group in groups:
+                by_hash: Dict[str, List[Dict]] = {}
+                for candidate in group:
+                    file_hash = hashes.get(candidate["path"], {}).get(tier)
+                    if file_hash is not None:
+                        by_hash.setdefault(file_hash, []).append(candidate)
 
-            for file_hash, group in hashes.items():
-                if len(group) < 2:
-                    continue
-                suggested = self.suggest_keep(group, prefer_used)
-                duplicates.append({
-                    "hash": file_hash,
-                    "size_bytes": size,
-                    "files": group,
-                    "suggested_keep": suggested,
-                })
+                size = group[0]["size_bytes"]
+                # A tier that covers the whole file is already exact
+                exact = tier == final_tier or (chunk is not None and size <= chunk * 2)
+                for file_hash, matches in by_hash.items():
+                    if len(matches) < 2:
+                        continue
+                    if exact:
+                        duplicates.append({
+                            "hash": file_hash,
+                            "size_bytes": size,
+                            "files": matches,
+                            "suggested_keep": self.suggest_keep(matches, prefer_used),
+                        })
+                    else:
+                        next_groups.append(matches)
+            groups = next_groups
 
+        self._store_cached({path: stamps[path] for path in dirty}, hashes)
         return duplicates
 
     def suggest_keep(self, group: List[Dict], prefer_used: bool = True) -> Optional[Dict]:
@@ -119,25 +175,154 @@ class DuplicateDetector:
 
     def _hash_file(self, path: str, partial: bool = True) -> str:
         """Hash a file using SHA256 with optional partial hashing."""
-        hasher = hashlib.sha256()
         file_path = Path(path)
 
         if not file_path.exists() or not file_path.is_file():
             raise FileNotFoundError(f"File not found: {path}")
 
-        if partial and file_path.stat().st_size > self.PARTIAL_CHUNK * 2:
-            with open(file_path, "rb") as f:
-                hasher.update(f.read(self.PARTIAL_CHUNK))
-                f.seek(max(file_path.stat().st_size - self.PARTIAL_CHUNK, 0))
-                hasher.update(f.read(self.PARTIAL_CHUNK))
-                hasher.update(str(file_path.stat().st_size).encode())
-        else:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(8 * 1024 * 1024), b""):
-                    hasher.update(chunk)
+        return self._hash_ranges(str(file_path), self.PARTIAL_CHUNK if partial else None)
+
+    def _hash_ranges(self, path: str, chunk: Optional[int]) -> str:
+        """SHA256 of the first/last ``chunk`` bytes plus size, or of the whole file.
+
+        Files no larger than two chunks are hashed completely, so the result
+        equals the full hash. Reads are streamed in READ_CHUNK blocks.
+        """
+        hasher = hashlib.sha256()
+        size = os.path.getsize(path)
+
+        with open(path, "rb") as f:
+            if chunk is not None and size > chunk * 2:
+                self._update(hasher, f, chunk)
+                f.seek(size - chunk)
+                self._update(hasher, f, chunk)
+                hasher.update(str(size).encode())
+            else:
+                self._update(hasher, f, None)
 
         return hasher.hexdigest()
 
+    def _update(self, hasher, f, length: Optional[int]) -> None:
+        """Feed up to ``length`` bytes (None = rest of file) into the hasher."""
+        remaining = length
+        while remaining is None or remaining > 0:
+            block = f.read(self.READ_CHUNK if remaining is None else min(self.READ_CHUNK, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+
+    def _hash_many(self, paths: List[str], chunk: Optional[int]) -> List[Tuple[str, str]]:
+        """Hash files in a thread pool, skipping (and logging) failures."""
+        def work(path: str) -> Tuple[str, Optional[str]]:
+            try:
+                return path, self._hash_ranges(path, chunk)
+            except Exception as exc:
+                self.logger.error(f"Hash failed for {path}: {exc}")
+                return path, None
+
+        if not paths:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as pool:
+            return [(path, file_hash) for path, file_hash in pool.map(work, paths) if file_hash]
+
+    # ------------------------------------------------------------------ #
+    # Hash cache
+    # ------------------------------------------------------------------ #
+    def _ensure_cache(self) -> bool:
+        """Create hash cache table if not exists; returns False if unusable."""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.cache_path))
+            try:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS file_hashes (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        inode INTEGER NOT NULL,
+                        fingerprint TEXT,
+                        partial TEXT,
+                        full TEXT
+                    )
+                """)
+                conn.commit()
+            finally:
+                conn.close()
+            return True
+        except Exception as exc:
+            self.logger.warning(f"Hash cache unavailable, hashing without cache: {exc}")
+            return False
+
+    def _load_cached(
+        self,
+        stamps: Dict[str, Optional[Tuple[int, int, int]]]
+    ) -> Dict[str, Dict[str, str]]:
+        """Return cached tier hashes for files whose (size, mtime, inode) still match."""
+        hashes: Dict[str, Dict[str, str]] = {}
+        if not self._cache_enabled:
+            return hashes
+
+        paths = [path for path, stamp in stamps.items() if stamp]
+        try:
+            conn = sqlite3.connect(str(self.cache_path))
+            try:
+                for offset in range(0, len(paths), 500):
+                    batch = paths[offset:offset + 500]
+                    rows = conn.execute(
+                        "SELECT path, size, mtime_ns, inode, fingerprint, partial, full FROM file_hashes "
+                        f"WHERE path IN ({','.join('?' * len(batch))})",
+                        batch
+                    )
+                    for path, size, mtime_ns, inode, *tier_hashes in rows:
+                        if stamps[path] != (size, mtime_ns, inode):
+                            continue
+                        hashes[path] = {
+                            tier: value for tier, value in zip(self.TIERS, tier_hashes) if value
+                        }
+            finally:
+                conn.close()
+        except Exception as exc:
+            self.logger.warning(f"Could not read hash cache: {exc}")
+        return hashes
+
+    def _store_cached(
+        self,
+        stamps: Dict[str, Optional[Tuple[int, int, int]]],
+        hashes: Dict[str, Dict[str, str]]
+    ) -> None:
+        """Persist tier hashes for the given files."""
+        if not self._cache_enabled or not stamps:
+            return
+        rows = [
+            (path, *stamp, *(hashes[path].get(tier) for tier in self.TIERS))
+            for path, stamp in stamps.items() if stamp
+        ]
+        try:
+            conn = sqlite3.connect(str(self.cache_path))
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO file_hashes "
+                    "(path, size, mtime_ns, inode, fingerprint, partial, full) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as exc:
+            self.logger.warning(f"Could not persist hash cache: {exc}")
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int, int]]:
+        """Return the cache key (size, mtime_ns, inode), or None if missing."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns, st.st_ino
+
     @staticmethod
     def _safe_size(path: Optional[str]) -> Optional[int]:
         """Safely fetch file size."""
@@ -0,0 +1,196 @@
+"""Model Catalog - Columnar view of classified models for fast table queries.
+
+The classification is converted once per snapshot version into NumPy
+columns (size, mtime, workflow count, type/status codes, interned
+filenames). Filters become boolean masks over whole columns, sort orders are
+computed once per key and reused, and only the requested page is turned back
+into rows, so filter changes no longer rebuild and ship the full table.
+"""
+from __future__ import annotations
+
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.model_manager.model_classifier import ModelStatus
+from services.model_manager.workflow_index import WorkflowIndex
+
+
+class ModelCatalog:
+    """Array-backed model table with vectorized filters, sorting and paging."""
+
+    SORT_KEYS = ("default", "filename", "size", "type", "status", "workflows", "modified")
+
+    def __init__(
+        self,
+        models: Iterable[Dict],
+        workflow_index: Optional[WorkflowIndex] = None,
+        archived: Optional[Dict[str, Iterable[str]]] = None
+    ):
+        """
+        Build the columns
+
+        Args:
+            models: Classified model dicts (filename, type, status, size_bytes, path, ...)
+            workflow_index: Index used for workflow counts (falls back to 'workflow_count')
+            archived: Archived filenames by type (``ArchiveManager.scan_archive()``);
+                the "" key holds flat-archive files matching any type
+        """
+        self.models: List[Dict] = list(models)
+        count = len(self.models)
+        archived_keys = {
+            (model_type, filename)
+            for model_type, filenames in (archived or {}).items()
+            for filename in filenames
+        }
+
+        self.types: List[str] = sorted({m["type"] for m in self.models})
+        type_codes = {model_type: code for code, model_type in enumerate(self.types)}
+        self.statuses: List[ModelStatus] = list(ModelStatus)
+        status_codes = {status: code for code, status in enumerate(self.statuses)}
+
+        self.filenames = np.array([m["filename"] for m in self.models], dtype=object)
+        self._filenames_lower = np.array([m["filename"].lower() for m in self.models], dtype=str)
+        self.type_code = np.fromiter((type_codes[m["type"]] for m in self.models), np.int16, count)
+        self.status_code = np.fromiter(
+            (status_codes.get(m.get("status"), status_codes[ModelStatus.UNUSED]) for m in self.models),
+            np.int8, count
+        )
+        self.size = np.fromiter((m.get("size_bytes") or 0 for m in self.models), np.int64, count)
+        self.workflow_count = np.fromiter(
+            (
+                workflow_index.workflow_count(m["filename"]) if workflow_index is not None
+                else m.get("workflow_count", 0)
+                for m in self.models
+            ),
+            np.int32, count
+        )
+        self.mtime = np.fromiter((self._mtime(m.get("path")) for m in self.models), np.float64, count)
+        self.in_archive = np.fromiter(
+            (
+                (m["type"], m["filename"]) in archived_keys or ("", m["filename"]) in archived_keys
+                for m in self.models
+            ),
+            bool, count
+        )
+        self._orders: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def query(
+        self,
+        statuses: Optional[Sequence[ModelStatus]] = None,
+        types: Optional[Sequence[str]] = None,
+        search: str = "",
+        min_bytes: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        min_workflows: Optional[int] = None,
+        max_workflows: Optional[int] = None,
+        modified_after: Optional[datetime] = None,
+        modified_before: Optional[datetime] = None,
+        filename_regex: str = "",
+        sort_by: str = "default",
+        descending: bool = False
+    ) -> np.ndarray:
+        """
+        Evaluate all predicates as column masks and return matching rows
+
+        Returns:
+            Row indices in sort order
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        if statuses is not None:
+            codes = [self.statuses.index(status) for status in statuses]
+            mask &= np.isin(self.status_code, codes)
+        if types is not None:
+            codes = [self.types.index(t) for t in types if t in self.types]
+            mask &= np.isin(self.type_code, codes)
+        if min_bytes is not None:
+            mask &= self.size >= min_bytes
+        if max_bytes is not None:
+            mask &= self.size <= max_bytes
+        if min_workflows is not None:
+            mask &= self.workflow_count >= min_workflows
+        if max_workflows is not None:
+            mask &= self.workflow_count <= max_workflows
+        if modified_after is not None or modified_before is not None:
+            # Models without a file (NaN mtime) never match a date range
+            mask &= ~np.isnan(self.mtime)
+            if modified_after is not None:
+                mask &= self.mtime >= modified_after.timestamp()
+            if modified_before is not None:
+                mask &= self.mtime <= modified_before.timestamp()
+        if search and mask.any():
+            mask &= np.char.find(self._filenames_lower, search.lower()) >= 0
+        if filename_regex and mask.any():
+            # Not vectorizable: only run on rows that survived the cheap predicates
+            pattern = re.compile(filename_regex)
+            candidates = np.flatnonzero(mask)
+            mask[candidates] = [bool(pattern.search(self.filenames[i])) for i in candidates]
+
+        order = self.sort_order(sort_by)
+        if descending:
+            order = order[::-1]
+        return order[mask[order]]
+
+    def sort_order(self, key: str) -> np.ndarray:
+        """Row order for a sort key (computed once per catalog)."""
+        if key not in self.SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {key}")
+        order = self._orders.get(key)
+        if order is None:
+            if key == "default":
+                order = np.arange(len(self))
+            elif key == "filename":
+                order = np.argsort(self._filenames_lower, kind="stable")
+            elif key == "modified":
+                # Missing files (NaN) sort last
+                order = np.argsort(np.nan_to_num(self.mtime, nan=np.inf), kind="stable")
+            else:
+                column = {
+                    "size": self.size,
+                    "type": self.type_code,
+                    "status": self.status_code,
+                    "workflows": self.workflow_count,
+                }[key]
+                order = np.argsort(column, kind="stable")
+            self._orders[key] = order
+        return order
+
+    @staticmethod
+    def page(rows: np.ndarray, page: int, page_size: Optional[int]) -> Tuple[np.ndarray, int, int]:
+        """
+        Slice one page out of query results
+
+        Args:
+            rows: Result of query()
+            page: 1-based page number (clamped to the valid range)
+            page_size: Rows per page (None or <= 0 = everything)
+
+        Returns:
+            Tuple of (page rows, clamped page number, page count)
+        """
+        if not page_size or page_size <= 0:
+            return rows, 1, 1
+        page_count = max(1, -(-len(rows) // page_size))
+        page = min(max(1, int(page or 1)), page_count)
+        start = (page - 1) * page_size
+        return rows[start:start + page_size], page, page_count
+
+    def rows(self, indices: Iterable[int]) -> List[Dict]:
+        """Model dicts for row indices."""
+        return [self.models[i] for i in indices]
+
+    @staticmethod
+    def _mtime(path: Optional[str]) -> float:
+        if not path:
+            return np.nan
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return np.nan
@@ -1,5 +1,5 @@
 """Model Classifier - Classify models into used/unused/missing categories"""
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 from enum import Enum
 
 from services.model_manager.workflow_scanner import WorkflowScanner
@@ -138,14 +138,18 @@ class ModelClassifier:
 
         return classified
 
-    def get_statistics(self) -> Dict[str, any]:
+    def get_statistics(self, classified: Optional[Dict[str, List[Dict]]] = None) -> Dict[str, any]:
         """
         Get classification statistics
 
+        Args:
+            classified: Existing classify_all_models() result (default: classify now)
+
         Returns:
             Statistics dictionary
         """
-        classified = self.classify_all_models()
+        if classified is None:
+            classified = self.classify_all_models()
 
         # Calculate total sizes
         used_size = sum(m["size_bytes"] for m in classified[ModelStatus.USED])
@@ -1,10 +1,24 @@
-"""Model Downloader - Search and download models from Civitai and Huggingface"""
+"""Model Downloader - Search and download models from Civitai and Huggingface
+
+Files are fetched into ``<name>.part`` with several parallel HTTP range
+requests when the server supports them. Segment progress is kept in a
+``.part.json`` sidecar so an interrupted download resumes where it stopped.
+The SHA256 is computed while the data arrives and checked against the
+source metadata before the file is atomically renamed into place.
+
+Searches run concurrently with per-provider rate limiting; identical
+filenames are searched once, and search/file-listing responses are kept in
+an on-disk TTL cache between sessions.
+"""
+import hashlib
+import json
+import math
 import os
 import re
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 from pathlib import Path
 from queue import Queue
@@ -15,9 +29,12 @@ import requests
 
 from infrastructure.logger import get_logger
 from infrastructure.job_status_store import JobStatusStore
+from infrastructure.service_container import get_service_container
 
 logger = get_logger(__name__)
 
+DEFAULT_SEARCH_CACHE_PATH = Path.home() / ".cindergrace" / "cache" / "model_search.json"
+
 
 class DownloadSource(Enum):
     """Source of the model download"""
@@ -52,17 +69,28 @@ class SearchResult:
     rating: float = 0.0
     description: str = ""
     thumbnail_url: str = ""
+    sha256: str = ""
 
     @property
     def size_formatted(self) -> str:
         """Format size in human-readable format"""
         if self.size_bytes == 0:
             return "Unknown"
+        size = self.size_bytes  # Results are shared between tasks; don't mutate
         for unit in ['B', 'KB', 'MB', 'GB']:
-            if self.size_bytes < 1024:
-                return f"{self.size_bytes:.1f} {unit}"
-            self.size_bytes /= 1024
-        return f"{self.size_bytes:.1f} TB"
+            if size < 1024:
+                return f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} TB"
+
+    def to_cache(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["source"] = self.source.value
+        return data
+
+    @classmethod
+    def from_cache(cls, data: Dict[str, Any]) -> "SearchResult":
+        return cls(**{**data, "source": DownloadSource(data["source"])})
 
 
 @dataclass
@@ -91,17 +119,125 @@ class DownloadTask:
         }
 
 
+@dataclass
+class _Segment:
+    """Byte range [start, end] of a ranged download and bytes written so far"""
+    start: int
+    end: int
+    done: int = 0
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    @property
+    def complete(self) -> bool:
+        return self.done >= self.length
+
+
+class _ProgressThrottle:
+    """Updates task progress and notifies at most once per 5% step."""
+
+    def __init__(self, downloader: "ModelDownloader", task_id: str, total_size: int):
+        self.downloader = downloader
+        self.task_id = task_id
+        self.total_size = total_size
+        self._last_step = -1
+        self._lock = threading.Lock()
+
+    def update(self, downloaded: int):
+        if self.total_size <= 0:
+            return
+        progress = (downloaded / self.total_size) * 100
+        with self.downloader._lock:
+            task = self.downloader.download_queue.get(self.task_id)
+            if task:
+                task.progress = progress
+
+        step = int(progress) // 5
+        with self._lock:
+            if step == self._last_step:
+                return
+            self._last_step = step
+        self.downloader._notify_progress(self.task_id)
+
+
+class _RateLimiter:
+    """Spaces out requests to one provider across threads."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _SearchCache:
+    """JSON-backed TTL cache for provider API responses."""
+
+    def __init__(self, path: Path, ttl: float):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._load().get(key)
+            if not entry or time.time() - entry.get("ts", 0) > self.ttl:
+                return None
+            return entry.get("data")
+
+    def set(self, key: str, data: Any):
+        with self._lock:
+            entries = self._load()
+            entries[key] = {"ts": time.time(), "data": data}
+            now = time.time()
+            for stale in [k for k, v in entries.items() if now - v.get("ts", 0) > self.ttl]:
+                del entries[stale]
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp_path.write_text(json.dumps(entries), encoding="utf-8")
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"Could not persist model search cache: {e}")
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load entries on first access (caller holds the lock)."""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                if self.path.exists():
+                    data = json.loads(self.path.read_text(encoding="utf-8"))
+                    if isinstance(data, dict):
+                        self._entries = data
+            except Exception as e:
+                logger.warning(f"Model search cache unreadable, starting fresh: {e}")
+        return self._entries
+
+
 class CivitaiClient:
     """Client for Civitai API"""
 
     BASE_URL = "https://civitai.com/api/v1"
+    MIN_REQUEST_INTERVAL = 0.5  # Seconds between API calls
 
-    def __init__(self, api_key: str = ""):
+    def __init__(self, api_key: str = "", cache: Optional[_SearchCache] = None):
         self.api_key = api_key
+        self.cache = cache
         self.session = requests.Session()
         if api_key:
             self.session.headers["Authorization"] = f"Bearer {api_key}"
         self.session.headers["User-Agent"] = "CinderGrace-ModelManager/1.0"
+        self._limiter = _RateLimiter(self.MIN_REQUEST_INTERVAL)
 
     def search_by_filename(self, filename: str) -> List[SearchResult]:
         """
@@ -123,6 +259,11 @@ class CivitaiClient:
             logger.warning(f"Could not extract search term from filename: {filename}")
             return results
 
+        cache_key = f"civitai:search:{filename}"
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None:
+            return [SearchResult.from_cache(item) for item in cached]
+
         try:
             # Search models endpoint
             params = {
@@ -131,6 +272,7 @@ class CivitaiClient:
                 "sort": "Highest Rated",
             }
 
+            self._limiter.wait()
             response = self.session.get(
                 f"{self.BASE_URL}/models",
                 params=params,
@@ -159,12 +301,17 @@ class CivitaiClient:
                                 rating=model.get("stats", {}).get("rating", 0),
                                 description=model.get("description", "")[:200] if model.get("description") else "",
                                 thumbnail_url=version.get("images", [{}])[0].get("url", "") if version.get("images") else "",
+                                sha256=(file_info.get("hashes") or {}).get("SHA256", ""),
                             )
                             results.append(result)
 
             # Sort by download count (popularity) as proxy for "best"
             results.sort(key=lambda x: x.download_count, reverse=True)
 
+            # Only successful responses are cached
+            if self.cache:
+                self.cache.set(cache_key, [result.to_cache() for result in results])
+
         except requests.RequestException as e:
             logger.error(f"Civitai API error searching for {filename}: {e}")
         except Exception as e:
@@ -226,13 +373,17 @@ class HuggingfaceClient:
 
     BASE_URL = "https://huggingface.co"
     API_URL = "https://huggingface.co/api"
+    MIN_REQUEST_INTERVAL = 0.1  # Seconds between API calls
+    FILE_LIST_WORKERS = 4  # Parallel file listings of candidate repos
 
-    def __init__(self, token: str = ""):
+    def __init__(self, token: str = "", cache: Optional[_SearchCache] = None):
         self.token = token
+        self.cache = cache
         self.session = requests.Session()
         if token:
             self.session.headers["Authorization"] = f"Bearer {token}"
         self.session.headers["User-Agent"] = "CinderGrace-ModelManager/1.0"
+        self._limiter = _RateLimiter(self.MIN_REQUEST_INTERVAL)
 
     def search_by_filename(self, filename: str) -> List[SearchResult]:
         """
@@ -252,6 +403,11 @@ class HuggingfaceClient:
         if not search_name:
             return results
 
+        cache_key = f"huggingface:search:{filename}"
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None:
+            return [SearchResult.from_cache(item) for item in cached]
+
         try:
             # Search models endpoint
             params = {
@@ -262,6 +418,7 @@ class HuggingfaceClient:
                 "direction": "-1",
             }
 
+            self._limiter.wait()
             response = self.session.get(
                 f"{self.API_URL}/models",
                 params=params,
@@ -270,14 +427,14 @@ class HuggingfaceClient:
             response.raise_for_status()
             models = response.json()
 
-            for model in models:
-                model_id = model.get("modelId", "")
+            # File lists of all candidate repos are fetched concurrently
+            model_ids = [model.get("modelId", "") for model in models]
+            with ThreadPoolExecutor(max_workers=self.FILE_LIST_WORKERS) as pool:
+                file_lists = list(pool.map(self._list_model_files, model_ids))
 
-                # Get file list for this model
+            for model, model_id, files in zip(models, model_ids, file_lists):
                 try:
-                    files = self._get_model_files(model_id)
-
-                    for file_info in files:
+                    for file_info in files or []:
                         file_name = file_info.get("rfilename", "")
 
                         # Check if filename matches
@@ -295,6 +452,7 @@ class HuggingfaceClient:
                                 download_count=model.get("downloads", 0),
                                 rating=model.get("likes", 0),  # Use likes as rating proxy
                                 description=model.get("description", "")[:200] if model.get("description") else "",
+                                sha256=(file_info.get("lfs") or {}).get("sha256", ""),
                             )
                             results.append(result)
 
@@ -305,6 +463,10 @@ class HuggingfaceClient:
             # Sort by downloads
             results.sort(key=lambda x: x.download_count, reverse=True)
 
+            # A failed file listing makes the result incomplete; don't cache it
+            if self.cache and all(files is not None for files in file_lists):
+                self.cache.set(cache_key, [result.to_cache() for result in results])
+
         except requests.RequestException as e:
             logger.error(f"Huggingface API error searching for {filename}: {e}")
         except Exception as e:
@@ -314,7 +476,17 @@ class HuggingfaceClient:
 
     def _get_model_files(self, model_id: str) -> List[Dict]:
         """Get list of files for a model"""
+        return self._list_model_files(model_id) or []
+
+    def _list_model_files(self, model_id: str) -> Optional[List[Dict]]:
+        """Model files of a repo (cached), or None if the request failed"""
+        cache_key = f"huggingface:files:{model_id}"
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached is not None:
+            return cached
+
         try:
+            self._limiter.wait()
             response = self.session.get(
                 f"{self.API_URL}/models/{model_id}",
                 params={"blobs": True},
@@ -330,11 +502,13 @@ class HuggingfaceClient:
                 if any(filename.endswith(ext) for ext in ['.safetensors', '.ckpt', '.bin', '.pt', '.pth']):
                     files.append(sibling)
 
+            if self.cache:
+                self.cache.set(cache_key, files)
             return files
 
         except Exception as e:
             logger.debug(f"Error getting files for {model_id}: {e}")
-            return []
+            return None
 
     def _clean_filename_for_search(self, filename: str) -> str:
         """Extract searchable name from filename"""
@@ -376,12 +550,20 @@ class ModelDownloader:
     - Progress tracking
     """
 
+    SEGMENTS_PER_FILE = 4  # Parallel range requests per file
+    MIN_SEGMENT_SIZE = 64 * 1024 * 1024  # Smaller files use fewer segments
+    CHUNK_SIZE = 1024 * 1024  # 1MB reads
+    STATE_SAVE_INTERVAL = 64 * 1024 * 1024  # Persist resume state every 64MB
+    SEARCH_WORKERS = 6  # Concurrent filename searches
+    SEARCH_CACHE_TTL = 24 * 3600  # Seconds
+
     def __init__(
         self,
         models_root: str,
         civitai_api_key: str = "",
         huggingface_token: str = "",
         max_parallel_downloads: int = 2,
+        search_cache_path: Optional[str] = None,
     ):
         """
         Initialize the model downloader.
@@ -391,18 +573,24 @@ class ModelDownloader:
             civitai_api_key: Optional Civitai API key
             huggingface_token: Optional Huggingface token
             max_parallel_downloads: Maximum concurrent downloads (1-5)
+            search_cache_path: Search cache file (default: ~/.cindergrace/cache/model_search.json)
         """
         self.models_root = Path(models_root)
         self.max_parallel = max(1, min(5, max_parallel_downloads))
 
-        self.civitai = CivitaiClient(civitai_api_key)
-        self.huggingface = HuggingfaceClient(huggingface_token)
+        self.search_cache = _SearchCache(
+            Path(search_cache_path) if search_cache_path else DEFAULT_SEARCH_CACHE_PATH,
+            self.SEARCH_CACHE_TTL,
+        )
+        self.civitai = CivitaiClient(civitai_api_key, cache=self.search_cache)
+        self.huggingface = HuggingfaceClient(huggingface_token, cache=self.search_cache)
 
         self.download_queue: Dict[str, DownloadTask] = {}
         self._executor: Optional[ThreadPoolExecutor] = None
         self._stop_event = threading.Event()
         self._lock = threading.Lock()
-        self._job_store = JobStatusStore()
+        self._job_store = get_service_container().get(JobStatusStore)
+        self._searches: Dict[str, Future] = {}  # In-flight searches by filename
 
         # Progress callback: fn(task_id, task_dict)
         self.progress_callback: Optional[Callable[[str, Dict], None]] = None
@@ -411,6 +599,9 @@ class ModelDownloader:
         """
         Search for a model across all sources.
 
+        Concurrent searches for the same filename (e.g. referenced under
+        several model types) share one request.
+
         Args:
             filename: Model filename to search for
             model_type: Model type (checkpoints, loras, etc.)
@@ -418,6 +609,30 @@ class ModelDownloader:
         Returns:
             Combined list of search results, sorted by popularity
         """
+        with self._lock:
+            pending = self._searches.get(filename)
+            if pending is None:
+                pending = self._searches[filename] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return list(pending.result())
+
+        try:
+            results = self._search_sources(filename)
+            pending.set_result(results)
+            return list(results)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._searches.pop(filename, None)
+
+    def _search_sources(self, filename: str) -> List[SearchResult]:
+        """Query all sources for one filename."""
         all_results = []
 
         # Search Civitai first (primary source for SD models)
@@ -583,6 +798,8 @@ class ModelDownloader:
         """
         Search for all missing models.
 
+        Searches run concurrently; progress_callback reports completions.
+
         Args:
             missing_models: List of dicts with 'filename' and 'type' keys
             progress_callback: Optional callback(current, total, filename)
@@ -590,16 +807,37 @@ class ModelDownloader:
         Returns:
             Dict of task_id -> DownloadTask
         """
-        total = len(missing_models)
-
-        for idx, model in enumerate(missing_models, start=1):
+        filenames = {}
+        for model in missing_models:
             filename = model.get("filename", "")
-            model_type = model.get("type", "unknown")
+            task_id = self.add_to_queue(filename, model.get("type", "unknown"), auto_search=False)
+            filenames[task_id] = filename
 
-            if progress_callback:
-                progress_callback(idx, total, filename)
-
-            self.add_to_queue(filename, model_type, auto_search=True)
+        # Tasks queued earlier keep their existing search results
+        with self._lock:
+            task_ids = [
+                task_id for task_id in filenames
+                if self.download_queue[task_id].status == DownloadStatus.PENDING
+            ]
+        total = len(task_ids)
+        if not task_ids:
+            return self.download_queue
+
+        with ThreadPoolExecutor(max_workers=min(self.SEARCH_WORKERS, total)) as pool:
+            futures = {pool.submit(self._search_task, task_id): task_id for task_id in task_ids}
+            for idx, future in enumerate(as_completed(futures), start=1):
+                task_id = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Search failed for {task_id}: {e}")
+                    with self._lock:
+                        task = self.download_queue.get(task_id)
+                        if task:
+                            task.status = DownloadStatus.NOT_FOUND
+                            task.error_message = str(e)
+                if progress_callback:
+                    progress_callback(idx, total, filenames[task_id])
 
         return self.download_queue
 
@@ -712,6 +950,7 @@ class ModelDownloader:
                 dest_path=dest_path,
                 task_id=task_id,
                 api_key=self.civitai.api_key if result.source == DownloadSource.CIVITAI else self.huggingface.token,
+                expected_sha256=result.sha256,
             )
 
             with self._lock:
@@ -729,13 +968,7 @@ class ModelDownloader:
                 if task:
                     task.status = DownloadStatus.FAILED
                     task.error_message = str(e)
-
-            # Clean up partial download
-            if dest_path.exists():
-                try:
-                    dest_path.unlink()
-                except Exception:
-                    pass
+            # Partial data stays in the .part file so a retry resumes
 
         self._notify_progress(task_id)
 
@@ -745,38 +978,254 @@ class ModelDownloader:
         dest_path: Path,
         task_id: str,
         api_key: str = "",
+        expected_sha256: str = "",
     ):
-        """Download a file with progress tracking"""
+        """
+        Download a file with progress tracking, resume and checksum.
+
+        Uses parallel range requests when the server supports them, otherwise
+        a single stream. The file only appears at dest_path once complete
+        and verified.
+
+        Args:
+            url: Download URL
+            dest_path: Final file path
+            task_id: Queue task for progress updates
+            api_key: Optional bearer token
+            expected_sha256: Expected SHA256 from source metadata (skip check if empty)
+        """
         headers = {"User-Agent": "CinderGrace-ModelManager/1.0"}
         if api_key:
             headers["Authorization"] = f"Bearer {api_key}"
 
-        response = requests.get(url, headers=headers, stream=True, timeout=60)
+        part_path = dest_path.with_name(dest_path.name + ".part")
+        state_path = dest_path.with_name(dest_path.name + ".part.json")
+
+        # Probe with a one-byte range; servers without range support answer 200
+        response = requests.get(url, headers={**headers, "Range": "bytes=0-0"}, stream=True, timeout=60)
         response.raise_for_status()
+        total_size = self._range_total(response)
+
+        if total_size is not None:
+            response.close()
+            # Segments go to the resolved URL, skipping the redirect per request
+            range_url = response.url if isinstance(response.url, str) and response.url else url
+            range_headers = headers
+            if urlparse(range_url).netloc != urlparse(url).netloc:
+                # Redirected to another host (CDN): like requests, never forward the token
+                range_headers = {k: v for k, v in headers.items() if k != "Authorization"}
+            digest = self._download_ranged(
+                range_url, url, range_headers, part_path, state_path, total_size, task_id
+            )
+        else:
+            total_size = int(response.headers.get('content-length', 0))
+            digest = self._download_stream(response, part_path, state_path, total_size, task_id)
+
+        if total_size and part_path.stat().st_size != total_size:
+            raise Exception(f"Incomplete download: {part_path.stat().st_size} of {total_size} bytes")
+
+        if expected_sha256 and digest.lower() != expected_sha256.lower():
+            self._remove_part(part_path, state_path)
+            raise Exception(f"Checksum mismatch for {dest_path.name}: expected {expected_sha256}, got {digest}")
 
-        total_size = int(response.headers.get('content-length', 0))
+        os.replace(part_path, dest_path)
+        if state_path.exists():
+            state_path.unlink()
+
+    def _download_stream(
+        self,
+        response,
+        part_path: Path,
+        state_path: Path,
+        total_size: int,
+        task_id: str,
+    ) -> str:
+        """Single-stream download (no range support); returns the SHA256."""
+        hasher = hashlib.sha256()
         downloaded = 0
-        chunk_size = 8192 * 16  # 128KB chunks
+        progress = _ProgressThrottle(self, task_id, total_size)
+
+        # Without ranges nothing can be resumed
+        if state_path.exists():
+            state_path.unlink()
 
-        with open(dest_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=chunk_size):
+        with open(part_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
                 if self._stop_event.is_set():
                     raise Exception("Download cancelled")
 
                 if chunk:
                     f.write(chunk)
+                    hasher.update(chunk)
                     downloaded += len(chunk)
+                    progress.update(downloaded)
 
-                    if total_size > 0:
-                        progress = (downloaded / total_size) * 100
-                        with self._lock:
-                            task = self.download_queue.get(task_id)
-                            if task:
-                                task.progress = progress
+        return hasher.hexdigest()
+
+    def _download_ranged(
+        self,
+        range_url: str,
+        url: str,
+        headers: Dict[str, str],
+        part_path: Path,
+        state_path: Path,
+        total_size: int,
+        task_id: str,
+    ) -> str:
+        """Parallel range download into part_path; returns the SHA256.
 
-                        # Throttle progress updates
-                        if int(progress) % 5 == 0:
-                            self._notify_progress(task_id)
+        Hashing follows the contiguous prefix written so far, so it overlaps
+        with the download instead of re-reading the whole file afterwards.
+        """
+        segments = self._load_segments(state_path, part_path, url, total_size)
+        if segments is None:
+            count = max(1, min(self.SEGMENTS_PER_FILE, math.ceil(total_size / self.MIN_SEGMENT_SIZE)))
+            step = math.ceil(total_size / count) if total_size else 0
+            segments = [
+                _Segment(start, min(start + step, total_size) - 1)
+                for start in range(0, total_size, step or 1)
+            ]
+            with open(part_path, 'wb') as f:
+                f.truncate(total_size)
+            self._save_segments(state_path, url, total_size, segments)
+        else:
+            logger.info(
+                f"Resuming {part_path.name}: {sum(seg.done for seg in segments)} of {total_size} bytes present"
+            )
+
+        lock = threading.Lock()
+        abort = threading.Event()
+        progress = _ProgressThrottle(self, task_id, total_size)
+        state = {"unsaved": 0}
+
+        def written() -> int:
+            return sum(seg.done for seg in segments)
+
+        def fetch(segment: _Segment):
+            if segment.complete:
+                return
+            range_headers = {**headers, "Range": f"bytes={segment.start + segment.done}-{segment.end}"}
+            with requests.get(range_url, headers=range_headers, stream=True, timeout=60) as resp:
+                resp.raise_for_status()
+                if resp.status_code != 206:
+                    raise Exception(f"Server ignored range request (HTTP {resp.status_code})")
+                with open(part_path, 'r+b') as f:
+                    f.seek(segment.start + segment.done)
+                    for chunk in resp.iter_content(chunk_size=self.CHUNK_SIZE):
+                        if self._stop_event.is_set() or abort.is_set():
+                            raise Exception("Download cancelled")
+                        if not chunk:
+                            continue
+                        chunk = chunk[:segment.length - segment.done]
+                        f.write(chunk)
+                        f.flush()
+                        with lock:
+                            segment.done += len(chunk)
+                            state["unsaved"] += len(chunk)
+                            if state["unsaved"] >= self.STATE_SAVE_INTERVAL:
+                                state["unsaved"] = 0
+                                self._save_segments(state_path, url, total_size, segments)
+                        progress.update(written())
+                        if segment.complete:
+                            break
+            if not segment.complete:
+                raise Exception(f"Connection closed early for bytes {segment.start}-{segment.end}")
+
+        hasher = hashlib.sha256()
+        hashed = 0
+        pool = ThreadPoolExecutor(max_workers=len(segments))
+        try:
+            futures = [pool.submit(fetch, segment) for segment in segments]
+            # Unbuffered: read-ahead past the frontier would hash unwritten bytes
+            with open(part_path, 'rb', buffering=0) as reader:
+                while True:
+                    with lock:
+                        frontier = self._contiguous_end(segments)
+                    while hashed < frontier:
+                        block = reader.read(min(self.CHUNK_SIZE * 8, frontier - hashed))
+                        if not block:
+                            break
+                        hasher.update(block)
+                        hashed += len(block)
+
+                    failed = next((fut for fut in futures if fut.done() and fut.exception()), None)
+                    if failed is not None:
+                        abort.set()
+                        raise failed.exception()
+                    if all(fut.done() for fut in futures) and hashed >= frontier:
+                        break
+                    time.sleep(0.05)
+        finally:
+            abort.set()  # Stops remaining segments after a failure
+            pool.shutdown(wait=True)
+            with lock:
+                self._save_segments(state_path, url, total_size, segments)
+
+        if hashed != total_size:
+            raise Exception(f"Incomplete download: {hashed} of {total_size} bytes")
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _range_total(response) -> Optional[int]:
+        """Total size from a 206 probe response, or None without range support."""
+        if response.status_code != 206:
+            return None
+        match = re.match(r"bytes\s+\d+-\d+/(\d+)", str(response.headers.get("content-range", "")))
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def _contiguous_end(segments: List[_Segment]) -> int:
+        """End offset of the data written contiguously from byte 0."""
+        end = 0
+        for segment in segments:
+            if segment.start != end:
+                break
+            end = segment.start + segment.done
+            if not segment.complete:
+                break
+        return end
+
+    def _load_segments(
+        self,
+        state_path: Path,
+        part_path: Path,
+        url: str,
+        total_size: int,
+    ) -> Optional[List[_Segment]]:
+        """Resume state for this URL and size, or None to start over."""
+        if not state_path.exists() or not part_path.exists():
+            return None
+        try:
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+            if state.get("url") != url or state.get("size") != total_size:
+                return None
+            if part_path.stat().st_size != total_size:
+                return None
+            return [_Segment(*entry) for entry in state["segments"]]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable resume state {state_path}: {e}")
+            return None
+
+    def _save_segments(self, state_path: Path, url: str, total_size: int, segments: List[_Segment]):
+        """Persist segment progress atomically."""
+        try:
+            tmp_path = state_path.with_name(state_path.name + ".tmp")
+            tmp_path.write_text(json.dumps({
+                "url": url,
+                "size": total_size,
+                "segments": [[seg.start, seg.end, seg.done] for seg in segments],
+            }), encoding="utf-8")
+            os.replace(tmp_path, state_path)
+        except Exception as e:
+            logger.warning(f"Could not save resume state {state_path}: {e}")
+
+    @staticmethod
+    def _remove_part(part_path: Path, state_path: Path):
+        for path in (part_path, state_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
 
     def cancel_downloads(self):
         """Cancel all running downloads"""
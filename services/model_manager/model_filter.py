@@ -8,6 +8,7 @@ from typing import Callable, Dict, Iterable, List, Optional
 
 from infrastructure.logger import get_logger
 from services.model_manager.model_classifier import ModelStatus
+from services.model_manager.workflow_index import WorkflowIndex
 
 logger = get_logger(__name__)
 
@@ -15,8 +16,9 @@ logger = get_logger(__name__)
 class ModelFilter:
     """Chainable filters for model classification results."""
 
-    def __init__(self, models: Iterable[Dict]):
+    def __init__(self, models: Iterable[Dict], workflow_index: Optional[WorkflowIndex] = None):
         self.base_models = list(models)
+        self.workflow_index = workflow_index
         self.filters: List[Callable[[Dict], bool]] = []
         self.logger = logger
 
@@ -62,8 +64,14 @@ class ModelFilter:
         return self
 
     def by_workflow_count(self, min_count: Optional[int] = None, max_count: Optional[int] = None) -> "ModelFilter":
+        index = self.workflow_index
+
         def _filter(model: Dict) -> bool:
-            count = model.get("workflow_count", 0)
+            # Index lookup covers models without a precomputed count
+            if index is not None:
+                count = index.workflow_count(model.get("filename", ""))
+            else:
+                count = model.get("workflow_count", 0)
             if min_count is not None and count < min_count:
                 return False
             if max_count is not None and count > max_count:
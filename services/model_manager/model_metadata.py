@@ -0,0 +1,435 @@
+"""Model Metadata - Header-only safetensors/GGUF inspection.
+
+Only the file header is read: for safetensors the 8-byte length plus the JSON
+tensor table, for GGUF the key/value section and tensor infos. Tensor data
+is never touched, so even multi-GB files cost a few KB of I/O. From the
+header we derive architecture (flux, sdxl, sd3, ...), LoRA vs. full model,
+dominant dtype, parameter count and embedded training metadata. Results are
+cached per (path, size, mtime, inode) in SQLite next to the model index.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import struct
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from math import prod
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from infrastructure.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_METADATA_CACHE_PATH = Path.home() / ".cindergrace" / "cache" / "model_metadata.db"
+
+# Refuse absurd header sizes (corrupt or non-safetensors file)
+MAX_HEADER_BYTES = 100 * 1024 * 1024
+
+# Metadata values longer than this are dropped (e.g. dataset tag frequencies)
+MAX_METADATA_VALUE = 4096
+
+GGUF_MAGIC = b"GGUF"
+
+# ggml tensor types (subset; unknown ids are reported as "type_<id>")
+GGML_TYPES = {
+    0: "F32", 1: "F16", 2: "Q4_0", 3: "Q4_1", 6: "Q5_0", 7: "Q5_1", 8: "Q8_0",
+    9: "Q8_1", 10: "Q2_K", 11: "Q3_K", 12: "Q4_K", 13: "Q5_K", 14: "Q6_K",
+    15: "Q8_K", 24: "I8", 25: "I16", 26: "I32", 27: "I64", 28: "F64", 30: "BF16",
+}
+
+# GGUF value types -> struct format (strings/arrays handled separately)
+_GGUF_SCALARS = {
+    0: "<B", 1: "<b", 2: "<H", 3: "<h", 4: "<I", 5: "<i",
+    6: "<f", 7: "<?", 10: "<Q", 11: "<q", 12: "<d",
+}
+_GGUF_STRING = 8
+_GGUF_ARRAY = 9
+
+# Tensor-name markers per architecture, checked in order. LoRA keys use
+# kohya ("lora_unet_double_blocks_0_...") or diffusers/peft ("...lora_A")
+# naming; both contain the underlying module names.
+_ARCHITECTURE_MARKERS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("flux", ("double_blocks", "single_blocks", "single_transformer_blocks")),
+    ("sd3", ("joint_blocks", "context_embedder")),
+    ("wan", ("patch_embedding", "blocks.0.cross_attn", "blocks_0_cross_attn")),
+    ("sdxl", ("conditioner.embedders.1", "lora_te2_", "lora_unet_input_blocks", "add_embedding",
+              "label_emb.0")),
+    ("sd15", ("model.diffusion_model.input_blocks", "cond_stage_model", "lora_unet_down_blocks")),
+    ("t5", ("encoder.block.0.layer",)),
+    ("clip", ("text_model.encoder.layers", "text_projection")),
+    ("vae", ("decoder.conv_in", "decoder.up_blocks", "decoder.up.")),
+]
+
+_LORA_MARKERS = ("lora_down", "lora_up", "lora_A", "lora_B", "lokr_", "hada_")
+
+# Training metadata values mapping to an architecture
+_BASE_MODEL_HINTS = [
+    ("flux", "flux"),
+    ("sd3", "sd3"),
+    ("stable-diffusion-v3", "sd3"),
+    ("sdxl", "sdxl"),
+    ("stable-diffusion-xl", "sdxl"),
+    ("sd_v1", "sd15"),
+    ("stable-diffusion-v1", "sd15"),
+    ("wan", "wan"),
+]
+
+
+@dataclass
+class ModelMetadata:
+    """Header information of a model file."""
+    format: str  # "safetensors" or "gguf"
+    architecture: Optional[str] = None  # flux, sdxl, sd3, sd15, wan, t5, clip, vae, ...
+    is_lora: bool = False
+    dtype: Optional[str] = None  # Dominant dtype by parameter count
+    parameter_count: int = 0
+    tensor_count: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def parameters_formatted(self) -> str:
+        """Parameter count like '11.9B' or '19.2M'."""
+        count = float(self.parameter_count)
+        for unit in ("", "K", "M", "B"):
+            if count < 1000 or unit == "B":
+                return f"{count:.1f}{unit}" if unit else f"{int(count)}"
+            count /= 1000
+        return str(self.parameter_count)
+
+
+class ModelMetadataReader:
+    """Read and cache model headers without loading tensors."""
+
+    READ_WORKERS = 8
+
+    def __init__(self, cache_path: Optional[str] = None, max_workers: Optional[int] = None):
+        """
+        Initialize metadata reader
+
+        Args:
+            cache_path: SQLite cache file (default: ~/.cindergrace/cache/model_metadata.db)
+            max_workers: Parallel header reads for read_many (default: READ_WORKERS)
+        """
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_METADATA_CACHE_PATH
+        self.max_workers = max_workers or self.READ_WORKERS
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Tuple[Tuple[int, int, int], Optional[ModelMetadata]]] = {}
+        self._cache_enabled = self._ensure_cache()
+
+    def read(self, path: str) -> Optional[ModelMetadata]:
+        """
+        Return header metadata of a model file, parsing only on cache miss
+
+        Args:
+            path: Path to a .safetensors or .gguf file
+
+        Returns:
+            ModelMetadata, or None if the file is missing or not parseable
+        """
+        return self.read_many([path]).get(os.path.abspath(path))
+
+    def read_many(self, paths: Iterable[str]) -> Dict[str, Optional[ModelMetadata]]:
+        """
+        Return metadata for many files; cache misses are parsed in parallel
+
+        Returns:
+            Dict mapping absolute path to ModelMetadata (or None)
+        """
+        stamps = {}
+        for path in dict.fromkeys(os.path.abspath(p) for p in paths if p):
+            stamp = self._stat(path)
+            if stamp is not None:
+                stamps[path] = stamp
+
+        results: Dict[str, Optional[ModelMetadata]] = {}
+        with self._lock:
+            for path, stamp in stamps.items():
+                cached = self._memory.get(path)
+                if cached and cached[0] == stamp:
+                    results[path] = cached[1]
+
+        pending = {path: stamp for path, stamp in stamps.items() if path not in results}
+        results.update(self._load_cached(pending))
+        pending = {path: stamp for path, stamp in pending.items() if path not in results}
+
+        if pending:
+            parsed = self._parse_many(list(pending))
+            results.update(parsed)
+            self._store_cached({path: (pending[path], meta) for path, meta in parsed.items()})
+
+        with self._lock:
+            for path, meta in results.items():
+                self._memory[path] = (stamps[path], meta)
+        return results
+
+    def detect_architecture(self, path: str) -> Optional[str]:
+        """Return the architecture from the file header, or None if unknown."""
+        meta = self.read(path)
+        return meta.architecture if meta else None
+
+    # ------------------------------------------------------------------ #
+    # Parsing
+    # ------------------------------------------------------------------ #
+    def _parse_many(self, paths: List[str]) -> Dict[str, Optional[ModelMetadata]]:
+        if len(paths) == 1:
+            return {paths[0]: self._parse(paths[0])}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as pool:
+            return dict(zip(paths, pool.map(self._parse, paths)))
+
+    def _parse(self, path: str) -> Optional[ModelMetadata]:
+        """Parse a header; None for unsupported or corrupt files."""
+        suffix = os.path.splitext(path)[1].lower()
+        parser = {".gguf": parse_gguf_header, ".safetensors": parse_safetensors_header}.get(suffix)
+        if parser is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return parser(f)
+        except (OSError, ValueError, struct.error, UnicodeDecodeError) as e:
+            self.logger.debug(f"No readable model header in {path}: {e}")
+        return None
+
+    # ------------------------------------------------------------------ #
+    # Cache
+    # ------------------------------------------------------------------ #
+    def _ensure_cache(self) -> bool:
+        """Create metadata cache table if not exists; returns False if unusable."""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.cache_path))
+            try:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS model_metadata (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        inode INTEGER NOT NULL,
+                        data TEXT
+                    )
+                """)
+                conn.commit()
+            finally:
+                conn.close()
+            return True
+        except Exception as exc:
+            self.logger.warning(f"Metadata cache unavailable, reading headers without cache: {exc}")
+            return False
+
+    def _load_cached(
+        self,
+        stamps: Dict[str, Tuple[int, int, int]]
+    ) -> Dict[str, Optional[ModelMetadata]]:
+        """Return cached entries whose (size, mtime, inode) still match."""
+        results: Dict[str, Optional[ModelMetadata]] = {}
+        if not self._cache_enabled or not stamps:
+            return results
+
+        paths = list(stamps)
+        try:
+            conn = sqlite3.connect(str(self.cache_path))
+            try:
+                for offset in range(0, len(paths), 500):
+                    batch = paths[offset:offset + 500]
+                    rows = conn.execute(
+                        "SELECT path, size, mtime_ns, inode, data FROM model_metadata "
+                        f"WHERE path IN ({','.join('?' * len(batch))})",
+                        batch
+                    )
+                    for path, size, mtime_ns, inode, data in rows:
+                        if stamps[path] != (size, mtime_ns, inode):
+                            continue
+                        results[path] = ModelMetadata(**json.loads(data)) if data else None
+            finally:
+                conn.close()
+        except Exception as exc:
+            self.logger.warning(f"Could not read metadata cache: {exc}")
+        return results
+
+    def _store_cached(
+        self,
+        entries: Dict[str, Tuple[Tuple[int, int, int], Optional[ModelMetadata]]]
+    ) -> None:
+        """Persist parsed headers (None is stored too, so bad files are not re-read)."""
+        if not self._cache_enabled or not entries:
+            return
+        rows = [
+            (path, *stamp, json.dumps(asdict(meta)) if meta else None)
+            for path, (stamp, meta) in entries.items()
+        ]
+        try:
+            conn = sqlite3.connect(str(self.cache_path))
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO model_metadata (path, size, mtime_ns, inode, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as exc:
+            self.logger.warning(f"Could not persist metadata cache: {exc}")
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int, int]]:
+        """Return the cache key (size, mtime_ns, inode), or None if missing."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+# ---------------------------------------------------------------------- #
+# Header parsers
+# ---------------------------------------------------------------------- #
+def parse_safetensors_header(f: BinaryIO) -> ModelMetadata:
+    """Parse the JSON header of an open safetensors file."""
+    raw = f.read(8)
+    if len(raw) != 8:
+        raise ValueError("File too short for a safetensors header")
+    (header_len,) = struct.unpack("<Q", raw)
+    if not 2 <= header_len <= MAX_HEADER_BYTES:
+        raise ValueError(f"Implausible safetensors header length {header_len}")
+
+    header = json.loads(f.read(header_len).decode("utf-8"))
+    if not isinstance(header, dict):
+        raise ValueError("safetensors header is not an object")
+    metadata = _clean_metadata(header.pop("__metadata__", None) or {})
+
+    dtypes: Counter = Counter()
+    parameters = 0
+    for info in header.values():
+        count = prod(info.get("shape") or [1])
+        parameters += count
+        dtypes[info.get("dtype")] += count
+
+    names = list(header)
+    return ModelMetadata(
+        format="safetensors",
+        architecture=_architecture(names, metadata),
+        is_lora=_is_lora(names, metadata),
+        dtype=dtypes.most_common(1)[0][0] if dtypes else None,
+        parameter_count=parameters,
+        tensor_count=len(header),
+        metadata=metadata,
+    )
+
+
+def parse_gguf_header(f: BinaryIO) -> ModelMetadata:
+    """Parse key/values and tensor infos of an open GGUF file."""
+    if f.read(4) != GGUF_MAGIC:
+        raise ValueError("Not a GGUF file")
+    (version,) = struct.unpack("<I", f.read(4))
+    count_fmt = "<I" if version == 1 else "<Q"
+    count_size = struct.calcsize(count_fmt)
+    (tensor_count,) = struct.unpack(count_fmt, f.read(count_size))
+    (kv_count,) = struct.unpack(count_fmt, f.read(count_size))
+
+    def read_string() -> str:
+        (length,) = struct.unpack(count_fmt, f.read(count_size))
+        if length > MAX_HEADER_BYTES:
+            raise ValueError("Implausible GGUF string length")
+        return f.read(length).decode("utf-8", errors="replace")
+
+    def read_value(value_type: int) -> Any:
+        if value_type in _GGUF_SCALARS:
+            fmt = _GGUF_SCALARS[value_type]
+            return struct.unpack(fmt, f.read(struct.calcsize(fmt)))[0]
+        if value_type == _GGUF_STRING:
+            return read_string()
+        if value_type == _GGUF_ARRAY:
+            (item_type,) = struct.unpack("<I", f.read(4))
+            (length,) = struct.unpack(count_fmt, f.read(count_size))
+            if item_type in _GGUF_SCALARS:
+                # Skip numeric arrays (e.g. tokenizer scores) without decoding
+                f.seek(length * struct.calcsize(_GGUF_SCALARS[item_type]), os.SEEK_CUR)
+            else:
+                for _ in range(length):
+                    read_value(item_type)
+            return f"<array[{length}]>"
+        raise ValueError(f"Unknown GGUF value type {value_type}")
+
+    metadata: Dict[str, Any] = {}
+    for _ in range(kv_count):
+        key = read_string()
+        (value_type,) = struct.unpack("<I", f.read(4))
+        metadata[key] = read_value(value_type)
+    metadata = _clean_metadata(metadata)
+
+    names = []
+    dtypes: Counter = Counter()
+    parameters = 0
+    for _ in range(tensor_count):
+        names.append(read_string())
+        (n_dims,) = struct.unpack("<I", f.read(4))
+        dims = struct.unpack(f"<{n_dims}Q", f.read(8 * n_dims))
+        (ggml_type,) = struct.unpack("<I", f.read(4))
+        f.read(8)  # Data offset
+        count = prod(dims)
+        parameters += count
+        dtypes[GGML_TYPES.get(ggml_type, f"type_{ggml_type}")] += count
+
+    architecture = _architecture(names, metadata)
+    gguf_arch = metadata.get("general.architecture")
+    if architecture is None and isinstance(gguf_arch, str):
+        architecture = gguf_arch.lower()
+
+    return ModelMetadata(
+        format="gguf",
+        architecture=architecture,
+        is_lora=_is_lora(names, metadata),
+        dtype=dtypes.most_common(1)[0][0] if dtypes else None,
+        parameter_count=parameters,
+        tensor_count=tensor_count,
+        metadata=metadata,
+    )
+
+
+def _clean_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep scalar metadata values of reasonable size."""
+    return {
+        str(key): value for key, value in metadata.items()
+        if isinstance(value, (int, float, bool))
+        or (isinstance(value, str) and len(value) <= MAX_METADATA_VALUE)
+    }
+
+
+def _architecture(names: List[str], metadata: Dict[str, Any]) -> Optional[str]:
+    """Architecture from training metadata first, then tensor names."""
+    for key in ("modelspec.architecture", "ss_base_model_version", "general.architecture"):
+        value = str(metadata.get(key, "")).lower()
+        for hint, architecture in _BASE_MODEL_HINTS:
+            if hint in value:
+                return architecture
+
+    for architecture, markers in _ARCHITECTURE_MARKERS:
+        if any(marker in name for name in names for marker in markers):
+            return architecture
+    return None
+
+
+def _is_lora(names: List[str], metadata: Dict[str, Any]) -> bool:
+    if "ss_network_module" in metadata:
+        return True
+    if str(metadata.get("modelspec.architecture", "")).endswith("/lora"):
+        return True
+    return any(marker in name for name in names for marker in _LORA_MARKERS)
+
+
+# Singleton instance
+_metadata_reader: Optional[ModelMetadataReader] = None
+
+
+def get_model_metadata_reader() -> ModelMetadataReader:
+    """Get the global ModelMetadataReader instance."""
+    global _metadata_reader
+    if _metadata_reader is None:
+        _metadata_reader = ModelMetadataReader()
+    return _metadata_reader
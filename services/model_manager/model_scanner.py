@@ -1,12 +1,28 @@
-"""Model Scanner - Scan filesystem for actual model files"""
+"""Model Scanner - Scan filesystem for actual model files
+
+Model files are tracked in a persistent SQLite index (path, size, mtime,
+inode, type). A refresh walks the tree once with ``os.scandir``; directories
+whose mtime has not changed since the last refresh are not listed again, so
+only new, renamed or deleted entries cost I/O. Lookups are answered from an
+in-memory view of the index.
+"""
 import os
-from typing import Dict, List
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 from infrastructure.logger import get_logger
 
 logger = get_logger(__name__)
 
+DEFAULT_INDEX_PATH = Path.home() / ".cindergrace" / "cache" / "model_index.db"
+
+# Directories modified this recently are re-listed on the next refresh, since
+# coarse (NAS) timestamps could hide a second change within the same tick.
+_RECENT_MTIME_NS = 2_000_000_000
+
 
 class ModelScanner:
     """Scans ComfyUI models directory for actual model files"""
@@ -26,20 +42,29 @@ class ModelScanner:
         "text_encoders": [".safetensors", ".pt", ".pth", ".gguf"],  # T5, CLIP text encoders
     }
 
-    def __init__(self, comfyui_models_dir: str):
+    def __init__(self, comfyui_models_dir: str, index_path: Optional[str] = None):
         """
         Initialize model scanner
 
         Args:
             comfyui_models_dir: Path to ComfyUI models directory
+            index_path: SQLite index file (default: ~/.cindergrace/cache/model_index.db)
         """
         self.models_dir = Path(comfyui_models_dir)
+        self.index_path = Path(index_path) if index_path else DEFAULT_INDEX_PATH
         self.logger = logger
+        self._root = os.path.abspath(comfyui_models_dir)
+        self._lock = threading.Lock()
+        self._models: Optional[Dict[str, List[Dict[str, any]]]] = None
+        self._by_name: Dict[Tuple[str, str], Dict[str, any]] = {}
+        self._ensure_tables()
 
     def scan_all_models(self) -> Dict[str, List[Dict[str, any]]]:
         """
         Scan all model directories for files
 
+        Refreshes the index incrementally, then returns its contents.
+
         Returns:
             Dict mapping model type to list of model files
             Format: {
@@ -49,31 +74,46 @@ class ModelScanner:
                 ]
             }
         """
-        results = {}
+        self.refresh()
+        results = {model_type: list(models) for model_type, models in self._models.items()}
 
-        if not self.models_dir.exists():
-            self.logger.warning(f"Models directory does not exist: {self.models_dir}")
-            return results
+        for model_type, models in results.items():
+            total_size = sum(m["size_bytes"] for m in models)
+            self.logger.info(f"Found {len(models)} {model_type} ({self._format_size(total_size)})")
 
-        # Scan each model type directory
-        for model_type, extensions in self.MODEL_EXTENSIONS.items():
-            model_type_dir = self.models_dir / model_type
-            if not model_type_dir.exists():
-                self.logger.debug(f"Model type directory does not exist: {model_type_dir}")
-                continue
+        return results
 
-            models = self.scan_model_directory(str(model_type_dir), extensions)
-            if models:
-                results[model_type] = models
-                total_size = sum(m["size_bytes"] for m in models)
-                self.logger.info(f"Found {len(models)} {model_type} ({self._format_size(total_size)})")
+    def refresh(self, full: bool = False) -> None:
+        """
+        Bring the index up to date with the filesystem
 
-        return results
+        Args:
+            full: Re-list every directory, ignoring stored directory mtimes
+        """
+        with self._lock:
+            if not self.models_dir.exists():
+                self.logger.warning(f"Models directory does not exist: {self.models_dir}")
+                self._models = {}
+                self._by_name = {}
+                return
+
+            conn = self._get_conn()
+            try:
+                for model_type, extensions in self.MODEL_EXTENSIONS.items():
+                    model_type_dir = os.path.join(self._root, model_type)
+                    self._refresh_type(conn, model_type, model_type_dir, extensions, full)
+                conn.commit()
+                self._load_view(conn)
+            finally:
+                conn.close()
 
     def scan_model_directory(self, directory: str, extensions: List[str]) -> List[Dict[str, any]]:
         """
         Scan a single model directory for files
 
+        Walks the tree once and matches all extensions per entry. This does
+        not use the index.
+
         Args:
             directory: Directory to scan
             extensions: List of file extensions to look for
@@ -82,27 +122,31 @@ class ModelScanner:
             List of model file information
         """
         models = []
-        dir_path = Path(directory)
-
-        if not dir_path.exists():
+        if not os.path.isdir(directory):
             return models
 
-        # Recursively find all files with matching extensions
-        for ext in extensions:
-            for file_path in dir_path.rglob(f"*{ext}"):
-                if file_path.is_file():
-                    try:
-                        size = file_path.stat().st_size
-                        models.append({
-                            "filename": file_path.name,
-                            "path": str(file_path),
-                            "relative_path": str(file_path.relative_to(dir_path)),
-                            "size_bytes": size,
-                            "size_formatted": self._format_size(size),
-                        })
-                    except Exception as e:
-                        self.logger.error(f"Error reading file {file_path}: {e}")
-
+        suffixes = tuple(ext.lower() for ext in extensions)
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.lower().endswith(suffixes) and entry.is_file():
+                            try:
+                                size = entry.stat().st_size
+                            except OSError as e:
+                                self.logger.error(f"Error reading file {entry.path}: {e}")
+                                continue
+                            models.append(self._model_dict(
+                                entry.path, os.path.relpath(entry.path, directory), size
+                            ))
+            except OSError as e:
+                self.logger.error(f"Error scanning directory {current}: {e}")
+
+        models.sort(key=lambda m: m["relative_path"])
         return models
 
     def get_model_info(self, model_type: str, filename: str) -> Dict[str, any]:
@@ -116,16 +160,8 @@ class ModelScanner:
         Returns:
             Model information dict or None if not found
         """
-        all_models = self.scan_all_models()
-
-        if model_type not in all_models:
-            return None
-
-        for model in all_models[model_type]:
-            if model["filename"] == filename:
-                return model
-
-        return None
+        self._ensure_loaded()
+        return self._by_name.get((model_type, filename))
 
     def model_exists(self, model_type: str, filename: str) -> bool:
         """
@@ -147,14 +183,11 @@ class ModelScanner:
         Returns:
             Dict mapping model type to total size in bytes
         """
-        all_models = self.scan_all_models()
-        sizes = {}
-
-        for model_type, models in all_models.items():
-            total = sum(m["size_bytes"] for m in models)
-            sizes[model_type] = total
-
-        return sizes
+        self._ensure_loaded()
+        return {
+            model_type: sum(m["size_bytes"] for m in models)
+            for model_type, models in self._models.items()
+        }
 
     def get_all_model_filenames(self) -> Dict[str, List[str]]:
         """
@@ -163,13 +196,176 @@ class ModelScanner:
         Returns:
             Dict mapping model type to list of filenames
         """
-        all_models = self.scan_all_models()
-        filenames = {}
-
-        for model_type, models in all_models.items():
-            filenames[model_type] = [m["filename"] for m in models]
-
-        return filenames
+        self._ensure_loaded()
+        return {
+            model_type: [m["filename"] for m in models]
+            for model_type, models in self._models.items()
+        }
+
+    # ------------------------------------------------------------------ #
+    # Index
+    # ------------------------------------------------------------------ #
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get index database connection."""
+        return sqlite3.connect(str(self.index_path))
+
+    def _ensure_tables(self) -> None:
+        """Create index tables if not exists."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._get_conn()
+        try:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS model_files (
+                    path TEXT PRIMARY KEY,
+                    root TEXT NOT NULL,
+                    model_type TEXT NOT NULL,
+                    dir TEXT NOT NULL,
+                    relative_path TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_model_files_root ON model_files (root, model_type);
+                CREATE INDEX IF NOT EXISTS idx_model_files_dir ON model_files (dir);
+                CREATE TABLE IF NOT EXISTS model_dirs (
+                    path TEXT PRIMARY KEY,
+                    root TEXT NOT NULL,
+                    model_type TEXT NOT NULL,
+                    parent TEXT,
+                    mtime_ns INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_model_dirs_root ON model_dirs (root, model_type);
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _ensure_loaded(self) -> None:
+        """Refresh once per scanner so lookups never trigger repeated walks."""
+        if self._models is None:
+            self.refresh()
+
+    def _refresh_type(
+        self,
+        conn: sqlite3.Connection,
+        model_type: str,
+        type_dir: str,
+        extensions: List[str],
+        full: bool
+    ) -> None:
+        """Incrementally refresh the index for one model type directory."""
+        known = {
+            row[0]: (row[1], row[2])
+            for row in conn.execute(
+                "SELECT path, parent, mtime_ns FROM model_dirs WHERE root = ? AND model_type = ?",
+                (self._root, model_type)
+            )
+        }
+        children: Dict[str, List[str]] = {}
+        for path, (parent, _) in known.items():
+            children.setdefault(parent, []).append(path)
+
+        suffixes = tuple(ext.lower() for ext in extensions)
+        seen = set()
+        unsettled_before = time.time_ns() - _RECENT_MTIME_NS
+        stack: List[Tuple[str, Optional[str]]] = [(type_dir, None)]
+        listed = 0
+
+        while stack:
+            directory, parent = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue  # Gone; dropped below with everything unseen
+            seen.add(directory)
+
+            if not full and directory in known and known[directory][1] == mtime_ns:
+                subdirs = children.get(directory, [])
+            else:
+                subdirs = self._index_directory(conn, model_type, type_dir, directory, suffixes)
+                conn.execute(
+                    "INSERT OR REPLACE INTO model_dirs (path, root, model_type, parent, mtime_ns) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (directory, self._root, model_type, parent,
+                     mtime_ns if mtime_ns < unsettled_before else -1)
+                )
+                listed += 1
+
+            stack.extend((subdir, directory) for subdir in subdirs)
+
+        gone = [path for path in known if path not in seen]
+        if gone:
+            conn.executemany("DELETE FROM model_dirs WHERE path = ?", [(p,) for p in gone])
+            conn.executemany("DELETE FROM model_files WHERE dir = ?", [(p,) for p in gone])
+
+        if listed:
+            self.logger.debug(f"Model index: re-listed {listed} {model_type} directories")
+
+    def _index_directory(
+        self,
+        conn: sqlite3.Connection,
+        model_type: str,
+        type_dir: str,
+        directory: str,
+        suffixes: Tuple[str, ...]
+    ) -> List[str]:
+        """List one directory, replace its file rows and return its subdirectories."""
+        subdirs = []
+        rows = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(suffixes) and entry.is_file():
+                            st = entry.stat()
+                            rows.append((
+                                entry.path, self._root, model_type, directory,
+                                os.path.relpath(entry.path, type_dir), entry.name,
+                                st.st_size, st.st_mtime_ns, st.st_ino,
+                            ))
+                    except OSError as e:
+                        self.logger.error(f"Error reading file {entry.path}: {e}")
+        except OSError as e:
+            self.logger.error(f"Error scanning directory {directory}: {e}")
+
+        conn.execute("DELETE FROM model_files WHERE dir = ?", (directory,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO model_files "
+            "(path, root, model_type, dir, relative_path, filename, size, mtime_ns, inode) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        return subdirs
+
+    def _load_view(self, conn: sqlite3.Connection) -> None:
+        """Build the in-memory lookup tables from the index."""
+        models: Dict[str, List[Dict[str, any]]] = {}
+        by_name: Dict[Tuple[str, str], Dict[str, any]] = {}
+
+        for model_type, path, relative_path, size in conn.execute(
+            "SELECT model_type, path, relative_path, size FROM model_files "
+            "WHERE root = ? ORDER BY model_type, relative_path",
+            (self._root,)
+        ):
+            model = self._model_dict(path, relative_path, size)
+            models.setdefault(model_type, []).append(model)
+            by_name.setdefault((model_type, model["filename"]), model)
+
+        # Keep MODEL_EXTENSIONS order for callers that display types
+        self._models = {t: models[t] for t in self.MODEL_EXTENSIONS if t in models}
+        self._by_name = by_name
+
+    def _model_dict(self, path: str, relative_path: str, size: int) -> Dict[str, any]:
+        return {
+            "filename": os.path.basename(path),
+            "path": path,
+            "relative_path": relative_path,
+            "size_bytes": size,
+            "size_formatted": self._format_size(size),
+        }
 
     @staticmethod
     def _format_size(size_bytes: int) -> str:
@@ -0,0 +1,176 @@
+"""Model Snapshot - Shared, versioned classification for the Model Manager."""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from infrastructure.logger import get_logger
+from services.model_manager.model_classifier import ModelClassifier, ModelStatus
+from services.model_manager.model_scanner import ModelScanner
+from services.model_manager.workflow_index import WorkflowIndex
+
+logger = get_logger(__name__)
+
+
+class ModelSnapshot:
+    """One scan + workflow index + classification, shared by all services.
+
+    ``refresh()`` rescans incrementally (both scanners only re-read what
+    changed on disk) and bumps ``version``. Archive, restore and delete
+    results are applied in place, so the UI stays current without a rescan.
+    """
+
+    def __init__(self, classifier: ModelClassifier):
+        self.classifier = classifier
+        self.workflow_scanner = classifier.workflow_scanner
+        self.model_scanner = classifier.model_scanner
+        self.logger = logger
+        self.version = 0
+        self._classification: Optional[Dict[ModelStatus, List[Dict]]] = None
+        self._lock = threading.RLock()
+
+    @property
+    def classification(self) -> Dict[ModelStatus, List[Dict]]:
+        """Current classification (built on first access)."""
+        with self._lock:
+            if self._classification is None:
+                self.refresh()
+            return self._classification
+
+    @property
+    def workflow_index(self) -> WorkflowIndex:
+        """Workflow index the current classification was built from."""
+        return self.workflow_scanner.get_index()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._classification is not None
+
+    def refresh(self) -> Dict[ModelStatus, List[Dict]]:
+        """
+        Bring the snapshot up to date with the filesystem and workflows
+
+        Returns:
+            The new classification
+        """
+        with self._lock:
+            # Picks up changed workflow files; unchanged ones come from the file cache
+            self.workflow_scanner.scan_all_workflows(use_cache=False)
+            self._classification = self.classifier.classify_all_models()
+            self.version += 1
+            self.logger.info(f"Model snapshot refreshed (version {self.version})")
+            return self._classification
+
+    def invalidate(self) -> None:
+        """Drop the classification; the next access rescans."""
+        with self._lock:
+            self._classification = None
+            self.version += 1
+
+    def get_statistics(self) -> Dict:
+        """Classification statistics without reclassifying."""
+        return self.classifier.get_statistics(self.classification)
+
+    def all_models(self, statuses: Optional[Iterable[ModelStatus]] = None) -> List[Dict]:
+        """Flat model list, optionally limited to some statuses."""
+        classified = self.classification
+        keys = list(statuses) if statuses is not None else list(classified)
+        return [model for status in keys for model in classified.get(status, [])]
+
+    def models_by_type(self, statuses: Iterable[ModelStatus]) -> Dict[str, List[Dict]]:
+        """Models of the given statuses grouped by type."""
+        grouped: Dict[str, List[Dict]] = {}
+        for model in self.all_models(statuses):
+            grouped.setdefault(model["type"], []).append(model)
+        return grouped
+
+    # ------------------------------------------------------------------ #
+    # In-place updates
+    # ------------------------------------------------------------------ #
+    def mark_removed(self, paths: Iterable[str]) -> int:
+        """
+        Apply files that left the models directory (archived or deleted)
+
+        Used models become missing, unused models disappear.
+
+        Returns:
+            Number of snapshot entries updated
+        """
+        targets = {os.path.abspath(path) for path in paths if path}
+        if not targets:
+            return 0
+
+        with self._lock:
+            if self._classification is None:
+                return 0
+            classified = self._classification
+            updated = 0
+
+            for status in (ModelStatus.USED, ModelStatus.UNUSED):
+                kept = []
+                for model in classified.get(status, []):
+                    if not model.get("path") or os.path.abspath(model["path"]) not in targets:
+                        kept.append(model)
+                        continue
+                    updated += 1
+                    if status == ModelStatus.USED:
+                        classified.setdefault(ModelStatus.MISSING, []).append({
+                            **model,
+                            "status": ModelStatus.MISSING,
+                            "size_bytes": 0,
+                            "size": "N/A",
+                            "path": None,
+                        })
+                classified[status] = kept
+
+            if updated:
+                self.version += 1
+            return updated
+
+    def mark_restored(self, restored: Iterable[Dict[str, str]]) -> int:
+        """
+        Apply files that were restored into the models directory
+
+        Args:
+            restored: Dicts with 'filename', 'type' and 'path' of the restored file
+
+        Returns:
+            Number of snapshot entries updated
+        """
+        with self._lock:
+            if self._classification is None:
+                return 0
+            classified = self._classification
+            missing = {(m["type"], m["filename"]): m for m in classified.get(ModelStatus.MISSING, [])}
+            updated = 0
+
+            for item in restored:
+                path = item.get("path")
+                try:
+                    size = os.path.getsize(path)
+                except (OSError, TypeError):
+                    continue
+                entry = {
+                    "type": item["type"],
+                    "filename": os.path.basename(path),
+                    "size_bytes": size,
+                    "size": ModelScanner._format_size(size),
+                    "path": path,
+                }
+
+                previous = missing.pop((item["type"], item["filename"]), None)
+                if previous is not None:
+                    classified[ModelStatus.MISSING].remove(previous)
+                    classified.setdefault(ModelStatus.USED, []).append({
+                        **previous, **entry, "filename": previous["filename"], "status": ModelStatus.USED,
+                    })
+                else:
+                    classified.setdefault(ModelStatus.UNUSED, []).append({
+                        **entry, "status": ModelStatus.UNUSED, "workflows": [], "workflow_count": 0,
+                    })
+                updated += 1
+
+            if updated:
+                self.version += 1
+            return updated
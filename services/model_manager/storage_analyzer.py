@@ -1,24 +1,30 @@
 """Storage Analyzer - Provide storage insights for models."""
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from infrastructure.logger import get_logger
 from services.model_manager.model_classifier import ModelClassifier, ModelStatus
 from services.model_manager.model_scanner import ModelScanner
 
+if TYPE_CHECKING:
+    from services.model_manager.model_snapshot import ModelSnapshot
+
 logger = get_logger(__name__)
 
 
 class StorageAnalyzer:
     """Computes storage statistics from model classification data."""
 
-    def __init__(self, classifier: ModelClassifier):
+    def __init__(self, classifier: ModelClassifier, snapshot: Optional["ModelSnapshot"] = None):
         self.classifier = classifier
+        self.snapshot = snapshot
         self.logger = logger
         self._classification_cache: Optional[Dict] = None
 
     def _get_classification(self) -> Dict:
+        if self.snapshot is not None:
+            return self.snapshot.classification
         if self._classification_cache is None:
             self._classification_cache = self.classifier.classify_all_models()
         return self._classification_cache
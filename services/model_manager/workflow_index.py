@@ -0,0 +1,82 @@
+"""Workflow Index - Inverted model→workflow lookups built from one scan."""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, List, Set
+
+
+class WorkflowIndex:
+    """Inverted index over a ``WorkflowScanner.scan_all_workflows()`` result.
+
+    Built once per scan in a single pass over all model references, so
+    per-model lookups no longer rescan every workflow.
+    """
+
+    def __init__(self, workflow_map: Dict[str, List[Dict]]):
+        """
+        Build the index
+
+        Args:
+            workflow_map: Workflow filename -> list of model references
+        """
+        self._models = workflow_map
+        self._usages: Dict[str, List[Dict]] = {}
+        self._workflows: Dict[str, List[str]] = {}
+        self._by_type: Dict[str, Set[str]] = {}
+
+        for workflow_name, models in workflow_map.items():
+            for model in models:
+                filename = model.get("filename")
+                if not filename:
+                    continue
+                self._usages.setdefault(filename, []).append({
+                    "workflow": workflow_name,
+                    "model_type": model.get("type"),
+                    "node_id": model.get("node_id"),
+                    "node_type": model.get("node_type"),
+                    "filename": filename,
+                })
+                workflows = self._workflows.setdefault(filename, [])
+                if not workflows or workflows[-1] != workflow_name:
+                    workflows.append(workflow_name)
+                if model.get("type"):
+                    self._by_type.setdefault(model["type"], set()).add(filename)
+
+    @property
+    def workflow_map(self) -> Dict[str, List[Dict]]:
+        """The scan result this index was built from."""
+        return self._models
+
+    def workflows_using(self, filename: str) -> List[str]:
+        """Return workflow filenames referencing a model (each once, scan order)."""
+        return list(self._workflows.get(filename, []))
+
+    def workflow_count(self, filename: str) -> int:
+        """Return the number of workflows referencing a model."""
+        return len(self._workflows.get(filename, ()))
+
+    def usage_details(self, filename: str) -> List[Dict]:
+        """Return one entry per referencing node (workflow, type, node id/type)."""
+        return [dict(usage) for usage in self._usages.get(filename, [])]
+
+    def models_in(self, workflow_name: str) -> List[Dict]:
+        """Return the model references of a workflow."""
+        return self._models.get(workflow_name, [])
+
+    def referenced_models(self) -> Dict[str, Set[str]]:
+        """Return referenced filenames grouped by model type."""
+        return {model_type: set(filenames) for model_type, filenames in self._by_type.items()}
+
+    def usage_counts(self) -> Counter:
+        """Return workflow count per referenced filename."""
+        return Counter({filename: len(workflows) for filename, workflows in self._workflows.items()})
+
+    def reference_count(self) -> int:
+        """Return the total number of model references across workflows."""
+        return sum(len(models) for models in self._models.values())
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._workflows
+
+    def __len__(self) -> int:
+        return len(self._workflows)
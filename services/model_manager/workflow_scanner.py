@@ -1,13 +1,22 @@
-"""Workflow Scanner - Extract model references from ComfyUI workflows"""
+"""Workflow Scanner - Extract model references from ComfyUI workflows
+
+Per-file scan results are persisted keyed by (path, size, mtime), so a
+rescan only parses workflows that were added or changed since the last run.
+"""
 import os
 import json
-from typing import Dict, List, Set
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
 from infrastructure.logger import get_logger
+from services.model_manager.workflow_index import WorkflowIndex
 
 logger = get_logger(__name__)
 
+DEFAULT_CACHE_PATH = Path.home() / ".cindergrace" / "cache" / "workflow_scan.json"
+
 
 class WorkflowScanner:
     """Scans ComfyUI workflow files and extracts model references"""
@@ -29,16 +38,23 @@ class WorkflowScanner:
         "StyleModelLoader": "style_models",
     }
 
-    def __init__(self, workflows_dir: str):
+    PARSE_WORKERS = 8  # Parallel reads/parses of changed workflow files
+
+    def __init__(self, workflows_dir: str, cache_path: Optional[str] = None):
         """
         Initialize workflow scanner
 
         Args:
             workflows_dir: Path to ComfyUI workflows directory
+            cache_path: Per-file scan cache (default: ~/.cindergrace/cache/workflow_scan.json)
         """
         self.workflows_dir = Path(workflows_dir)
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
         self.logger = logger
         self._scan_cache = None  # Cache for scan_all_workflows results
+        self._index: Optional[WorkflowIndex] = None  # Built from _scan_cache
+        self._file_cache: Optional[Dict[str, Dict]] = None  # Loaded lazily
+        self._lock = threading.Lock()
 
     def scan_all_workflows(self, use_cache: bool = True) -> Dict[str, List[Dict[str, str]]]:
         """
@@ -66,21 +82,47 @@ class WorkflowScanner:
             self.logger.warning(f"Workflows directory does not exist: {self.workflows_dir}")
             return results
 
-        # Find all JSON files
-        workflow_files = list(self.workflows_dir.glob("*.json"))
-        workflow_files.extend(self.workflows_dir.glob("**/*.json"))
+        # Find all JSON files (rglob includes the top level)
+        root = Path(os.path.abspath(self.workflows_dir))
+        workflow_files = list(root.rglob("*.json"))
+
+        with self._lock:
+            entries = self._load_file_cache()
+            stamps: Dict[str, Tuple[int, int]] = {}
+            changed = []
+            for workflow_file in workflow_files:
+                key = str(workflow_file)
+                try:
+                    st = workflow_file.stat()
+                except OSError:
+                    continue
+                stamps[key] = (st.st_size, st.st_mtime_ns)
+                entry = entries.get(key)
+                if not entry or (entry.get("size"), entry.get("mtime_ns")) != stamps[key]:
+                    changed.append(key)
+
+            self.logger.info(f"Scanning {len(workflow_files)} workflow files ({len(changed)} changed)...")
+
+            if changed:
+                with ThreadPoolExecutor(max_workers=min(self.PARSE_WORKERS, len(changed))) as pool:
+                    for key, models in zip(changed, pool.map(self.scan_workflow, changed)):
+                        size, mtime_ns = stamps[key]
+                        entries[key] = {"size": size, "mtime_ns": mtime_ns, "models": models}
+
+            # Only entries of this directory that vanished are invalidated
+            prefix = str(root) + os.sep
+            removed = [key for key in entries if key.startswith(prefix) and key not in stamps]
+            for key in removed:
+                del entries[key]
 
-        self.logger.info(f"Scanning {len(workflow_files)} workflow files...")
+            if changed or removed:
+                self._save_file_cache(entries)
 
         for workflow_file in workflow_files:
-            try:
-                models = self.scan_workflow(str(workflow_file))
-                if models:
-                    results[workflow_file.name] = models
-                    self.logger.debug(f"Found {len(models)} model references in {workflow_file.name}")
-            except Exception as e:
-                self.logger.error(f"Failed to scan {workflow_file.name}: {e}")
-                continue
+            models = entries.get(str(workflow_file), {}).get("models")
+            if models:
+                results[workflow_file.name] = [dict(model) for model in models]
+                self.logger.debug(f"Found {len(models)} model references in {workflow_file.name}")
 
         self.logger.info(f"Scanned {len(results)} workflows with model references")
 
@@ -238,6 +280,20 @@ class WorkflowScanner:
 
         return ""
 
+    def get_index(self) -> WorkflowIndex:
+        """
+        Get the inverted model->workflow index for the current scan
+
+        Built once per scan result and reused until the next rescan.
+
+        Returns:
+            WorkflowIndex over scan_all_workflows()
+        """
+        all_workflows = self.scan_all_workflows()
+        if self._index is None or self._index.workflow_map is not all_workflows:
+            self._index = WorkflowIndex(all_workflows)
+        return self._index
+
     def get_all_referenced_models(self) -> Dict[str, Set[str]]:
         """
         Get all unique model filenames referenced across all workflows
@@ -250,22 +306,7 @@ class WorkflowScanner:
                 ...
             }
         """
-        all_workflows = self.scan_all_workflows()
-
-        # Aggregate by type
-        models_by_type: Dict[str, Set[str]] = {}
-
-        for workflow_name, models in all_workflows.items():
-            for model_ref in models:
-                model_type = model_ref["type"]
-                filename = model_ref["filename"]
-
-                if model_type not in models_by_type:
-                    models_by_type[model_type] = set()
-
-                models_by_type[model_type].add(filename)
-
-        return models_by_type
+        return self.get_index().referenced_models()
 
     def get_workflows_using_model(self, model_filename: str) -> List[str]:
         """
@@ -277,13 +318,27 @@ class WorkflowScanner:
         Returns:
             List of workflow filenames that use this model
         """
-        all_workflows = self.scan_all_workflows()
-        workflows_using_model = []
+        return self.get_index().workflows_using(model_filename)
 
-        for workflow_name, models in all_workflows.items():
-            for model_ref in models:
-                if model_ref["filename"] == model_filename:
-                    workflows_using_model.append(workflow_name)
-                    break  # Only add workflow once
+    def _load_file_cache(self) -> Dict[str, Dict]:
+        """Load the per-file cache on first access (caller holds the lock)."""
+        if self._file_cache is None:
+            self._file_cache = {}
+            try:
+                if self.cache_path.exists():
+                    data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+                    if isinstance(data, dict):
+                        self._file_cache = data
+            except Exception as e:
+                self.logger.warning(f"Workflow scan cache unreadable, starting fresh: {e}")
+        return self._file_cache
 
-        return workflows_using_model
+    def _save_file_cache(self, entries: Dict[str, Dict]) -> None:
+        """Write the per-file cache atomically (caller holds the lock)."""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(entries), encoding="utf-8")
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            self.logger.warning(f"Could not persist workflow scan cache: {e}")
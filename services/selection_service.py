@@ -1,37 +1,81 @@
 """Service helpers for keyframe selection and export."""
-import glob
+import fnmatch
 import json
 import os
 import shutil
+import time
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
 from infrastructure.project_store import ProjectStore
+from services.keyframe.parameter_sweep import describe_params, load_parameter_manifest, matches_filter
+
+# Directories modified this recently are re-listed on the next lookup,
+# since coarse timestamps could hide a second change within one tick.
+_RECENT_MTIME_NS = 2_000_000_000
 
 
 class SelectionService:
     def __init__(self, project_store: ProjectStore):
         self.project_store = project_store
+        # Directory -> (mtime_ns, sorted PNG names); switching shots reuses the listing
+        self._listings: Dict[str, Tuple[int, List[str]]] = {}
 
     def collect_keyframes(self, project: Dict[str, Any], filename_base: str) -> List[Dict[str, Any]]:
         directory = self.project_store.ensure_dir(project, "keyframes")
-        pattern = os.path.join(directory, f"{filename_base}_v*.png")
-        files = sorted(glob.glob(pattern))
+        names = fnmatch.filter(self._list_pngs(directory), f"{filename_base}_v*.png")
+        # Parameter sets recorded by parameter sweeps (keyframes/parameters.json)
+        manifest = load_parameter_manifest(directory) if names else {}
         keyframes: List[Dict[str, Any]] = []
-        for idx, path in enumerate(files, start=1):
-            filename = os.path.basename(path)
+        for idx, filename in enumerate(names, start=1):
+            path = os.path.join(directory, filename)
             variant = self._extract_variant(filename) or idx
+            params = manifest.get(filename, {})
+            suffix = f" · {describe_params(params)}" if params else ""
             keyframes.append(
                 {
                     "variant": variant,
                     "filename": filename,
                     "path": path,
-                    "label": f"Var {variant} – {filename}",
-                    "caption": f"{filename_base} · Var {variant}",
+                    "label": f"Var {variant} – {filename}{suffix}",
+                    "caption": f"{filename_base} · Var {variant}{suffix}",
+                    "params": params,
                 }
             )
         return keyframes
 
+    @staticmethod
+    def filter_keyframes(keyframes: List[Dict[str, Any]], filter_text: str) -> List[Dict[str, Any]]:
+        """Keyframes whose sweep parameters match filter_text (e.g. ``cfg>=4 sampler=euler``).
+
+        Raises:
+            InputValidationError: On malformed filter terms
+        """
+        if not (filter_text or "").strip():
+            return keyframes
+        return [item for item in keyframes if matches_filter(item.get("params") or {}, filter_text)]
+
+    def _list_pngs(self, directory: str) -> List[str]:
+        """Sorted PNG filenames in directory, cached until its mtime changes."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+        cached = self._listings.get(directory)
+        if cached and cached[0] == mtime_ns and mtime_ns < time.time_ns() - _RECENT_MTIME_NS:
+            return cached[1]
+
+        try:
+            with os.scandir(directory) as entries:
+                names = sorted(
+                    entry.name for entry in entries
+                    if entry.name.endswith(".png") and not entry.name.startswith(".") and entry.is_file()
+                )
+        except OSError:
+            return []
+        self._listings[directory] = (mtime_ns, names)
+        return names
+
     def export_selections(
         self,
         project: Dict[str, Any],
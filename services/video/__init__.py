@@ -3,10 +3,12 @@ from services.video.video_plan_builder import VideoPlanBuilder
 from services.video.video_generation_service import VideoGenerationService
 from services.video.file_operations import VideoFileHandler
 from services.video.last_frame_extractor import LastFrameExtractor
+from services.video.timeline_assembler import TimelineAssembler
 
 __all__ = [
     "VideoPlanBuilder",
     "VideoGenerationService",
     "VideoFileHandler",
     "LastFrameExtractor",
+    "TimelineAssembler",
 ]
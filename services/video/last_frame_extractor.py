@@ -1,11 +1,11 @@
 """Utility to extract the last frame from a generated video."""
 import os
-import shutil
 import subprocess
 import tempfile
 from typing import Optional
 
 from infrastructure.logger import get_logger
+from infrastructure.media_probe import find_ffmpeg, get_media_probe
 
 logger = get_logger(__name__)
 
@@ -14,18 +14,8 @@ class LastFrameExtractor:
     """Extract the last frame from a video file using ffmpeg."""
 
     def __init__(self):
-        self._ffmpeg_path = self._find_ffmpeg()
-
-    def _find_ffmpeg(self) -> str:
-        """Find ffmpeg executable."""
-        ffmpeg = shutil.which("ffmpeg")
-        if ffmpeg:
-            return ffmpeg
-        # Common locations
-        for path in ["/usr/bin/ffmpeg", "/usr/local/bin/ffmpeg"]:
-            if os.path.isfile(path):
-                return path
-        return "ffmpeg"  # Hope it's in PATH
+        self._ffmpeg_path = find_ffmpeg()
+        self._probe = get_media_probe()
 
     def is_available(self) -> bool:
         """Return True when extraction backend is available."""
@@ -61,27 +51,11 @@ class LastFrameExtractor:
             output_path = os.path.join(temp_dir, f"{basename}_lastframe.png")
 
         try:
-            # First, get video duration
-            probe_cmd = [
-                self._ffmpeg_path.replace("ffmpeg", "ffprobe"),
-                "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "csv=p=0",
-                video_path
-            ]
-
-            probe_result = subprocess.run(
-                probe_cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if probe_result.returncode != 0:
-                logger.error(f"ffprobe failed: {probe_result.stderr}")
+            # First, get video duration (cached across services)
+            duration = self._probe.get_duration(video_path)
+            if duration is None:
                 return None
 
-            duration = float(probe_result.stdout.strip())
             # Go slightly before end to ensure we get a frame
             seek_time = max(0, duration - 0.1)
 
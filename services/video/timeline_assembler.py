@@ -0,0 +1,501 @@
+"""Timeline assembly: render final videos from completed plan segments.
+
+Builds an ordered timeline from the ``output_files`` of completed plan
+segments, normalizes only the clips that cannot be stream-copied (wrong
+codec/pixel format/resolution/fps/audio layout, or a chained segment whose
+first frame duplicates the previous segment's last frame), and joins
+everything with a single ffmpeg call. When clip audio is kept, clips without
+an audio track get a silent one so every clip has the same streams. Hard
+cuts are stream-copied; crossfades and an optional audio bed (TTS narration,
+music) are applied in the final pass.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from domain.models import PlanSegment
+from infrastructure.logger import get_logger
+from infrastructure.media_probe import MediaInfo, MediaProbe, find_ffmpeg, get_media_probe
+
+logger = get_logger(__name__)
+
+# Preferred output file types when a segment produced several files
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".webm", ".mkv", ".gif")
+
+TARGET_VIDEO_CODEC = "h264"
+TARGET_PIX_FMT = "yuv420p"
+TARGET_AUDIO_CODEC = "aac"
+TARGET_SAMPLE_RATE = 48000
+TARGET_CHANNELS = 2
+
+
+@dataclass
+class TimelineClip:
+    """One clip on the timeline."""
+    path: str
+    label: str = ""
+    trim_frames: int = 0  # Leading frames to drop (duplicated chain boundary)
+    info: Optional[MediaInfo] = None
+    needs_transcode: bool = False
+    prepared_path: Optional[str] = None  # Normalized file, if transcoded
+
+    @property
+    def source(self) -> str:
+        """File used for the final join."""
+        return self.prepared_path or self.path
+
+    def duration(self, fps: float) -> Optional[float]:
+        """Clip duration after trimming, or None if unknown."""
+        if self.info is None:
+            return None
+        if self.prepared_path and self.info.path == self.prepared_path:
+            return self.info.duration  # Already trimmed during normalization
+        return max(0.0, self.info.duration - self.trim_frames / fps)
+
+
+@dataclass
+class Timeline:
+    """Ordered clips plus output format for a final render."""
+    clips: List[TimelineClip]
+    width: int
+    height: int
+    fps: float
+    crossfade: float = 0.0
+    keep_clip_audio: bool = False  # Only set if at least one clip has audio
+    sample_rate: int = TARGET_SAMPLE_RATE  # Clip audio rate when keep_clip_audio is set
+    audio_bed: Optional[str] = None
+    audio_bed_volume: float = 1.0
+    skipped: List[str] = field(default_factory=list)
+
+    @property
+    def transcode_count(self) -> int:
+        return sum(1 for clip in self.clips if clip.needs_transcode)
+
+
+def _pick_output_file(files: List[str]) -> Optional[str]:
+    """Pick the most useful video file from a segment's outputs."""
+    existing = [f for f in files if f and os.path.isfile(f)]
+    for ext in VIDEO_EXTENSIONS:
+        matches = [f for f in existing if f.lower().endswith(ext)]
+        if matches:
+            return matches[-1]
+    return existing[-1] if existing else None
+
+
+class TimelineAssembler:
+    """Assemble final renders with minimal re-encoding."""
+
+    TRANSCODE_TIMEOUT = 1800
+    JOIN_TIMEOUT = 3600
+
+    def __init__(
+        self,
+        probe: Optional[MediaProbe] = None,
+        ffmpeg_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self._ffmpeg_path = ffmpeg_path or find_ffmpeg()
+        self._probe = probe or get_media_probe()
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) // 2))
+
+    # ------------------------------------------------------------------
+    # Timeline construction
+    # ------------------------------------------------------------------
+
+    def build_from_plan(
+        self,
+        plan: Iterable[Union[PlanSegment, Dict[str, Any]]],
+        fps: Optional[float] = None,
+        resolution: Optional[Tuple[int, int]] = None,
+        crossfade: float = 0.0,
+        audio_bed: Optional[str] = None,
+        audio_bed_volume: float = 1.0,
+    ) -> Timeline:
+        """Build a timeline from completed plan segments.
+
+        Segments stay in shot order; segments of the same chain are ordered by
+        segment_index. Chained segments (start frame taken from the previous
+        segment's last frame) drop their first frame so the boundary frame is
+        not shown twice.
+
+        Args:
+            plan: Plan segments (PlanSegment objects or plan_state dicts)
+            fps: Output frame rate (defaults to the first clip's fps)
+            resolution: Output (width, height) (defaults to the first clip's size)
+            crossfade: Crossfade duration between clips in seconds (0 = hard cut)
+            audio_bed: Optional narration/music track laid under the video
+            audio_bed_volume: Volume factor for the audio bed
+
+        Returns:
+            Timeline ready for assemble()
+        """
+        entries = [seg.to_dict() if isinstance(seg, PlanSegment) else seg for seg in plan]
+
+        # Group by chain in order of first appearance, then order inside each chain
+        chain_order: List[str] = []
+        chains: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            chain_id = entry.get("chain_id") or entry.get("shot_id") or entry.get("plan_id", "")
+            if chain_id not in chains:
+                chain_order.append(chain_id)
+                chains[chain_id] = []
+            chains[chain_id].append(entry)
+
+        clips: List[TimelineClip] = []
+        skipped: List[str] = []
+        for chain_id in chain_order:
+            for entry in sorted(chains[chain_id], key=lambda e: e.get("segment_index", 1)):
+                label = entry.get("plan_id") or entry.get("shot_id") or chain_id
+                path = _pick_output_file(entry.get("output_files") or [])
+                if entry.get("status") != "completed" or not path:
+                    skipped.append(label)
+                    continue
+                chained = (
+                    entry.get("segment_index", 1) > 1
+                    and entry.get("start_frame_source") == "chain"
+                )
+                clips.append(TimelineClip(path=path, label=label, trim_frames=1 if chained else 0))
+
+        if skipped:
+            logger.warning(
+                f"Timeline: {len(skipped)} segment(s) not completed, skipped: {', '.join(skipped)}"
+            )
+
+        return self.build(
+            clips,
+            fps=fps,
+            resolution=resolution,
+            crossfade=crossfade,
+            audio_bed=audio_bed,
+            audio_bed_volume=audio_bed_volume,
+            skipped=skipped,
+        )
+
+    def build(
+        self,
+        clips: List[Union[TimelineClip, str]],
+        fps: Optional[float] = None,
+        resolution: Optional[Tuple[int, int]] = None,
+        crossfade: float = 0.0,
+        keep_clip_audio: bool = False,
+        audio_bed: Optional[str] = None,
+        audio_bed_volume: float = 1.0,
+        skipped: Optional[List[str]] = None,
+    ) -> Timeline:
+        """Probe clips and decide which ones need normalization.
+
+        Args:
+            clips: TimelineClips or plain file paths, in playback order
+            fps: Output frame rate (defaults to the first clip's fps)
+            resolution: Output (width, height) (defaults to the first clip's size)
+            crossfade: Crossfade duration between clips in seconds
+            keep_clip_audio: Keep the clips' own audio (e.g. lipsync clips);
+                clips without audio get silence
+            audio_bed: Optional narration/music track laid under the video
+            audio_bed_volume: Volume factor for the audio bed
+            skipped: Labels of plan entries left out of the timeline
+
+        Returns:
+            Timeline ready for assemble()
+        """
+        timeline_clips = [
+            c if isinstance(c, TimelineClip) else TimelineClip(path=c, label=os.path.basename(c))
+            for c in clips
+        ]
+        for clip in timeline_clips:
+            clip.info = self._probe.probe(clip.path)
+
+        reference = next((c.info for c in timeline_clips if c.info and c.info.has_video), None)
+        if resolution:
+            width, height = resolution
+        elif reference and reference.width and reference.height:
+            width, height = reference.width, reference.height
+        else:
+            width, height = 0, 0  # Unknown: keep clips as they are
+        out_fps = float(fps or (reference.fps if reference and reference.fps else 24))
+
+        # Keep the clips' audio rate when it is already AAC so matching clips stay stream-copyable
+        audio_ref = next((c.info for c in timeline_clips if c.info and c.info.has_audio), None)
+        sample_rate = TARGET_SAMPLE_RATE
+        if audio_ref and audio_ref.audio_codec == TARGET_AUDIO_CODEC and audio_ref.sample_rate:
+            sample_rate = audio_ref.sample_rate
+
+        timeline = Timeline(
+            clips=timeline_clips,
+            width=width,
+            height=height,
+            fps=out_fps,
+            crossfade=max(0.0, float(crossfade or 0.0)),
+            keep_clip_audio=keep_clip_audio and audio_ref is not None,
+            sample_rate=sample_rate,
+            audio_bed=audio_bed or None,
+            audio_bed_volume=audio_bed_volume,
+            skipped=list(skipped or []),
+        )
+        for clip in timeline_clips:
+            clip.needs_transcode = self._needs_transcode(clip, timeline)
+        return timeline
+
+    def _needs_transcode(self, clip: TimelineClip, timeline: Timeline) -> bool:
+        """Return True if the clip cannot be stream-copied into the output."""
+        if clip.trim_frames:
+            return True  # Frame-accurate trim needs a re-encode
+        info = clip.info
+        if info is None:
+            return False  # Unknown format: let the join step decide
+        if info.video_codec != TARGET_VIDEO_CODEC or info.pix_fmt != TARGET_PIX_FMT:
+            return True
+        if timeline.width and (info.width, info.height) != (timeline.width, timeline.height):
+            return True
+        if info.fps and abs(info.fps - timeline.fps) > 0.01:
+            return True
+        if timeline.keep_clip_audio and (
+            # Includes clips without audio (silence is added)
+            info.audio_codec != TARGET_AUDIO_CODEC
+            or info.sample_rate != timeline.sample_rate
+            or (info.channels or TARGET_CHANNELS) != TARGET_CHANNELS
+        ):
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def assemble(
+        self,
+        timeline: Timeline,
+        output_path: str,
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+    ) -> Tuple[bool, str]:
+        """Render the timeline to a single file.
+
+        Args:
+            timeline: Timeline from build() / build_from_plan()
+            output_path: Destination video file
+            progress_callback: Optional callback (progress 0-1, status)
+
+        Returns:
+            Tuple of (success, output_path or error message)
+        """
+        if not timeline.clips:
+            return False, "No completed clips to assemble"
+
+        def report(pct: float, status: str) -> None:
+            if progress_callback:
+                progress_callback(pct, status)
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="timeline_")
+        try:
+            to_transcode = [clip for clip in timeline.clips if clip.needs_transcode]
+            if to_transcode:
+                report(0.05, f"Normalizing {len(to_transcode)}/{len(timeline.clips)} clip(s)...")
+                error = self._transcode_clips(to_transcode, timeline, work_dir, report)
+                if error:
+                    return False, error
+
+            report(0.8, "Joining clips...")
+            if timeline.crossfade > 0 and len(timeline.clips) > 1:
+                cmd = self._build_crossfade_cmd(timeline, output_path)
+                if isinstance(cmd, str):
+                    return False, cmd
+            else:
+                cmd = self._build_concat_cmd(timeline, output_path, work_dir)
+
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.JOIN_TIMEOUT)
+            if result.returncode != 0:
+                logger.error(f"Timeline join failed: {result.stderr}")
+                return False, f"Concatenation failed: {str(result.stderr)[:200]}"
+
+            self._probe.invalidate(output_path)
+            report(1.0, "Complete!")
+            logger.info(
+                f"Timeline assembled: {output_path} ({len(timeline.clips)} clips, "
+                f"{len(to_transcode)} re-encoded)"
+            )
+            return True, output_path
+        except subprocess.TimeoutExpired:
+            return False, "Timeline assembly timed out"
+        except Exception as e:
+            logger.error(f"Timeline assembly failed: {e}", exc_info=True)
+            return False, str(e)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _transcode_clips(
+        self,
+        clips: List[TimelineClip],
+        timeline: Timeline,
+        work_dir: str,
+        report: Callable[[float, str], None],
+    ) -> Optional[str]:
+        """Normalize clips in parallel; return an error message or None."""
+        jobs = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for index, clip in enumerate(clips):
+                target = os.path.join(work_dir, f"norm_{index:04d}.mp4")
+                jobs[executor.submit(self._transcode_clip, clip, timeline, target)] = (clip, target)
+
+            done = 0
+            errors = []
+            for future in as_completed(jobs):
+                clip, target = jobs[future]
+                ok, message = future.result()
+                done += 1
+                if ok:
+                    clip.prepared_path = target
+                    clip.info = self._probe.probe(target) or clip.info
+                else:
+                    errors.append(f"{clip.label}: {message}")
+                report(0.05 + 0.75 * done / len(clips), f"Normalized {done}/{len(clips)} clip(s)")
+
+        if errors:
+            return "Normalization failed: " + "; ".join(errors[:3])
+        return None
+
+    def _transcode_clip(
+        self, clip: TimelineClip, timeline: Timeline, target: str
+    ) -> Tuple[bool, str]:
+        """Re-encode one clip to the timeline format."""
+        filters = []
+        if clip.trim_frames:
+            filters.append(f"trim=start_frame={clip.trim_frames},setpts=PTS-STARTPTS")
+        if timeline.width and timeline.height:
+            filters.append(
+                f"scale={timeline.width}:{timeline.height}:force_original_aspect_ratio=decrease,"
+                f"pad={timeline.width}:{timeline.height}:(ow-iw)/2:(oh-ih)/2"
+            )
+        filters.append(f"fps={timeline.fps:g}")
+        filters.append("format=yuv420p")
+
+        cmd = [self._ffmpeg_path, "-y", "-i", clip.path]
+        has_audio = clip.info is not None and clip.info.has_audio
+        if timeline.keep_clip_audio and not has_audio:
+            # Silent track so concat/acrossfade see the same streams in every clip
+            cmd.extend([
+                "-f", "lavfi", "-i",
+                f"anullsrc=channel_layout=stereo:sample_rate={timeline.sample_rate}",
+                "-map", "0:v:0", "-map", "1:a:0", "-shortest",
+            ])
+        cmd.extend(["-vf", ",".join(filters), "-c:v", "libx264", "-preset", "medium", "-crf", "18"])
+        if timeline.keep_clip_audio:
+            if has_audio and clip.trim_frames:
+                trim_seconds = clip.trim_frames / timeline.fps
+                cmd.extend(["-af", f"atrim=start={trim_seconds:.6f},asetpts=PTS-STARTPTS"])
+            cmd.extend([
+                "-c:a", "aac", "-ar", str(timeline.sample_rate), "-ac", str(TARGET_CHANNELS),
+            ])
+        else:
+            cmd.append("-an")
+        cmd.append(target)
+
+        try:
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=self.TRANSCODE_TIMEOUT
+            )
+        except subprocess.TimeoutExpired:
+            return False, "timed out"
+        except Exception as e:
+            return False, str(e)
+        if result.returncode != 0:
+            return False, str(result.stderr)[:200]
+        return True, target
+
+    def _audio_bed_args(
+        self, timeline: Timeline, bed_index: int, clip_audio: Optional[str]
+    ) -> Tuple[List[str], str]:
+        """Return (filter parts, output label) for mixing the audio bed."""
+        parts = [f"[{bed_index}:a]volume={timeline.audio_bed_volume:g}[bed]"]
+        if clip_audio:
+            parts.append(
+                f"[{clip_audio}][bed]amix=inputs=2:duration=first:dropout_transition=0[aout]"
+            )
+            return parts, "[aout]"
+        return parts, "[bed]"
+
+    def _build_concat_cmd(self, timeline: Timeline, output_path: str, work_dir: str) -> List[str]:
+        """Stream-copy join via the concat demuxer (per-run list file)."""
+        list_file = os.path.join(work_dir, "concat_list.txt")
+        with open(list_file, "w", encoding="utf-8") as handle:
+            for clip in timeline.clips:
+                escaped = os.path.abspath(clip.source).replace("'", "'\\''")
+                handle.write(f"file '{escaped}'\n")
+
+        cmd = [self._ffmpeg_path, "-y", "-f", "concat", "-safe", "0", "-i", list_file]
+        if not timeline.audio_bed:
+            cmd.extend(["-map", "0:v:0"])
+            if timeline.keep_clip_audio:
+                cmd.extend(["-map", "0:a?"])
+            cmd.extend(["-c", "copy", output_path])
+            return cmd
+
+        cmd.extend(["-i", timeline.audio_bed])
+        clip_audio = "0:a" if timeline.keep_clip_audio else None
+        parts, audio_label = self._audio_bed_args(timeline, 1, clip_audio)
+        cmd.extend([
+            "-filter_complex", ";".join(parts),
+            "-map", "0:v:0", "-map", audio_label,
+            "-c:v", "copy", "-c:a", "aac", "-shortest",
+            output_path,
+        ])
+        return cmd
+
+    def _build_crossfade_cmd(self, timeline: Timeline, output_path: str) -> Union[List[str], str]:
+        """Build an xfade/acrossfade filter graph; returns an error string on failure."""
+        durations = [clip.duration(timeline.fps) for clip in timeline.clips]
+        if any(d is None for d in durations):
+            return "Crossfade requires readable clip durations"
+        # A crossfade cannot be longer than half of the shortest clip
+        fade = min(timeline.crossfade, min(durations) / 2)
+
+        cmd = [self._ffmpeg_path, "-y"]
+        for clip in timeline.clips:
+            cmd.extend(["-i", clip.source])
+
+        parts = [
+            f"[{i}:v]settb=AVTB,fps={timeline.fps:g},format=yuv420p[v{i}]"
+            for i in range(len(timeline.clips))
+        ]
+        video_label = "v0"
+        offset = 0.0
+        for i in range(1, len(timeline.clips)):
+            offset += durations[i - 1] - fade
+            out = f"vx{i}"
+            parts.append(
+                f"[{video_label}][v{i}]xfade=transition=fade"
+                f":duration={fade:.3f}:offset={offset:.3f}[{out}]"
+            )
+            video_label = out
+
+        audio_label = None
+        if timeline.keep_clip_audio:
+            audio_label = "0:a"
+            for i in range(1, len(timeline.clips)):
+                out = f"ax{i}"
+                parts.append(f"[{audio_label}][{i}:a]acrossfade=d={fade:.3f}[{out}]")
+                audio_label = out
+
+        if timeline.audio_bed:
+            cmd.extend(["-i", timeline.audio_bed])
+            bed_parts, mixed = self._audio_bed_args(timeline, len(timeline.clips), audio_label)
+            parts.extend(bed_parts)
+            audio_map = mixed
+        else:
+            audio_map = f"[{audio_label}]" if audio_label else None
+
+        cmd.extend(["-filter_complex", ";".join(parts), "-map", f"[{video_label}]"])
+        if audio_map:
+            cmd.extend(["-map", audio_map, "-c:a", "aac"])
+        cmd.extend(["-c:v", "libx264", "-preset", "medium", "-crf", "18", "-pix_fmt", "yuv420p"])
+        if timeline.audio_bed:
+            cmd.append("-shortest")
+        cmd.append(output_path)
+        return cmd
+
+
+__all__ = ["TimelineAssembler", "Timeline", "TimelineClip"]
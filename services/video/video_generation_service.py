@@ -3,6 +3,7 @@ import copy
 import os
 import random
 import re
+from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
 
 from domain.models import Storyboard, SelectionSet, PlanSegment, GenerationPlan
@@ -12,9 +13,11 @@ from infrastructure.state_store import VideoGeneratorStateStore
 from infrastructure.comfy_api import ComfyUIAPI
 from infrastructure.logger import get_logger
 from infrastructure.job_status_store import JobStatusStore
+from infrastructure.service_container import get_service_container
 from services.video.video_plan_builder import VideoPlanBuilder
 from services.video.file_operations import VideoFileHandler
 from services.video.last_frame_extractor import LastFrameExtractor
+from services.video.timeline_assembler import TimelineAssembler
 from services.cleanup_service import CleanupService
 
 logger = get_logger(__name__)
@@ -40,8 +43,19 @@ class VideoGenerationService:
         self.state_store = state_store
         self.plan_builder = plan_builder or VideoPlanBuilder()
         self._file_handler = VideoFileHandler(project_store)
-        self._cleanup_service = CleanupService(project_store)
-        self._job_store = JobStatusStore()
+        services = get_service_container()
+        self._cleanup_service = services.get(CleanupService, project_store)
+        self._job_store = services.get(JobStatusStore)
+        self.stop_requested = False
+
+    def request_stop(self) -> bool:
+        """Cancel hook for background jobs: stop before the next segment.
+
+        Returns:
+            True (the run winds down by itself after the current segment)
+        """
+        self.stop_requested = True
+        return True
 
     def run_generation(
         self,
@@ -77,6 +91,9 @@ class VideoGenerationService:
         # Process segments
         idx = 0
         while idx < len(working_plan):
+            if self.stop_requested:
+                logs.append(f"- ⏹️ Gestoppt: {len(working_plan) - idx} Segment(e) nicht gerendert")
+                break
             entry = working_plan[idx]
             clip_label = self._format_clip_label(entry)
             segment_info = self._format_segment_info(entry)
@@ -138,7 +155,10 @@ class VideoGenerationService:
         completed = sum(1 for entry in working_plan if entry.get("status") == "completed")
         failed = sum(1 for entry in working_plan if str(entry.get("status", "")).startswith("error"))
         warnings = sum(1 for entry in working_plan if entry.get("status") == "generated_no_copy")
-        if failed or warnings:
+        if self.stop_requested:
+            status = "cancelled"
+            message = f"Stopped after {completed}/{len(working_plan)} segments"
+        elif failed or warnings:
             status = "completed_with_issues"
             message = f"Completed {completed}/{len(working_plan)} segments, {failed} failed, {warnings} warnings"
         else:
@@ -160,6 +180,59 @@ class VideoGenerationService:
 
         return working_plan, logs, last_video_path
 
+    def assemble_final_video(
+        self,
+        plan_state: List[Dict[str, Any]],
+        project: Dict[str, Any],
+        fps: Optional[int] = None,
+        crossfade: float = 0.0,
+        audio_bed: Optional[str] = None,
+        resolution: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[bool, str]:
+        """Render all completed plan segments into one video under project/final/.
+
+        Args:
+            plan_state: Plan entries (with output_files from run_generation)
+            project: Active project metadata
+            fps: Output frame rate (defaults to the clips' frame rate)
+            crossfade: Crossfade between clips in seconds (0 = hard cut, stream copy)
+            audio_bed: Optional narration/music file laid under the video
+            resolution: Optional output resolution (defaults to the clips' size)
+
+        Returns:
+            Tuple of (success, output_path or error message)
+        """
+        assembler = TimelineAssembler()
+        timeline = assembler.build_from_plan(
+            plan_state,
+            fps=fps,
+            resolution=resolution,
+            crossfade=crossfade,
+            audio_bed=audio_bed,
+        )
+        if not timeline.clips:
+            return False, "Keine fertigen Clips im Plan"
+
+        final_dir = self.project_store.ensure_dir(project, "final")
+        name = project.get("slug") or "final"
+        output_path = os.path.join(final_dir, f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4")
+
+        self._job_store.set_status(
+            project.get("path"),
+            "final_render",
+            "running",
+            message=f"Final render started ({len(timeline.clips)} clips, {timeline.transcode_count} re-encode)",
+        )
+        success, result = assembler.assemble(timeline, output_path)
+        self._job_store.set_status(
+            project.get("path"),
+            "final_render",
+            "completed" if success else "failed",
+            message=result if success else f"Final render failed: {result}",
+            metadata={"clips": len(timeline.clips), "skipped": timeline.skipped},
+        )
+        return success, result
+
     def _format_segment_info(self, entry: Dict[str, Any]) -> str:
         """Format segment information for multi-segment shots."""
         segment_total = entry.get("segment_total", 1)
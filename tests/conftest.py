@@ -40,6 +40,55 @@ def reset_settings_store():
     ss._settings_store = None
 
 
+@pytest.fixture(autouse=True)
+def reset_service_container():
+    """Give each test a fresh shared-services container."""
+    import infrastructure.service_container as sc
+
+    sc.reset_service_container()
+    yield
+    sc.reset_service_container()
+
+
+@pytest.fixture(autouse=True)
+def isolated_media_probe(tmp_path, monkeypatch):
+    """Keep the shared ffprobe cache per-test and out of the home directory."""
+    import infrastructure.media_probe as mp
+
+    monkeypatch.setattr(mp, "DEFAULT_CACHE_PATH", tmp_path / "media_probe.json")
+    mp._media_probe = None
+    yield
+    mp._media_probe = None
+
+
+@pytest.fixture(autouse=True)
+def isolated_thumbnail_cache(tmp_path, monkeypatch):
+    """Render gallery thumbnails inline into a per-test cache directory."""
+    import infrastructure.thumbnail_cache as tc
+
+    monkeypatch.setattr(tc, "DEFAULT_CACHE_DIR", tmp_path / "thumbnails")
+    tc._thumbnail_cache = tc.ThumbnailCache(max_workers=0)
+    yield
+    tc._thumbnail_cache = None
+
+
+@pytest.fixture(autouse=True)
+def isolated_model_manager_caches(tmp_path, monkeypatch):
+    """Keep the Model Manager caches per-test and out of the home directory."""
+    import services.model_manager.duplicate_detector as dd
+    import services.model_manager.model_downloader as md
+    import services.model_manager.model_metadata as mm
+    import services.model_manager.model_scanner as ms
+    import services.model_manager.workflow_scanner as ws
+
+    monkeypatch.setattr(ms, "DEFAULT_INDEX_PATH", tmp_path / "model_index.db")
+    monkeypatch.setattr(dd, "DEFAULT_HASH_CACHE_PATH", tmp_path / "model_hashes.db")
+    monkeypatch.setattr(ws, "DEFAULT_CACHE_PATH", tmp_path / "workflow_scan.json")
+    monkeypatch.setattr(md, "DEFAULT_SEARCH_CACHE_PATH", tmp_path / "model_search.json")
+    monkeypatch.setattr(mm, "DEFAULT_METADATA_CACHE_PATH", tmp_path / "model_metadata.db")
+    monkeypatch.setattr(mm, "_metadata_reader", None)
+
+
 # ============================================================================
 # Directory Fixtures
 # ============================================================================
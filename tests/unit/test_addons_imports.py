@@ -283,3 +283,69 @@ def test_keyframe_generator_render_smoke(monkeypatch):
     addon = kg.KeyframeGeneratorAddon()
     ui = addon.render()
     assert ui is not None
+
+
+@pytest.mark.unit
+def test_addon_registry_is_lazy():
+    """Importing the addons package must not import addon modules."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, addons; "
+        "print(any(m in sys.modules for m in ('gradio', 'addons.model_manager', 'addons.video_generator')))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "False"
+
+
+@pytest.mark.unit
+def test_load_addons_profiles_and_warms_up(monkeypatch):
+    """load_addons imports by name and records timings; warm-up runs in background."""
+    import addons
+    from infrastructure.startup_profile import StartupProfile
+
+    warmed = []
+
+    class DummyAddon(BaseAddon):
+        def __init__(self):
+            super().__init__("Dummy", "Desc")
+
+        def render(self):
+            return []
+
+        def get_tab_name(self):
+            return "Dummy"
+
+        def warm_up(self):
+            warmed.append(self.name)
+
+    class BrokenAddon(DummyAddon):
+        def __init__(self):
+            raise RuntimeError("boom")
+
+    classes = {"DummyAddon": DummyAddon, "BrokenAddon": BrokenAddon}
+    monkeypatch.setattr(addons, "AVAILABLE_ADDONS", [("x", "DummyAddon"), ("y", "BrokenAddon")])
+    monkeypatch.setattr(addons, "get_addon_class", lambda name: classes[name])
+
+    profile = StartupProfile()
+    loaded = addons.load_addons(profile)
+    done = []
+    addons.warm_up_addons(loaded, profile, on_complete=lambda: done.append(True)).join(timeout=5)
+
+    assert [a.name for a in loaded] == ["Dummy"]
+    assert warmed == ["Dummy"] and done == [True]
+    timings = profile.timings()
+    assert {"import", "construct", "warm_up"} <= set(timings["DummyAddon"])
+    assert "construct" in timings["BrokenAddon"]
+
+
+@pytest.mark.unit
+def test_get_addon_class_by_name():
+    """Registered names resolve to classes; unknown names raise."""
+    pytest.importorskip("gradio")
+    import addons
+
+    assert addons.get_addon_class("SettingsAddon").__name__ == "SettingsAddon"
+    with pytest.raises(KeyError):
+        addons.get_addon_class("NopeAddon")
@@ -474,6 +474,44 @@ class TestAudioAnalyzerService:
 
             assert paths == []
 
+    def test_export_segments_decodes_once(self, service, tmp_path):
+        """Test multiple segments are written by a single ffmpeg pass."""
+        segments = [
+            AudioSegment(index=0, start_time=0, end_time=25, duration=25, overlap_after=2),
+            AudioSegment(index=1, start_time=25, end_time=50, duration=25, overlap_before=2),
+        ]
+
+        with patch('subprocess.run', return_value=Mock(returncode=0)) as mock_run:
+            paths = service.export_segments("/path/to/audio.mp3", segments, str(tmp_path))
+
+        assert len(paths) == 2
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args[0][0]
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert "asplit=2" in graph
+        assert "atrim=start=0.000:end=27.000" in graph
+        assert "atrim=start=23.000:end=50.000" in graph
+        assert cmd.count("-i") == 1
+
+    def test_export_segments_falls_back_to_input_seeking(self, service, tmp_path):
+        """Test a failed single pass is retried per segment with input seeking."""
+        segments = [
+            AudioSegment(index=0, start_time=0, end_time=25, duration=25),
+            AudioSegment(index=1, start_time=25, end_time=50, duration=25),
+        ]
+
+        def run(cmd, **kwargs):
+            return Mock(returncode=1 if "-filter_complex" in cmd else 0, stderr="error")
+
+        with patch('subprocess.run', side_effect=run) as mock_run:
+            paths = service.export_segments("/path/to/audio.mp3", segments, str(tmp_path))
+
+        assert [os.path.basename(p) for p in paths] == ["audio_seg000.wav", "audio_seg001.wav"]
+        retries = [call[0][0] for call in mock_run.call_args_list[1:]]
+        assert len(retries) == 2
+        for cmd in retries:
+            assert cmd.index("-ss") < cmd.index("-i")
+
     # ========================================================================
     # Format Segments Table Tests
     # ========================================================================
@@ -0,0 +1,109 @@
+"""Unit tests for the headless BatchPipeline and batch.py CLI"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+import batch
+from domain.models import Storyboard
+from infrastructure.project_store import ProjectStore
+from services.batch_pipeline import BatchOptions, BatchPipeline, BatchStageError, ProjectResult
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def project(temp_project_dir):
+    for name in ("a_v1.png", "a_v2.png", "b_v1.png"):
+        (temp_project_dir / "keyframes" / name).write_bytes(b"png")
+    return {"slug": "demo", "name": "Demo", "path": str(temp_project_dir)}
+
+
+@pytest.fixture
+def storyboard():
+    return Storyboard.from_dict({"project": "Demo", "shots": [
+        {"shot_id": "001", "prompt": "p", "filename_base": "a"},
+        {"shot_id": "002", "prompt": "p", "filename_base": "b"},
+        {"shot_id": "003", "prompt": "p", "filename_base": "c"},
+    ]})
+
+
+@pytest.fixture
+def pipeline():
+    store = Mock(spec=ProjectStore)
+    store.ensure_dir.side_effect = lambda project, *parts: os.path.join(project["path"], *parts)
+    services = Mock(project_store=store)
+    events = []
+    pipeline = BatchPipeline(services=services, emit=events.append)
+    pipeline.events = events
+    return pipeline
+
+
+class TestSelectionStage:
+    @pytest.mark.unit
+    def test_auto_selection_exports_one_variant_per_shot(self, pipeline, project, storyboard):
+        summary = pipeline._run_selection(project, storyboard, BatchOptions(pick="last"))
+
+        assert summary["selected"] == 2
+        assert summary["missing"] == ["003"]
+        payload = json.loads(Path(summary["path"]).read_text())
+        assert [s["selected_file"] for s in payload["selections"]] == ["a_v2.png", "b_v1.png"]
+        assert os.path.exists(os.path.join(project["path"], "selected", "a_v2.png"))
+
+    @pytest.mark.unit
+    def test_file_based_selection(self, pipeline, project, storyboard, tmp_path):
+        selection_file = tmp_path / "picks.json"
+        selection_file.write_text(json.dumps({"001": 2, "002": "b_v1.png"}))
+
+        summary = pipeline._run_selection(project, storyboard, BatchOptions(selection_file=str(selection_file)))
+
+        payload = json.loads(Path(summary["path"]).read_text())
+        assert {s["shot_id"]: s["selected_variant"] for s in payload["selections"]} == {"001": 2, "002": 1}
+
+
+class TestRunProject:
+    @pytest.mark.unit
+    def test_failing_stage_stops_project_and_reports(self, pipeline, project, storyboard):
+        pipeline._load_storyboard = Mock(return_value=storyboard)
+        pipeline._run_keyframes = Mock(side_effect=BatchStageError("Connection failed"))
+        pipeline._run_video = Mock()
+
+        result = pipeline.run_project(project, BatchOptions())
+
+        assert result.status == "failed"
+        assert result.error == "Connection failed"
+        pipeline._run_video.assert_not_called()
+        assert [e["event"] for e in pipeline.events] == ["project_start", "stage_start", "project_done"]
+        assert pipeline.events[-1]["stage"] == "keyframes"
+
+    @pytest.mark.unit
+    def test_selected_stages_only(self, pipeline, project, storyboard):
+        pipeline._load_storyboard = Mock(return_value=storyboard)
+        pipeline._run_keyframes = Mock()
+
+        result = pipeline.run_project(project, BatchOptions(stages=("select",)))
+
+        assert result.ok
+        pipeline._run_keyframes.assert_not_called()
+        assert result.stages["select"]["selected"] == 2
+
+
+class TestBatchCli:
+    @pytest.mark.unit
+    def test_exit_codes(self, capsys):
+        with patch.object(batch.BatchPipeline, "resolve_projects", return_value=[{"slug": "a"}, {"slug": "b"}]), \
+             patch.object(batch.BatchPipeline, "run", return_value=[ProjectResult("a"), ProjectResult("b", status="failed")]):
+            assert batch.main(["--all"]) == batch.EXIT_FAILED
+
+        with patch.object(batch.BatchPipeline, "resolve_projects", side_effect=batch.PipelineException("Unknown project: x")):
+            assert batch.main(["--project", "x"]) == batch.EXIT_USAGE
+        assert json.loads(capsys.readouterr().out.splitlines()[-1]) == {"event": "error", "error": "Unknown project: x"}
+
+    @pytest.mark.unit
+    def test_does_not_import_gradio(self):
+        code = "import sys, batch; sys.exit(1 if 'gradio' in sys.modules else 0)"
+        assert subprocess.run([sys.executable, "-c", code], cwd=ROOT).returncode == 0
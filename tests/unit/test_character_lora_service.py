@@ -7,6 +7,8 @@ from unittest.mock import Mock, patch, MagicMock
 
 from services.character_lora_service import CharacterLoraService, CharacterLora
 
+READER_PATCH = "services.character_lora_service.get_model_metadata_reader"
+
 
 class TestCharacterLoraDataclass:
     """Test CharacterLora dataclass with compatible_models field"""
@@ -291,6 +293,30 @@ class TestIsModelCompatible:
             result = service.is_model_compatible("cg_elena", "diffusion_models/sdxl.safetensors")
         assert result is False
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("architecture", ["sd15", "wan"])
+    def test_unmapped_header_architecture_is_compatible(self, architecture):
+        """Header architectures outside flux/sdxl/sd3 must not block a typed LoRA"""
+        service = CharacterLoraService()
+        lora = CharacterLora(
+            id="cg_elena",
+            name="Elena",
+            trigger_word="elena",
+            lora_file="cg_elena.safetensors",
+            lora_path="/path/to/cg_elena.safetensors",
+            strength=1.0,
+            model_type="flux",
+        )
+        reader = Mock()
+        reader.detect_architecture.return_value = architecture
+        model_path = "checkpoints/checkpoint.safetensors"
+        with patch.object(service, 'scan_loras', return_value=[lora]), \
+                patch.object(service, '_resolve_model_path', return_value="/m/" + model_path), \
+                patch(READER_PATCH, return_value=reader):
+            assert service._detect_model_type(model_path) is None
+            assert service.is_model_compatible("cg_elena", model_path) is True
+            assert service.get_compatibility_warning("cg_elena", model_path) is None
+
 
 class TestGetCompatibilityWarning:
     """Test get_compatibility_warning method"""
@@ -447,3 +473,20 @@ class TestScanLorasWithModels:
             assert len(loras) == 1
             assert loras[0].id == "cg_test"
             assert loras[0].compatible_models is None
+
+    @pytest.mark.unit
+    def test_scan_loras_ignores_unmapped_header_architecture(self):
+        """A LoRA whose header reads as sd15 stays untyped (usable with any model)"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            Path(os.path.join(tmpdir, "cg_test.safetensors")).touch()
+            reader = Mock()
+            reader.detect_architecture.return_value = "sd15"
+
+            service = CharacterLoraService()
+            with patch.object(service, 'get_lora_directory', return_value=tmpdir), \
+                    patch(READER_PATCH, return_value=reader):
+                loras = service.scan_loras(force_refresh=True)
+                choices = service.get_choices_by_type("sdxl")
+
+            assert loras[0].model_type is None
+            assert choices == [(loras[0].name, "cg_test")]
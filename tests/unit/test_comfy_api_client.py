@@ -3,7 +3,7 @@ import io
 import json
 import urllib
 from urllib.error import HTTPError, URLError
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 import websocket
@@ -515,3 +515,50 @@ def test_get_request_wraps_generic_error(monkeypatch):
         api._get_request("/system_stats")
 
     assert "boom" in str(excinfo.value)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("queue, expected_posts", [
+    ({"queue_running": [[1, "pid", {}]], "queue_pending": []}, [("/interrupt", {"prompt_id": "pid"})]),
+    ({"queue_running": [[1, "other", {}]], "queue_pending": [[2, "pid", {}]]}, [("/queue", {"delete": ["pid"]})]),
+    ({"queue_running": [[1, "other", {}]], "queue_pending": []}, []),
+])
+def test_cancel_prompt_only_touches_this_job(queue, expected_posts):
+    """Queued jobs are deleted, the running one interrupted, other jobs are left alone"""
+    api = ComfyUIAPI("http://localhost:8188")
+
+    with patch.object(ComfyUIAPI, "_get_request", return_value=queue), \
+            patch.object(ComfyUIAPI, "_post_request", return_value={}) as post:
+        cancelled = api.cancel_prompt("pid")
+
+    assert cancelled is bool(expected_posts)
+    assert [c.args for c in post.call_args_list] == expected_posts
+
+
+@pytest.mark.unit
+def test_post_request_accepts_empty_body():
+    """/interrupt and /queue answer with an empty body"""
+    api = ComfyUIAPI("http://localhost:8188")
+    response = MagicMock()
+    response.__enter__.return_value.read.return_value = b""
+
+    with patch("infrastructure.comfy_api.client.urllib.request.urlopen", return_value=response):
+        assert api._post_request("/interrupt", {}) == {}
+
+
+@pytest.mark.unit
+def test_find_output_file_uses_history_entry(tmp_path):
+    """Only existing files of type output with an accepted extension are returned"""
+    (tmp_path / "video").mkdir()
+    (tmp_path / "video" / "clip_00001_.MP4").write_bytes(b"video")
+    history = {"outputs": {
+        "1": {"images": [{"filename": "preview.png", "subfolder": "", "type": "output"}]},
+        "2": {"gifs": [{"filename": "temp_00001_.mp4", "subfolder": "", "type": "temp"},
+                       {"filename": "gone_00001_.mp4", "subfolder": "video", "type": "output"},
+                       {"filename": "clip_00001_.MP4", "subfolder": "video", "type": "output"}]},
+    }}
+
+    found = ComfyUIAPI.find_output_file(history, str(tmp_path), (".mp4",))
+
+    assert found == str(tmp_path / "video" / "clip_00001_.MP4")
+    assert ComfyUIAPI.find_output_file(None, str(tmp_path), (".mp4",)) is None
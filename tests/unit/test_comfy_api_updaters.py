@@ -295,6 +295,45 @@ class TestKSamplerUpdater:
         assert "steps" not in node_data["inputs"]
         assert "cfg" not in node_data["inputs"]
 
+    @pytest.mark.unit
+    def test_update_sampler_on_ksampler_and_select_node(self):
+        """Should set sampler_name on KSampler and KSamplerSelect nodes"""
+        updater = KSamplerUpdater()
+        ksampler = {"inputs": {"sampler_name": "euler", "scheduler": "simple"}}
+        select = {"inputs": {"sampler_name": "euler"}}
+
+        updater.update(ksampler, {"sampler": "dpmpp_2m"})
+        updater.update(select, {"sampler": "dpmpp_2m"})
+
+        assert ksampler["inputs"] == {"sampler_name": "dpmpp_2m", "scheduler": "simple"}
+        assert select["inputs"]["sampler_name"] == "dpmpp_2m"
+        assert updater.applies_to("KSamplerSelect")
+        assert not updater.applies_to("KSamplerAdvanced")  # Split-step video samplers keep their steps
+
+
+class TestLoraLoaderUpdater:
+    """Test LoraLoaderUpdater"""
+
+    @pytest.mark.unit
+    def test_strength_without_lora_name_keeps_workflow_lora(self):
+        """Should apply lora_strength to the workflow's own LoRA when no lora_name is given"""
+        updater = LoraLoaderUpdater()
+        node_data = {"inputs": {"lora_name": "style.safetensors", "strength_model": 1, "strength_clip": 1}}
+
+        updater.update(node_data, {"lora_strength": 0.6})
+
+        assert node_data["inputs"] == {"lora_name": "style.safetensors", "strength_model": 0.6, "strength_clip": 0.6}
+
+    @pytest.mark.unit
+    def test_no_lora_params_leaves_node_untouched(self):
+        """Should not touch the node without lora_name and lora_strength"""
+        updater = LoraLoaderUpdater()
+        node_data = {"inputs": {"lora_name": "style.safetensors", "strength_model": 1}}
+
+        updater.update(node_data, {"seed": 1})
+
+        assert node_data["inputs"] == {"lora_name": "style.safetensors", "strength_model": 1}
+
 
 class TestBasicSchedulerUpdater:
     """Test BasicSchedulerUpdater"""
@@ -380,6 +380,27 @@ class TestConfigManagerBackends:
         assert "local" in backends
         assert backends["local"]["type"] == "local"
 
+    @pytest.mark.unit
+    def test_with_backend_pins_url_root_and_type(self, tmp_path):
+        """A pinned copy follows the worker's backend; the original stays untouched"""
+        manager = ConfigManager()
+        manager.set("comfy_root", str(tmp_path / "local"))
+        url = manager.get_comfy_url()
+
+        mounted = manager.with_backend(url="http://gpu1:8188", comfy_root=str(tmp_path / "gpu1"))
+        remote = manager.with_backend(url="http://gpu2:8188")
+        same = manager.with_backend(url=url)
+
+        assert mounted.get_comfy_url() == "http://gpu1:8188"
+        assert mounted.get_comfy_root() == str(tmp_path / "gpu1")
+        assert mounted.get("comfy_root") == str(tmp_path / "gpu1")
+        assert mounted.is_runpod_backend() is False
+        assert remote.is_runpod_backend() is True
+        assert remote.get("comfy_root") == str(tmp_path / "local")  # Download staging
+        assert same.is_runpod_backend() is False
+        assert manager.get_comfy_url() == url
+        assert manager.get_active_backend().get("comfy_root") != str(tmp_path / "gpu1")
+
     @pytest.mark.unit
     def test_add_backend(self):
         """Should add a new backend"""
@@ -0,0 +1,178 @@
+"""Unit tests for distributed workers and the WorkDispatcher"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from infrastructure.project_store import ProjectStore
+from infrastructure.work_queue import WorkQueue
+from services.distributed_worker import (
+    KIND_KEYFRAME,
+    KIND_TRANSITION,
+    KIND_VIDEO,
+    DistributedWorker,
+    WorkDispatcher,
+)
+from services.keyframe_service import KeyframeGenerationService
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Stand-in worker: leases a task, keeps it and never finishes (killed by the test)
+STALLED_WORKER = """
+import sys, time
+from unittest.mock import Mock
+from infrastructure.work_queue import WorkQueue
+from services.distributed_worker import DistributedWorker
+
+def stall(task):
+    print("leased", task.task_id, flush=True)
+    time.sleep(60)
+
+queue = WorkQueue(sys.argv[1])
+services = Mock()
+services.config.with_backend.return_value = services.config
+worker = DistributedWorker(queue, comfy_url="http://127.0.0.1:1", worker_id="doomed", lease_seconds=0.5,
+                           services=services, handlers={"keyframe_variant": stall})
+worker.run(max_tasks=1)
+"""
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return WorkQueue(str(tmp_path / "queue.db"))
+
+
+@pytest.fixture
+def services(tmp_path):
+    store = Mock(spec=ProjectStore)
+    store.ensure_dir.side_effect = lambda project, *parts: os.path.join(project["path"], *parts)
+    config = Mock()
+    config.get_resolution_tuple.return_value = (1024, 576)
+    config.with_backend.return_value = config
+    config.is_runpod_backend.return_value = False
+    services = Mock(config=config, project_store=store)
+    services.get.return_value.cleanup_before_keyframe_generation.return_value = 0
+    services.get.return_value.cleanup_before_video_generation.return_value = 0
+    return services
+
+
+def _worker(queue, services, handlers, **kwargs):
+    return DistributedWorker(queue, comfy_url="http://stand-in:8188", services=services,
+                             handlers=handlers, poll_interval=0.01, **kwargs)
+
+
+class TestDistributedWorker:
+    @pytest.mark.unit
+    def test_chained_segments_run_in_order_with_last_frame(self, queue, services):
+        plan = [
+            {"plan_id": "001A", "shot_id": "001", "segment_index": 1, "segment_total": 2, "ready": True,
+             "start_frame": "/shared/a.png"},
+            {"plan_id": "001B", "shot_id": "001", "segment_index": 2, "segment_total": 2, "ready": False,
+             "start_frame_source": "pending_last_frame"},
+            {"plan_id": "002", "shot_id": "002", "segment_index": 1, "ready": False},
+        ]
+        dispatcher = WorkDispatcher(queue, services)
+        batch, count = dispatcher.enqueue_video({"slug": "demo", "path": "/shared/demo"}, plan, "gcv.json", fps=24)
+        assert count == 2  # Shot 002 has no start frame
+
+        rendered = []
+
+        def segment(task):
+            entry = task.payload["entry"]
+            start = (task.dependency_result or {}).get("last_frame") or entry["start_frame"]
+            rendered.append((entry["plan_id"], start))
+            return {"video_paths": [f"/shared/{entry['plan_id']}.mp4"], "last_frame": f"/shared/{entry['plan_id']}_last.png"}
+
+        assert _worker(queue, services, {KIND_VIDEO: segment}).run(exit_when_idle=True) == 2
+        assert rendered == [("001A", "/shared/a.png"), ("001B", "/shared/001A_last.png")]
+
+        updated, last_video = dispatcher.apply_video_results(batch, plan)
+        assert [entry.get("status") for entry in updated] == ["completed", "completed", None]
+        assert last_video == "/shared/001B.mp4"
+
+    @pytest.mark.unit
+    def test_handler_error_is_retried_and_reported(self, queue, services):
+        task_id = queue.enqueue(KIND_KEYFRAME, {}, max_attempts=2)
+        events = []
+        calls = []
+
+        def flaky(task):
+            calls.append(task.attempts)
+            if task.attempts == 1:
+                raise RuntimeError("ComfyUI restarted")
+            return {"images": ["a_v1_00001_.png"]}
+
+        _worker(queue, services, {KIND_KEYFRAME: flaky}, emit=events.append).run(exit_when_idle=True)
+
+        assert calls == [1, 2]
+        assert queue.get(task_id).status == "done"
+        assert [e["event"] for e in events] == ["worker_start", "task_start", "task_failed",
+                                                "task_start", "task_done", "worker_stop"]
+
+    @pytest.mark.unit
+    def test_task_of_killed_worker_is_finished_by_another(self, queue, services):
+        task_id = queue.enqueue(KIND_KEYFRAME, {"shot_idx": 0})
+        doomed = subprocess.Popen(
+            [sys.executable, "-c", STALLED_WORKER, queue.db_path], cwd=ROOT, stdout=subprocess.PIPE, text=True
+        )
+        try:
+            assert doomed.stdout.readline().split() == ["leased", str(task_id)]
+        finally:
+            doomed.send_signal(signal.SIGKILL)
+            doomed.wait(timeout=10)
+        assert queue.get(task_id).worker_id == "doomed"
+
+        survivor = _worker(queue, services, {KIND_KEYFRAME: lambda task: {"attempt": task.attempts}})
+        deadline = time.monotonic() + 10
+        while survivor.run_once() is False and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+        task = queue.get(task_id)
+        assert (task.status, task.result, task.worker_id) == ("done", {"attempt": 2}, survivor.worker_id)
+
+    @pytest.mark.unit
+    def test_backend_override_drives_config_and_store(self, queue, services):
+        pinned = Mock()
+        pinned.get_comfy_url.return_value = "http://gpu2:8188"
+        pinned.is_runpod_backend.return_value = True
+        services.config.with_backend.return_value = pinned
+
+        worker = _worker(queue, services, {})
+
+        services.config.with_backend.assert_called_once_with(url="http://stand-in:8188", comfy_root=None)
+        assert worker.config is pinned
+        assert worker.project_store.config is pinned
+        assert worker.remote is True
+        assert KIND_TRANSITION not in worker.kinds  # Needs the backend's folders
+        with pytest.raises(ValueError):
+            _worker(queue, services, {}, kinds=(KIND_TRANSITION,))
+
+    @pytest.mark.unit
+    def test_keyframe_handler_renders_variant_on_own_backend(self, queue, services, tmp_path):
+        workflow_dir = tmp_path / "workflows"
+        workflow_dir.mkdir()
+        (workflow_dir / "gcp_flux.json").write_text(json.dumps({"1": {}}))
+        services.config.get_workflow_dir.return_value = str(workflow_dir)
+        dispatcher = WorkDispatcher(queue, services)
+        storyboard = Mock(raw={"shots": [{"shot_id": "001", "filename_base": "hero", "prompt": "p"}]})
+        dispatcher.enqueue_keyframes({"slug": "demo", "path": str(tmp_path)}, storyboard, "gcp_flux.json",
+                                     variants_per_shot=2, base_seed=100)
+
+        worker = _worker(queue, services, {})
+        worker.api = Mock()
+        worker.api.load_workflow.return_value = {"1": {}}
+        worker._keyframe_service = Mock()
+        worker._keyframe_service.variant_identity.side_effect = KeyframeGenerationService.variant_identity
+        worker._keyframe_service.render_variant.side_effect = lambda **kw: [f"{kw['variant_name']}_00001_.png"]
+
+        assert worker.run(exit_when_idle=True) == 2
+        calls = [call.kwargs for call in worker._keyframe_service.render_variant.call_args_list]
+        assert [(c["seed"], c["variant_name"], c["width"]) for c in calls] == [(100, "hero_v1", 1024), (101, "hero_v2", 1024)]
+        assert calls[0]["output_dir"] == os.path.join(str(tmp_path), "keyframes")
+        worker.api.load_workflow.assert_called_once()  # Workflow is cached per worker
@@ -28,3 +28,64 @@ def test_duplicate_detector_find_duplicates(tmp_path):
     group = duplicates[0]
     assert group["suggested_keep"]["filename"] == file_a.name
     assert {f["filename"] for f in group["files"]} == {file_a.name, file_b.name}
+
+
+def _models(*paths):
+    return {
+        "checkpoints": [
+            {"path": str(p), "filename": p.name, "size_bytes": p.stat().st_size, "status": ModelStatus.UNUSED}
+            for p in paths
+        ]
+    }
+
+
+def test_duplicate_detector_tiers_stop_at_fingerprint(tmp_path, monkeypatch):
+    monkeypatch.setitem(DuplicateDetector.TIERS, "fingerprint", 4)
+    file_a = tmp_path / "a.safetensors"
+    file_b = tmp_path / "b.safetensors"
+    file_a.write_bytes(b"HEAD" + b"x" * 100 + b"TAIL")
+    file_b.write_bytes(b"HEAD" + b"y" * 100 + b"TAI2")
+
+    detector = DuplicateDetector(cache_path=str(tmp_path / "hashes.db"))
+    chunks = []
+    real_hash = detector._hash_ranges
+    monkeypatch.setattr(detector, "_hash_ranges", lambda path, chunk: chunks.append(chunk) or real_hash(path, chunk))
+
+    assert detector.find_duplicates(_models(file_a, file_b), use_partial_hash=False) == []
+    # Fingerprints already differ, so no deeper tier is read
+    assert chunks == [4, 4]
+
+
+def test_duplicate_detector_full_hash_only_on_collision(tmp_path, monkeypatch):
+    monkeypatch.setitem(DuplicateDetector.TIERS, "fingerprint", 4)
+    monkeypatch.setitem(DuplicateDetector.TIERS, "partial", 8)
+    file_a = tmp_path / "a.safetensors"
+    file_b = tmp_path / "b.safetensors"
+    file_a.write_bytes(b"HEADHEAD" + b"x" * 100 + b"TAILTAIL")
+    file_b.write_bytes(b"HEADHEAD" + b"y" * 100 + b"TAILTAIL")
+
+    detector = DuplicateDetector(cache_path=str(tmp_path / "hashes.db"))
+
+    # Partial mode trusts head/tail and reports a duplicate
+    assert len(detector.find_duplicates(_models(file_a, file_b), use_partial_hash=True)) == 1
+    # Full mode reads the middle and tells them apart
+    assert detector.find_duplicates(_models(file_a, file_b), use_partial_hash=False) == []
+
+
+def test_duplicate_detector_reuses_persisted_hashes(tmp_path, monkeypatch):
+    file_a = tmp_path / "a.safetensors"
+    file_b = tmp_path / "b.safetensors"
+    file_a.write_bytes(b"same-content")
+    file_b.write_bytes(b"same-content")
+    cache = str(tmp_path / "hashes.db")
+
+    first = DuplicateDetector(cache_path=cache).find_duplicates(_models(file_a, file_b))
+
+    rerun = DuplicateDetector(cache_path=cache)
+    monkeypatch.setattr(rerun, "_hash_ranges", lambda *a: (_ for _ in ()).throw(AssertionError("rehashed")))
+    assert rerun.find_duplicates(_models(file_a, file_b)) == first
+
+    # A changed file gets a new cache key and is hashed again
+    file_b.write_bytes(b"diff-content")
+    fresh = DuplicateDetector(cache_path=cache)
+    assert fresh.find_duplicates(_models(file_a, file_b)) == []
@@ -121,6 +121,7 @@ class TestFirstLastVideoService:
         }
         api.queue_prompt.return_value = "test-prompt-id"
         api.monitor_progress.return_value = {"status": "success"}
+        api.get_history.return_value = None
         return api
 
     @pytest.fixture
@@ -445,122 +446,218 @@ class TestFirstLastVideoService:
 
         assert result.success is False
 
-    def test_generate_all_clips_success(self, service, create_test_images, tmp_path):
+    @pytest.fixture
+    def comfy_queue(self, service, mock_api, tmp_path):
+        """Simulate ComfyUI finishing each queued transition on the first poll."""
+        video_dir = tmp_path / "comfyui" / "output" / "video"
+        video_dir.mkdir(parents=True, exist_ok=True)
+        (tmp_path / "comfyui" / "input").mkdir(parents=True, exist_ok=True)
+        queued = []
+
+        def queue_prompt(workflow):
+            prefix = workflow["83"]["inputs"]["filename_prefix"].split("/", 1)[1]
+            filename = f"{prefix}_00001.mp4"
+            (video_dir / filename).write_bytes(b"fake video")
+            queued.append(workflow)
+            return f"prompt-{len(queued)}"
+
+        def get_history(prompt_id):
+            workflow = queued[int(prompt_id.split("-")[1]) - 1]
+            prefix = workflow["83"]["inputs"]["filename_prefix"].split("/", 1)[1]
+            return {
+                "status": {"status_str": "success", "completed": True},
+                "outputs": {"83": {"images": [
+                    {"filename": f"{prefix}_00001.mp4", "subfolder": "video", "type": "output"}
+                ]}},
+            }
+
+        mock_api.queue_prompt.side_effect = queue_prompt
+        mock_api.get_history.side_effect = get_history
+        service.POLL_INTERVAL = 0
+        with patch.object(service, "_get_output_dir", return_value=str(tmp_path / "out")):
+            (tmp_path / "out").mkdir()
+            yield queued
+
+    def test_generate_all_clips_success(self, service, create_test_images, comfy_queue):
         """Test successful generation of all clips."""
         images = create_test_images(4)
         clips = [images[:2], images[2:4]]
 
-        input_dir = tmp_path / "comfyui" / "input"
-        input_dir.mkdir(parents=True, exist_ok=True)
-
-        with patch.object(service, 'generate_clip') as mock_clip:
-            mock_clip.return_value = ClipResult(
-                success=True,
-                clip_index=0,
-                transitions=[TransitionResult(True, "a", "b", "/out/t.mp4")]
-            )
-
-            result = service.generate_all_clips(clips, "test")
+        result = service.generate_all_clips(clips, "test")
 
         assert result.success is True
         assert result.total_transitions == 2
+        assert [c.clip_index for c in result.clips] == [0, 1]
+        video = result.clips[1].transitions[0].video_path
+        assert os.path.basename(video).startswith("clip02_trans01_")
+        assert os.path.exists(video)
 
-    def test_generate_all_clips_records_duration(self, service, create_test_images, tmp_path):
+    def test_generate_all_clips_records_duration(self, service, create_test_images, comfy_queue):
         """Test that generation records duration."""
         images = create_test_images(2)
-        clips = [images]
-
-        input_dir = tmp_path / "comfyui" / "input"
-        input_dir.mkdir(parents=True, exist_ok=True)
 
-        with patch.object(service, 'generate_clip') as mock_clip:
-            mock_clip.return_value = ClipResult(
-                success=True,
-                clip_index=0,
-                transitions=[TransitionResult(True, "a", "b", "/out/t.mp4")]
-            )
-
-            result = service.generate_all_clips(clips, "test")
+        result = service.generate_all_clips([images], "test")
 
         assert result.duration_seconds >= 0
 
-    def test_generate_all_clips_with_callback(self, service, create_test_images, tmp_path):
+    def test_generate_all_clips_with_callback(self, service, create_test_images, comfy_queue):
         """Test generation with progress callback."""
-        images = create_test_images(2)
-        clips = [images]
-
-        input_dir = tmp_path / "comfyui" / "input"
-        input_dir.mkdir(parents=True, exist_ok=True)
-
+        images = create_test_images(3)
         callback_calls = []
 
         def callback(pct, status):
             callback_calls.append((pct, status))
 
-        with patch.object(service, 'generate_clip') as mock_clip:
-            mock_clip.return_value = ClipResult(
-                success=True,
-                clip_index=0,
-                transitions=[TransitionResult(True, "a", "b", "/out/t.mp4")]
-            )
-
-            service.generate_all_clips(clips, "test", callback=callback)
+        service.generate_all_clips([images], "test", callback=callback)
 
-        # Callback should have been called
-        assert len(callback_calls) >= 0  # May be 0 if clip callback not triggered
+        assert callback_calls[-1][0] == 1.0
+        assert "2/2" in callback_calls[-1][1]
 
-    def test_generate_all_clips_skips_single_image_clips(self, service, create_test_images, tmp_path):
+    def test_generate_all_clips_skips_single_image_clips(self, service, create_test_images, comfy_queue):
         """Test that single-image clips are skipped."""
         images = create_test_images(3)
         clips = [images[:2], [images[2]]]  # Second clip has only 1 image
 
-        input_dir = tmp_path / "comfyui" / "input"
-        input_dir.mkdir(parents=True, exist_ok=True)
-
-        with patch.object(service, 'generate_clip') as mock_clip:
-            mock_clip.return_value = ClipResult(
-                success=True,
-                clip_index=0,
-                transitions=[TransitionResult(True, "a", "b", "/out/t.mp4")]
-            )
-
-            result = service.generate_all_clips(clips, "test")
+        result = service.generate_all_clips(clips, "test")
 
         # Only one clip should be processed
-        assert mock_clip.call_count == 1
+        assert len(result.clips) == 1
+        assert len(comfy_queue) == 1
 
-    def test_generate_all_clips_custom_parameters(self, service, create_test_images, tmp_path):
+    def test_generate_all_clips_custom_parameters(self, service, create_test_images, comfy_queue):
         """Test generation with custom parameters passed through."""
         images = create_test_images(2)
-        clips = [images]
 
-        input_dir = tmp_path / "comfyui" / "input"
-        input_dir.mkdir(parents=True, exist_ok=True)
+        service.generate_all_clips(
+            [images],
+            "test prompt",
+            negative_prompt="bad quality",
+            width=1920,
+            height=1080,
+            frames=121,
+            fps=24,
+            steps=30,
+            cfg=6.0
+        )
 
-        with patch.object(service, 'generate_clip') as mock_clip:
-            mock_clip.return_value = ClipResult(
-                success=True,
-                clip_index=0,
-                transitions=[]
-            )
+        workflow = comfy_queue[0]
+        assert workflow["81"]["inputs"]["width"] == 1920
+        assert workflow["81"]["inputs"]["height"] == 1080
+        assert workflow["81"]["inputs"]["length"] == 121
+        assert workflow["86"]["inputs"]["fps"] == 24
+        assert workflow["84"]["inputs"]["steps"] == 30
+        assert workflow["87"]["inputs"]["cfg"] == 6.0
+        assert workflow["78"]["inputs"]["text"] == "bad quality"
+
+    def test_generate_all_clips_uploads_each_image_once(self, service, create_test_images, comfy_queue, tmp_path):
+        """Shared keyframes are uploaded once and removed after the run."""
+        images = create_test_images(4)
 
-            service.generate_all_clips(
-                clips,
-                "test prompt",
-                negative_prompt="bad quality",
-                width=1920,
-                height=1080,
-                frames=121,
-                fps=24,
-                steps=30,
-                cfg=6.0
-            )
+        with patch.object(service, "_upload_image", wraps=service._upload_image) as mock_upload:
+            service.generate_all_clips([images], "test")
+
+        assert sorted(call[0][0] for call in mock_upload.call_args_list) == sorted(images)
+        # End of one transition is the start of the next
+        assert comfy_queue[0]["89"]["inputs"]["image"] == comfy_queue[1]["80"]["inputs"]["image"]
+        assert list((tmp_path / "comfyui" / "input").iterdir()) == []
+
+    def test_generate_all_clips_bounds_in_flight(self, service, create_test_images, comfy_queue, mock_api):
+        """All transitions are queued before any finishes, up to the limit."""
+        images = create_test_images(5)
+        max_seen = []
+        history = mock_api.get_history.side_effect
+
+        def get_history(prompt_id):
+            max_seen.append(len(comfy_queue))
+            return history(prompt_id)
+
+        mock_api.get_history.side_effect = get_history
+
+        result = service.generate_all_clips([images], "test", max_in_flight=3)
+
+        assert result.total_transitions == 4
+        assert max_seen[0] == 3
+        assert len(comfy_queue) == 4
+
+    def test_generate_all_clips_missing_image_fails_only_its_transitions(
+        self, service, create_test_images, comfy_queue
+    ):
+        """A missing keyframe fails its transitions without blocking others."""
+        images = create_test_images(2)
+        clips = [images, [images[1], "/nonexistent/end.png"]]
+
+        result = service.generate_all_clips(clips, "test")
+
+        assert result.clips[0].success is True
+        assert result.clips[1].success is False
+        assert "End image not found" in result.clips[1].transitions[0].error
+        assert len(comfy_queue) == 1
+
+    def test_generate_all_clips_timeout_cancels_prompt(self, service, create_test_images, comfy_queue, mock_api):
+        """A transition that never finishes is removed from ComfyUI."""
+        images = create_test_images(2)
+        mock_api.get_history.side_effect = lambda prompt_id: None
+        service.TRANSITION_TIMEOUT = 0
+
+        result = service.generate_all_clips([images], "test")
+
+        assert "Timeout" in result.clips[0].transitions[0].error
+        mock_api.cancel_prompt.assert_called_once_with("prompt-1")
 
-        # Verify parameters were passed
-        call_kwargs = mock_clip.call_args[1]
-        assert call_kwargs["width"] == 1920
-        assert call_kwargs["height"] == 1080
-        assert call_kwargs["frames"] == 121
-        assert call_kwargs["fps"] == 24
-        assert call_kwargs["steps"] == 30
-        assert call_kwargs["cfg"] == 6.0
+    def test_generate_all_clips_ignores_foreign_outputs(
+        self, service, create_test_images, comfy_queue, mock_api, tmp_path
+    ):
+        """Without history outputs only this prompt's unique prefix is accepted."""
+        images = create_test_images(2)
+        video_dir = tmp_path / "comfyui" / "output" / "video"
+        mock_api.queue_prompt.side_effect = lambda workflow: comfy_queue.append(workflow) or "prompt-1"
+        mock_api.get_history.side_effect = lambda prompt_id: {"status": {"status_str": "success"}, "outputs": {}}
+        (video_dir / "ComfyUI_00001_.mp4").write_bytes(b"other job")
+        (video_dir / "clip01_trans01_00001_.mp4").write_bytes(b"earlier run")
+
+        with patch("services.firstlast_video_service.time.sleep"):
+            result = service.generate_all_clips([images], "test")
+
+        assert result.success is False
+        assert "No output video" in result.clips[0].transitions[0].error
+        assert (video_dir / "ComfyUI_00001_.mp4").exists()
+
+    def test_generate_transition_uses_history_output(self, service, create_test_images, mock_api, tmp_path):
+        """The single-transition path resolves its video from the prompt's history."""
+        images = create_test_images(2)
+        video_dir = tmp_path / "comfyui" / "output" / "video"
+        video_dir.mkdir(parents=True)
+        (tmp_path / "comfyui" / "input").mkdir()
+        (video_dir / "mine_00001_.mp4").write_bytes(b"video")
+        mock_api.get_history.return_value = {"outputs": {"83": {"images": [
+            {"filename": "mine_00001_.mp4", "subfolder": "video", "type": "output"}
+        ]}}}
+
+        with patch.object(service, "_get_output_dir", return_value=str(tmp_path)):
+            result = service.generate_transition(images[0], images[1], "test", output_prefix="mine")
+
+        assert result.success is True
+        assert os.path.basename(result.video_path).startswith("mine_")
+        prefix = mock_api.queue_prompt.call_args.args[0]["83"]["inputs"]["filename_prefix"]
+        assert prefix.startswith("video/mine_") and prefix != "video/mine"
+
+    def test_generate_transition_failure_cancels_prompt(self, service, create_test_images, tmp_path, mock_api):
+        """A timed-out prompt is deleted/interrupted in ComfyUI."""
+        images = create_test_images(2)
+        (tmp_path / "comfyui" / "input").mkdir(parents=True)
+        mock_api.monitor_progress.return_value = {"status": "error", "error": "Timeout waiting for completion"}
+
+        result = service.generate_transition(images[0], images[1], "test")
+
+        assert result.success is False
+        mock_api.cancel_prompt.assert_called_once_with("test-prompt-id")
+
+    def test_generate_all_clips_execution_error(self, service, create_test_images, comfy_queue, mock_api):
+        """Errors reported in the history fail the transition."""
+        images = create_test_images(2)
+        mock_api.get_history.side_effect = lambda prompt_id: {"status": {"status_str": "error"}, "outputs": {}}
+
+        result = service.generate_all_clips([images], "test")
+
+        assert result.success is False
+        assert "execution error" in result.clips[0].transitions[0].error
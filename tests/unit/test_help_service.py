@@ -0,0 +1,67 @@
+"""Unit tests for HelpService (in-memory help texts and search)"""
+from unittest.mock import patch
+
+import pytest
+
+from infrastructure.help_service import HelpService
+
+
+@pytest.fixture
+def service(tmp_path):
+    help_service = HelpService(db_path=str(tmp_path / "help.db"))
+    help_service.add_tab_info("keyframe_generator", "Keyframes", "Bilder erzeugen")
+    help_service.add_help_text("keyframe_generator", "prompt", "tooltip", "Beschreibe die Szene")
+    help_service.add_help_text("keyframe_generator", "prompt", "modal", "Ausführliche Hilfe zum Prompt")
+    help_service.add_help_text("common", "seed", "tooltip", "Zufallswert für reproduzierbare Ergebnisse")
+    help_service.add_help_text("keyframe_generator", "prompt", "tooltip", "Describe the scene", language="en")
+    return help_service
+
+
+class TestHelpService:
+    @pytest.mark.unit
+    def test_lookups_served_from_memory(self, service):
+        service.get_tooltip("keyframe_generator", "prompt")
+
+        with patch("infrastructure.help_service.sqlite3.connect", side_effect=AssertionError("db access")):
+            assert service.get_tooltip("keyframe_generator", "prompt") == "Beschreibe die Szene"
+            assert service.get_tooltip("keyframe_generator", "seed") == "Zufallswert für reproduzierbare Ergebnisse"
+            assert service.get_modal("keyframe_generator", "missing") == ""
+            assert service.get_tab_info("keyframe_generator") == {"title": "Keyframes", "description": "Bilder erzeugen"}
+            assert service.get_tab_info("unknown") == {"title": "", "description": ""}
+            assert service.get_all_fields("keyframe_generator") == ["prompt"]
+
+    @pytest.mark.unit
+    def test_writes_and_language_switch(self, service):
+        assert service.get_tooltip("keyframe_generator", "prompt") == "Beschreibe die Szene"
+
+        service.add_help_text("keyframe_generator", "steps", "tooltip", "Anzahl Schritte")
+        assert service.get_all_fields("keyframe_generator") == ["prompt", "steps"]
+
+        service.set_language("en")
+        assert service.get_tooltip("keyframe_generator", "prompt") == "Describe the scene"
+
+    @pytest.mark.unit
+    def test_search_ranks_matches(self, service):
+        results = service.search("reproduz")
+        assert [(r["tab"], r["field"]) for r in results] == [("common", "seed")]
+
+        assert [r["text_type"] for r in service.search("ausführliche hilfe")] == ["modal"]
+        assert service.search("   ") == []
+
+        service.add_help_text("project", "name", "tooltip", "Projektname für die Szene")
+        assert {r["tab"] for r in service.search("szene")} == {"keyframe_generator", "project"}
+
+
+class TestHelpAddonSearch:
+    @pytest.mark.unit
+    def test_search_box_lists_hits(self, service):
+        pytest.importorskip("gradio")
+        from addons.help_addon import HelpAddon
+
+        addon = HelpAddon(help_service=service)
+
+        result = addon._search_help("szene")
+        assert "**1 result(s)**" in result
+        assert "**Keyframes › prompt** (tooltip): Beschreibe die Szene" in result
+        assert "No help texts found" in addon._search_help("unbekannt")
+        assert addon._search_help("  ") == "Enter one or more search terms."
@@ -0,0 +1,189 @@
+"""Unit tests for the background JobRunner"""
+import threading
+
+import pytest
+
+from infrastructure.job_runner import JobRunner
+from infrastructure.job_status_store import JobStatusStore
+
+
+@pytest.fixture
+def job_store(tmp_path):
+    return JobStatusStore(base_dir=tmp_path / "jobs")
+
+
+@pytest.fixture
+def runner(job_store):
+    runner = JobRunner(max_workers=1, job_store=job_store)
+    yield runner
+    runner.shutdown(wait=True)
+
+
+class TestJobRunner:
+    @pytest.mark.unit
+    def test_runs_job_and_persists_status(self, runner, job_store, tmp_path):
+        project = tmp_path / "project"
+
+        def work(job):
+            job.report("Halfway", 0.5)
+            return 42
+
+        job = runner.submit("dataset_generation", work, project_path=str(project), label="Dataset")
+
+        assert job.wait(timeout=5)
+        assert job.status == "completed"
+        assert job.result == 42
+        status = job_store.get_status(str(project), "dataset_generation")
+        assert status.status == "completed"
+        assert status.message == "Halfway"
+        assert status.metadata["job_id"] == job.job_id
+
+    @pytest.mark.unit
+    def test_generator_events_can_be_followed_and_replayed(self, runner):
+        release = threading.Event()
+
+        def work(job):
+            yield "first"
+            release.wait(timeout=5)
+            yield "second"
+
+        job = runner.submit("keyframe_generation", work)
+        follower = job.follow()
+        assert next(follower) == "first"
+        release.set()
+
+        assert list(follower) == ["second"]
+        assert list(job.follow()) == ["first", "second"]
+        assert job.status == "completed"
+
+    @pytest.mark.unit
+    def test_bounded_pool_queues_and_cancels_waiting_jobs(self, runner, job_store):
+        release = threading.Event()
+        started = threading.Event()
+        ran = []
+
+        def blocking(job):
+            started.set()
+            release.wait(timeout=5)
+
+        first = runner.submit("video_generation", blocking, project_path=None)
+        assert started.wait(timeout=5)
+        second = runner.submit("keyframe_generation", lambda job: ran.append(job.job_id))
+
+        assert second.status == "queued"
+        assert runner.queue_position(second) == 1
+        assert runner.find_active("keyframe_generation") is second
+
+        assert runner.cancel(second.job_id)
+        release.set()
+        assert first.wait(timeout=5) and second.wait(timeout=5)
+
+        assert second.status == "cancelled"
+        assert ran == []
+        assert job_store.get_status(None, "keyframe_generation").status == "cancelled"
+        assert runner.find_active("keyframe_generation") is None
+
+    @pytest.mark.unit
+    def test_failure_is_recorded_even_without_persist(self, runner, job_store):
+        def work(job):
+            raise RuntimeError("ComfyUI gone")
+
+        job = runner.submit("video_generation", work, persist=False)
+
+        assert job.wait(timeout=5)
+        assert job.status == "failed"
+        assert job.error == "ComfyUI gone"
+        assert job_store.get_status(None, "video_generation").status == "failed"
+
+    @pytest.mark.unit
+    def test_cooperative_cancel_lets_work_finish(self, runner):
+        stop = threading.Event()
+        started = threading.Event()
+
+        def work(job):
+            started.set()
+            stop.wait(timeout=5)
+            yield "stopped"
+
+        job = runner.submit("keyframe_generation", work, on_cancel=stop.set)
+        assert started.wait(timeout=5)
+
+        assert runner.cancel(job.job_id)
+        assert job.wait(timeout=5)
+        assert job.status == "cancelled"
+        assert list(job.follow()) == ["stopped"]
+
+    @pytest.mark.unit
+    def test_cancel_without_wind_down_stops_at_next_event(self, runner):
+        release = threading.Event()
+        hook_calls = []
+
+        def work(job):
+            yield "first"
+            release.wait(timeout=5)
+            yield "second"
+            yield "third"
+
+        job = runner.submit("keyframe_generation", work, on_cancel=lambda: hook_calls.append(1))
+        follower = job.follow()
+        assert next(follower) == "first"
+
+        assert runner.cancel(job.job_id)
+        release.set()
+        assert job.wait(timeout=5)
+        assert hook_calls == [1]
+        assert job.status == "cancelled"
+        assert list(job.follow()) == ["first", "second"]
+
+    @pytest.mark.unit
+    def test_exclusive_submit_returns_active_job(self, runner):
+        release = threading.Event()
+
+        def work(job):
+            release.wait(timeout=5)
+            return "done"
+
+        first = runner.submit("video_generation", work, project_path="/p", exclusive=True)
+        second = runner.submit("video_generation", work, project_path="/p", exclusive=True)
+        other = runner.submit("video_generation", work, project_path="/other", exclusive=True)
+        release.set()
+
+        assert second is first
+        assert other is not first
+        assert first.wait(timeout=5) and other.wait(timeout=5)
+        assert len(runner.list_jobs(project_path="/p")) == 1
+
+    @pytest.mark.unit
+    def test_event_buffer_is_capped_and_compacted(self, runner):
+        runner.MAX_JOB_EVENTS = 10
+
+        def compact(events):
+            return [("summary", sum(value for _, value in events))]
+
+        def work(job):
+            for value in range(25):
+                yield ("event", value)
+
+        job = runner.submit("keyframe_generation", work, compact_events=compact)
+        assert job.wait(timeout=5)
+
+        events = list(job.follow())
+        assert len(events) <= 11
+        assert events[0][0] == "summary"
+        # Folded summaries plus the live tail still cover every value exactly once
+        assert sum(value for _, value in events) == sum(range(25))
+        assert events[-1] == ("event", 24)
+
+    @pytest.mark.unit
+    def test_event_buffer_drops_oldest_without_compaction(self, runner):
+        runner.MAX_JOB_EVENTS = 4
+
+        def work(job):
+            yield from range(9)
+
+        job = runner.submit("keyframe_generation", work)
+        assert job.wait(timeout=5)
+
+        assert job.event_count == 9
+        assert list(job.follow()) == [6, 7, 8]
+        assert list(job.follow(start=7)) == [7, 8]
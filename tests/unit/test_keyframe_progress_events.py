@@ -0,0 +1,118 @@
+"""Unit tests for keyframe progress events and UI coalescing"""
+from unittest.mock import Mock, patch
+
+import pytest
+
+from domain.models import Storyboard
+from infrastructure.config_manager import ConfigManager
+from infrastructure.project_store import ProjectStore
+from services.keyframe.progress_events import ImagesAdded, ProgressCoalescer, StatusUpdate, compact_events
+from services.keyframe_service import KeyframeGenerationService
+
+SKIP = object()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _status(text, final=False):
+    return StatusUpdate(text, "progress", "shot", {"status": text}, final=final)
+
+
+class TestProgressCoalescer:
+    @pytest.mark.unit
+    def test_status_deltas_skip_gallery_until_interval(self):
+        clock = FakeClock()
+        coalescer = ProgressCoalescer(gallery_interval=2.0, unchanged=SKIP, clock=clock)
+
+        assert coalescer.feed(_status("start")) == (SKIP, "start", "progress", SKIP, "shot")
+        assert coalescer.feed(ImagesAdded(("a.png",))) is None
+
+        gallery, status, _, checkpoint, _ = coalescer.feed(_status("v1"))
+        assert (gallery, status, checkpoint) == (SKIP, "v1", SKIP)
+
+        clock.now = 2.5
+        gallery, _, _, checkpoint, _ = coalescer.feed(ImagesAdded(("b.png",)))
+        assert gallery == ["a.png", "b.png"]
+        assert checkpoint == {"status": "v1"}
+
+        # Nothing new since the refresh: status only
+        clock.now = 10.0
+        assert coalescer.feed(_status("v2"))[0] is SKIP
+
+    @pytest.mark.unit
+    def test_final_event_always_flushes(self):
+        coalescer = ProgressCoalescer(gallery_interval=60.0, unchanged=SKIP, clock=FakeClock())
+        coalescer.feed(_status("start"))
+        coalescer.feed(ImagesAdded(("a.png", "b.png")))
+
+        gallery, status, _, checkpoint, _ = coalescer.feed(_status("done", final=True))
+
+        assert gallery == ["a.png", "b.png"]
+        assert status == "done"
+        assert checkpoint == {"status": "done"}
+
+
+class TestCompactEvents:
+    @pytest.mark.unit
+    def test_folds_images_and_keeps_latest_status(self):
+        events = [ImagesAdded(("a.png",)), _status("one"), ImagesAdded(("b.png", "c.png")), _status("two")]
+
+        folded = compact_events(events)
+
+        assert folded == [ImagesAdded(("a.png", "b.png", "c.png")), _status("two")]
+
+    @pytest.mark.unit
+    def test_empty_and_status_only(self):
+        assert compact_events([]) == []
+        assert compact_events([_status("one"), _status("two")]) == [_status("two")]
+
+
+class TestRunGenerationEvents:
+    @pytest.mark.unit
+    @patch("services.keyframe_service.ComfyUIAPI")
+    def test_emits_new_images_only(self, mock_api_class, tmp_path):
+        mock_api = Mock()
+        mock_api.test_connection.return_value = {"connected": True}
+        mock_api.load_workflow.return_value = {}
+        mock_api_class.return_value = mock_api
+        (tmp_path / "wf.json").write_text("{}")
+
+        config = Mock(spec=ConfigManager)
+        config.get_workflow_dir.return_value = str(tmp_path)
+        store = Mock(spec=ProjectStore)
+        store.ensure_dir.return_value = str(tmp_path / "out")
+
+        service = KeyframeGenerationService(config, store)
+        service._save_checkpoint = Mock()
+        checkpoint = {
+            "storyboard_file": "sb.json", "variants_per_shot": 2, "base_seed": 0,
+            "completed_shots": [], "total_images_generated": 0, "status": "running",
+        }
+        service._generate_shot = Mock(side_effect=lambda **kw: iter([
+            ([f"{kw['shot_id']}_v1.png"], "v1", "p", checkpoint, "c"),
+            ([f"{kw['shot_id']}_v2.png"], "v2", "p", checkpoint, "c"),
+        ]))
+        storyboard = Storyboard.from_dict({"project": "T", "shots": [
+            {"shot_id": "001", "prompt": "p", "filename_base": "a"},
+            {"shot_id": "002", "prompt": "p", "filename_base": "b"},
+        ]})
+        kwargs = dict(storyboard=storyboard, workflow_file="wf.json", checkpoint=checkpoint,
+                      project={"path": str(tmp_path)}, comfy_url="http://127.0.0.1:8188")
+
+        events = list(service.run_generation_events(**kwargs))
+
+        added = [event.images for event in events if isinstance(event, ImagesAdded)]
+        assert added == [("001_v1.png",), ("001_v2.png",), ("002_v1.png",), ("002_v2.png",)]
+        assert events[-1].final and "Complete" in events[-1].status
+        assert not any(event.final for event in events[:-1] if isinstance(event, StatusUpdate))
+
+        # Legacy API still yields the cumulative list
+        checkpoint["status"] = "running"
+        final_images = list(service.run_generation(**kwargs))[-1][0]
+        assert final_images == ["001_v1.png", "001_v2.png", "002_v1.png", "002_v2.png"]
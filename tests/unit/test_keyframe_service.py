@@ -7,7 +7,9 @@ from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 
+from services.keyframe.parameter_sweep import record_parameters
 from services.keyframe_service import KeyframeService, KeyframeGenerationService
+from services.selection_service import SelectionService
 from domain.models import Storyboard, Shot
 from infrastructure.config_manager import ConfigManager
 from infrastructure.project_store import ProjectStore
@@ -158,6 +160,17 @@ class TestKeyframeGenerationServiceStopGeneration:
         assert "info" in status.lower() or "stop" in status.lower()
         assert service.stop_requested is True
 
+    @pytest.mark.unit
+    def test_request_stop_reports_whether_run_winds_down(self):
+        """Cancel hook flags the stop and returns True only while the loop runs"""
+        service = KeyframeGenerationService(Mock(spec=ConfigManager), Mock(spec=ProjectStore))
+
+        assert service.request_stop() is False
+        assert service.stop_requested is True
+
+        service.is_running = True
+        assert service.request_stop() is True
+
 
 class TestKeyframeGenerationServiceFormatProgress:
     """Test KeyframeGenerationService._format_progress()"""
@@ -1038,3 +1051,280 @@ class TestKeyframeGenerationServiceInternals:
         assert "gestoppt" in status.lower()
         assert "Progress" in progress
         assert "Stopped" in current
+
+
+class TestKeyframeDraftMode:
+    """Draft-then-final rendering"""
+
+    @staticmethod
+    def _service(tmp_path):
+        mock_config = Mock(spec=ConfigManager)
+        mock_config.get_resolution_tuple.return_value = (1024, 576)
+        mock_config.get_workflow_dir.return_value = str(tmp_path / "workflows")
+        mock_store = Mock(spec=ProjectStore)
+
+        def ensure_dir(project, *parts):
+            path = os.path.join(project["path"], *parts)
+            os.makedirs(path, exist_ok=True)
+            return path
+
+        mock_store.ensure_dir.side_effect = ensure_dir
+        return KeyframeGenerationService(mock_config, mock_store)
+
+    @pytest.mark.unit
+    def test_draft_settings_reduce_steps_and_optionally_resolution(self):
+        from services.keyframe import draft_render_settings, get_workflow_steps
+
+        workflow = {"1": {"inputs": {"steps": 28}}, "2": {"inputs": {"steps": "x"}}, "3": {"inputs": {}}}
+        assert get_workflow_steps(workflow) == 28
+        assert get_workflow_steps({"1": {"inputs": {}}}) is None
+
+        assert draft_render_settings(1024, 576, 28, step_ratio=0.5) == {
+            "width": 1024, "height": 576, "steps": 14
+        }
+        assert draft_render_settings(1024, 576, 28, scale=0.5, step_ratio=0.5) == {
+            "width": 512, "height": 288, "steps": 14
+        }
+        # Never below the minimums, never above the final values
+        assert draft_render_settings(300, 200, 6, scale=0.5, step_ratio=0.5) == {
+            "width": 256, "height": 200, "steps": 4
+        }
+        assert draft_render_settings(1024, 576, None, scale=0.5, step_ratio=0.5)["steps"] is None
+
+    @pytest.mark.unit
+    def test_draft_checkpoint_drives_render_settings(self, tmp_path):
+        service = self._service(tmp_path)
+        storyboard = Storyboard(project="P", shots=[], raw={"storyboard_file": "sb.json"})
+        checkpoint = KeyframeService(Mock(), Mock(), Mock()).prepare_checkpoint(
+            storyboard, "flux.json", 2, 100, draft=True
+        )
+        assert checkpoint["quality"] == "draft"
+        assert service._render_settings(checkpoint) == (1024, 576, None)
+
+        service._prepare_draft(checkpoint, {"1": {"inputs": {"steps": 20}}})
+        assert service._render_settings(checkpoint) == (1024, 576, 10)  # Final resolution by default
+
+        # Settings are fixed once, a resumed run keeps them
+        service._prepare_draft(checkpoint, {"1": {"inputs": {"steps": 50}}})
+        assert checkpoint["draft"]["steps"] == 10
+
+    @pytest.mark.unit
+    def test_draft_downscale_is_opt_in(self, tmp_path):
+        service = self._service(tmp_path)
+        storyboard = Storyboard(project="P", shots=[], raw={"storyboard_file": "sb.json"})
+        checkpoint = KeyframeService(Mock(), Mock(), Mock()).prepare_checkpoint(
+            storyboard, "flux.json", 2, 100, draft=True, draft_downscale=True
+        )
+
+        service._prepare_draft(checkpoint, {"1": {"inputs": {"steps": 20}}})
+
+        assert service._render_settings(checkpoint) == (512, 288, 10)
+
+    @pytest.mark.unit
+    def test_finalize_replaces_selected_draft_with_final_render(self, tmp_path):
+        service = self._service(tmp_path)
+        workflows = tmp_path / "workflows"
+        workflows.mkdir()
+        (workflows / "flux.json").write_text("{}")
+        project = {"path": str(tmp_path / "project")}
+        keyframes = Path(service.project_store.ensure_dir(project, "keyframes"))
+        draft_file = keyframes / "hero_v2_00001_.png"
+        draft_file.write_text("draft")
+
+        storyboard = Storyboard(project="P", shots=[], raw={
+            "storyboard_file": "sb.json",
+            "shots": [{"shot_id": "001", "filename_base": "hero", "prompt": "p"}],
+        })
+        selection = {"shot_id": "001", "filename_base": "hero", "selected_variant": 2,
+                     "selected_file": draft_file.name, "source_path": str(draft_file)}
+        SelectionService(service.project_store).export_selections(project, storyboard.raw, {"001": selection})
+
+        checkpoint = {"storyboard_file": "sb.json", "workflow_file": "flux.json", "variants_per_shot": 4,
+                      "base_seed": 100, "quality": "draft",
+                      "draft": {"width": 512, "height": 288, "steps": 10, "seeds": {"hero_v2": 777}}}
+
+        def render(**kwargs):
+            final = Path(kwargs["output_dir"]) / f"{kwargs['variant_name']}_00001_.png"
+            final.write_text("final")
+            return [str(final)]
+
+        service.render_variant = Mock(side_effect=render)
+        service._save_checkpoint = Mock()
+        with patch("services.keyframe_service.ComfyUIAPI") as api_cls:
+            api_cls.return_value.test_connection.return_value = {"connected": True}
+            api_cls.return_value.load_workflow.return_value = {"1": {}}
+            events = list(service.finalize_events(storyboard, checkpoint, project, "http://comfy"))
+
+        call = service.render_variant.call_args.kwargs
+        assert (call["seed"], call["variant_name"], call["width"], call["height"]) == (777, "hero_v2", 1024, 576)
+        assert "steps" not in call  # Workflow's own step count
+        assert draft_file.read_text() == "final"
+        assert (keyframes / "drafts" / draft_file.name).read_text() == "draft"
+        assert (Path(project["path"]) / "selected" / draft_file.name).read_text() == "final"
+        assert checkpoint["finalized"]["001"]["seed"] == 777
+        assert checkpoint["finalize_status"] == "completed"
+        assert events[-1].final and "Complete" in events[-1].status
+
+        # Repeating the run skips finalized shots
+        service.render_variant.reset_mock()
+        with patch("services.keyframe_service.ComfyUIAPI") as api_cls:
+            api_cls.return_value.test_connection.return_value = {"connected": True}
+            list(service.finalize_events(storyboard, checkpoint, project, "http://comfy"))
+        service.render_variant.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("variant, seeds", [(5, {"hero_v5": 1}), (2, {})])
+    def test_finalize_skips_selection_outside_the_draft_run(self, tmp_path, variant, seeds):
+        """Index above variants_per_shot or no recorded draft seed: skip, never re-render"""
+        service = self._service(tmp_path)
+        (tmp_path / "workflows").mkdir()
+        (tmp_path / "workflows" / "flux.json").write_text("{}")
+        project = {"path": str(tmp_path / "project")}
+        keyframes = Path(service.project_store.ensure_dir(project, "keyframes"))
+        chosen = keyframes / f"hero_v{variant}_00001_.png"
+        chosen.write_text("chosen")
+        storyboard = Storyboard(project="P", shots=[], raw={
+            "storyboard_file": "sb.json",
+            "shots": [{"shot_id": "001", "filename_base": "hero", "prompt": "p"}],
+        })
+        selection = {"shot_id": "001", "filename_base": "hero", "selected_variant": variant,
+                     "selected_file": chosen.name, "source_path": str(chosen)}
+        SelectionService(service.project_store).export_selections(project, storyboard.raw, {"001": selection})
+        checkpoint = {"storyboard_file": "sb.json", "workflow_file": "flux.json", "variants_per_shot": 4,
+                      "base_seed": 100, "quality": "draft",
+                      "draft": {"width": 1024, "height": 576, "steps": 10, "seeds": seeds}}
+
+        service.render_variant = Mock()
+        service._save_checkpoint = Mock()
+        with patch("services.keyframe_service.ComfyUIAPI") as api_cls:
+            api_cls.return_value.test_connection.return_value = {"connected": True}
+            events = list(service.finalize_events(storyboard, checkpoint, project, "http://comfy"))
+
+        service.render_variant.assert_not_called()
+        assert chosen.read_text() == "chosen"
+        assert any("not rendered by this draft run" in getattr(e, "status", "") for e in events)
+        assert checkpoint["finalize_status"] == "completed_with_issues"
+        assert "001" not in checkpoint["finalized"]
+
+    @pytest.mark.unit
+    def test_finalize_keeps_sweep_selected_variant(self, tmp_path):
+        """A sweep output is already final: never re-rendered with draft seed/settings"""
+        service = self._service(tmp_path)
+        (tmp_path / "workflows").mkdir()
+        (tmp_path / "workflows" / "flux.json").write_text("{}")
+        project = {"path": str(tmp_path / "project")}
+        keyframes = Path(service.project_store.ensure_dir(project, "keyframes"))
+        chosen = keyframes / "hero_v3_00001_.png"  # Within variants_per_shot, but from a sweep
+        chosen.write_text("sweep")
+        record_parameters(str(keyframes), {chosen.name: {"seed": 4242, "cfg": 6.0, "shot_id": "001",
+                                                         "workflow": "flux.json", "sweep_id": "sweep_1"}})
+        storyboard = Storyboard(project="P", shots=[], raw={
+            "storyboard_file": "sb.json",
+            "shots": [{"shot_id": "001", "filename_base": "hero", "prompt": "p"}],
+        })
+        selection = {"shot_id": "001", "filename_base": "hero", "selected_variant": 3,
+                     "selected_file": chosen.name, "source_path": str(chosen)}
+        SelectionService(service.project_store).export_selections(project, storyboard.raw, {"001": selection})
+        checkpoint = {"storyboard_file": "sb.json", "workflow_file": "flux.json", "variants_per_shot": 4,
+                      "base_seed": 100, "quality": "draft",
+                      "draft": {"width": 1024, "height": 576, "steps": 10, "seeds": {"hero_v3": 1}}}
+
+        service.render_variant = Mock()
+        service._save_checkpoint = Mock()
+        with patch("services.keyframe_service.ComfyUIAPI") as api_cls:
+            api_cls.return_value.test_connection.return_value = {"connected": True}
+            list(service.finalize_events(storyboard, checkpoint, project, "http://comfy"))
+
+        service.render_variant.assert_not_called()
+        assert chosen.read_text() == "sweep"
+        assert not (keyframes / "drafts" / chosen.name).exists()
+        assert checkpoint["finalized"]["001"]["seed"] == 4242
+        assert checkpoint["finalize_status"] == "completed"
+
+
+class TestKeyframeParameterSweep:
+    """Parameter sweeps through the ComfyUI queue"""
+
+    @pytest.mark.unit
+    def test_sweep_keeps_queue_filled_records_params_and_skips_rendered(self, tmp_path):
+        service = TestKeyframeDraftMode._service(tmp_path)
+        (tmp_path / "workflows").mkdir()
+        (tmp_path / "workflows" / "flux.json").write_text("{}")
+        project = {"path": str(tmp_path / "project")}
+        keyframes = Path(service.project_store.ensure_dir(project, "keyframes"))
+        (keyframes / "hero_v1_00001_.png").write_bytes(b"png")  # Regular variant already there
+        storyboard = Storyboard(project="P", shots=[], raw={"shots": [
+            {"shot_id": "001", "filename_base": "hero", "prompt": "p"},
+            {"shot_id": "002", "filename_base": "other", "prompt": "q"},
+        ]})
+        calls = []
+
+        def queue_prompt(workflow):
+            calls.append(("queue", workflow["filename_prefix"]))
+            return workflow["filename_prefix"]
+
+        def await_prompt(prompt_id):
+            calls.append(("collect", prompt_id))
+            return {"status": "success", "output_images": []}
+
+        def copy(variant_name, output_dir, api_result):
+            image = Path(output_dir) / f"{variant_name}_00001_.png"
+            image.write_bytes(b"png")
+            return [str(image)]
+
+        service._copy_generated_images = Mock(side_effect=copy)
+        service._await_prompt = Mock(side_effect=await_prompt)
+        spec = {"cfg": [3.5, 5.0, "5"], "sampler": ["euler"]}
+
+        def run(spec):
+            with patch("services.keyframe_service.ComfyUIAPI") as api_cls:
+                api = api_cls.return_value
+                api.test_connection.return_value = {"connected": True}
+                api.load_workflow.return_value = {}
+                api.update_workflow_params.side_effect = lambda workflow, **params: params
+                api.queue_prompt.side_effect = queue_prompt
+                return list(service.sweep_events(storyboard, project, "http://comfy", "flux.json", ["001"],
+                                                 spec, base_seed=2000, queue_depth=2)), api
+
+        events, api = run(spec)
+
+        assert calls == [("queue", "hero_v2"), ("queue", "hero_v3"), ("collect", "hero_v2"), ("collect", "hero_v3")]
+        params = [call.kwargs for call in api.update_workflow_params.call_args_list]
+        assert [(p["seed"], p["cfg"], p["sampler"], p["prompt"]) for p in params] == [
+            (2000, 3.5, "euler", "p"), (2000, 5.0, "euler", "p")
+        ]
+        manifest = json.loads((keyframes / "parameters.json").read_text())["files"]
+        assert manifest["hero_v3_00001_.png"]["cfg"] == 5.0
+        assert manifest["hero_v3_00001_.png"]["shot_id"] == "001"
+        assert events[-1].final and events[-1].checkpoint["status"] == "completed"
+
+        # Rendered configurations are skipped; new ones continue the variant numbering
+        calls.clear()
+        events, _ = run({"cfg": [3.5, 7.0], "sampler": ["euler"]})
+        assert calls == [("queue", "hero_v4"), ("collect", "hero_v4")]
+        assert events[-1].checkpoint["duplicates"] == 1
+
+        # The same grid with another model override is not a duplicate
+        calls.clear()
+        with patch("services.keyframe_service.inject_model_override", side_effect=lambda wf, model: wf):
+            with patch("services.keyframe_service.ComfyUIAPI") as api_cls:
+                api = api_cls.return_value
+                api.test_connection.return_value = {"connected": True}
+                api.load_workflow.return_value = {}
+                api.update_workflow_params.side_effect = lambda workflow, **params: params
+                api.queue_prompt.side_effect = queue_prompt
+                events = list(service.sweep_events(storyboard, project, "http://comfy", "flux.json", ["001"],
+                                                   spec, base_seed=2000, model_override="other.safetensors"))
+        assert calls[0] == ("queue", "hero_v5")
+        assert events[-1].checkpoint["duplicates"] == 0
+
+    @pytest.mark.unit
+    def test_invalid_spec_ends_with_error(self, tmp_path):
+        service = TestKeyframeDraftMode._service(tmp_path)
+        storyboard = Storyboard(project="P", shots=[], raw={"shots": [{"shot_id": "001"}]})
+
+        events = list(service.sweep_events(storyboard, {"path": str(tmp_path)}, "http://comfy", "flux.json",
+                                           ["001"], {"cfg": {"min": 5, "max": 1}}))
+
+        assert len(events) == 1 and events[0].final
+        assert "Invalid range" in events[0].status
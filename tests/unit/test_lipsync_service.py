@@ -3,6 +3,7 @@ import os
 import json
 import pytest
 import subprocess
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch, call
 from dataclasses import asdict
@@ -238,9 +239,11 @@ class TestGetAudioInfo:
         """Successfully get audio info."""
         mock_result = Mock()
         mock_result.returncode = 0
-        # ffprobe returns: sample_rate,channels on first line, duration on last
-        # The code parses all lines and the last parseable float becomes duration
-        mock_result.stdout = "44100,2\n10.5"
+        mock_result.stdout = json.dumps({
+            "format": {"duration": "10.5", "format_name": "wav"},
+            "streams": [{"codec_type": "audio", "codec_name": "pcm_s16le",
+                         "sample_rate": "44100", "channels": 2}],
+        })
 
         with patch("subprocess.run", return_value=mock_result):
             result = service.get_audio_info(sample_audio)
@@ -719,69 +722,235 @@ class TestGenerateBatchLipsync:
         assert result.success is False
         assert "no segments" in result.errors[0].lower()
 
-    def test_batch_single_segment(self, service, mock_config, mock_api, sample_image, sample_audio, tmp_path):
-        """Process single segment."""
-        # Create workflow file
-        workflow_dir = tmp_path / "workflows"
-        workflow_file = workflow_dir / "workflow.json"
-        workflow_file.write_text(json.dumps({}))
-
-        # Create output video
+    @pytest.fixture
+    def comfy_batch(self, service, mock_config, mock_api, tmp_path):
+        """Workflow file plus a ComfyUI that writes each output when queued."""
+        (tmp_path / "workflows" / "workflow.json").write_text(json.dumps({}))
         output_dir = Path(mock_config.get_comfy_root()) / "output" / "lipsync"
-        output_video = output_dir / "output_00001.mp4"
-        output_video.write_bytes(b"video data")
+        queued = []
+
+        def queue_prompt(workflow):
+            prefix = workflow["113"]["inputs"]["filename_prefix"].split("/", 1)[1]
+            (output_dir / f"{prefix}_00001_.mp4").write_bytes(b"video data")
+            queued.append(workflow)
+            return f"prompt-{len(queued)}"
+
+        mock_api.queue_prompt.side_effect = queue_prompt
+        mock_api.get_history.return_value = {"status": {"status_str": "success"}, "outputs": {}}
+        service.POLL_INTERVAL = 0
+        with patch.object(service, "_get_api", return_value=mock_api):
+            yield queued
 
+    def test_batch_single_segment(self, service, comfy_batch, sample_image, sample_audio):
+        """Process single segment."""
         segments = [
             BatchSegment(
                 audio_path=sample_audio,
                 start_time=0.0,
-                end_time=5.0,
+                end_time=0.0,
                 segment_index=0
             )
         ]
 
-        with patch.object(service, "_get_api", return_value=mock_api):
-            with patch.object(service, "generate_lipsync", return_value=(True, str(output_video))):
-                result = service.generate_batch_lipsync(
-                    base_image_path=sample_image,
-                    segments=segments,
-                    prompt="test",
-                    negative_prompt="",
-                    width=1280,
-                    height=720,
-                    workflow_file="workflow.json"
-                )
+        result = service.generate_batch_lipsync(
+            base_image_path=sample_image,
+            segments=segments,
+            prompt="test",
+            negative_prompt="",
+            width=1280,
+            height=720,
+            workflow_file="workflow.json"
+        )
 
         assert result.total_segments == 1
         assert result.completed_segments == 1
+        assert os.path.basename(result.videos[0]).startswith("lipsync_batch_seg001_")
 
-    def test_batch_with_callback(self, service, mock_config, mock_api, sample_image, sample_audio, tmp_path):
+    def test_batch_with_callback(self, service, comfy_batch, sample_image, sample_audio):
         """Batch calls progress callback."""
-        output_dir = Path(mock_config.get_comfy_root()) / "output" / "lipsync"
-        output_video = output_dir / "output_00001.mp4"
-        output_video.write_bytes(b"video data")
-
         segments = [
-            BatchSegment(audio_path=sample_audio, start_time=0, end_time=5, segment_index=0)
+            BatchSegment(audio_path=sample_audio, start_time=0, end_time=0, segment_index=0)
         ]
 
         callback = MagicMock()
 
-        with patch.object(service, "_get_api", return_value=mock_api):
-            with patch.object(service, "generate_lipsync", return_value=(True, str(output_video))):
-                service.generate_batch_lipsync(
-                    base_image_path=sample_image,
-                    segments=segments,
-                    prompt="test",
-                    negative_prompt="",
-                    width=1280,
-                    height=720,
-                    workflow_file="workflow.json",
-                    progress_callback=callback
-                )
+        service.generate_batch_lipsync(
+            base_image_path=sample_image,
+            segments=segments,
+            prompt="test",
+            negative_prompt="",
+            width=1280,
+            height=720,
+            workflow_file="workflow.json",
+            progress_callback=callback
+        )
 
         assert callback.call_count >= 2
 
+    def test_find_segment_output_prefers_history(self, service, mock_config):
+        """The file named in the prompt's history wins over newer files with the same prefix."""
+        output_dir = Path(mock_config.get_comfy_root()) / "output" / "lipsync"
+        (output_dir / "seg_00001_.mp4").write_bytes(b"mine")
+        (output_dir / "seg_00002_.mp4").write_bytes(b"other")
+        history = {"outputs": {"113": {"gifs": [
+            {"filename": "seg_00001_.mp4", "subfolder": "lipsync", "type": "output"}
+        ]}}}
+
+        success, path = service._find_segment_output("seg", history, time.time())
+
+        assert success is True
+        assert path == str(output_dir / "seg_00001_.mp4")
+
+    def test_find_segment_output_ignores_stale_files(self, service, mock_config):
+        """Without history outputs, files older than the submit time are not a result."""
+        output_dir = Path(mock_config.get_comfy_root()) / "output" / "lipsync"
+        stale = output_dir / "seg_00001_.mp4"
+        stale.write_bytes(b"earlier run")
+        os.utime(stale, (time.time() - 3600, time.time() - 3600))
+
+        success, message = service._find_segment_output("seg", {"outputs": {}}, time.time())
+
+        assert success is False
+        assert "not found" in message
+
+    def test_batch_workflow_not_found(self, service, mock_api, sample_image, sample_audio):
+        """Missing workflow fails before anything is copied."""
+        segments = [BatchSegment(audio_path=sample_audio, start_time=0, end_time=0, segment_index=0)]
+
+        with patch.object(service, "_get_api", return_value=mock_api):
+            result = service.generate_batch_lipsync(
+                sample_image, segments, "test", "", 1280, 720, "missing.json"
+            )
+
+        assert result.success is False
+        assert "not found" in result.errors[0].lower()
+        mock_api.queue_prompt.assert_not_called()
+
+    def test_batch_without_chaining_queues_all_before_waiting(
+        self, service, comfy_batch, mock_api, sample_image, sample_audio
+    ):
+        """Non-chained mode submits every segment up front."""
+        segments = [
+            BatchSegment(audio_path=sample_audio, start_time=0, end_time=0, segment_index=i)
+            for i in range(3)
+        ]
+        queued_when_polled = []
+        mock_api.get_history.side_effect = lambda prompt_id: (
+            queued_when_polled.append(len(comfy_batch)) or {"status": {"status_str": "success"}}
+        )
+
+        result = service.generate_batch_lipsync(
+            sample_image, segments, "test", "", 1280, 720, "workflow.json",
+            use_last_frame_chaining=False
+        )
+
+        assert result.success is True
+        assert queued_when_polled[0] == 3
+        assert [os.path.basename(v)[:24] for v in result.videos] == [
+            "lipsync_batch_seg001_000", "lipsync_batch_seg002_000", "lipsync_batch_seg003_000"
+        ]
+        mock_api.monitor_progress.assert_not_called()
+        # Each segment gets its own audio file in ComfyUI input
+        assert len({w["58"]["inputs"]["audio"] for w in comfy_batch}) == 3
+
+    def test_batch_chaining_uses_previous_last_frame(
+        self, service, comfy_batch, mock_config, sample_image, sample_audio
+    ):
+        """Chained mode starts segment N+1 from the last frame of segment N."""
+        segments = [
+            BatchSegment(audio_path=sample_audio, start_time=0, end_time=0, segment_index=i)
+            for i in range(2)
+        ]
+
+        def extract(video_path, output_path):
+            Path(output_path).write_bytes(b"png")
+            return output_path
+
+        with patch.object(service._frame_extractor, "extract", side_effect=extract):
+            result = service.generate_batch_lipsync(
+                sample_image, segments, "test", "", 1280, 720, "workflow.json"
+            )
+
+        assert result.completed_segments == 2
+        assert comfy_batch[0]["52"]["inputs"]["image"] == "lipsync_image_image.png"
+        assert comfy_batch[1]["52"]["inputs"]["image"] == "lipsync_image_lipsync_batch_seg001_lastframe.png"
+        input_dir = Path(mock_config.get_comfy_root()) / "input"
+        assert (input_dir / "lipsync_image_lipsync_batch_seg001_lastframe.png").exists()
+
+    def test_batch_parallel_timeout_cancels_pending_prompts(
+        self, service, comfy_batch, mock_api, sample_image, sample_audio
+    ):
+        """Segments still pending at the timeout are removed from ComfyUI."""
+        segments = [
+            BatchSegment(audio_path=sample_audio, start_time=0, end_time=0, segment_index=i)
+            for i in range(2)
+        ]
+        mock_api.get_history.return_value = None
+        service.SEGMENT_TIMEOUT = 0
+
+        result = service.generate_batch_lipsync(
+            sample_image, segments, "test", "", 1280, 720, "workflow.json",
+            use_last_frame_chaining=False
+        )
+
+        assert result.completed_segments == 0
+        cancelled = sorted(c.args[0] for c in mock_api.cancel_prompt.call_args_list)
+        assert cancelled == ["prompt-1", "prompt-2"]
+
+    def test_batch_chained_timeout_cancels_prompt(
+        self, service, comfy_batch, mock_api, sample_image, sample_audio
+    ):
+        """A timed-out chained segment fails and its prompt is cancelled."""
+        segments = [
+            BatchSegment(audio_path=sample_audio, start_time=0, end_time=0, segment_index=0)
+        ]
+        mock_api.monitor_progress.return_value = {
+            "status": "error", "error": "Timeout waiting for completion"
+        }
+
+        result = service.generate_batch_lipsync(
+            sample_image, segments, "test", "", 1280, 720, "workflow.json"
+        )
+
+        assert result.completed_segments == 0
+        assert "Timeout" in result.errors[0]
+        mock_api.cancel_prompt.assert_called_once_with("prompt-1")
+
+    def test_batch_trims_time_ranges_in_prep(self, service, comfy_batch, sample_image, sample_audio):
+        """Segments with a time range are trimmed before submission."""
+        segments = [
+            BatchSegment(audio_path=sample_audio, start_time=2.0, end_time=4.5, segment_index=0)
+        ]
+
+        def trim(input_path, output_path, start_time=0.0, end_time=None, max_duration=None):
+            Path(output_path).write_bytes(b"RIFF")
+            return True, "ok"
+
+        with patch.object(service, "trim_audio", side_effect=trim) as mock_trim:
+            result = service.generate_batch_lipsync(
+                sample_image, segments, "test", "", 1280, 720, "workflow.json"
+            )
+
+        assert result.success is True
+        assert mock_trim.call_args[0][2:] == (2.0, 4.5)
+        assert comfy_batch[0]["58"]["inputs"]["audio"] == "lipsync_audio_lipsync_batch_seg001_lipsync_batch_seg001.wav"
+
+    def test_batch_prep_failure_is_reported_per_segment(self, service, comfy_batch, sample_image, sample_audio):
+        """A segment whose audio cannot be prepared fails alone."""
+        segments = [
+            BatchSegment(audio_path=sample_audio, start_time=0, end_time=0, segment_index=0),
+            BatchSegment(audio_path="/nonexistent/audio.wav", start_time=0, end_time=0, segment_index=1),
+        ]
+
+        result = service.generate_batch_lipsync(
+            sample_image, segments, "test", "", 1280, 720, "workflow.json",
+            use_last_frame_chaining=False
+        )
+
+        assert result.completed_segments == 1
+        assert result.errors[0].startswith("Segment 2:")
+        assert len(comfy_batch) == 1
+
 
 class TestGenerateCharacterImage:
     """Tests for generate_character_image method."""
@@ -0,0 +1,127 @@
+"""Unit tests for the shared MediaProbe cache"""
+import json
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from infrastructure.media_probe import MediaInfo, MediaProbe, find_ffprobe
+
+
+FFPROBE_VIDEO = {
+    "format": {"duration": "5.0", "format_name": "mov,mp4"},
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264", "width": 832, "height": 480,
+         "avg_frame_rate": "16/1", "nb_frames": "81", "pix_fmt": "yuv420p"},
+        {"codec_type": "audio", "codec_name": "aac", "sample_rate": "44100", "channels": 2},
+    ],
+}
+
+
+def _ok(payload):
+    result = Mock()
+    result.returncode = 0
+    result.stdout = json.dumps(payload)
+    return result
+
+
+@pytest.fixture
+def media_file(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"\x00" * 64)
+    return str(path)
+
+
+@pytest.fixture
+def probe(tmp_path):
+    return MediaProbe(ffprobe_path="/usr/bin/ffprobe", cache_path=tmp_path / "cache" / "probe.json")
+
+
+class TestMediaInfo:
+    @pytest.mark.unit
+    def test_parses_video_and_audio_streams(self):
+        info = MediaInfo.from_ffprobe("clip.mp4", FFPROBE_VIDEO)
+
+        assert info.duration == 5.0
+        assert info.video_codec == "h264"
+        assert (info.width, info.height) == (832, 480)
+        assert info.fps == 16.0
+        assert info.frame_count == 81
+        assert info.pix_fmt == "yuv420p"
+        assert info.audio_codec == "aac"
+        assert info.sample_rate == 44100
+        assert info.has_video and info.has_audio
+
+    @pytest.mark.unit
+    def test_frame_count_derived_from_fps(self):
+        payload = {"format": {"duration": "2.0"},
+                   "streams": [{"codec_type": "video", "codec_name": "vp9", "r_frame_rate": "24/1"}]}
+
+        info = MediaInfo.from_ffprobe("clip.webm", payload)
+
+        assert info.frame_count == 48
+        assert not info.has_audio
+
+
+class TestMediaProbe:
+    @pytest.mark.unit
+    def test_find_ffprobe_derives_from_ffmpeg(self):
+        assert find_ffprobe("/opt/bin/ffmpeg") == "/opt/bin/ffprobe"
+
+    @pytest.mark.unit
+    def test_probe_runs_ffprobe_once_per_file(self, probe, media_file):
+        with patch("subprocess.run", return_value=_ok(FFPROBE_VIDEO)) as mock_run:
+            first = probe.probe(media_file)
+            second = probe.probe(media_file)
+
+        assert first == second
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args[0][0]
+        assert "-show_format" in cmd and "-show_streams" in cmd
+
+    @pytest.mark.unit
+    def test_cache_persists_to_disk(self, probe, media_file, tmp_path):
+        with patch("subprocess.run", return_value=_ok(FFPROBE_VIDEO)):
+            probe.probe(media_file)
+
+        fresh = MediaProbe(ffprobe_path="/usr/bin/ffprobe", cache_path=probe.cache_path)
+        with patch("subprocess.run") as mock_run:
+            info = fresh.probe(media_file)
+
+        mock_run.assert_not_called()
+        assert info.fps == 16.0
+
+    @pytest.mark.unit
+    def test_changed_file_is_reprobed(self, probe, media_file):
+        with patch("subprocess.run", return_value=_ok(FFPROBE_VIDEO)) as mock_run:
+            probe.probe(media_file)
+            with open(media_file, "ab") as handle:
+                handle.write(b"more")
+            probe.probe(media_file)
+
+        assert mock_run.call_count == 2
+
+    @pytest.mark.unit
+    def test_failure_is_not_cached(self, probe, media_file):
+        failed = Mock(returncode=1, stderr="boom")
+        with patch("subprocess.run", return_value=failed):
+            assert probe.probe(media_file) is None
+        with patch("subprocess.run", return_value=_ok(FFPROBE_VIDEO)):
+            assert probe.get_duration(media_file) == 5.0
+
+    @pytest.mark.unit
+    def test_invalidate_drops_entry(self, probe, media_file):
+        with patch("subprocess.run", return_value=_ok(FFPROBE_VIDEO)) as mock_run:
+            probe.probe(media_file)
+            probe.invalidate(media_file)
+            probe.probe(media_file)
+
+        assert mock_run.call_count == 2
+
+    @pytest.mark.unit
+    def test_corrupt_cache_file_is_ignored(self, probe, media_file):
+        os.makedirs(probe.cache_path.parent, exist_ok=True)
+        probe.cache_path.write_text("{not json", encoding="utf-8")
+
+        with patch("subprocess.run", return_value=_ok(FFPROBE_VIDEO)):
+            assert probe.get_duration(media_file) == 5.0
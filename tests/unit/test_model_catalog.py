@@ -0,0 +1,99 @@
+"""Unit tests for the columnar ModelCatalog"""
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.model_manager.model_catalog import ModelCatalog
+from services.model_manager.model_classifier import ModelStatus
+from services.model_manager.workflow_index import WorkflowIndex
+
+
+@pytest.fixture
+def models(tmp_path):
+    recent = tmp_path / "recent.ckpt"
+    old = tmp_path / "old.ckpt"
+    recent.write_text("x")
+    old.write_text("y")
+    old_time = time.time() - 86400 * 5
+    os.utime(old, (old_time, old_time))
+
+    return [
+        {"filename": "recent.ckpt", "type": "checkpoints", "size_bytes": 10, "path": str(recent),
+         "workflow_count": 2, "status": ModelStatus.USED},
+        {"filename": "old.ckpt", "type": "checkpoints", "size_bytes": 1, "path": str(old),
+         "workflow_count": 0, "status": ModelStatus.UNUSED},
+        {"filename": "Style_LoRA.safetensors", "type": "loras", "size_bytes": 5, "path": None,
+         "workflow_count": 1, "status": ModelStatus.MISSING},
+    ]
+
+
+def _names(catalog, rows):
+    return [m["filename"] for m in catalog.rows(rows)]
+
+
+class TestModelCatalog:
+    @pytest.mark.unit
+    def test_combined_predicates(self, models):
+        catalog = ModelCatalog(models)
+        cutoff = datetime.now() - timedelta(days=1)
+
+        rows = catalog.query(
+            statuses=[ModelStatus.UNUSED], min_bytes=0, max_bytes=5,
+            max_workflows=0, modified_before=cutoff,
+        )
+
+        assert _names(catalog, rows) == ["old.ckpt"]
+
+    @pytest.mark.unit
+    def test_search_type_and_regex(self, models):
+        catalog = ModelCatalog(models)
+
+        assert _names(catalog, catalog.query(search="style")) == ["Style_LoRA.safetensors"]
+        assert _names(catalog, catalog.query(types=["checkpoints"], filename_regex=r"^o")) == ["old.ckpt"]
+        assert len(catalog.query(types=["unknown"])) == 0
+
+    @pytest.mark.unit
+    def test_missing_models_never_match_date_range(self, models):
+        catalog = ModelCatalog(models)
+
+        rows = catalog.query(modified_after=datetime(2000, 1, 1))
+
+        assert "Style_LoRA.safetensors" not in _names(catalog, rows)
+
+    @pytest.mark.unit
+    def test_sorting_reuses_precomputed_order(self, models):
+        catalog = ModelCatalog(models)
+
+        assert _names(catalog, catalog.query(sort_by="size")) == [
+            "old.ckpt", "Style_LoRA.safetensors", "recent.ckpt"
+        ]
+        order = catalog.sort_order("size")
+        assert _names(catalog, catalog.query(sort_by="size", descending=True))[0] == "recent.ckpt"
+        assert catalog.sort_order("size") is order
+        with pytest.raises(ValueError):
+            catalog.sort_order("bogus")
+
+    @pytest.mark.unit
+    def test_pagination_clamps_page(self, models):
+        catalog = ModelCatalog(models)
+        rows = catalog.query(sort_by="filename")
+
+        page_rows, page, page_count = catalog.page(rows, 2, 2)
+        assert (_names(catalog, page_rows), page, page_count) == (["Style_LoRA.safetensors"], 2, 2)
+
+        page_rows, page, _ = catalog.page(rows, 99, 2)
+        assert page == 2
+        assert len(catalog.page(rows, 1, None)[0]) == 3
+
+    @pytest.mark.unit
+    def test_workflow_index_and_archive_flags(self, models):
+        index = WorkflowIndex({
+            "a.json": [{"filename": "old.ckpt", "type": "checkpoints"}],
+            "b.json": [{"filename": "old.ckpt", "type": "checkpoints"}],
+        })
+        catalog = ModelCatalog(models, index, archived={"": ["Style_LoRA.safetensors"]})
+
+        assert _names(catalog, catalog.query(min_workflows=2)) == ["old.ckpt"]
+        assert catalog.in_archive.tolist() == [False, False, True]
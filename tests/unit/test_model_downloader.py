@@ -1,6 +1,12 @@
 """Tests for ModelDownloader - Security, API clients, and download flow."""
+import hashlib
+import json
 import os
+import re
+import threading
+import time
 import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from concurrent.futures import ThreadPoolExecutor
@@ -13,6 +19,7 @@ from services.model_manager.model_downloader import (
     DownloadTask,
     DownloadSource,
     DownloadStatus,
+    _SearchCache,
 )
 
 
@@ -309,6 +316,41 @@ class TestCivitaiClient:
 
         assert results == []
 
+    @patch('requests.Session.get')
+    def test_search_results_cached_across_sessions(self, mock_get, tmp_path):
+        """Successful searches are answered from the on-disk cache afterwards."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"items": [{
+            "id": 1, "name": "Flux", "stats": {},
+            "modelVersions": [{"id": 2, "downloadCount": 5, "images": [], "files": [{
+                "name": "flux1-dev.safetensors", "downloadUrl": "https://civitai.com/api/download/2",
+                "sizeKB": 1, "hashes": {"SHA256": "ABC"},
+            }]}],
+        }]}
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+        cache_path = tmp_path / "search.json"
+
+        first = CivitaiClient(cache=_SearchCache(cache_path, ttl=60)).search_by_filename("flux1-dev.safetensors")
+        second = CivitaiClient(cache=_SearchCache(cache_path, ttl=60)).search_by_filename("flux1-dev.safetensors")
+
+        assert mock_get.call_count == 1
+        assert second == first
+        assert second[0].sha256 == "ABC"
+        assert second[0].source == DownloadSource.CIVITAI
+
+    @patch('requests.Session.get')
+    def test_failed_search_not_cached(self, mock_get, tmp_path):
+        """Errors are retried next time instead of caching an empty result."""
+        import requests
+        mock_get.side_effect = requests.RequestException("Network error")
+        client = CivitaiClient(cache=_SearchCache(tmp_path / "search.json", ttl=60))
+
+        client.search_by_filename("model.safetensors")
+        client.search_by_filename("model.safetensors")
+
+        assert mock_get.call_count == 2
+
 
 # =============================================================================
 # HuggingfaceClient Tests
@@ -447,6 +489,34 @@ class TestModelDownloaderSearch:
         assert len(results) == 1
         assert results[0].source == DownloadSource.CIVITAI
 
+    def test_search_all_missing_coalesces_filenames(self, downloader):
+        """Same filename under several types is searched once, concurrently."""
+        result = SearchResult(
+            filename="shared.safetensors", source=DownloadSource.CIVITAI,
+            download_url="https://civitai.com/download/1", model_name="Shared", model_id="1",
+        )
+        calls = []
+
+        def slow_search(filename):
+            calls.append(filename)
+            time.sleep(0.2)
+            return [result]
+
+        missing = [
+            {"filename": "shared.safetensors", "type": "loras"},
+            {"filename": "shared.safetensors", "type": "checkpoints"},
+            {"filename": "other.safetensors", "type": "vae"},
+        ]
+        with patch.object(downloader, '_search_sources', side_effect=slow_search):
+            started = time.monotonic()
+            queue = downloader.search_all_missing(missing)
+            elapsed = time.monotonic() - started
+
+        assert sorted(calls) == ["other.safetensors", "shared.safetensors"]
+        assert elapsed < 0.4  # Searches overlapped
+        assert queue["checkpoints/shared.safetensors"].status == DownloadStatus.FOUND
+        assert queue["loras/shared.safetensors"].selected_result == result
+
     def test_get_best_result(self, downloader):
         """Test selecting best result."""
         results = [
@@ -550,6 +620,163 @@ class TestModelDownloaderDownload:
             )
 
 
+class _RangeServer:
+    """Local HTTP server serving one payload, optionally with Range support."""
+
+    def __init__(self, payload: bytes, ranges: bool = True, redirect: str = ""):
+        self.payload = payload
+        self.ranges = ranges
+        self.redirect = redirect
+        self.bytes_served = 0
+        self.range_requests = []
+        self.auth_headers = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.auth_headers.append(self.headers.get("Authorization"))
+                if server.redirect:
+                    self.send_response(302)
+                    self.send_header("Location", server.redirect)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = server.payload
+                match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                if match and server.ranges:
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else len(body) - 1
+                    server.range_requests.append((start, end))
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+                    body = body[start:end + 1]
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server.bytes_served += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/model.safetensors"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestRangedDownload:
+    """Segmented downloads against a local HTTP server."""
+
+    PAYLOAD = os.urandom(1000) * 300  # 300KB
+
+    @pytest.fixture
+    def downloader(self, tmp_path):
+        downloader = ModelDownloader(models_root=str(tmp_path / "models"))
+        downloader.MIN_SEGMENT_SIZE = 64 * 1024
+        downloader.CHUNK_SIZE = 16 * 1024
+        with patch.object(downloader, '_search_task'):
+            downloader.add_to_queue("model.safetensors", "loras", auto_search=False)
+        return downloader
+
+    @pytest.fixture
+    def server(self):
+        server = _RangeServer(self.PAYLOAD)
+        yield server
+        server.close()
+
+    def test_parallel_segments_verified_and_renamed(self, downloader, server, tmp_path):
+        dest = tmp_path / "model.safetensors"
+
+        downloader._download_file(
+            server.url, dest, "loras/model.safetensors",
+            expected_sha256=hashlib.sha256(self.PAYLOAD).hexdigest(),
+        )
+
+        assert dest.read_bytes() == self.PAYLOAD
+        assert len(server.range_requests) == 1 + downloader.SEGMENTS_PER_FILE  # probe + segments
+        assert not (tmp_path / "model.safetensors.part").exists()
+        assert not (tmp_path / "model.safetensors.part.json").exists()
+
+    def test_resumes_from_part_file(self, downloader, server, tmp_path):
+        dest = tmp_path / "model.safetensors"
+        half = len(self.PAYLOAD) // 2
+        part = tmp_path / "model.safetensors.part"
+        part.write_bytes(self.PAYLOAD[:half] + b"\0" * (len(self.PAYLOAD) - half))
+        (tmp_path / "model.safetensors.part.json").write_text(json.dumps({
+            "url": server.url,
+            "size": len(self.PAYLOAD),
+            "segments": [[0, len(self.PAYLOAD) - 1, half]],
+        }))
+
+        downloader._download_file(
+            server.url, dest, "loras/model.safetensors",
+            expected_sha256=hashlib.sha256(self.PAYLOAD).hexdigest(),
+        )
+
+        assert dest.read_bytes() == self.PAYLOAD
+        assert server.range_requests[-1] == (half, len(self.PAYLOAD) - 1)
+        assert server.bytes_served == 1 + len(self.PAYLOAD) - half
+
+    def test_checksum_mismatch_discards_download(self, downloader, server, tmp_path):
+        dest = tmp_path / "model.safetensors"
+
+        with pytest.raises(Exception, match="Checksum mismatch"):
+            downloader._download_file(server.url, dest, "loras/model.safetensors", expected_sha256="0" * 64)
+
+        assert not dest.exists()
+        assert not (tmp_path / "model.safetensors.part").exists()
+
+    def test_cancel_keeps_part_for_resume(self, downloader, server, tmp_path):
+        dest = tmp_path / "model.safetensors"
+        downloader._stop_event.set()
+
+        with pytest.raises(Exception, match="cancelled"):
+            downloader._download_file(server.url, dest, "loras/model.safetensors")
+
+        assert not dest.exists()
+        assert (tmp_path / "model.safetensors.part").exists()
+        assert (tmp_path / "model.safetensors.part.json").exists()
+
+    def test_token_not_forwarded_to_redirect_host(self, downloader, server, tmp_path):
+        origin = _RangeServer(b"", redirect=server.url.replace("127.0.0.1", "localhost"))
+        dest = tmp_path / "model.safetensors"
+        try:
+            downloader._download_file(origin.url, dest, "loras/model.safetensors", api_key="secret")
+        finally:
+            origin.close()
+
+        assert dest.read_bytes() == self.PAYLOAD
+        assert origin.auth_headers == ["Bearer secret"]
+        assert len(server.auth_headers) == 1 + downloader.SEGMENTS_PER_FILE
+        assert set(server.auth_headers) == {None}
+
+    def test_token_kept_for_same_host_segments(self, downloader, server, tmp_path):
+        dest = tmp_path / "model.safetensors"
+
+        downloader._download_file(server.url, dest, "loras/model.safetensors", api_key="secret")
+
+        assert set(server.auth_headers) == {"Bearer secret"}
+
+    def test_server_without_ranges_streams(self, downloader, tmp_path):
+        server = _RangeServer(self.PAYLOAD, ranges=False)
+        dest = tmp_path / "model.safetensors"
+        try:
+            downloader._download_file(
+                server.url, dest, "loras/model.safetensors",
+                expected_sha256=hashlib.sha256(self.PAYLOAD).hexdigest(),
+            )
+        finally:
+            server.close()
+
+        assert dest.read_bytes() == self.PAYLOAD
+        assert server.range_requests == []
+
+
 class TestSearchTaskFlow:
     """Test the search task flow."""
 
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 
 from services.model_manager.model_filter import ModelFilter
 from services.model_manager.model_classifier import ModelStatus
+from services.model_manager.workflow_index import WorkflowIndex
 
 
 def test_model_filter_chain(tmp_path):
@@ -32,3 +33,15 @@ def test_model_filter_chain(tmp_path):
     )
     assert len(filtered) == 1
     assert filtered[0]["filename"] == "old.ckpt"
+
+
+def test_workflow_count_from_index():
+    index = WorkflowIndex({
+        "a.json": [{"filename": "shared.safetensors", "type": "loras"}],
+        "b.json": [{"filename": "shared.safetensors", "type": "loras"}],
+    })
+    models = [{"filename": "shared.safetensors"}, {"filename": "lonely.safetensors"}]
+
+    filtered = ModelFilter(models, workflow_index=index).by_workflow_count(min_count=2).apply()
+
+    assert [m["filename"] for m in filtered] == ["shared.safetensors"]
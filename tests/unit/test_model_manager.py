@@ -578,3 +578,212 @@ class TestArchiveManager:
 
         assert len(result["success"]) == 1
         assert (models_dir / "checkpoints" / "missing_model.safetensors").exists()
+
+    # ========================================================================
+    # Cross-Device Moves, Journal and Index Tests
+    # ========================================================================
+
+    def test_cross_device_move_verifies_and_reports_progress(self, manager, models_dir, archive_dir):
+        """Cross-device moves copy via .part, report bytes and remove the source."""
+        progress = []
+        models = [
+            {"path": str(models_dir / "checkpoints" / "model_a.safetensors"), "type": "checkpoints"},
+            {"path": str(models_dir / "loras" / "lora_1.safetensors"), "type": "loras"},
+        ]
+
+        with patch.object(ArchiveManager, "_same_device", return_value=False):
+            result = manager.batch_move_to_archive(models, progress_callback=lambda *args: progress.append(args))
+
+        assert result["success"] == ["model_a.safetensors", "lora_1.safetensors"]
+        assert (archive_dir / "checkpoints" / "model_a.safetensors").read_bytes() == b"x" * 1000
+        assert not (models_dir / "checkpoints" / "model_a.safetensors").exists()
+        assert not list(archive_dir.rglob("*.part"))
+        assert max(done for done, _, _ in progress) == 1500
+        assert all(total == 1500 for _, total, _ in progress)
+        assert not manager.journal_file.exists()
+
+    def test_failed_copy_keeps_source(self, manager, models_dir, archive_dir):
+        """A checksum mismatch leaves the source in place and no partial file."""
+        src = models_dir / "checkpoints" / "model_a.safetensors"
+        manager.deep_verify = True
+
+        with patch.object(ArchiveManager, "_same_device", return_value=False), \
+                patch.object(ArchiveManager, "_hash_file", return_value="bad"):
+            success, message = manager.move_to_archive(str(src), "checkpoints")
+
+        assert success is False
+        assert "Checksum mismatch" in message
+        assert src.exists()
+        assert not list(archive_dir.rglob("model_a.safetensors*"))
+
+    def test_copy_verification_hashes_only_on_mismatch(self, manager, models_dir, archive_dir):
+        """Matching size and mtime skip the re-read; a source changed mid-copy is hashed."""
+        src = models_dir / "checkpoints" / "model_a.safetensors"
+        lora = models_dir / "loras" / "lora_1.safetensors"
+        real_hash = ArchiveManager._hash_file
+        hashed = []
+
+        def tracking_hash(self, path):
+            hashed.append(Path(path).name)
+            return real_hash(self, path)
+
+        def rewrite_source(delta):
+            with open(lora, "r+b") as f:  # Already copied bytes change behind the reader
+                f.write(b"late")
+            os.utime(lora, ns=(0, 0))
+
+        with patch.object(ArchiveManager, "_same_device", return_value=False), \
+                patch.object(ArchiveManager, "_hash_file", tracking_hash):
+            assert manager.move_to_archive(str(src), "checkpoints")[0] is True
+            assert hashed == []
+
+            success, message = manager.move_to_archive(
+                str(lora), "loras", progress_callback=rewrite_source
+            )
+
+        assert success is False
+        assert "Checksum mismatch" in message
+        assert hashed == ["lora_1.safetensors.part", "lora_1.safetensors"]
+        assert lora.exists()
+
+    def test_recover_interrupted_moves(self, archive_dir, models_dir):
+        """Verified copies are completed, stale partial copies rolled back on init."""
+        copied_src = models_dir / "checkpoints" / "model_a.safetensors"
+        copied_dest = archive_dir / "checkpoints" / "model_a.safetensors"
+        partial_src = models_dir / "loras" / "lora_1.safetensors"
+        partial_dest = archive_dir / "loras" / "lora_1.safetensors"
+        partial_part = archive_dir / "loras" / "lora_1.safetensors.part"
+        copied_dest.parent.mkdir()
+        partial_dest.parent.mkdir()
+        copied_dest.write_bytes(copied_src.read_bytes())
+        partial_part.write_bytes(b"z" * 10)  # No longer matches the source
+
+        entries = [
+            {"op": "move", "src": str(copied_src), "dest": str(copied_dest), "state": "started"},
+            {"op": "move", "src": str(copied_src), "dest": str(copied_dest), "state": "copied"},
+            {"op": "move", "src": str(partial_src), "dest": str(partial_dest), "state": "copying",
+             "part_ino": partial_part.stat().st_ino},
+        ]
+        journal = archive_dir / ArchiveManager.JOURNAL_FILENAME
+        journal.write_text("\n".join(json.dumps(e) for e in entries) + "\n{\"torn")
+
+        ArchiveManager(str(archive_dir), str(models_dir))
+
+        assert not copied_src.exists()
+        assert copied_dest.exists()
+        assert partial_src.exists()
+        assert not partial_part.exists()
+        assert not partial_dest.exists()
+        assert not list(archive_dir.glob("archive_journal*"))
+
+    def test_recover_resumes_matching_partial_copy(self, archive_dir, models_dir):
+        """A partial copy that matches the source prefix is continued, not restarted."""
+        src = models_dir / "loras" / "lora_1.safetensors"
+        dest = archive_dir / "loras" / "lora_1.safetensors"
+        part = archive_dir / "loras" / "lora_1.safetensors.part"
+        dest.parent.mkdir()
+        part.write_bytes(b"y" * 200)
+        journal = archive_dir / "archive_journal.999999999.jsonl"
+        journal.write_text(json.dumps({
+            "op": "move", "pid": 999999999, "src": str(src), "dest": str(dest),
+            "state": "copying", "part_ino": part.stat().st_ino,
+        }) + "\n")
+
+        with patch("services.model_manager.archive_manager._pid_alive", return_value=False):
+            manager = ArchiveManager(str(archive_dir), str(models_dir))
+
+        assert dest.read_bytes() == b"y" * 500
+        assert not src.exists()
+        assert not part.exists()
+        assert not journal.exists()
+        assert "recover_interrupted" in [op["action"] for op in manager.get_operation_log()]
+
+    def test_recover_skips_journals_of_live_processes(self, archive_dir, models_dir):
+        """A journal whose owner is still running is left alone, including its .part."""
+        src = models_dir / "loras" / "lora_1.safetensors"
+        dest = archive_dir / "loras" / "lora_1.safetensors"
+        part = archive_dir / "loras" / "lora_1.safetensors.part"
+        dest.parent.mkdir()
+        part.write_bytes(b"y" * 200)
+        journal = archive_dir / "archive_journal.4242.jsonl"
+        journal.write_text(json.dumps({
+            "op": "move", "pid": 4242, "src": str(src), "dest": str(dest),
+            "state": "copying", "part_ino": part.stat().st_ino,
+        }) + "\n")
+
+        with patch("services.model_manager.archive_manager._pid_alive", return_value=True):
+            ArchiveManager(str(archive_dir), str(models_dir))
+
+        assert part.read_bytes() == b"y" * 200
+        assert journal.exists()
+        assert src.exists()
+
+    @pytest.mark.parametrize("same_device", [True, False])
+    def test_move_never_overwrites_existing_archive_file(self, manager, models_dir, archive_dir, same_device):
+        """A destination created after the existence check makes the move fail, not replace."""
+        src = models_dir / "checkpoints" / "model_a.safetensors"
+        dest = archive_dir / "checkpoints" / "model_a.safetensors"
+        dest.parent.mkdir()
+        real_move = ArchiveManager._move_file
+
+        def racing_move(self, src_path, dest_path, callback=None):
+            dest.write_bytes(b"other")  # Concurrent writer wins the race
+            return real_move(self, src_path, dest_path, callback)
+
+        with patch.object(ArchiveManager, "_same_device", return_value=same_device), \
+                patch.object(ArchiveManager, "_move_file", racing_move):
+            success, message = manager.move_to_archive(str(src), "checkpoints")
+
+        assert success is False
+        assert "already exists" in message
+        assert dest.read_bytes() == b"other"
+        assert src.read_bytes() == b"x" * 1000
+        assert not list(archive_dir.rglob("*.part"))
+
+    def test_copy_does_not_touch_foreign_partial_copy(self, manager, models_dir, archive_dir):
+        """An existing .part belongs to another writer and is neither reused nor deleted."""
+        src = models_dir / "checkpoints" / "model_a.safetensors"
+        part = archive_dir / "checkpoints" / "model_a.safetensors.part"
+        part.parent.mkdir()
+        part.write_bytes(b"in progress")
+
+        with patch.object(ArchiveManager, "_same_device", return_value=False):
+            success, _ = manager.move_to_archive(str(src), "checkpoints")
+
+        assert success is False
+        assert part.read_bytes() == b"in progress"
+        assert src.exists()
+
+    def test_moves_are_logged_and_journals_not_listed(self, manager, models_dir, archive_dir):
+        """Every move is in the operation log; other processes' journals are not archive files."""
+        (archive_dir / "archive_journal.4242.jsonl").write_text("{}\n" * 100)
+        (archive_dir / "flat.safetensors").write_bytes(b"f" * 10)
+
+        with patch("services.model_manager.archive_manager._pid_alive", return_value=True):
+            manager.move_to_archive(str(models_dir / "checkpoints" / "model_a.safetensors"),
+                                    "checkpoints")
+
+        moves = [op for op in manager.get_operation_log() if op["action"] == "move_to_archive"]
+        dest = archive_dir / "checkpoints" / "model_a.safetensors"
+        assert moves[0]["payload"]["dest"] == str(dest)
+        assert manager.scan_archive(include_flat=True) == {
+            "": ["flat.safetensors"], "checkpoints": ["model_a.safetensors"],
+        }
+        assert manager.get_archive_size() == 1010
+
+    def test_archive_index_persists_and_tracks_changes(self, manager, archive_dir, models_dir):
+        """Index is reused across instances and re-lists only changed directories."""
+        (archive_dir / "checkpoints").mkdir()
+        (archive_dir / "checkpoints" / "a.safetensors").write_bytes(b"a" * 100)
+        assert manager.scan_archive() == {"checkpoints": ["a.safetensors"]}
+        assert manager.index_file.exists()
+
+        (archive_dir / "checkpoints" / "b.safetensors").write_bytes(b"b" * 50)
+        fresh = ArchiveManager(str(archive_dir), str(models_dir))
+        assert fresh.scan_archive() == {"checkpoints": ["a.safetensors", "b.safetensors"]}
+        assert fresh.get_archive_size() == 150
+
+        with patch.object(ArchiveManager, "_list_archive_dir") as mock_list:
+            fresh._index["dirs"]["checkpoints"] = (archive_dir / "checkpoints").stat().st_mtime_ns
+            fresh.scan_archive()
+        mock_list.assert_not_called()
@@ -0,0 +1,132 @@
+"""Unit tests for header-only model metadata extraction"""
+import json
+import struct
+from unittest.mock import patch
+
+import pytest
+
+from services.kohya.model_scanner import KohyaModelScanner
+from services.model_manager.model_metadata import ModelMetadataReader
+
+
+def write_safetensors(path, tensors, metadata=None):
+    """Write a safetensors file with zeroed tensor data."""
+    header = {}
+    offset = 0
+    for name, (dtype, shape) in tensors.items():
+        size = 2
+        for dim in shape:
+            size *= dim
+        header[name] = {"dtype": dtype, "shape": shape, "data_offsets": [offset, offset + size]}
+        offset += size
+    if metadata:
+        header["__metadata__"] = metadata
+    raw = json.dumps(header).encode()
+    path.write_bytes(struct.pack("<Q", len(raw)) + raw + b"\0" * offset)
+
+
+def _gguf_string(value):
+    raw = value.encode()
+    return struct.pack("<Q", len(raw)) + raw
+
+
+def write_gguf(path, architecture, tensors):
+    """Write a minimal GGUF v3 header (one string KV, one array KV)."""
+    data = b"GGUF" + struct.pack("<IQQ", 3, len(tensors), 2)
+    data += _gguf_string("general.architecture") + struct.pack("<I", 8) + _gguf_string(architecture)
+    data += _gguf_string("tokenizer.scores") + struct.pack("<IIQ", 9, 6, 3) + struct.pack("<3f", 1, 2, 3)
+    for name, ggml_type, dims in tensors:
+        data += _gguf_string(name) + struct.pack("<I", len(dims))
+        data += struct.pack(f"<{len(dims)}Q", *dims) + struct.pack("<IQ", ggml_type, 0)
+    path.write_bytes(data)
+
+
+@pytest.fixture
+def reader(tmp_path):
+    return ModelMetadataReader(cache_path=str(tmp_path / "meta.db"))
+
+
+class TestModelMetadataReader:
+    @pytest.mark.unit
+    def test_safetensors_full_model(self, reader, tmp_path):
+        path = tmp_path / "renamed_model.safetensors"
+        write_safetensors(path, {
+            "double_blocks.0.img_attn.qkv.weight": ("BF16", [64, 32]),
+            "single_blocks.0.linear1.weight": ("BF16", [32, 32]),
+            "img_in.bias": ("F32", [32]),
+        })
+
+        meta = reader.read(str(path))
+
+        assert meta.format == "safetensors"
+        assert meta.architecture == "flux"
+        assert meta.is_lora is False
+        assert meta.dtype == "BF16"
+        assert meta.parameter_count == 64 * 32 + 32 * 32 + 32
+        assert meta.tensor_count == 3
+
+    @pytest.mark.unit
+    def test_safetensors_lora_with_training_metadata(self, reader, tmp_path):
+        path = tmp_path / "cg_elena.safetensors"
+        write_safetensors(
+            path,
+            {"lora_unet_input_blocks_4_1_proj_in.lora_down.weight": ("F16", [4, 8])},
+            metadata={"ss_base_model_version": "sdxl_base_v1-0", "ss_network_dim": "16"},
+        )
+
+        meta = reader.read(str(path))
+
+        assert meta.architecture == "sdxl"
+        assert meta.is_lora is True
+        assert meta.metadata["ss_network_dim"] == "16"
+
+    @pytest.mark.unit
+    def test_gguf_header(self, reader, tmp_path):
+        path = tmp_path / "encoder.gguf"
+        write_gguf(path, "t5encoder", [("enc.blk.0.attn_q.weight", 8, [16, 16])])
+
+        meta = reader.read(str(path))
+
+        assert meta.format == "gguf"
+        assert meta.architecture == "t5encoder"
+        assert meta.dtype == "Q8_0"
+        assert meta.parameter_count == 256
+        assert meta.metadata["tokenizer.scores"] == "<array[3]>"
+
+    @pytest.mark.unit
+    def test_unreadable_file_returns_none(self, reader, tmp_path):
+        path = tmp_path / "broken.safetensors"
+        path.write_bytes(b"not a model")
+
+        assert reader.read(str(path)) is None
+        assert reader.read(str(tmp_path / "missing.safetensors")) is None
+
+    @pytest.mark.unit
+    def test_cache_survives_new_reader_and_tracks_changes(self, reader, tmp_path):
+        path = tmp_path / "model.safetensors"
+        write_safetensors(path, {"joint_blocks.0.x.weight": ("F16", [2, 2])})
+        assert reader.detect_architecture(str(path)) == "sd3"
+
+        fresh = ModelMetadataReader(cache_path=str(tmp_path / "meta.db"))
+        with patch("services.model_manager.model_metadata.parse_safetensors_header") as mock_parse:
+            assert fresh.detect_architecture(str(path)) == "sd3"
+        mock_parse.assert_not_called()
+
+        write_safetensors(path, {"double_blocks.0.x.weight": ("F16", [2, 4])})
+        assert fresh.detect_architecture(str(path)) == "flux"
+
+
+class TestHeaderBasedDetection:
+    @pytest.mark.unit
+    def test_kohya_scanner_uses_header_over_filename(self, tmp_path):
+        unet_dir = tmp_path / "models" / "unet"
+        unet_dir.mkdir(parents=True)
+        write_safetensors(unet_dir / "my_finetune.safetensors", {"double_blocks.0.w": ("BF16", [2])})
+        write_safetensors(unet_dir / "flux_named_sdxl.safetensors", {"label_emb.0.0.weight": ("F16", [2])})
+        (unet_dir / "flux_plain.safetensors").write_bytes(b"")  # No header: filename decides
+
+        scanner = KohyaModelScanner(str(tmp_path))
+        names = [name.split(" ")[0] for name, _ in scanner.scan_flux_models()]
+
+        assert names == ["flux_plain.safetensors", "my_finetune.safetensors"]
+        assert [name.split(" ")[0] for name, _ in scanner.scan_sdxl_models()] == ["flux_named_sdxl.safetensors"]
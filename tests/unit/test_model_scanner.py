@@ -0,0 +1,115 @@
+"""Unit tests for ModelScanner and its persistent file index"""
+import os
+
+import pytest
+
+from services.model_manager.model_scanner import ModelScanner
+
+
+def _write(path, size=16):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\x00" * size)
+    return path
+
+
+def _age(path, seconds=60):
+    """Backdate a directory so the index trusts its mtime."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    root = tmp_path / "models"
+    _write(root / "checkpoints" / "sdxl.safetensors", 100)
+    _write(root / "checkpoints" / "sd15.ckpt", 50)
+    _write(root / "checkpoints" / "notes.txt")
+    _write(root / "loras" / "style" / "anime.safetensors", 10)
+    _write(root / "unet" / "wan.gguf", 70)
+    for directory in [root / "checkpoints", root / "loras", root / "loras" / "style", root / "unet"]:
+        _age(directory)
+    return root
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "index.db")
+
+
+class TestModelScanner:
+    @pytest.mark.unit
+    def test_scan_all_models_groups_by_type(self, models_dir, index_path):
+        scanner = ModelScanner(str(models_dir), index_path=index_path)
+
+        models = scanner.scan_all_models()
+
+        assert list(models) == ["checkpoints", "loras", "unet"]
+        assert [m["filename"] for m in models["checkpoints"]] == ["sd15.ckpt", "sdxl.safetensors"]
+        anime = models["loras"][0]
+        assert anime["relative_path"] == os.path.join("style", "anime.safetensors")
+        assert anime["size_bytes"] == 10
+
+    @pytest.mark.unit
+    def test_scan_model_directory_single_walk(self, models_dir):
+        scanner = ModelScanner(str(models_dir))
+
+        models = scanner.scan_model_directory(str(models_dir / "checkpoints"), [".safetensors", ".ckpt"])
+
+        assert sorted(m["filename"] for m in models) == ["sd15.ckpt", "sdxl.safetensors"]
+
+    @pytest.mark.unit
+    def test_lookups_do_not_rescan(self, models_dir, index_path, monkeypatch):
+        scanner = ModelScanner(str(models_dir), index_path=index_path)
+        scanner.scan_all_models()
+
+        calls = []
+        monkeypatch.setattr(os, "scandir", lambda *a: calls.append(a) or pytest.fail("rescanned"))
+
+        assert scanner.model_exists("checkpoints", "sdxl.safetensors")
+        assert scanner.get_model_info("unet", "wan.gguf")["size_bytes"] == 70
+        assert scanner.get_model_info("loras", "missing.safetensors") is None
+        assert scanner.get_total_size_by_type() == {"checkpoints": 150, "loras": 10, "unet": 70}
+        assert scanner.get_all_model_filenames()["loras"] == ["anime.safetensors"]
+        assert calls == []
+
+    @pytest.mark.unit
+    def test_unchanged_directories_are_not_relisted(self, models_dir, index_path, monkeypatch):
+        ModelScanner(str(models_dir), index_path=index_path).scan_all_models()
+
+        listed = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: listed.append(path) or real_scandir(path))
+        models = ModelScanner(str(models_dir), index_path=index_path).scan_all_models()
+
+        assert listed == []
+        assert len(models["checkpoints"]) == 2
+
+    @pytest.mark.unit
+    def test_refresh_picks_up_added_and_removed_files(self, models_dir, index_path):
+        scanner = ModelScanner(str(models_dir), index_path=index_path)
+        scanner.scan_all_models()
+
+        _write(models_dir / "loras" / "style" / "new.safetensors")
+        (models_dir / "checkpoints" / "sd15.ckpt").unlink()
+        models = scanner.scan_all_models()
+
+        assert [m["filename"] for m in models["loras"]] == ["anime.safetensors", "new.safetensors"]
+        assert [m["filename"] for m in models["checkpoints"]] == ["sdxl.safetensors"]
+        assert not scanner.model_exists("checkpoints", "sd15.ckpt")
+
+    @pytest.mark.unit
+    def test_removed_type_directory_is_dropped(self, models_dir, index_path):
+        scanner = ModelScanner(str(models_dir), index_path=index_path)
+        scanner.scan_all_models()
+
+        (models_dir / "unet" / "wan.gguf").unlink()
+        (models_dir / "unet").rmdir()
+
+        assert "unet" not in scanner.scan_all_models()
+
+    @pytest.mark.unit
+    def test_missing_models_dir(self, tmp_path, index_path):
+        scanner = ModelScanner(str(tmp_path / "nope"), index_path=index_path)
+
+        assert scanner.scan_all_models() == {}
+        assert scanner.model_exists("checkpoints", "x.safetensors") is False
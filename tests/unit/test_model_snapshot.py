@@ -0,0 +1,104 @@
+"""Unit tests for the shared ModelSnapshot"""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from services.model_manager.model_classifier import ModelClassifier, ModelStatus
+from services.model_manager.model_scanner import ModelScanner
+from services.model_manager.model_snapshot import ModelSnapshot
+from services.model_manager.storage_analyzer import StorageAnalyzer
+from services.model_manager.workflow_scanner import WorkflowScanner
+
+
+@pytest.fixture
+def layout(tmp_path):
+    models_dir = tmp_path / "models"
+    (models_dir / "checkpoints").mkdir(parents=True)
+    (models_dir / "loras").mkdir()
+    (models_dir / "checkpoints" / "used.safetensors").write_bytes(b"u" * 10)
+    (models_dir / "loras" / "spare.safetensors").write_bytes(b"s" * 5)
+
+    workflows_dir = tmp_path / "workflows"
+    workflows_dir.mkdir()
+    workflow = {
+        "1": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "used.safetensors"}},
+        "2": {"class_type": "LoraLoader", "inputs": {"lora_name": "gone.safetensors"}},
+    }
+    (workflows_dir / "wf.json").write_text(json.dumps(workflow))
+    return models_dir, workflows_dir
+
+
+@pytest.fixture
+def snapshot(layout, tmp_path):
+    models_dir, workflows_dir = layout
+    classifier = ModelClassifier(
+        WorkflowScanner(str(workflows_dir), cache_path=str(tmp_path / "scan.json")),
+        ModelScanner(str(models_dir), index_path=str(tmp_path / "index.db")),
+    )
+    return ModelSnapshot(classifier)
+
+
+def _names(snapshot, status):
+    return sorted(m["filename"] for m in snapshot.classification[status])
+
+
+class TestModelSnapshot:
+    @pytest.mark.unit
+    def test_services_share_one_classification(self, snapshot):
+        analyzer = StorageAnalyzer(snapshot.classifier, snapshot)
+
+        with patch.object(snapshot.classifier, "classify_all_models",
+                          wraps=snapshot.classifier.classify_all_models) as mock_classify:
+            overview = analyzer.get_storage_overview()
+            stats = snapshot.get_statistics()
+            analyzer.get_largest_models()
+
+        assert mock_classify.call_count == 1
+        assert overview["counts"] == {"used": 1, "unused": 1, "missing": 1}
+        assert stats["total_used"] == 1
+        assert snapshot.version == 1
+
+    @pytest.mark.unit
+    def test_refresh_picks_up_filesystem_changes(self, snapshot, layout):
+        models_dir, _ = layout
+        assert _names(snapshot, ModelStatus.MISSING) == ["gone.safetensors"]
+
+        (models_dir / "loras" / "gone.safetensors").write_bytes(b"g")
+        snapshot.refresh()
+
+        assert _names(snapshot, ModelStatus.USED) == ["gone.safetensors", "used.safetensors"]
+        assert snapshot.version == 2
+
+    @pytest.mark.unit
+    def test_mark_removed_updates_in_place(self, snapshot, layout):
+        models_dir, _ = layout
+        used_path = str(models_dir / "checkpoints" / "used.safetensors")
+        spare_path = str(models_dir / "loras" / "spare.safetensors")
+        snapshot.refresh()
+        version = snapshot.version
+
+        with patch.object(snapshot.classifier, "classify_all_models") as mock_classify:
+            assert snapshot.mark_removed([used_path, spare_path]) == 2
+
+        mock_classify.assert_not_called()
+        assert snapshot.classification[ModelStatus.USED] == []
+        assert snapshot.classification[ModelStatus.UNUSED] == []
+        missing = {m["filename"]: m for m in snapshot.classification[ModelStatus.MISSING]}
+        assert missing["used.safetensors"]["path"] is None
+        assert missing["used.safetensors"]["workflow_count"] == 1
+        assert snapshot.version == version + 1
+
+    @pytest.mark.unit
+    def test_mark_restored_turns_missing_into_used(self, snapshot, layout):
+        models_dir, _ = layout
+        restored = models_dir / "loras" / "gone.safetensors"
+        snapshot.refresh()
+        restored.write_bytes(b"g" * 3)
+
+        snapshot.mark_restored([{"filename": "gone.safetensors", "type": "loras", "path": str(restored)}])
+
+        used = {m["filename"]: m for m in snapshot.classification[ModelStatus.USED]}
+        assert used["gone.safetensors"]["size_bytes"] == 3
+        assert used["gone.safetensors"]["status"] == ModelStatus.USED
+        assert snapshot.classification[ModelStatus.MISSING] == []
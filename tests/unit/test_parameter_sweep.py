@@ -0,0 +1,94 @@
+"""Unit tests for parameter sweep plans and the parameter manifest"""
+import pytest
+
+from domain.exceptions import InputValidationError
+from services.keyframe.parameter_sweep import (
+    build_sweep,
+    config_key,
+    forget_parameters,
+    load_parameter_manifest,
+    matches_filter,
+    parse_sweep_spec,
+    record_parameters,
+    rendered_configs,
+)
+
+
+class TestParseSweepSpec:
+    @pytest.mark.unit
+    def test_grid_ranges_and_random_axes(self):
+        spec = parse_sweep_spec("seed=10..12; cfg=3,4.5\nsampler=~euler,dpmpp_2m; lora_strength=~0.6..1")
+
+        assert spec == {
+            "seed": [10, 11, 12],
+            "cfg": [3.0, 4.5],
+            "sampler": {"choices": ["euler", "dpmpp_2m"]},
+            "lora_strength": {"min": 0.6, "max": 1.0},
+        }
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("text", ["cfg", "foo=1", "steps=2.5", "cfg=3..5", "seed=5..1", "sampler=~a..b"])
+    def test_malformed_entries_are_rejected(self, text):
+        with pytest.raises(InputValidationError):
+            parse_sweep_spec(text)
+
+
+class TestBuildSweep:
+    @pytest.mark.unit
+    def test_grid_is_crossed_and_deduplicated(self):
+        configs = build_sweep({"seed": [1, 2], "cfg": [3, "3.0", 4.5]}, defaults={"seed": 99, "steps": 20})
+
+        assert configs == [
+            {"seed": 1, "steps": 20, "cfg": 3.0},
+            {"seed": 1, "steps": 20, "cfg": 4.5},
+            {"seed": 2, "steps": 20, "cfg": 3.0},
+            {"seed": 2, "steps": 20, "cfg": 4.5},
+        ]
+
+    @pytest.mark.unit
+    def test_random_draws_are_reproducible_and_unique(self):
+        spec = {"cfg": [3.5], "steps": {"min": 20, "max": 21}, "sampler": {"choices": ["euler", "heun"]}}
+
+        first = build_sweep(spec, samples=12, rng_seed=7)
+        assert first == build_sweep(spec, samples=12, rng_seed=7)
+        assert len(first) <= 4  # Only 2 x 2 distinct configurations exist
+        assert all(20 <= config["steps"] <= 21 and config["cfg"] == 3.5 for config in first)
+
+    @pytest.mark.unit
+    def test_oversized_sweep_is_refused(self):
+        with pytest.raises(InputValidationError, match="max. 4"):
+            build_sweep({"seed": list(range(5))}, limit=4)
+        with pytest.raises(InputValidationError):
+            build_sweep({"seed": list(range(10_000)), "cfg": list(range(1, 100))})
+
+
+class TestParameterManifest:
+    @pytest.mark.unit
+    def test_record_forget_and_filter(self, tmp_path):
+        assert load_parameter_manifest(str(tmp_path)) == {}
+        record_parameters(str(tmp_path), {"a_v5_00001_.png": {"seed": 1, "cfg": 3.5, "sampler": "euler"}})
+        record_parameters(str(tmp_path), {"a_v6_00001_.png": {"seed": 2, "cfg": 5.0, "sampler": "heun"}})
+
+        manifest = load_parameter_manifest(str(tmp_path))
+        assert sorted(manifest) == ["a_v5_00001_.png", "a_v6_00001_.png"]
+        assert matches_filter(manifest["a_v5_00001_.png"], "cfg<4 sampler=euler")
+        assert not matches_filter(manifest["a_v6_00001_.png"], "cfg<4")
+        assert not matches_filter({}, "seed=1")
+        with pytest.raises(InputValidationError):
+            matches_filter(manifest["a_v5_00001_.png"], "sampler>euler")
+
+        forget_parameters(str(tmp_path), ["a_v5_00001_.png", "other.png"])
+        assert list(load_parameter_manifest(str(tmp_path))) == ["a_v6_00001_.png"]
+
+    @pytest.mark.unit
+    def test_rendered_configs_are_keyed_by_model_override(self, tmp_path):
+        (tmp_path / "a_v5_00001_.png").write_bytes(b"png")
+        record_parameters(str(tmp_path), {"a_v5_00001_.png": {
+            "seed": 1, "cfg": 3.5, "shot_id": "001", "workflow": "flux.json", "model": "flux-dev.safetensors",
+        }})
+
+        done = set(rendered_configs(load_parameter_manifest(str(tmp_path)), "001", "flux.json", str(tmp_path)))
+
+        assert config_key({"seed": 1, "cfg": 3.5}, "flux-dev.safetensors") in done
+        assert config_key({"seed": 1, "cfg": 3.5}, "flux-schnell.safetensors") not in done
+        assert config_key({"seed": 1, "cfg": 3.5}) not in done
@@ -606,3 +606,34 @@ class TestKnownPresets:
         text = seeded_service.get_prompt_text("motion", "slow_motion")
         assert text is not None
         assert "slow" in text.lower()
+
+
+class TestPresetSnapshot:
+    """Tests for the in-memory preset snapshot."""
+
+    def test_lookups_do_not_open_connections(self, seeded_service):
+        """After the first load, lookups are served from memory."""
+        seeded_service.get_preset_count()
+
+        with patch.object(seeded_service, "_get_conn", side_effect=AssertionError("db access")):
+            assert seeded_service.get_dropdown_choices("style")[1] == ("Filmisch", "cinematic")
+            assert "film grain" in seeded_service.get_prompt_text("style", "cinematic")
+            assert "camera" in seeded_service.get_presets_by_phase("video")
+            assert seeded_service.build_prompt("a cat", style="anime").startswith("a cat, anime style")
+
+    def test_add_preset_reloads(self, service):
+        """Writes through the service are visible on the next lookup."""
+        assert service.get_presets_by_category("style") == []
+
+        service.add_preset("style", "new", "Neu", "new prompt")
+
+        assert service.get_prompt_text("style", "new") == "new prompt"
+        assert [p["key"] for p in service.get_presets_by_category("style")] == ["new"]
+
+    def test_returned_presets_are_copies(self, service):
+        """Mutating returned dicts does not change the snapshot."""
+        service.add_preset("style", "k", "Name", "prompt")
+
+        service.get_presets_by_category("style")[0]["prompt_text"] = "changed"
+
+        assert service.get_prompt_text("style", "k") == "prompt"
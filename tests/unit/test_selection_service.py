@@ -506,3 +506,57 @@ class TestSelectionServiceIntegration:
             saved = json.load(f)
         assert saved["project"] == "Test Project"
         assert len(saved["selections"]) == 2
+
+
+class TestSelectionServiceListingCache:
+    """Test the cached keyframe directory listing"""
+
+    @pytest.mark.unit
+    def test_listing_refreshes_when_directory_changes(self, tmp_path):
+        keyframes = tmp_path / "keyframes"
+        keyframes.mkdir()
+        (keyframes / "a_v1.png").write_bytes(b"png")
+        (keyframes / "b_v1.png").write_bytes(b"png")
+        store = Mock(spec=ProjectStore)
+        store.ensure_dir.return_value = str(keyframes)
+        service = SelectionService(store)
+        old = 1_000_000_000_000_000_000
+        os.utime(keyframes, ns=(old, old))
+
+        assert [k["filename"] for k in service.collect_keyframes({}, "a")] == ["a_v1.png"]
+
+        # Same directory mtime: the cached listing is reused
+        (keyframes / "a_v2.png").write_bytes(b"png")
+        os.utime(keyframes, ns=(old, old))
+        assert [k["filename"] for k in service.collect_keyframes({}, "a")] == ["a_v1.png"]
+
+        os.utime(keyframes, ns=(old, old + 1_000_000_000))
+        assert [k["filename"] for k in service.collect_keyframes({}, "a")] == ["a_v1.png", "a_v2.png"]
+        assert [k["filename"] for k in service.collect_keyframes({}, "b")] == ["b_v1.png"]
+
+
+class TestSelectionServiceSweepParameters:
+    """Test sweep parameters in collected keyframes"""
+
+    @pytest.mark.unit
+    def test_labels_and_filter_use_recorded_parameters(self, tmp_path):
+        keyframes = tmp_path / "keyframes"
+        keyframes.mkdir()
+        for name in ("hero_v1_00001_.png", "hero_v5_00001_.png", "hero_v6_00001_.png"):
+            (keyframes / name).write_bytes(b"png")
+        (keyframes / "parameters.json").write_text(json.dumps({"files": {
+            "hero_v5_00001_.png": {"seed": 2000, "cfg": 3.5, "sampler": "euler", "shot_id": "001"},
+            "hero_v6_00001_.png": {"seed": 2000, "cfg": 5.0, "sampler": "dpmpp_2m", "shot_id": "001"},
+        }}))
+        store = Mock(spec=ProjectStore)
+        store.ensure_dir.return_value = str(keyframes)
+        service = SelectionService(store)
+
+        collected = service.collect_keyframes({}, "hero")
+
+        assert collected[0]["label"] == "Var 1 – hero_v1_00001_.png"
+        assert collected[1]["label"] == "Var 5 – hero_v5_00001_.png · seed 2000 · cfg 3.5 · euler"
+        assert [k["variant"] for k in service.filter_keyframes(collected, "cfg>=4")] == [6]
+        assert [k["variant"] for k in service.filter_keyframes(collected, "seed=2000, sampler!=dpmpp_2m")] == [5]
+        assert service.filter_keyframes(collected, "  ") == collected
+
@@ -0,0 +1,69 @@
+"""Unit tests for the shared ServiceContainer"""
+import pytest
+
+from infrastructure.config_manager import ConfigManager
+from infrastructure.project_store import ProjectStore
+from infrastructure.service_container import (
+    ServiceContainer,
+    get_service_container,
+    reset_service_container,
+)
+
+
+class TestServiceContainer:
+    @pytest.mark.unit
+    def test_one_instance_per_factory_and_args(self):
+        created = []
+
+        class Service:
+            def __init__(self, name="default"):
+                created.append(name)
+
+        services = ServiceContainer()
+
+        assert services.get(Service) is services.get(Service)
+        assert services.get(Service, "a") is services.get(Service, "a")
+        assert services.get(Service, "a") is not services.get(Service)
+        assert created == ["default", "a"]
+
+    @pytest.mark.unit
+    def test_infrastructure_shortcuts_share_config(self):
+        services = ServiceContainer()
+
+        assert services.config is services.get(ConfigManager)
+        assert isinstance(services.project_store, ProjectStore)
+        assert services.project_store.config is services.config
+        assert services.project_store is services.get(ProjectStore, services.config)
+
+    @pytest.mark.unit
+    def test_register_and_clear(self):
+        services = ServiceContainer()
+        marker = object()
+
+        services.register(ConfigManager, marker)
+        assert services.config is marker
+
+        services.clear()
+        assert len(services) == 0
+        assert isinstance(services.config, ConfigManager)
+
+    @pytest.mark.unit
+    def test_global_container_is_shared_until_reset(self):
+        first = get_service_container()
+        assert get_service_container() is first
+
+        reset_service_container()
+        assert get_service_container() is not first
+
+    @pytest.mark.unit
+    def test_addons_share_infrastructure_objects(self):
+        from addons.keyframe_generator import KeyframeGeneratorAddon
+        from addons.storyboard_editor import StoryboardEditorAddon
+
+        keyframes = KeyframeGeneratorAddon()
+        editor = StoryboardEditorAddon()
+
+        assert keyframes.config is editor.config
+        assert keyframes.project_manager is editor.project_store
+        assert keyframes.character_lora_service is editor.character_lora_service
+        assert keyframes.generation_service.character_lora_service is editor.character_lora_service
@@ -0,0 +1,40 @@
+"""Unit tests for StartupProfile"""
+import json
+
+import pytest
+
+from infrastructure.startup_profile import StartupProfile
+
+
+@pytest.mark.unit
+def test_measure_accumulates_and_reports(tmp_path):
+    profile = StartupProfile()
+    profile.record("SlowAddon", "import", 1.5)
+    profile.record("SlowAddon", "render", 0.5)
+    profile.record("FastAddon", "construct", 0.1)
+    with profile.measure("FastAddon", "construct"):
+        pass
+
+    report = profile.report()
+    lines = report.splitlines()
+    assert lines[1].startswith("SlowAddon")
+    assert lines[2].startswith("FastAddon")
+    assert "Total" in lines[3]
+    assert profile.timings()["FastAddon"]["construct"] >= 0.1
+
+    path = tmp_path / "profile.json"
+    profile.save(str(path))
+    data = json.loads(path.read_text())
+    assert data["addons"]["SlowAddon"]["import"] == 1.5
+
+
+@pytest.mark.unit
+def test_report_top_limits_rows():
+    profile = StartupProfile()
+    for i in range(5):
+        profile.record(f"Addon{i}", "construct", i)
+
+    lines = profile.report(top=2).splitlines()
+
+    assert [line.split()[0] for line in lines[1:3]] == ["Addon4", "Addon3"]
+    assert lines[3].startswith("Total")
@@ -0,0 +1,81 @@
+"""Unit tests for the gallery ThumbnailCache"""
+import os
+
+import pytest
+from PIL import Image
+
+from infrastructure.thumbnail_cache import ThumbnailCache
+
+
+def _image(path, size=(1920, 1080), color="red"):
+    Image.new("RGB", size, color).save(path)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ThumbnailCache(cache_dir=tmp_path / "cache", max_size=256, max_workers=0)
+
+
+class TestThumbnailCache:
+    @pytest.mark.unit
+    def test_renders_small_webp_once(self, cache, tmp_path):
+        src = _image(tmp_path / "shot_v1.png")
+
+        thumb = cache.thumbnail(src)
+
+        assert thumb != src and thumb.endswith(".webp")
+        with Image.open(thumb) as image:
+            assert image.format == "WEBP"
+            assert image.size == (256, 144)
+        mtime = os.stat(thumb).st_mtime_ns
+        assert cache.thumbnail(src) == thumb
+        assert os.stat(thumb).st_mtime_ns == mtime
+
+    @pytest.mark.unit
+    def test_changed_source_gets_new_entry(self, cache, tmp_path):
+        src = _image(tmp_path / "shot_v1.png")
+        first = cache.thumbnail(src)
+
+        _image(tmp_path / "shot_v1.png", size=(800, 800), color="blue")
+        os.utime(src, ns=(os.stat(src).st_atime_ns, os.stat(src).st_mtime_ns + 1_000_000_000))
+
+        second = cache.thumbnail(src)
+        assert second != first
+        with Image.open(second) as image:
+            assert image.size == (256, 256)
+
+    @pytest.mark.unit
+    def test_falls_back_to_original(self, cache, tmp_path):
+        broken = tmp_path / "broken.png"
+        broken.write_bytes(b"not an image")
+        text = tmp_path / "notes.txt"
+        text.write_text("x")
+        missing = str(tmp_path / "missing.png")
+
+        assert cache.thumbnails([str(broken), str(text), missing]) == [str(broken), str(text), missing]
+
+    @pytest.mark.unit
+    def test_gallery_keeps_captions_and_order(self, cache, tmp_path):
+        items = [(_image(tmp_path / f"s_v{i}.png", size=(64, 64)), f"Variant {i}") for i in (1, 2)]
+
+        gallery = cache.gallery(items)
+
+        assert [caption for _, caption in gallery] == ["Variant 1", "Variant 2"]
+        assert all(thumb.endswith(".webp") for thumb, _ in gallery)
+
+
+    @pytest.mark.unit
+    def test_pool_workers_import_only_the_worker_module(self):
+        """Spawned workers unpickle tasks from a module without GUI/app imports."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, infrastructure.thumbnail_worker as w; "
+            "print(w.render_image_thumbnail.__module__, 'gradio' in sys.modules, 'addons' in sys.modules)"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+
+        assert result.stdout.split() == ["infrastructure.thumbnail_worker", "False", "False"]
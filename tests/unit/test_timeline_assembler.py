@@ -0,0 +1,229 @@
+"""Unit tests for TimelineAssembler"""
+from unittest.mock import Mock, patch
+
+import pytest
+
+from infrastructure.media_probe import MediaInfo
+from services.video.timeline_assembler import TimelineAssembler, TimelineClip
+
+
+class StubProbe:
+    """Probe returning canned MediaInfo per path."""
+
+    def __init__(self, infos=None):
+        self.infos = infos or {}
+
+    def probe(self, path):
+        return self.infos.get(path)
+
+    def invalidate(self, path):
+        pass
+
+
+def _h264(path, width=832, height=480, fps=16.0, duration=3.0, audio=False):
+    return MediaInfo(
+        path=path, duration=duration, format_name="mp4", video_codec="h264",
+        audio_codec="aac" if audio else None, width=width, height=height, fps=fps,
+        sample_rate=48000 if audio else None, channels=2 if audio else None, pix_fmt="yuv420p",
+    )
+
+
+@pytest.fixture
+def clips(tmp_path):
+    paths = []
+    for name in ("a.mp4", "b.mp4", "c.mp4"):
+        path = tmp_path / name
+        path.write_bytes(b"video")
+        paths.append(str(path))
+    return paths
+
+
+def _ok():
+    return Mock(returncode=0, stderr="")
+
+
+def _assembler(clips):
+    return TimelineAssembler(probe=StubProbe({p: _h264(p) for p in clips}), ffmpeg_path="ffmpeg")
+
+
+class TestBuildFromPlan:
+    @pytest.mark.unit
+    def test_orders_by_chain_and_trims_chained_segments(self, clips):
+        a, b, c = clips
+        plan = [
+            {"plan_id": "010", "shot_id": "010", "chain_id": "010", "segment_index": 1,
+             "status": "completed", "output_files": [a], "start_frame_source": "selection"},
+            {"plan_id": "020B", "shot_id": "020", "chain_id": "020", "segment_index": 2,
+             "status": "completed", "output_files": [c], "start_frame_source": "chain"},
+            {"plan_id": "020", "shot_id": "020", "chain_id": "020", "segment_index": 1,
+             "status": "completed", "output_files": [b], "start_frame_source": "selection"},
+        ]
+        assembler = _assembler(clips)
+
+        timeline = assembler.build_from_plan(plan)
+
+        assert [clip.path for clip in timeline.clips] == [a, b, c]
+        assert [clip.trim_frames for clip in timeline.clips] == [0, 0, 1]
+        assert [clip.needs_transcode for clip in timeline.clips] == [False, False, True]
+
+    @pytest.mark.unit
+    def test_skips_incomplete_segments(self, clips):
+        plan = [
+            {"plan_id": "010", "shot_id": "010", "segment_index": 1,
+             "status": "completed", "output_files": [clips[0]]},
+            {"plan_id": "020", "shot_id": "020", "segment_index": 1,
+             "status": "pending", "output_files": []},
+            {"plan_id": "030", "shot_id": "030", "segment_index": 1,
+             "status": "completed", "output_files": ["/gone.mp4"]},
+        ]
+        assembler = TimelineAssembler(probe=StubProbe(), ffmpeg_path="ffmpeg")
+
+        timeline = assembler.build_from_plan(plan)
+
+        assert len(timeline.clips) == 1
+        assert timeline.skipped == ["020", "030"]
+
+
+class TestNormalizationDecision:
+    @pytest.mark.unit
+    def test_only_mismatching_clips_are_transcoded(self, clips):
+        a, b, c = clips
+        probe = StubProbe({
+            a: _h264(a),
+            b: _h264(b, width=1280, height=720),
+            c: MediaInfo(path=c, duration=3.0, video_codec="vp9", width=832, height=480, fps=16.0),
+        })
+        assembler = TimelineAssembler(probe=probe, ffmpeg_path="ffmpeg")
+
+        timeline = assembler.build(clips)
+
+        assert (timeline.width, timeline.height, timeline.fps) == (832, 480, 16.0)
+        assert [clip.needs_transcode for clip in timeline.clips] == [False, True, True]
+        assert timeline.transcode_count == 2
+
+    @pytest.mark.unit
+    def test_pixel_format_mismatch_is_transcoded(self, clips):
+        a, b, _ = clips
+        yuv444 = _h264(b)
+        yuv444.pix_fmt = "yuv444p"
+        assembler = TimelineAssembler(
+            probe=StubProbe({a: _h264(a), b: yuv444}), ffmpeg_path="ffmpeg"
+        )
+
+        timeline = assembler.build([a, b])
+
+        assert [clip.needs_transcode for clip in timeline.clips] == [False, True]
+
+    @pytest.mark.unit
+    def test_clip_audio_ignored_when_no_clip_has_audio(self, clips):
+        assembler = _assembler(clips)
+
+        timeline = assembler.build(clips, keep_clip_audio=True)
+
+        assert timeline.keep_clip_audio is False
+        assert timeline.transcode_count == 0
+
+
+class TestAssemble:
+    @pytest.mark.unit
+    def test_hard_cut_stream_copies_with_private_list_file(self, clips, tmp_path):
+        assembler = _assembler(clips)
+        timeline = assembler.build(clips)
+        output = str(tmp_path / "out" / "final.mp4")
+
+        with patch("subprocess.run", return_value=_ok()) as mock_run:
+            success, result = assembler.assemble(timeline, output)
+
+        assert success is True and result == output
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args[0][0]
+        assert "concat" in cmd and "copy" in cmd
+        list_file = cmd[cmd.index("-i") + 1]
+        assert "timeline_" in list_file
+
+    @pytest.mark.unit
+    def test_transcodes_in_parallel_then_joins(self, clips, tmp_path):
+        a, b, c = clips
+        probe = StubProbe({a: _h264(a), b: _h264(b, fps=24.0), c: _h264(c, fps=24.0)})
+        assembler = TimelineAssembler(probe=probe, ffmpeg_path="ffmpeg", max_workers=2)
+        timeline = assembler.build(clips)
+
+        with patch("subprocess.run", return_value=_ok()) as mock_run:
+            success, _ = assembler.assemble(timeline, str(tmp_path / "final.mp4"))
+
+        assert success is True
+        commands = [call[0][0] for call in mock_run.call_args_list]
+        assert sum("libx264" in cmd for cmd in commands[:-1]) == 2
+        assert "concat" in commands[-1]
+
+    @pytest.mark.unit
+    def test_crossfade_builds_xfade_chain_with_offsets(self, clips, tmp_path):
+        assembler = _assembler(clips)
+        timeline = assembler.build(clips, crossfade=0.5)
+
+        with patch("subprocess.run", return_value=_ok()) as mock_run:
+            success, _ = assembler.assemble(timeline, str(tmp_path / "final.mp4"))
+
+        assert success is True
+        graph = mock_run.call_args[0][0][mock_run.call_args[0][0].index("-filter_complex") + 1]
+        assert "xfade=transition=fade:duration=0.500:offset=2.500" in graph
+        assert "offset=5.000" in graph
+
+    @pytest.mark.unit
+    def test_audio_bed_is_mapped_without_reencoding_video(self, clips, tmp_path):
+        bed = tmp_path / "narration.wav"
+        bed.write_bytes(b"RIFF")
+        assembler = _assembler(clips)
+        timeline = assembler.build(clips, audio_bed=str(bed), audio_bed_volume=0.8)
+
+        with patch("subprocess.run", return_value=_ok()) as mock_run:
+            assembler.assemble(timeline, str(tmp_path / "final.mp4"))
+
+        cmd = mock_run.call_args[0][0]
+        assert str(bed) in cmd
+        assert cmd[cmd.index("-c:v") + 1] == "copy"
+        assert "volume=0.8" in cmd[cmd.index("-filter_complex") + 1]
+        assert "-shortest" in cmd
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("crossfade", [0.0, 0.5])
+    def test_mixed_audio_clips_get_silence(self, clips, tmp_path, crossfade):
+        a, b, c = clips
+        probe = StubProbe({a: _h264(a, audio=True), b: _h264(b), c: _h264(c, audio=True)})
+        assembler = TimelineAssembler(probe=probe, ffmpeg_path="ffmpeg")
+        timeline = assembler.build(clips, crossfade=crossfade, keep_clip_audio=True)
+
+        assert [clip.needs_transcode for clip in timeline.clips] == [False, True, False]
+        with patch("subprocess.run", return_value=_ok()) as mock_run:
+            success, _ = assembler.assemble(timeline, str(tmp_path / "final.mp4"))
+
+        assert success is True
+        transcode, join = (call[0][0] for call in mock_run.call_args_list)
+        assert transcode[transcode.index("-i") + 1] == b
+        assert "anullsrc=channel_layout=stereo:sample_rate=48000" in transcode
+        assert transcode[transcode.index("-c:a") + 1] == "aac" and "-an" not in transcode
+        if crossfade:
+            graph = join[join.index("-filter_complex") + 1]
+            assert "[1:a]acrossfade" in graph and "[2:a]acrossfade" in graph
+        else:
+            assert "0:a?" in join
+
+    @pytest.mark.unit
+    def test_normalization_failure_is_reported(self, clips, tmp_path):
+        a = clips[0]
+        assembler = TimelineAssembler(probe=StubProbe({a: _h264(a)}), ffmpeg_path="ffmpeg")
+        timeline = assembler.build([TimelineClip(path=a, label="010B", trim_frames=1)])
+
+        with patch("subprocess.run", return_value=Mock(returncode=1, stderr="bad input")):
+            success, message = assembler.assemble(timeline, str(tmp_path / "final.mp4"))
+
+        assert success is False
+        assert "010B" in message
+
+    @pytest.mark.unit
+    def test_empty_timeline(self, tmp_path):
+        assembler = TimelineAssembler(probe=StubProbe(), ffmpeg_path="ffmpeg")
+
+        success, message = assembler.assemble(assembler.build([]), str(tmp_path / "final.mp4"))
+
+        assert success is False
@@ -244,6 +244,35 @@ class TestRunGeneration:
         assert updated_plan[1].get("status") is None
         assert last_video is None
 
+    @pytest.mark.unit
+    def test_stop_request_ends_run_before_next_segment(self, service, tmp_path):
+        """Should finish the current segment, skip the rest and record a cancelled job"""
+        def render(*args, **kwargs):
+            assert service.request_stop() is True
+            return [str(tmp_path / "video.mp4")], None
+
+        service._run_video_job = Mock(side_effect=render)
+        service._job_store = Mock()
+        plan_state = [
+            {"shot_id": "001", "segment_index": 1, "segment_total": 1, "ready": True},
+            {"shot_id": "002", "segment_index": 1, "segment_total": 1, "ready": True},
+        ]
+
+        updated_plan, logs, last_video = service.run_generation(
+            plan_state=plan_state,
+            workflow_template={},
+            fps=24,
+            project={"path": str(tmp_path / "project")},
+            comfy_api=Mock(),
+        )
+
+        assert service._run_video_job.call_count == 1
+        assert updated_plan[0]["status"] == "completed"
+        assert updated_plan[1].get("status") is None
+        assert any("Gestoppt" in log for log in logs)
+        assert last_video == str(tmp_path / "video.mp4")
+        assert service._job_store.set_status.call_args_list[-1].args[2] == "cancelled"
+
 
 class TestRunVideoJob:
     """Tests for _run_video_job() execution wrapper"""
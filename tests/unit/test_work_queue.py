@@ -0,0 +1,99 @@
+"""Unit tests for the SQLite WorkQueue"""
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from infrastructure.work_queue import WorkQueue
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return WorkQueue(str(tmp_path / "queue.db"))
+
+
+class TestWorkQueue:
+    @pytest.mark.unit
+    def test_claim_complete_and_stats(self, queue):
+        first = queue.enqueue("keyframe_variant", {"n": 1}, batch="b1")
+        queue.enqueue("video_segment", {"n": 2}, batch="b1")
+
+        task = queue.claim("w1", kinds=["keyframe_variant"])
+        assert (task.task_id, task.payload, task.attempts) == (first, {"n": 1}, 1)
+        assert queue.claim("w2", kinds=["keyframe_variant"]) is None
+
+        assert not queue.complete(task.task_id, "w2", {"images": []})
+        assert queue.complete(task.task_id, "w1", {"images": ["a.png"]})
+        assert queue.get(first).result == {"images": ["a.png"]}
+        assert queue.stats("b1") == {"pending": 1, "leased": 0, "done": 1, "failed": 0}
+
+    @pytest.mark.unit
+    def test_dependency_order_and_result_handover(self, queue):
+        first = queue.enqueue("video_segment", {"segment": 1})
+        second = queue.enqueue("video_segment", {"segment": 2}, depends_on=first)
+
+        task = queue.claim("w1")
+        assert task.task_id == first
+        assert queue.claim("w2") is None  # Segment 2 waits for segment 1
+
+        queue.complete(first, "w1", {"last_frame": "/shared/last.png"})
+        task = queue.claim("w2")
+        assert task.task_id == second
+        assert task.dependency_result == {"last_frame": "/shared/last.png"}
+
+    @pytest.mark.unit
+    def test_failure_retries_then_fails_dependents(self, queue):
+        first = queue.enqueue("video_segment", {}, max_attempts=2)
+        second = queue.enqueue("video_segment", {}, depends_on=first)
+        third = queue.enqueue("video_segment", {}, depends_on=second)
+
+        queue.fail(queue.claim("w1").task_id, "w1", "OOM")
+        assert queue.get(first).status == "pending"
+        queue.fail(queue.claim("w1").task_id, "w1", "OOM again")
+
+        assert queue.get(first).status == "failed"
+        assert [queue.get(task_id).error for task_id in (second, third)] == [
+            f"Dependency {first} failed", f"Dependency {second} failed"
+        ]
+
+    @pytest.mark.unit
+    def test_expired_lease_is_requeued_for_another_worker(self, queue):
+        task_id = queue.enqueue("keyframe_variant", {})
+        queue.claim("dead-worker", lease_seconds=0.05)
+        assert queue.claim("w2") is None
+        time.sleep(0.1)
+
+        task = queue.claim("w2")
+        assert (task.task_id, task.attempts) == (task_id, 2)
+        assert "dead-worker" in task.error
+        assert not queue.heartbeat(task_id, "dead-worker")
+        assert not queue.complete(task_id, "dead-worker", {})
+        assert queue.heartbeat(task_id, "w2")
+
+    @pytest.mark.unit
+    def test_concurrent_processes_never_share_a_task(self, queue):
+        for n in range(30):
+            queue.enqueue("keyframe_variant", {"n": n})
+        code = (
+            "import sys\n"
+            "from infrastructure.work_queue import WorkQueue\n"
+            "queue = WorkQueue(sys.argv[1])\n"
+            "while True:\n"
+            "    task = queue.claim(sys.argv[2])\n"
+            "    if task is None:\n"
+            "        break\n"
+            "    queue.complete(task.task_id, sys.argv[2], {'worker': sys.argv[2]})\n"
+        )
+        workers = [
+            subprocess.Popen([sys.executable, "-c", code, queue.db_path, f"w{n}"], cwd=ROOT)
+            for n in range(4)
+        ]
+        assert all(worker.wait(timeout=60) == 0 for worker in workers)
+
+        tasks = queue.tasks()
+        assert all(task.status == "done" and task.attempts == 1 for task in tasks)
+        assert queue.stats()["done"] == 30
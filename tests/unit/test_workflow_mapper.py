@@ -1,3 +1,4 @@
+from services.model_manager.workflow_index import WorkflowIndex
 from services.model_manager.workflow_mapper import WorkflowMapper
 
 
@@ -8,6 +9,9 @@ class DummyScanner:
     def scan_all_workflows(self, use_cache=True):
         return self.mapping
 
+    def get_index(self):
+        return WorkflowIndex(self.mapping)
+
 
 def test_workflow_mapper_usage_details():
     mapping = {
@@ -553,6 +553,53 @@ class TestScanAllWorkflows:
         assert "without_models.json" not in result
 
 
+class TestPersistentScanCache:
+    """Tests for the per-file scan cache."""
+
+    WORKFLOW = {"4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "model.safetensors"}}}
+
+    def test_top_level_files_parsed_once(self, scanner, tmp_workflows_dir):
+        """Discovery does not return top-level workflows twice."""
+        (tmp_workflows_dir / "top.json").write_text(json.dumps(self.WORKFLOW))
+
+        with patch.object(scanner, "scan_workflow", wraps=scanner.scan_workflow) as mock_scan:
+            scanner.scan_all_workflows()
+
+        assert mock_scan.call_count == 1
+
+    def test_unchanged_files_not_reparsed_across_instances(self, tmp_workflows_dir, tmp_path):
+        """A new scanner reuses the persisted per-file results."""
+        cache = str(tmp_path / "scan.json")
+        (tmp_workflows_dir / "a.json").write_text(json.dumps(self.WORKFLOW))
+        (tmp_workflows_dir / "b.json").write_text(json.dumps(self.WORKFLOW))
+        first = WorkflowScanner(str(tmp_workflows_dir), cache_path=cache).scan_all_workflows()
+
+        rescanner = WorkflowScanner(str(tmp_workflows_dir), cache_path=cache)
+        with patch.object(rescanner, "scan_workflow") as mock_scan:
+            second = rescanner.scan_all_workflows()
+
+        mock_scan.assert_not_called()
+        assert second == first
+
+    def test_only_changed_files_reparsed(self, scanner, tmp_workflows_dir):
+        """Changed and deleted workflows invalidate only their own entries."""
+        (tmp_workflows_dir / "a.json").write_text(json.dumps(self.WORKFLOW))
+        (tmp_workflows_dir / "b.json").write_text(json.dumps(self.WORKFLOW))
+        scanner.scan_all_workflows()
+
+        lora = {"1": {"class_type": "LoraLoader", "inputs": {"lora_name": "x.safetensors"}}}
+        (tmp_workflows_dir / "a.json").write_text(json.dumps(lora) + " ")
+        (tmp_workflows_dir / "b.json").unlink()
+
+        with patch.object(scanner, "scan_workflow", wraps=scanner.scan_workflow) as mock_scan:
+            result = scanner.scan_all_workflows(use_cache=False)
+
+        assert [call[0][0] for call in mock_scan.call_args_list] == [str(tmp_workflows_dir / "a.json")]
+        assert result == {"a.json": [
+            {"type": "loras", "filename": "x.safetensors", "node_id": "1", "node_type": "LoraLoader"}
+        ]}
+
+
 class TestExtractInputsFromWidgets:
     """Tests for _extract_inputs_from_widgets method."""
 
@@ -873,3 +920,41 @@ class TestGetWorkflowsUsingModel:
 
         assert len(result) == 1
         assert "test.json" in result
+
+
+class TestWorkflowIndex:
+    """Tests for the inverted model->workflow index."""
+
+    def test_index_built_once_per_scan(self, scanner, tmp_workflows_dir):
+        """Repeated lookups reuse the index until the next rescan."""
+        wf = {"4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "model.safetensors"}}}
+        (tmp_workflows_dir / "test.json").write_text(json.dumps(wf))
+
+        index = scanner.get_index()
+        scanner.get_workflows_using_model("model.safetensors")
+
+        assert scanner.get_index() is index
+        scanner.scan_all_workflows(use_cache=False)
+        assert scanner.get_index() is not index
+
+    def test_index_lookups(self, scanner, tmp_workflows_dir):
+        """Index maps models to workflows, nodes and counts."""
+        wf1 = {
+            "4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "model.safetensors"}},
+            "5": {"class_type": "LoraLoader", "inputs": {"lora_name": "detail.safetensors"}},
+        }
+        wf2 = {"7": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "model.safetensors"}}}
+        (tmp_workflows_dir / "a.json").write_text(json.dumps(wf1))
+        (tmp_workflows_dir / "b.json").write_text(json.dumps(wf2))
+
+        index = scanner.get_index()
+
+        assert sorted(index.workflows_using("model.safetensors")) == ["a.json", "b.json"]
+        assert index.workflow_count("detail.safetensors") == 1
+        assert index.workflow_count("unknown.safetensors") == 0
+        assert {d["node_id"] for d in index.usage_details("model.safetensors")} == {"4", "7"}
+        assert index.referenced_models() == {
+            "checkpoints": {"model.safetensors"},
+            "loras": {"detail.safetensors"},
+        }
+        assert index.reference_count() == 3
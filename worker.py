@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""CINDERGRACE worker - render queued tasks on one ComfyUI backend (no Gradio).
+
+Start one worker per GPU box / ComfyUI instance, all pointing at the same
+queue file on the shared filesystem; dispatch work with
+``batch.py --queue FILE``. Workers that die lose their lease and their task is
+picked up again by another worker.
+
+Outputs are read from ``--comfy-root`` (the backend's ComfyUI folder as
+mounted here). Without it, a ``--comfy-url`` other than the configured one
+is treated as remote: inputs are uploaded and outputs downloaded through the
+ComfyUI API, and transition tasks are skipped.
+
+Examples:
+    python worker.py --queue /mnt/shared/work_queue.db --comfy-url http://gpu1:8188 --comfy-root /mnt/gpu1/ComfyUI
+    python worker.py --queue /mnt/shared/work_queue.db --comfy-url http://gpu2:8188
+    python worker.py --queue /mnt/shared/work_queue.db --kinds keyframe_variant --exit-when-idle
+    python worker.py --queue /mnt/shared/work_queue.db --stats
+
+Progress goes to stdout as JSON lines (``--format text`` for humans); logs
+go to stderr and logs/pipeline.log.
+
+Exit codes: 0 stopped normally, 1 ComfyUI backend not reachable,
+2 invalid arguments, 130 interrupted.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch import EXIT_FAILED, EXIT_INTERRUPTED, EXIT_OK, EXIT_USAGE, _printer  # noqa: E402
+from infrastructure.logger import PipelineLogger  # noqa: E402
+from infrastructure.work_queue import WorkQueue, default_queue_path  # noqa: E402
+from services.distributed_worker import TASK_KINDS, DistributedWorker  # noqa: E402
+
+
+def _kinds(value: str) -> tuple:
+    kinds = tuple(kind.strip() for kind in value.split(",") if kind.strip())
+    if not kinds or any(kind not in TASK_KINDS for kind in kinds):
+        raise argparse.ArgumentTypeError(f"Kinds must be a comma-separated subset of {','.join(TASK_KINDS)}")
+    return kinds
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Render CINDERGRACE tasks from a shared work queue.")
+    parser.add_argument("--queue", default=None, metavar="FILE",
+                        help="Work queue file shared by all workers (default: data/work_queue.db)")
+    parser.add_argument("--comfy-url", help="This worker's ComfyUI backend (default: configured URL)")
+    parser.add_argument("--comfy-root", metavar="DIR",
+                        help="That backend's ComfyUI folder as seen from here (default: fetch outputs via its API)")
+    parser.add_argument("--worker-id", help="Worker name in leases and logs (default: host-pid)")
+    parser.add_argument("--kinds", type=_kinds, default=None,
+                        help=f"Task kinds to take (default: {','.join(TASK_KINDS)}; no transitions when remote)")
+    parser.add_argument("--lease", type=float, default=DistributedWorker.DEFAULT_LEASE_SECONDS,
+                        help="Lease seconds; a task is re-queued if the worker stops renewing it")
+    parser.add_argument("--max-tasks", type=int, help="Exit after this many tasks")
+    parser.add_argument("--exit-when-idle", action="store_true", help="Exit when no task is runnable")
+    parser.add_argument("--stats", action="store_true", help="Print queue statistics and exit")
+    parser.add_argument("--format", choices=("json", "text"), default="json", help="Progress output format")
+    parser.add_argument("--log-level", default="WARNING", help="Console log level (stderr)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    PipelineLogger.set_level(getattr(logging, str(args.log_level).upper(), logging.WARNING))
+    emit = _printer(args.format)
+    if args.lease <= 0:
+        emit({"event": "error", "error": "--lease must be positive"})
+        return EXIT_USAGE
+
+    queue = WorkQueue(args.queue or default_queue_path())
+    if args.stats:
+        print(json.dumps(queue.stats()), flush=True)
+        return EXIT_OK
+
+    if args.comfy_root and not os.path.isdir(args.comfy_root):
+        emit({"event": "error", "error": f"--comfy-root is not a directory: {args.comfy_root}"})
+        return EXIT_USAGE
+    try:
+        worker = DistributedWorker(
+            queue,
+            comfy_url=args.comfy_url,
+            comfy_root=args.comfy_root,
+            worker_id=args.worker_id,
+            kinds=args.kinds,
+            lease_seconds=args.lease,
+            emit=emit,
+        )
+    except ValueError as e:
+        emit({"event": "error", "error": str(e)})
+        return EXIT_USAGE
+    conn = worker.check_backend()
+    if not conn.get("connected"):
+        emit({"event": "error", "error": f"ComfyUI not reachable at {worker.comfy_url}: {conn.get('error')}"})
+        return EXIT_FAILED
+
+    try:
+        worker.run(max_tasks=args.max_tasks, exit_when_idle=args.exit_when_idle)
+    except KeyboardInterrupt:
+        emit({"event": "interrupted", "worker": worker.worker_id})
+        return EXIT_INTERRUPTED
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())